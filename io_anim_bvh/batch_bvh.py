@@ -0,0 +1,250 @@
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Batch import of BVH files, to convert whole motion capture libraries at once.
+
+BVH files are read (parsed, and their channels converted) in a pool of worker processes,
+the resulting armatures and actions are then created in Blender's process.
+
+Usage:
+
+    blender --background --factory-startup --python io_anim_bvh/batch_bvh.py -- \\
+        [--jobs N] [--output-dir DIR] [--blend FILE] [--rotate-mode MODE] [--scale SCALE] \\
+        [--frame-start FRAME] [--use-fps-scale] [--use-cyclic] INPUT [INPUT ...]
+
+Each INPUT is a BVH file, a directory (searched recursively for ``*.bvh`` files) or a glob pattern.
+With ``--output-dir``, each imported armature is exported back to BVH in that directory,
+with ``--blend`` all armatures are kept and saved in that blend file.
+"""
+
+import glob
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+# Worker processes run outside of Blender, where neither `bpy` nor this add-on's package
+# can be imported, only its `bpy`-free `bvh_utils` module, imported from the add-on directory.
+_ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+if _ADDON_DIR not in sys.path:
+    sys.path.append(_ADDON_DIR)
+
+import bvh_utils
+
+
+def find_bvh_files(inputs):
+    """Return the BVH files matching *inputs* (files, directories or glob patterns), sorted and without duplicates."""
+    file_paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            file_paths.extend(sorted(glob.glob(os.path.join(glob.escape(path), "**", "*.bvh"), recursive=True)))
+        elif os.path.isfile(path):
+            file_paths.append(path)
+        else:
+            file_paths.extend(sorted(glob.glob(path, recursive=True)))
+    return list(dict.fromkeys(os.path.abspath(file_path) for file_path in file_paths))
+
+
+def read_bvh_files(file_paths, global_scale=1.0, rotate_mode=None, jobs=None):
+    """
+    Read BVH files, in *jobs* worker processes (the CPU count by default, 1 reading in this process).
+    With a *rotate_mode*, their animation is also converted to pose bone channels there.
+
+    Yield a tuple (file path, result of :func:`bvh_utils.read_bvh_data` or the exception raised, time spent reading)
+    for each file, in order. Only a few files are read ahead, so that memory use does not depend on the file count.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    executor = None
+    if jobs > 1 and len(file_paths) > 1:
+        try:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Never fork Blender's process.
+            executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+        except (ImportError, OSError) as ex:
+            print("\tunable to start worker processes (%s), reading files in this process" % ex)
+
+    if executor is None:
+        for file_path in file_paths:
+            try:
+                result, read_time = bvh_utils.read_bvh_data_timed(file_path, global_scale, rotate_mode)
+            except Exception as ex:
+                result, read_time = ex, 0.0
+            yield file_path, result, read_time
+        return
+
+    def submit(file_path):
+        return file_path, executor.submit(bvh_utils.read_bvh_data_timed, file_path, global_scale, rotate_mode)
+
+    with executor:
+        file_path_iter = iter(file_paths)
+        pending = deque(map(submit, islice(file_path_iter, jobs * 2)))
+        while pending:
+            file_path, future = pending.popleft()
+            # Keep the pool busy while this file gets imported.
+            pending.extend(map(submit, islice(file_path_iter, 1)))
+            try:
+                result, read_time = future.result()
+            except Exception as ex:
+                result, read_time = ex, 0.0
+            yield file_path, result, read_time
+
+
+def _addon_module(name):
+    """Import a module of this add-on, be this file run as a script or imported from the add-on package."""
+    import importlib
+    if __package__:
+        return importlib.import_module("." + name, __package__)
+    parent_dir = os.path.dirname(_ADDON_DIR)
+    if parent_dir not in sys.path:
+        sys.path.append(parent_dir)
+    return importlib.import_module(os.path.basename(_ADDON_DIR) + "." + name)
+
+
+def batch_import(
+        context,
+        file_paths,
+        *,
+        jobs=None,
+        output_dir=None,
+        keep_objects=True,
+        rotate_mode='NATIVE',
+        global_scale=1.0,
+        use_cyclic=False,
+        frame_start=1,
+        global_matrix=None,
+        use_fps_scale=False,
+):
+    """
+    Import BVH files as armatures, reading them in worker processes, see :func:`read_bvh_files`.
+
+    With *output_dir*, each armature gets exported back to a BVH file of the same name in that directory.
+    Unless *keep_objects* is set, armatures are removed once exported.
+
+    Return the list of the imported armature objects (empty when not kept), and the list of the files
+    which could not be read.
+    """
+    import bpy
+    import_bvh = _addon_module("import_bvh")
+    export_bvh = _addon_module("export_bvh")
+
+    scene = context.scene
+    frame_orig = scene.frame_current
+    arm_obs = []
+    failed = []
+
+    t_start = time.time()
+    for file_path, result, read_time in read_bvh_files(
+            file_paths, global_scale=global_scale, rotate_mode=rotate_mode, jobs=jobs):
+        if isinstance(result, Exception):
+            print("%s: FAILED (%s)" % (file_path, result))
+            failed.append(file_path)
+            continue
+
+        t1 = time.time()
+        bvh_joints, bvh_frame_time, _bvh_frame_count = result
+        bvh_nodes = import_bvh.bvh_nodes_from_joints(bvh_joints, global_scale=global_scale)
+
+        # Broken BVH handling: guess frame rate when it is not contained in the file.
+        file_use_fps_scale = use_fps_scale
+        if bvh_frame_time is None:
+            bvh_frame_time = scene.render.fps_base / scene.render.fps
+            file_use_fps_scale = False
+
+        arm_ob = import_bvh.bvh_node_dict2armature(
+            context, bpy.path.display_name_from_filepath(file_path), bvh_nodes, bvh_frame_time,
+            rotate_mode=rotate_mode,
+            frame_start=frame_start,
+            IMPORT_LOOP=use_cyclic,
+            global_matrix=global_matrix,
+            use_fps_scale=file_use_fps_scale,
+        )
+        import_time = time.time() - t1
+
+        export_time = 0.0
+        if output_dir is not None:
+            t1 = time.time()
+            action = arm_ob.animation_data.action if arm_ob.animation_data else None
+            export_frame_start, export_frame_end = (
+                (int(action.frame_range[0]), int(action.frame_range[1])) if action else (frame_start, frame_start)
+            )
+            export_bvh.write_armature(
+                context, os.path.join(output_dir, os.path.basename(file_path)),
+                export_frame_start, export_frame_end,
+                # Back to the units of the BVH file.
+                global_scale=1.0 / global_scale,
+                rotate_mode='NATIVE' if rotate_mode == 'QUATERNION' else rotate_mode,
+            )
+            export_time = time.time() - t1
+
+        if keep_objects:
+            arm_obs.append(arm_ob)
+        else:
+            action = arm_ob.animation_data.action if arm_ob.animation_data else None
+            arm = arm_ob.data
+            bpy.data.objects.remove(arm_ob)
+            bpy.data.armatures.remove(arm)
+            if action is not None:
+                bpy.data.actions.remove(action)
+
+        print("%s: read %.4f, import %.4f, export %.4f" % (file_path, read_time, import_time, export_time))
+
+    scene.frame_set(frame_orig)
+
+    print("%d files in %.4f (%d failed)" % (len(file_paths), time.time() - t_start, len(failed)))
+    return arm_obs, failed
+
+
+def main(argv):
+    import argparse
+    import bpy
+
+    parser = argparse.ArgumentParser(
+        prog="blender --background --python " + os.path.basename(__file__) + " --",
+        description="Import (and convert) BVH files in batch.",
+    )
+    parser.add_argument("inputs", nargs="+", metavar="INPUT", help="BVH file, directory or glob pattern")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Number of worker processes reading files")
+    parser.add_argument("--output-dir", help="Export the imported armatures back to BVH files in this directory")
+    parser.add_argument("--blend", help="Save all the imported armatures in this blend file")
+    parser.add_argument(
+        "--rotate-mode", default='NATIVE',
+        choices=('QUATERNION', 'NATIVE', 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX'),
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--frame-start", type=int, default=1)
+    parser.add_argument("--use-fps-scale", action="store_true")
+    parser.add_argument("--use-cyclic", action="store_true")
+    args = parser.parse_args(argv)
+
+    file_paths = find_bvh_files(args.inputs)
+    if not file_paths:
+        parser.error("no BVH file found")
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    _arm_obs, failed = batch_import(
+        bpy.context, file_paths,
+        jobs=args.jobs,
+        output_dir=args.output_dir,
+        keep_objects=args.blend is not None,
+        rotate_mode=args.rotate_mode,
+        global_scale=args.scale,
+        use_cyclic=args.use_cyclic,
+        frame_start=args.frame_start,
+        use_fps_scale=args.use_fps_scale,
+    )
+
+    if args.blend is not None:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.blend))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
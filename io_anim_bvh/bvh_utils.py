@@ -0,0 +1,590 @@
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+NumPy helpers to process BVH motion data, all frames of a joint at once.
+
+Rotation conversions follow the conventions of Blender's ``mathutils``
+(column vectors, euler orders naming the axes in the order they are applied,
+canonical quaternions with a non-negative W, compatible eulers), so that
+results match converting frame by frame with ``mathutils``.
+
+Note: neither `bpy` nor `mathutils` are imported here, so this module can
+be used outside of Blender, e.g. from worker processes.
+"""
+
+import time
+
+import numpy as np
+
+# Indices of the axes of each euler order, and whether the order has an odd parity,
+# see `get_rotation_order_info()` in Blender's BLI_math_rotation.
+_EULER_ORDER_INFO = {
+    'XYZ': ((0, 1, 2), False),
+    'XZY': ((0, 2, 1), True),
+    'YXZ': ((1, 0, 2), True),
+    'YZX': ((1, 2, 0), False),
+    'ZXY': ((2, 0, 1), False),
+    'ZYX': ((2, 1, 0), True),
+}
+# Euler order of the rotation channels of a joint, by `BVHJoint.rot_order`.
+_EULER_ORDER_FROM_ROT_ORDER = {axes: order for order, (axes, _parity) in _EULER_ORDER_INFO.items()}
+
+_PI_X2 = 2.0 * np.pi
+
+
+def _values_counts(text):
+    """
+    Number of values of each line of *text*, empty lines included, without splitting each line.
+    """
+    # Spaces and control characters end values, as far as valid motion data is concerned.
+    data = np.frombuffer(text.encode() + b"\n", dtype=np.uint8)
+    is_space = data <= 32
+    value_ends = np.flatnonzero(is_space[1:] > is_space[:-1])
+    line_ends = np.flatnonzero(data == ord("\n"))
+    return np.diff(np.searchsorted(value_ends, line_ends), prepend=0)
+
+
+def parse_motion(motion_lines, channel_count):
+    """
+    Parse the frames of a BVH MOTION block, return a (frames, channel_count) float array.
+
+    *motion_lines* are the text lines following the "Frame Time:" line, one frame per (non-empty) line.
+    """
+    text = "\n".join(motion_lines)
+    # Number of values of each (non-empty) line, the values of all lines can only be used at once
+    # when each line has exactly one value per channel (a matching total is not enough).
+    values_counts = _values_counts(text)
+    values_counts = values_counts[values_counts != 0]
+    frames_count = len(values_counts)
+    if np.all(values_counts == channel_count):
+        motion = np.fromstring(text, dtype=np.float64, sep=" ") if frames_count else np.empty(0)
+        if motion.size == frames_count * channel_count:
+            return motion.reshape(frames_count, channel_count)
+
+    # Some values could not be parsed, or there are extra values on some lines,
+    # only read the expected channels of each line (raising an error on invalid ones).
+    motion = np.empty((frames_count, channel_count), dtype=np.float64)
+    for frame_i, words in enumerate(words for words in (line.split() for line in motion_lines) if words):
+        if len(words) < channel_count:
+            raise ValueError("Frame %d has %d values, %d expected" % (frame_i, len(words), channel_count))
+        motion[frame_i] = words[:channel_count]
+    return motion
+
+
+class BVHJoint:
+    """
+    A joint of the BVH hierarchy, as read from the file (without any `mathutils` type).
+    """
+    __slots__ = (
+        # Bvh joint name (made unique).
+        'name',
+        # Index of the parent joint, None for no parent.
+        'parent',
+        # Offset of the joint from its parent (scaled).
+        'offset',
+        # Offset of the end site from the joint (scaled), None if the joint has no end site.
+        'end_offset',
+        # List of 6 ints, -1 for an unused channel, otherwise the column of the motion data,
+        # loc triple then rot triple.
+        'channels',
+        # A triple of indices as to the order rotation is applied.
+        # [0,1,2] is x/y/z - [None, None, None] if no rotation..
+        'rot_order',
+        # Index from the file.
+        'index',
+        # A (frames, 6) array, one row for each frame: (locx, locy, locz, rotx, roty, rotz),
+        # locations scaled, euler rotation in radians ALWAYS stored xyz order.
+        # The first row is the rest pose.
+        'anim_data',
+        # The pose bone channels of all frames but the rest pose, as set by the importer, see `convert_channels()`.
+        # A (frames, 3) location array, None if the joint has no location channel.
+        'location',
+        # A (frames, 3) euler (or (frames, 4) quaternion) rotation array, None if the joint has no rotation channel.
+        'rotation',
+    )
+
+    def __init__(self, name, parent, offset, channels, rot_order, index):
+        self.name = name
+        self.parent = parent
+        self.offset = offset
+        self.end_offset = None
+        self.channels = channels
+        self.rot_order = tuple(rot_order)
+        self.index = index
+        self.anim_data = None
+        self.location = None
+        self.rotation = None
+
+
+def read_bvh_data(file_path, global_scale=1.0, rotate_mode=None):
+    """
+    Read a BVH file, return a tuple (joints, frame time, frame count).
+
+    *joints* is the list of :class:`BVHJoint`, in file order, with their animation data.
+    Frame time and count are None when missing from the file.
+
+    With a *rotate_mode*, the animation is also converted to pose bone channels, see :func:`convert_channels`.
+    """
+    # File loading stuff
+    # Open the file for importing
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+    # Non standard carriage returns?
+    if len(lines) == 1:
+        lines = lines[0].split('\r')
+
+    # Separate the hierarchy into a list of lists, each line a list of words,
+    # up to the MOTION header (its "Frames:" and "Frame Time:" lines included).
+    # The motion data itself is kept as text lines, to be parsed at once.
+    file_lines = []
+    line_iter = iter(lines)
+    for line in line_iter:
+        # Split by whitespace.
+        words = line.split()
+        if not words:
+            continue
+        file_lines.append(words)
+        if len(words) == 1 and words[0].lower() == 'motion':
+            # Also split the "Frames:" and "Frame Time:" lines.
+            header_count = 0
+            for line in line_iter:
+                words = line.split()
+                if words:
+                    file_lines.append(words)
+                    header_count += 1
+                    if header_count == 2:
+                        break
+            break
+    motion_lines = list(line_iter)
+    del lines, line_iter
+
+    # Create hierarchy as empties
+    if file_lines[0][0].lower() == 'hierarchy':
+        # print 'Importing the BVH Hierarchy for:', file_path
+        pass
+    else:
+        raise Exception("This is not a BVH file")
+
+    bvh_nodes = {None: None}
+    bvh_nodes_serial = [None]
+    bvh_frame_count = None
+    bvh_frame_time = None
+
+    channelIndex = -1
+
+    lineIdx = 0  # An index for the file.
+    while lineIdx < len(file_lines) - 1:
+        if file_lines[lineIdx][0].lower() in {'root', 'joint'}:
+
+            # Join spaces into 1 word with underscores joining it.
+            if len(file_lines[lineIdx]) > 2:
+                file_lines[lineIdx][1] = '_'.join(file_lines[lineIdx][1:])
+                file_lines[lineIdx] = file_lines[lineIdx][:2]
+
+            # MAY NEED TO SUPPORT MULTIPLE ROOTS HERE! Still unsure weather multiple roots are possible?
+
+            # Make sure the names are unique - Object names will match joint names exactly and both will be unique.
+            name = file_lines[lineIdx][1]
+
+            # While unlikely, there exists a user report of duplicate joint names, see: #109399.
+            if name in bvh_nodes:
+                name_orig = name
+                name_index = 1
+                while (name := "%s.%03d" % (name_orig, name_index)) in bvh_nodes:
+                    name_index += 1
+                del name_orig, name_index
+
+            # print '%snode: %s, parent: %s' % (len(bvh_nodes_serial) * '  ', name,  bvh_nodes_serial[-1])
+
+            lineIdx += 2  # Increment to the next line (Offset)
+            offset = (
+                global_scale * float(file_lines[lineIdx][1]),
+                global_scale * float(file_lines[lineIdx][2]),
+                global_scale * float(file_lines[lineIdx][3]),
+            )
+            lineIdx += 1  # Increment to the next line (Channels)
+
+            # newChannel[Xposition, Yposition, Zposition, Xrotation, Yrotation, Zrotation]
+            # newChannel references indices to the motiondata,
+            # if not assigned then -1 refers to the last value that will be added on loading at a value of zero, this is appended
+            # We'll add a zero value onto the end of the MotionDATA so this always refers to a value.
+            my_channel = [-1, -1, -1, -1, -1, -1]
+            my_rot_order = [None, None, None]
+            rot_count = 0
+            for channel in file_lines[lineIdx][2:]:
+                channel = channel.lower()
+                channelIndex += 1  # So the index points to the right channel
+                if channel == 'xposition':
+                    my_channel[0] = channelIndex
+                elif channel == 'yposition':
+                    my_channel[1] = channelIndex
+                elif channel == 'zposition':
+                    my_channel[2] = channelIndex
+
+                elif channel == 'xrotation':
+                    my_channel[3] = channelIndex
+                    my_rot_order[rot_count] = 0
+                    rot_count += 1
+                elif channel == 'yrotation':
+                    my_channel[4] = channelIndex
+                    my_rot_order[rot_count] = 1
+                    rot_count += 1
+                elif channel == 'zrotation':
+                    my_channel[5] = channelIndex
+                    my_rot_order[rot_count] = 2
+                    rot_count += 1
+
+            channels = file_lines[lineIdx][2:]
+
+            my_parent = bvh_nodes_serial[-1]  # account for none
+
+            bvh_joint = bvh_nodes[name] = BVHJoint(
+                name,
+                None if my_parent is None else my_parent.index,
+                offset,
+                my_channel,
+                my_rot_order,
+                len(bvh_nodes) - 1,
+            )
+
+            # If we have another child then we can call ourselves a parent, else
+            bvh_nodes_serial.append(bvh_joint)
+
+        # Account for an end node.
+        # There is sometimes a name after 'End Site' but we will ignore it.
+        if file_lines[lineIdx][0].lower() == 'end' and file_lines[lineIdx][1].lower() == 'site':
+            # Increment to the next line (Offset)
+            lineIdx += 2
+            bvh_nodes_serial[-1].end_offset = (
+                global_scale * float(file_lines[lineIdx][1]),
+                global_scale * float(file_lines[lineIdx][2]),
+                global_scale * float(file_lines[lineIdx][3]),
+            )
+
+            # Just so we can remove the parents in a uniform way,
+            # the end has kids so this is a placeholder.
+            bvh_nodes_serial.append(None)
+
+        if len(file_lines[lineIdx]) == 1 and file_lines[lineIdx][0] == '}':  # == ['}']
+            bvh_nodes_serial.pop()  # Remove the last item
+
+        # End of the hierarchy. Begin the animation section of the file with
+        # the following header.
+        #  MOTION
+        #  Frames: n
+        #  Frame Time: dt
+        if len(file_lines[lineIdx]) == 1 and file_lines[lineIdx][0].lower() == 'motion':
+            lineIdx += 1  # Read frame count.
+            if (
+                    len(file_lines[lineIdx]) == 2 and
+                    file_lines[lineIdx][0].lower() == 'frames:'
+            ):
+                bvh_frame_count = int(file_lines[lineIdx][1])
+
+            lineIdx += 1  # Read frame rate.
+            if (
+                    len(file_lines[lineIdx]) == 3 and
+                    file_lines[lineIdx][0].lower() == 'frame' and
+                    file_lines[lineIdx][1].lower() == 'time:'
+            ):
+                bvh_frame_time = float(file_lines[lineIdx][2])
+
+            lineIdx += 1  # Set the cursor to the first frame
+
+            break
+
+        lineIdx += 1
+
+    # Remove the None value used for easy parent reference
+    del bvh_nodes[None]
+    # Don't use anymore
+    del bvh_nodes_serial
+
+    # In file order.
+    bvh_joints = list(bvh_nodes.values())
+
+    # Parse all the frames at once, the last (extra) column is always zero,
+    # so unused channels (-1) refer to it.
+    motion = parse_motion(motion_lines, channelIndex + 1)
+    motion = np.hstack((motion, np.zeros((len(motion), 1))))
+    del motion_lines
+
+    for bvh_joint in bvh_joints:
+        channels = bvh_joint.channels
+        anim_data = bvh_joint.anim_data = np.zeros((len(motion) + 1, 6))
+        anim_data[1:, :3] = global_scale * motion[:, channels[:3]]
+        if any(channel != -1 for channel in channels[3:]):
+            anim_data[1:, 3:] = np.radians(motion[:, channels[3:]])
+
+    if rotate_mode is not None:
+        convert_channels(bvh_joints, rotate_mode, global_scale=global_scale)
+
+    return bvh_joints, bvh_frame_time, bvh_frame_count
+
+
+def read_bvh_data_timed(file_path, global_scale=1.0, rotate_mode=None):
+    """
+    Same as :func:`read_bvh_data`, return a tuple (result, time spent reading), for batch processing.
+    """
+    t1 = time.perf_counter()
+    result = read_bvh_data(file_path, global_scale=global_scale, rotate_mode=rotate_mode)
+    return result, time.perf_counter() - t1
+
+
+def euler_to_matrix(eulers, order='XYZ'):
+    """
+    Convert a (..., 3) array of euler angles (in XYZ components, whatever the order) to (..., 3, 3) rotation matrices.
+    """
+    cos = np.cos(eulers)
+    sin = np.sin(eulers)
+    zero = np.zeros(eulers.shape[:-1])
+    one = np.ones(eulers.shape[:-1])
+
+    result = None
+    for axis in order:
+        i = "XYZ".index(axis)
+        c = cos[..., i]
+        s = sin[..., i]
+        if i == 0:
+            rows = ((one, zero, zero), (zero, c, -s), (zero, s, c))
+        elif i == 1:
+            rows = ((c, zero, s), (zero, one, zero), (-s, zero, c))
+        else:
+            rows = ((c, -s, zero), (s, c, zero), (zero, zero, one))
+        axis_matrix = np.stack([np.stack(row, axis=-1) for row in rows], axis=-2)
+        # The first axis of the order is applied first.
+        result = axis_matrix if result is None else axis_matrix @ result
+    return result
+
+
+def matrix_to_quaternion(matrices):
+    """
+    Convert (..., 3, 3) rotation matrices to (..., 4) quaternions (WXYZ), with a non-negative W.
+    """
+    # Blender's matrices are accessed as mat[column][row].
+    m = np.swapaxes(matrices, -1, -2)
+    m00, m11, m22 = m[..., 0, 0], m[..., 1, 1], m[..., 2, 2]
+    trace = m00 + m11 + m22
+
+    quats = np.empty(matrices.shape[:-2] + (4,))
+    # Choose the formula with the best precision for each matrix, see `mat3_normalized_to_quat()`.
+    use_w = trace > 0.0
+    use_x = ~use_w & (m00 > m11) & (m00 > m22)
+    use_y = ~use_w & ~use_x & (m11 > m22)
+    use_z = ~use_w & ~use_x & ~use_y
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = 2.0 * np.sqrt(np.maximum(1.0 + trace, 0.0))
+        w_quat = np.stack((0.25 * s, (m[..., 1, 2] - m[..., 2, 1]) / s,
+                           (m[..., 2, 0] - m[..., 0, 2]) / s, (m[..., 0, 1] - m[..., 1, 0]) / s), axis=-1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m00 - m11 - m22, 0.0))
+        x_quat = np.stack(((m[..., 1, 2] - m[..., 2, 1]) / s, 0.25 * s,
+                           (m[..., 1, 0] + m[..., 0, 1]) / s, (m[..., 2, 0] + m[..., 0, 2]) / s), axis=-1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m11 - m00 - m22, 0.0))
+        y_quat = np.stack(((m[..., 2, 0] - m[..., 0, 2]) / s, (m[..., 1, 0] + m[..., 0, 1]) / s,
+                           0.25 * s, (m[..., 2, 1] + m[..., 1, 2]) / s), axis=-1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 + m22 - m00 - m11, 0.0))
+        z_quat = np.stack(((m[..., 0, 1] - m[..., 1, 0]) / s, (m[..., 2, 0] + m[..., 0, 2]) / s,
+                           (m[..., 2, 1] + m[..., 1, 2]) / s, 0.25 * s), axis=-1)
+
+    quats[use_w] = w_quat[use_w]
+    quats[use_x] = x_quat[use_x]
+    quats[use_y] = y_quat[use_y]
+    quats[use_z] = z_quat[use_z]
+
+    # Make sure W is non-negative for a canonical result.
+    quats[quats[..., 0] < 0.0] *= -1.0
+    quats /= np.linalg.norm(quats, axis=-1)[..., None]
+    return quats
+
+
+def matrix_to_euler_pair(matrices, order='XYZ'):
+    """
+    Convert (..., 3, 3) rotation matrices to the two equivalent (..., 3) euler rotations of the given order,
+    see `mat3_normalized_to_eulo2()` in Blender's BLI_math_rotation.
+    """
+    (i, j, k), parity = _EULER_ORDER_INFO[order]
+    # Blender's matrices are accessed as mat[column][row].
+    m = np.swapaxes(matrices, -1, -2)
+
+    cy = np.hypot(m[..., i, i], m[..., i, j])
+    eul1 = np.empty(matrices.shape[:-2] + (3,))
+    eul2 = np.empty(matrices.shape[:-2] + (3,))
+
+    eul1[..., i] = np.arctan2(m[..., j, k], m[..., k, k])
+    eul1[..., j] = np.arctan2(-m[..., i, k], cy)
+    eul1[..., k] = np.arctan2(m[..., i, j], m[..., i, i])
+    eul2[..., i] = np.arctan2(-m[..., j, k], -m[..., k, k])
+    eul2[..., j] = np.arctan2(-m[..., i, k], -cy)
+    eul2[..., k] = np.arctan2(-m[..., i, j], -m[..., i, i])
+
+    # Gimbal lock, both solutions are the same.
+    locked = cy <= 16.0 * np.finfo(np.float32).eps
+    eul1[locked, i] = np.arctan2(-m[..., k, j], m[..., j, j])[locked]
+    eul1[locked, k] = 0.0
+    eul2[locked] = eul1[locked]
+
+    if parity:
+        eul1 = -eul1
+        eul2 = -eul2
+    return eul1, eul2
+
+
+def compatible_euler(eulers, eulers_old):
+    """
+    Return (..., 3) euler rotations changed to be as close as possible to the previous ones,
+    see `compatible_eul()` in Blender's BLI_math_rotation.
+    """
+    eulers = np.array(eulers)
+    pi_thresh = 5.1
+
+    # Correct differences of about 360 degrees first.
+    deul = eulers - eulers_old
+    eulers = np.where(deul > pi_thresh, eulers - np.floor(deul / _PI_X2 + 0.5) * _PI_X2, eulers)
+    eulers = np.where(deul < -pi_thresh, eulers + np.floor(-deul / _PI_X2 + 0.5) * _PI_X2, eulers)
+    deul = np.abs(eulers - eulers_old)
+    deul_sign = eulers > eulers_old
+
+    # Is one of the axis rotations larger than 180 degrees and the others small?
+    for i, (j, k) in enumerate(((1, 2), (2, 0), (0, 1))):
+        flip = (deul[..., i] > 3.2) & (deul[..., j] < 1.6) & (deul[..., k] < 1.6)
+        eulers[..., i] -= np.where(flip, np.where(deul_sign[..., i], _PI_X2, -_PI_X2), 0.0)
+    return eulers
+
+
+def compatible_euler_sequence(eulers1, eulers2, eulers_start=None):
+    """
+    Choose, for each frame of (frames, ..., 3) pairs of equivalent euler rotations (see :func:`matrix_to_euler_pair`),
+    the one closest to the rotation of the previous frame, as converting frame by frame with a compatible euler does.
+
+    All the trailing dimensions (e.g. joints) are processed at once, frames are processed in order, the first one being
+    compared to *eulers_start* (zero rotations by default).
+    """
+    result = np.empty_like(eulers1)
+    eulers_old = np.zeros(eulers1.shape[1:]) if eulers_start is None else eulers_start
+    for frame_i in range(len(eulers1)):
+        eul1 = compatible_euler(eulers1[frame_i], eulers_old)
+        eul2 = compatible_euler(eulers2[frame_i], eulers_old)
+        d1 = np.abs(eul1 - eulers_old).sum(axis=-1)
+        d2 = np.abs(eul2 - eulers_old).sum(axis=-1)
+        eulers_old = result[frame_i] = np.where((d1 > d2)[..., None], eul2, eul1)
+    return result
+
+
+def bone_rest_matrices(bvh_joints, global_scale=1.0):
+    """
+    Return the (joints, 3, 3) rest matrices of the bones created for *bvh_joints* by the importer,
+    i.e. the rotation part of their ``matrix_local`` (before the global matrix gets applied).
+
+    The heads and tails of the bones are placed as ``import_bvh`` does, rolls are zero,
+    see `vec_roll_to_mat3_normalized()` in Blender's armature code.
+    """
+    joint_count = len(bvh_joints)
+    head_local = np.array([bvh_joint.offset for bvh_joint in bvh_joints], dtype=np.float64).reshape(joint_count, 3)
+    head_world = head_local.copy()
+    children = [[] for _ in range(joint_count)]
+    for i, bvh_joint in enumerate(bvh_joints):
+        # Parents are always before their children.
+        if bvh_joint.parent is not None:
+            head_world[i] += head_world[bvh_joint.parent]
+            children[bvh_joint.parent].append(i)
+
+    # Tails of the joints, see `import_bvh.bvh_nodes_from_joints()`.
+    tail_world = head_world.copy()
+    tail_local = head_local.copy()
+    for i, bvh_joint in enumerate(bvh_joints):
+        if bvh_joint.end_offset is not None:
+            tail_world[i] += bvh_joint.end_offset
+            tail_local[i] += bvh_joint.end_offset
+        elif len(children[i]) == 1:
+            tail_world[i] = head_world[children[i][0]]
+            tail_local[i] += head_local[children[i][0]]
+        elif children[i]:
+            tail_world[i] = head_world[children[i]].sum(axis=0) * (1.0 / len(children[i]))
+            tail_local[i] = head_local[children[i]].sum(axis=0) * (1.0 / len(children[i]))
+
+        if np.linalg.norm(tail_local[i] - head_local[i]) <= 0.001 * global_scale:
+            tail_world[i, 1] += global_scale / 10
+            tail_local[i, 1] += global_scale / 10
+
+    # Tails of the bones, see `import_bvh.bvh_node_dict2armature()`.
+    lengths = np.linalg.norm(head_local - tail_local, axis=1)
+    average_bone_length = lengths[lengths != 0.0].mean() if lengths.any() else 0.1
+    tails = tail_world.copy()
+    for i, bvh_joint in enumerate(bvh_joints):
+        if np.linalg.norm(head_world[i] - tails[i]) < 0.001:
+            parent = bvh_joint.parent
+            if parent is not None and (head_local[parent] != tail_local[parent]).any():
+                tails[i] -= head_local[parent] - tail_local[parent]
+            else:
+                tails[i, 1] += average_bone_length
+
+    axes = tails - head_world
+    x, y, z = (axes / np.linalg.norm(axes, axis=1)[:, None]).T
+
+    # Remapping Y from [-1, +1] to [0, 2].
+    theta = 1.0 + y
+    # Squared distance from origin in the X, Z plane.
+    theta_alt = x * x + z * z
+    # Close to the negative Y axis the precision of theta is bad, recompute it from X and Z.
+    safe = theta > 6.1e-3
+    theta = np.where(safe, theta, theta_alt * 0.5 + theta_alt * theta_alt * 0.125)
+    # Too close to the negative Y axis, the roll is undefined.
+    singular = ~safe & (theta_alt <= 2.5e-4 * 2.5e-4)
+    theta[singular] = 1.0
+
+    # The Y axis of the bone is its direction.
+    matrices = np.stack((
+        np.stack((1.0 - x * x / theta, x, -x * z / theta), axis=-1),
+        np.stack((-x, y, -z), axis=-1),
+        np.stack((-x * z / theta, z, 1.0 - z * z / theta), axis=-1),
+    ), axis=-2)
+    matrices[singular] = np.diag((-1.0, -1.0, 1.0))
+    return matrices
+
+
+def convert_channels(bvh_joints, rotate_mode, global_scale=1.0):
+    """
+    Convert the animation of *bvh_joints* to the pose bone channels set by the importer, for all frames but
+    the rest pose, setting their *location* and *rotation*.
+
+    *rotate_mode* is 'QUATERNION', 'NATIVE' (the euler order of each joint) or an euler order.
+    """
+    rest_matrices = bone_rest_matrices(bvh_joints, global_scale=global_scale)
+    rest_matrices_inv = np.linalg.inv(rest_matrices)
+
+    # Euler rotations depend on the rotation of the previous frame, they are made compatible
+    # for all joints at once, once all rotation matrices are known.
+    euler_joints = []
+    euler_pairs = []
+
+    for bvh_joint, rest_matrix, rest_matrix_inv in zip(bvh_joints, rest_matrices, rest_matrices_inv):
+        anim_data = bvh_joint.anim_data[1:]
+        bvh_joint.location = bvh_joint.rotation = None
+
+        if any(channel != -1 for channel in bvh_joint.channels[:3]):
+            # The bone space translation, for all frames.
+            bvh_joint.location = (anim_data[:, :3] - bvh_joint.offset) @ rest_matrix_inv.T
+
+        if any(channel != -1 for channel in bvh_joint.channels[3:]):
+            rot_order_str = _EULER_ORDER_FROM_ROT_ORDER.get(bvh_joint.rot_order, 'XYZ')
+            # Apply the rotation order and convert to XYZ, note that the order is reversed.
+            matrices = rest_matrix_inv @ euler_to_matrix(anim_data[:, 3:], rot_order_str[::-1]) @ rest_matrix
+
+            if rotate_mode == 'QUATERNION':
+                bvh_joint.rotation = matrix_to_quaternion(matrices)
+            else:
+                euler_joints.append(bvh_joint)
+                euler_order = rot_order_str if rotate_mode == 'NATIVE' else rotate_mode
+                euler_pairs.append(matrix_to_euler_pair(matrices, euler_order))
+
+    if euler_joints:
+        # (frames, joints, 3) arrays.
+        eulers = compatible_euler_sequence(
+            np.stack([eul1 for eul1, _eul2 in euler_pairs], axis=1),
+            np.stack([eul2 for _eul1, eul2 in euler_pairs], axis=1),
+        )
+        for i, bvh_joint in enumerate(euler_joints):
+            bvh_joint.rotation = eulers[:, i]
@@ -2,11 +2,16 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-from math import radians, ceil
+from math import ceil
 
 import bpy
+import numpy as np
 from bpy.app.translations import pgettext_tip as tip_
-from mathutils import Vector, Euler, Matrix
+from mathutils import Vector
+
+from . import bvh_utils
+
+LINEAR_INTERPOLATION_VALUE = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
 
 
 class BVH_Node:
@@ -34,9 +39,14 @@ class BVH_Node:
         'rot_order',
         # Same as above but a string 'XYZ' format..
         'rot_order_str',
-        # A list one tuple's one for each frame: (locx, locy, locz, rotx, roty, rotz),
+        # A (frames, 6) array, one row for each frame: (locx, locy, locz, rotx, roty, rotz),
         # euler rotation ALWAYS stored xyz order, even when native used.
+        # The first row is the rest pose.
         'anim_data',
+        # The pose bone channels of all frames but the rest pose, converted by `bvh_utils.convert_channels()`,
+        # None when not converted or without such channels.
+        'location',
+        'rotation',
         # Convenience function, bool, same as: (channels[0] != -1 or channels[1] != -1 or channels[2] != -1).
         'has_loc',
         # Convenience function, bool, same as: (channels[3] != -1 or channels[4] != -1 or channels[5] != -1).
@@ -75,9 +85,11 @@ class BVH_Node:
 
         self.children = []
 
-        # List of 6 length tuples: (lx, ly, lz, rx, ry, rz)
+        # Rows of (lx, ly, lz, rx, ry, rz),
         # even if the channels aren't used they will just be zero.
-        self.anim_data = [(0, 0, 0, 0, 0, 0)]
+        self.anim_data = np.zeros((1, 6))
+        self.location = None
+        self.rotation = None
 
     def __repr__(self):
         return (
@@ -96,200 +108,48 @@ def sorted_nodes(bvh_nodes):
 
 
 def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
-    # File loading stuff
-    # Open the file for importing
-    file = open(file_path, 'r')
-
-    # Separate into a list of lists, each line a list of words.
-    file_lines = file.readlines()
-    # Non standard carriage returns?
-    if len(file_lines) == 1:
-        file_lines = file_lines[0].split('\r')
-
-    # Split by whitespace.
-    file_lines = [ll for ll in [l.split() for l in file_lines] if ll]
-
-    # Create hierarchy as empties
-    if file_lines[0][0].lower() == 'hierarchy':
-        # print 'Importing the BVH Hierarchy for:', file_path
-        pass
-    else:
-        raise Exception("This is not a BVH file")
-
-    bvh_nodes = {None: None}
-    bvh_nodes_serial = [None]
-    bvh_frame_count = None
-    bvh_frame_time = None
-
-    channelIndex = -1
-
-    lineIdx = 0  # An index for the file.
-    while lineIdx < len(file_lines) - 1:
-        if file_lines[lineIdx][0].lower() in {'root', 'joint'}:
-
-            # Join spaces into 1 word with underscores joining it.
-            if len(file_lines[lineIdx]) > 2:
-                file_lines[lineIdx][1] = '_'.join(file_lines[lineIdx][1:])
-                file_lines[lineIdx] = file_lines[lineIdx][:2]
-
-            # MAY NEED TO SUPPORT MULTIPLE ROOTS HERE! Still unsure weather multiple roots are possible?
-
-            # Make sure the names are unique - Object names will match joint names exactly and both will be unique.
-            name = file_lines[lineIdx][1]
-
-            # While unlikely, there exists a user report of duplicate joint names, see: #109399.
-            if name in bvh_nodes:
-                name_orig = name
-                name_index = 1
-                while (name := "%s.%03d" % (name_orig, name_index)) in bvh_nodes:
-                    name_index += 1
-                del name_orig, name_index
-
-            # print '%snode: %s, parent: %s' % (len(bvh_nodes_serial) * '  ', name,  bvh_nodes_serial[-1])
-
-            lineIdx += 2  # Increment to the next line (Offset)
-            rest_head_local = global_scale * Vector((
-                float(file_lines[lineIdx][1]),
-                float(file_lines[lineIdx][2]),
-                float(file_lines[lineIdx][3]),
-            ))
-            lineIdx += 1  # Increment to the next line (Channels)
-
-            # newChannel[Xposition, Yposition, Zposition, Xrotation, Yrotation, Zrotation]
-            # newChannel references indices to the motiondata,
-            # if not assigned then -1 refers to the last value that will be added on loading at a value of zero, this is appended
-            # We'll add a zero value onto the end of the MotionDATA so this always refers to a value.
-            my_channel = [-1, -1, -1, -1, -1, -1]
-            my_rot_order = [None, None, None]
-            rot_count = 0
-            for channel in file_lines[lineIdx][2:]:
-                channel = channel.lower()
-                channelIndex += 1  # So the index points to the right channel
-                if channel == 'xposition':
-                    my_channel[0] = channelIndex
-                elif channel == 'yposition':
-                    my_channel[1] = channelIndex
-                elif channel == 'zposition':
-                    my_channel[2] = channelIndex
-
-                elif channel == 'xrotation':
-                    my_channel[3] = channelIndex
-                    my_rot_order[rot_count] = 0
-                    rot_count += 1
-                elif channel == 'yrotation':
-                    my_channel[4] = channelIndex
-                    my_rot_order[rot_count] = 1
-                    rot_count += 1
-                elif channel == 'zrotation':
-                    my_channel[5] = channelIndex
-                    my_rot_order[rot_count] = 2
-                    rot_count += 1
-
-            channels = file_lines[lineIdx][2:]
-
-            my_parent = bvh_nodes_serial[-1]  # account for none
-
-            # Apply the parents offset accumulatively
-            if my_parent is None:
-                rest_head_world = Vector(rest_head_local)
-            else:
-                rest_head_world = my_parent.rest_head_world + rest_head_local
-
-            bvh_node = bvh_nodes[name] = BVH_Node(
-                name,
-                rest_head_world,
-                rest_head_local,
-                my_parent,
-                my_channel,
-                my_rot_order,
-                len(bvh_nodes) - 1,
-            )
-
-            # If we have another child then we can call ourselves a parent, else
-            bvh_nodes_serial.append(bvh_node)
+    bvh_joints, bvh_frame_time, bvh_frame_count = bvh_utils.read_bvh_data(
+        file_path, global_scale=global_scale, rotate_mode=rotate_mode,
+    )
+    return bvh_nodes_from_joints(bvh_joints, global_scale=global_scale), bvh_frame_time, bvh_frame_count
+
+
+def bvh_nodes_from_joints(bvh_joints, global_scale=1.0):
+    """
+    Create the BVH nodes from joints read by :func:`bvh_utils.read_bvh_data`, computing their rest positions.
+    """
+    bvh_nodes = {}
+    bvh_nodes_list = []
+    for bvh_joint in bvh_joints:
+        rest_head_local = Vector(bvh_joint.offset)
+        my_parent = None if bvh_joint.parent is None else bvh_nodes_list[bvh_joint.parent]
+
+        # Apply the parents offset accumulatively
+        if my_parent is None:
+            rest_head_world = Vector(rest_head_local)
+        else:
+            rest_head_world = my_parent.rest_head_world + rest_head_local
+
+        bvh_node = bvh_nodes[bvh_joint.name] = BVH_Node(
+            bvh_joint.name,
+            rest_head_world,
+            rest_head_local,
+            my_parent,
+            bvh_joint.channels,
+            bvh_joint.rot_order,
+            bvh_joint.index,
+        )
+        bvh_node.anim_data = bvh_joint.anim_data
+        bvh_node.location = bvh_joint.location
+        bvh_node.rotation = bvh_joint.rotation
 
         # Account for an end node.
-        # There is sometimes a name after 'End Site' but we will ignore it.
-        if file_lines[lineIdx][0].lower() == 'end' and file_lines[lineIdx][1].lower() == 'site':
-            # Increment to the next line (Offset)
-            lineIdx += 2
-            rest_tail = global_scale * Vector((
-                float(file_lines[lineIdx][1]),
-                float(file_lines[lineIdx][2]),
-                float(file_lines[lineIdx][3]),
-            ))
-
-            bvh_nodes_serial[-1].rest_tail_world = bvh_nodes_serial[-1].rest_head_world + rest_tail
-            bvh_nodes_serial[-1].rest_tail_local = bvh_nodes_serial[-1].rest_head_local + rest_tail
-
-            # Just so we can remove the parents in a uniform way,
-            # the end has kids so this is a placeholder.
-            bvh_nodes_serial.append(None)
-
-        if len(file_lines[lineIdx]) == 1 and file_lines[lineIdx][0] == '}':  # == ['}']
-            bvh_nodes_serial.pop()  # Remove the last item
-
-        # End of the hierarchy. Begin the animation section of the file with
-        # the following header.
-        #  MOTION
-        #  Frames: n
-        #  Frame Time: dt
-        if len(file_lines[lineIdx]) == 1 and file_lines[lineIdx][0].lower() == 'motion':
-            lineIdx += 1  # Read frame count.
-            if (
-                    len(file_lines[lineIdx]) == 2 and
-                    file_lines[lineIdx][0].lower() == 'frames:'
-            ):
-                bvh_frame_count = int(file_lines[lineIdx][1])
-
-            lineIdx += 1  # Read frame rate.
-            if (
-                    len(file_lines[lineIdx]) == 3 and
-                    file_lines[lineIdx][0].lower() == 'frame' and
-                    file_lines[lineIdx][1].lower() == 'time:'
-            ):
-                bvh_frame_time = float(file_lines[lineIdx][2])
-
-            lineIdx += 1  # Set the cursor to the first frame
-
-            break
-
-        lineIdx += 1
-
-    # Remove the None value used for easy parent reference
-    del bvh_nodes[None]
-    # Don't use anymore
-    del bvh_nodes_serial
-
-    # importing world with any order but nicer to maintain order
-    # second life expects it, which isn't to spec.
-    bvh_nodes_list = sorted_nodes(bvh_nodes)
+        if bvh_joint.end_offset is not None:
+            rest_tail = Vector(bvh_joint.end_offset)
+            bvh_node.rest_tail_world = bvh_node.rest_head_world + rest_tail
+            bvh_node.rest_tail_local = bvh_node.rest_head_local + rest_tail
 
-    while lineIdx < len(file_lines):
-        line = file_lines[lineIdx]
-        for bvh_node in bvh_nodes_list:
-            # for bvh_node in bvh_nodes_serial:
-            lx = ly = lz = rx = ry = rz = 0.0
-            channels = bvh_node.channels
-            anim_data = bvh_node.anim_data
-            if channels[0] != -1:
-                lx = global_scale * float(line[channels[0]])
-
-            if channels[1] != -1:
-                ly = global_scale * float(line[channels[1]])
-
-            if channels[2] != -1:
-                lz = global_scale * float(line[channels[2]])
-
-            if channels[3] != -1 or channels[4] != -1 or channels[5] != -1:
-
-                rx = radians(float(line[channels[3]]))
-                ry = radians(float(line[channels[4]]))
-                rz = radians(float(line[channels[5]]))
-
-            # Done importing motion data #
-            anim_data.append((lx, ly, lz, rx, ry, rz))
-        lineIdx += 1
+        bvh_nodes_list.append(bvh_node)
 
     # Assign children
     for bvh_node in bvh_nodes_list:
@@ -329,7 +189,7 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
             bvh_node.rest_tail_local.y = bvh_node.rest_tail_local.y + global_scale / 10
             bvh_node.rest_tail_world.y = bvh_node.rest_tail_world.y + global_scale / 10
 
-    return bvh_nodes, bvh_frame_time, bvh_frame_count
+    return bvh_nodes
 
 
 def bvh_node_dict2objects(context, bvh_name, bvh_nodes, rotate_mode='NATIVE', frame_start=1, IMPORT_LOOP=False):
@@ -519,21 +379,11 @@ def bvh_node_dict2armature(
     action = bpy.data.actions.new(name=bvh_name)
     arm_ob.animation_data.action = action
 
-    # Replace the bvh_node.temp (currently an editbone)
-    # With a tuple  (pose_bone, armature_bone, bone_rest_matrix, bone_rest_matrix_inv)
+    # Replace the bvh_node.temp (currently an editbone name) with the pose bone.
     num_frame = 0
     for bvh_node in bvh_nodes_list:
         bone_name = bvh_node.temp  # may not be the same name as the bvh_node, could have been shortened.
-        pose_bone = pose_bones[bone_name]
-        rest_bone = arm_data.bones[bone_name]
-        bone_rest_matrix = rest_bone.matrix_local.to_3x3()
-
-        bone_rest_matrix_inv = Matrix(bone_rest_matrix)
-        bone_rest_matrix_inv.invert()
-
-        bone_rest_matrix_inv.resize_4x4()
-        bone_rest_matrix.resize_4x4()
-        bvh_node.temp = (pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv)
+        bvh_node.temp = pose_bones[bone_name]
 
         if 0 == num_frame:
             num_frame = len(bvh_node.anim_data)
@@ -546,97 +396,55 @@ def bvh_node_dict2armature(
         num_frame = num_frame - skip_frame
 
     # Create a shared time axis for all animation curves.
-    time = [float(frame_start)] * num_frame
+    time = np.arange(num_frame, dtype=np.float64)
     if use_fps_scale:
-        dt = scene.render.fps * bvh_frame_time
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i) * dt
-    else:
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i)
+        time *= scene.render.fps * bvh_frame_time
+    time += frame_start
 
     # print("bvh_frame_time = %f, dt = %f, num_frame = %d"
     #      % (bvh_frame_time, dt, num_frame]))
 
-    for i, bvh_node in enumerate(bvh_nodes_list):
-        pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv = bvh_node.temp
+    # The keyframe_points 'co' are accessed as flattened pairs of (time, value), compatible with C float type.
+    keyframe_points_co = np.empty(num_frame * 2, dtype=np.single)
+    # Even indices are times.
+    keyframe_points_co[0::2] = time
+    # Compatible with C char type
+    interpolation_array = np.full(num_frame, LINEAR_INTERPOLATION_VALUE, dtype=np.ubyte)
+
+    def add_fcurves(data_path, group_name, values):
+        # For each component of the (num_frame, components) values.
+        for axis_i in range(values.shape[1]):
+            curve = action.fcurves.new(data_path=data_path, index=axis_i, action_group=group_name)
+            # Odd indices are values.
+            keyframe_points_co[1::2] = values[:, axis_i]
+            keyframe_points = curve.keyframe_points
+            keyframe_points.add(num_frame)
+            keyframe_points.foreach_set('co', keyframe_points_co)
+            keyframe_points.foreach_set('interpolation', interpolation_array)
+            curve.update()
+
+    # The pose bone channels were converted when reading the file (possibly in another process),
+    # with rest matrices matching the bones created above, see `bvh_utils.convert_channels()`.
+    for bvh_node in bvh_nodes_list:
+        pose_bone = bvh_node.temp
 
-        if bvh_node.has_loc:
+        if bvh_node.location is not None:
             # Not sure if there is a way to query this or access it in the
             # PoseBone structure.
             data_path = 'pose.bones["%s"].location' % escape_identifier(pose_bone.name)
-
-            location = [(0.0, 0.0, 0.0)] * num_frame
-            for frame_i in range(num_frame):
-                bvh_loc = bvh_node.anim_data[frame_i + skip_frame][:3]
-
-                bone_translate_matrix = Matrix.Translation(
-                    Vector(bvh_loc) - bvh_node.rest_head_local)
-                location[frame_i] = (bone_rest_matrix_inv @
-                                     bone_translate_matrix).to_translation()
-
             # For each location x, y, z.
-            for axis_i in range(3):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i, action_group=bvh_node.name)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        location[frame_i][axis_i],
-                    )
-
-        if bvh_node.has_rot:
-            data_path = None
-            rotate = None
+            add_fcurves(data_path, bvh_node.name, bvh_node.location)
 
+        if bvh_node.rotation is not None:
+            # For each quaternion w, x, y, z, or euler angle x, y, z.
             if 'QUATERNION' == rotate_mode:
-                rotate = [(1.0, 0.0, 0.0, 0.0)] * num_frame
                 data_path = ('pose.bones["%s"].rotation_quaternion' % escape_identifier(pose_bone.name))
             else:
-                rotate = [(0.0, 0.0, 0.0)] * num_frame
                 data_path = ('pose.bones["%s"].rotation_euler' % escape_identifier(pose_bone.name))
+            add_fcurves(data_path, bvh_node.name, bvh_node.rotation)
 
-            prev_euler = Euler((0.0, 0.0, 0.0))
-            for frame_i in range(num_frame):
-                bvh_rot = bvh_node.anim_data[frame_i + skip_frame][3:]
-
-                # apply rotation order and convert to XYZ
-                # note that the rot_order_str is reversed.
-                euler = Euler(bvh_rot, bvh_node.rot_order_str[::-1])
-                bone_rotation_matrix = euler.to_matrix().to_4x4()
-                bone_rotation_matrix = (
-                    bone_rest_matrix_inv @
-                    bone_rotation_matrix @
-                    bone_rest_matrix
-                )
-
-                if len(rotate[frame_i]) == 4:
-                    rotate[frame_i] = bone_rotation_matrix.to_quaternion()
-                else:
-                    rotate[frame_i] = bone_rotation_matrix.to_euler(
-                        pose_bone.rotation_mode, prev_euler)
-                    prev_euler = rotate[frame_i]
-
-            # For each euler angle x, y, z (or quaternion w, x, y, z).
-            for axis_i in range(len(rotate[0])):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i, action_group=bvh_node.name)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        rotate[frame_i][axis_i],
-                    )
-
-    for cu in action.fcurves:
-        if IMPORT_LOOP:
-            pass  # 2.5 doenst have cyclic now?
-
-        for bez in cu.keyframe_points:
-            bez.interpolation = 'LINEAR'
+    if IMPORT_LOOP:
+        pass  # 2.5 doenst have cyclic now?
 
     # finally apply matrix
     arm_ob.matrix_world = global_matrix
@@ -666,7 +474,8 @@ def load(
 
     bvh_nodes, bvh_frame_time, bvh_frame_count = read_bvh(
         context, filepath,
-        rotate_mode=rotate_mode,
+        # Pose bone channels are only needed for armatures.
+        rotate_mode=rotate_mode if target == 'ARMATURE' else None,
         global_scale=global_scale,
     )
 
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# The conversion tests need `mathutils`, the import tests need to be run from Blender:
+#   blender --background --factory-startup --python io_anim_bvh/import_bvh_test.py
+
+import os
+import sys
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+#     Worker processes of the batch tests re-import that file as `__mp_main__`.
+if __name__ in {'__main__', '__mp_main__'}:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import batch_bvh
+    import bvh_utils
+else:
+    from . import batch_bvh
+    from . import bvh_utils
+
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import mathutils
+    from mathutils import Euler, Matrix, Vector
+except ImportError:
+    mathutils = None
+
+try:
+    import bpy
+    from io_anim_bvh import import_bvh
+except ImportError:
+    bpy = None
+
+
+SAMPLE_BVH = """HIERARCHY
+ROOT Hips
+{
+	OFFSET 0.0 0.0 0.0
+	CHANNELS 6 Xposition Yposition Zposition Zrotation Xrotation Yrotation
+	JOINT Chest
+	{
+		OFFSET 0.0 5.2 0.0
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		JOINT Head
+		{
+			OFFSET 0.0 8.1 0.5
+			CHANNELS 3 Xrotation Yrotation Zrotation
+			End Site
+			{
+				OFFSET 0.0 3.0 0.0
+			}
+		}
+	}
+	JOINT Leg
+	{
+		OFFSET 2.0 -1.0 0.0
+		CHANNELS 6 Xposition Yposition Zposition Yrotation Zrotation Xrotation
+		End Site
+		{
+			OFFSET 0.0 -8.0 0.0
+		}
+	}
+}
+MOTION
+Frames: %d
+Frame Time: 0.033333
+%s
+"""
+
+
+# Edge cases of the bones created by the importer: zero offsets (Chest), zero length bones (Neck, and Fork
+# whose children average to its head, so that it takes the direction of its parent), tails averaged
+# from several children (Hips, Chest), and bones along -Y, exactly (LegL), within the singular
+# threshold of the roll (LegR) or close to it (Tail).
+EDGE_CASES_BVH = """HIERARCHY
+ROOT Hips
+{
+	OFFSET 0.0 0.0 0.0
+	CHANNELS 6 Xposition Yposition Zposition Zrotation Xrotation Yrotation
+	JOINT Spine
+	{
+		OFFSET 0.0 4.0 0.5
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		JOINT Chest
+		{
+			OFFSET 0.0 0.0 0.0
+			CHANNELS 3 Zrotation Xrotation Yrotation
+			JOINT Neck
+			{
+				OFFSET 0.0 3.0 0.0
+				CHANNELS 3 Zrotation Xrotation Yrotation
+				End Site
+				{
+					OFFSET 0.0 0.0 0.0
+				}
+			}
+			JOINT ArmL
+			{
+				OFFSET 3.0 0.0 0.0
+				CHANNELS 3 Zrotation Xrotation Yrotation
+				End Site
+				{
+					OFFSET 4.0 0.0 0.0
+				}
+			}
+			JOINT ArmR
+			{
+				OFFSET -3.0 0.0 0.0
+				CHANNELS 3 Zrotation Xrotation Yrotation
+				End Site
+				{
+					OFFSET -4.0 0.5 -0.5
+				}
+			}
+		}
+	}
+	JOINT LegL
+	{
+		OFFSET 1.0 -1.0 0.0
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		End Site
+		{
+			OFFSET 0.0 -8.0 0.0
+		}
+	}
+	JOINT LegR
+	{
+		OFFSET -1.0 -1.0 0.0
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		End Site
+		{
+			OFFSET 0.00001 -8.0 0.0
+		}
+	}
+	JOINT Tail
+	{
+		OFFSET 0.0 0.0 -1.0
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		End Site
+		{
+			OFFSET 0.05 -8.0 0.02
+		}
+	}
+	JOINT Fork
+	{
+		OFFSET 0.0 -1.0 -2.0
+		CHANNELS 3 Zrotation Xrotation Yrotation
+		JOINT Twig1
+		{
+			OFFSET 1.0 0.0 0.0
+			CHANNELS 3 Zrotation Xrotation Yrotation
+			End Site
+			{
+				OFFSET 1.0 0.0 0.0
+			}
+		}
+		JOINT Twig2
+		{
+			OFFSET -1.0 0.0 0.0
+			CHANNELS 3 Zrotation Xrotation Yrotation
+			End Site
+			{
+				OFFSET -1.0 0.0 0.0
+			}
+		}
+	}
+}
+MOTION
+Frames: 2
+Frame Time: 0.033333
+%s
+%s
+""" % ((" ".join(["0.0"] * 39),) * 2)
+
+
+def _sample_bvh(frame_count=120, seed=0):
+    rng = np.random.default_rng(seed)
+    # Smooth motion, with large rotations so that eulers have to be kept compatible.
+    t = np.linspace(0.0, 1.0, frame_count)[:, None]
+    motion = np.sin(t * rng.uniform(1.0, 20.0, 18) + rng.uniform(0.0, 6.0, 18)) * rng.uniform(10.0, 400.0, 18)
+    lines = "\n".join(" ".join("%.6f" % value for value in frame) for frame in motion)
+    return SAMPLE_BVH % (frame_count, lines)
+
+
+class ParseMotionTest(unittest.TestCase):
+    def test_parse(self):
+        motion = bvh_utils.parse_motion(["1 2 3\n", "\n", "4 5 6.5\n"], 3)
+        np.testing.assert_array_equal(motion, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.5]])
+
+    def test_whitespace(self):
+        motion = bvh_utils.parse_motion(["1\t2  3\r\n", "  4 5 6.5"], 3)
+        np.testing.assert_array_equal(motion, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.5]])
+
+    def test_extra_values(self):
+        motion = bvh_utils.parse_motion(["1 2 3 7\n", "4 5 6\n"], 3)
+        np.testing.assert_array_equal(motion, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+    def test_missing_values(self):
+        with self.assertRaises(ValueError):
+            bvh_utils.parse_motion(["1 2 3\n", "4 5\n"], 3)
+
+    def test_missing_then_extra_values(self):
+        # Same total number of values as two valid frames.
+        with self.assertRaises(ValueError):
+            bvh_utils.parse_motion(["1 2\n", "3 4 5 6\n"], 3)
+
+    def test_empty(self):
+        self.assertEqual(bvh_utils.parse_motion([], 3).shape, (0, 3))
+
+
+@unittest.skipIf(mathutils is None, "mathutils is not available")
+class RotationConversionTest(unittest.TestCase):
+    def setUp(self):
+        self.eulers = np.random.default_rng(1).uniform(-4.0, 4.0, (200, 3))
+
+    def test_euler_to_matrix(self):
+        for order in ('XYZ', 'ZXY'):
+            expected = [Euler(eul, order).to_matrix() for eul in self.eulers.tolist()]
+            np.testing.assert_allclose(bvh_utils.euler_to_matrix(self.eulers, order), expected, atol=1e-6)
+
+    def test_matrix_to_quaternion(self):
+        matrices = bvh_utils.euler_to_matrix(self.eulers, 'YZX')
+        expected = [Matrix(mat.tolist()).to_quaternion() for mat in matrices]
+        np.testing.assert_allclose(bvh_utils.matrix_to_quaternion(matrices), expected, atol=1e-6)
+
+    def test_compatible_euler(self):
+        eulers_old = np.random.default_rng(2).uniform(-12.0, 12.0, self.eulers.shape)
+        expected = []
+        for eul, eul_old in zip(self.eulers.tolist(), eulers_old.tolist()):
+            eul = Euler(eul)
+            eul.make_compatible(Euler(eul_old))
+            expected.append(eul)
+        np.testing.assert_allclose(bvh_utils.compatible_euler(self.eulers, eulers_old), expected, atol=1e-5)
+
+    def test_compatible_euler_sequence(self):
+        t = np.linspace(0.0, 20.0, 500)
+        matrices = bvh_utils.euler_to_matrix(np.stack((np.sin(t) * 3.0, t, np.cos(t * 1.3) * 2.0), axis=-1), 'XZY')
+
+        expected = []
+        eul_prev = Euler((0.0, 0.0, 0.0))
+        for mat in matrices:
+            eul_prev = Matrix(mat.tolist()).to_euler('XZY', eul_prev)
+            expected.append(eul_prev)
+
+        eulers = bvh_utils.compatible_euler_sequence(*bvh_utils.matrix_to_euler_pair(matrices[:, None], 'XZY'))
+        np.testing.assert_allclose(eulers[:, 0], expected, atol=1e-4)
+
+
+class ReadFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.tmpdir.name, "takes"))
+        self.file_paths = []
+        for i in range(5):
+            file_path = os.path.join(self.tmpdir.name, "takes", "take_%d.bvh" % i)
+            with open(file_path, 'w') as f:
+                f.write(_sample_bvh(frame_count=20 + i, seed=i))
+            self.file_paths.append(file_path)
+        with open(os.path.join(self.tmpdir.name, "takes", "broken.bvh"), 'w') as f:
+            f.write(_sample_bvh(frame_count=20).replace("OFFSET 0.0 8.1 0.5", "OFFSET 0.0 8.1"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_find_files(self):
+        takes_dir = os.path.join(self.tmpdir.name, "takes")
+        self.assertEqual(
+            batch_bvh.find_bvh_files([takes_dir, self.file_paths[0], os.path.join(takes_dir, "take_*.bvh")]),
+            [os.path.join(takes_dir, "broken.bvh")] + self.file_paths,
+        )
+
+    def _check_read(self, jobs, rotate_mode=None):
+        file_paths = self.file_paths[:2] + [os.path.join(self.tmpdir.name, "takes", "broken.bvh")] + self.file_paths[2:]
+        results = list(batch_bvh.read_bvh_files(file_paths, global_scale=0.5, rotate_mode=rotate_mode, jobs=jobs))
+        self.assertEqual([file_path for file_path, _result, _read_time in results], file_paths)
+        self.assertIsInstance(results[2][1], Exception)
+        del results[2], file_paths[2]
+
+        for file_path, (bvh_joints, frame_time, frame_count), _read_time in results:
+            expected_joints, expected_frame_time, expected_frame_count = bvh_utils.read_bvh_data(
+                file_path, 0.5, rotate_mode)
+            self.assertEqual((frame_time, frame_count), (expected_frame_time, expected_frame_count))
+            self.assertEqual([joint.name for joint in bvh_joints], [joint.name for joint in expected_joints])
+            for joint, expected_joint in zip(bvh_joints, expected_joints):
+                self.assertEqual(joint.offset, expected_joint.offset)
+                self.assertEqual(joint.end_offset, expected_joint.end_offset)
+                np.testing.assert_array_equal(joint.anim_data, expected_joint.anim_data)
+                for channel in ("location", "rotation"):
+                    if getattr(expected_joint, channel) is None:
+                        self.assertIsNone(getattr(joint, channel))
+                    else:
+                        np.testing.assert_array_equal(getattr(joint, channel), getattr(expected_joint, channel))
+
+    def test_read_in_process(self):
+        self._check_read(jobs=1)
+
+    def test_read_in_workers(self):
+        self._check_read(jobs=2)
+
+    def test_convert_in_workers(self):
+        self._check_read(jobs=2, rotate_mode='NATIVE')
+        self._check_read(jobs=2, rotate_mode='QUATERNION')
+
+
+class ConvertChannelsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "sample.bvh")
+        with open(self.filepath, 'w') as f:
+            f.write(_sample_bvh(frame_count=30))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_bone_rest_matrices(self):
+        bvh_joints, _frame_time, _frame_count = bvh_utils.read_bvh_data(self.filepath)
+        matrices = bvh_utils.bone_rest_matrices(bvh_joints)
+        np.testing.assert_allclose(matrices @ np.swapaxes(matrices, -1, -2), np.broadcast_to(np.eye(3), matrices.shape),
+                                   atol=1e-12)
+        np.testing.assert_allclose(np.linalg.det(matrices), 1.0)
+        # Y axes point from heads to tails: the children of the joint (Chest), or its end site (Head, Leg).
+        y_axes = {joint.name: matrix[:, 1] for joint, matrix in zip(bvh_joints, matrices)}
+        np.testing.assert_allclose(y_axes["Chest"], np.array((0.0, 8.1, 0.5)) / np.hypot(8.1, 0.5))
+        np.testing.assert_allclose(y_axes["Head"], (0.0, 1.0, 0.0))
+        np.testing.assert_allclose(y_axes["Leg"], (0.0, -1.0, 0.0))
+        np.testing.assert_allclose(matrices[3], np.diag((-1.0, -1.0, 1.0)))
+
+    def test_convert_channels(self):
+        bvh_joints, _frame_time, _frame_count = bvh_utils.read_bvh_data(self.filepath, rotate_mode='QUATERNION')
+        matrices = bvh_utils.bone_rest_matrices(bvh_joints)
+        for joint, matrix in zip(bvh_joints, matrices):
+            self.assertEqual(joint.location is not None, joint.name in {"Hips", "Leg"})
+            self.assertEqual(joint.rotation.shape, (30, 4))
+            if joint.location is not None:
+                # Back to the offsets of the file, in armature space.
+                np.testing.assert_allclose(joint.location @ matrix.T + joint.offset, joint.anim_data[1:, :3])
+
+
+def _legacy_curves(arm_ob, bvh_nodes, rotate_mode):
+    """Convert the BVH frames to pose bone channels frame by frame, as the importer used to."""
+    curves = {}
+    for bvh_node in bvh_nodes.values():
+        pose_bone = arm_ob.pose.bones[bvh_node.name]
+        rest = arm_ob.data.bones[bvh_node.name].matrix_local.to_3x3()
+        rest_inv = rest.inverted().to_4x4()
+        rest = rest.to_4x4()
+        anim_data = bvh_node.anim_data[1:]
+
+        if bvh_node.has_loc:
+            curves[pose_bone.path_from_id("location")] = [
+                (rest_inv @ Matrix.Translation(Vector(frame[:3]) - bvh_node.rest_head_local)).to_translation()
+                for frame in anim_data.tolist()
+            ]
+        if bvh_node.has_rot:
+            values = []
+            euler_prev = Euler((0.0, 0.0, 0.0))
+            for frame in anim_data.tolist():
+                mat = rest_inv @ Euler(frame[3:], bvh_node.rot_order_str[::-1]).to_matrix().to_4x4() @ rest
+                if rotate_mode == 'QUATERNION':
+                    values.append(mat.to_quaternion())
+                else:
+                    euler_prev = mat.to_euler(pose_bone.rotation_mode, euler_prev)
+                    values.append(euler_prev)
+            data_path = "rotation_quaternion" if rotate_mode == 'QUATERNION' else "rotation_euler"
+            curves[pose_bone.path_from_id(data_path)] = values
+    return curves
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class ImportArmatureTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "sample.bvh")
+        with open(self.filepath, 'w') as f:
+            f.write(_sample_bvh())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check_import(self, rotate_mode):
+        import_bvh.load(bpy.context, self.filepath, rotate_mode=rotate_mode, global_matrix=Matrix())
+        arm_ob = bpy.context.view_layer.objects.active
+        action = arm_ob.animation_data.action
+        bvh_nodes, _frame_time, _frame_count = import_bvh.read_bvh(bpy.context, self.filepath)
+
+        for data_path, values in _legacy_curves(arm_ob, bvh_nodes, rotate_mode).items():
+            for index in range(len(values[0])):
+                fcurve = action.fcurves.find(data_path, index=index)
+                self.assertIsNotNone(fcurve, data_path)
+                co = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+                fcurve.keyframe_points.foreach_get("co", co)
+                np.testing.assert_allclose(co[0::2], np.arange(1, len(values) + 1))
+                np.testing.assert_allclose(co[1::2], [value[index] for value in values], atol=1e-4,
+                                           err_msg="%s[%d]" % (data_path, index))
+
+    def test_rest_matrices(self):
+        # The rest matrices used to convert the channels, against the bones actually created by Blender.
+        for name, bvh, global_scale in (
+                ("sample", _sample_bvh(frame_count=2), 1.0),
+                ("edge_cases", EDGE_CASES_BVH, 1.0),
+                ("edge_cases_scaled", EDGE_CASES_BVH, 0.01),
+        ):
+            filepath = os.path.join(self.tmpdir.name, name + ".bvh")
+            with open(filepath, 'w') as f:
+                f.write(bvh)
+            import_bvh.load(bpy.context, filepath, global_scale=global_scale, global_matrix=Matrix())
+            arm_ob = bpy.context.view_layer.objects.active
+
+            bvh_joints, _frame_time, _frame_count = bvh_utils.read_bvh_data(filepath, global_scale)
+            matrices = bvh_utils.bone_rest_matrices(bvh_joints, global_scale=global_scale)
+            for joint, matrix in zip(bvh_joints, matrices):
+                np.testing.assert_allclose(matrix, arm_ob.data.bones[joint.name].matrix_local.to_3x3(), atol=1e-5,
+                                           err_msg="%s: %s" % (name, joint.name))
+
+    def test_native(self):
+        self._check_import('NATIVE')
+
+    def test_quaternion(self):
+        self._check_import('QUATERNION')
+
+    def test_euler(self):
+        self._check_import('ZXY')
+
+
+def _action_curves(action):
+    curves = {}
+    for fcurve in action.fcurves:
+        co = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+        fcurve.keyframe_points.foreach_get("co", co)
+        curves[fcurve.data_path, fcurve.array_index] = co
+    return curves
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class BatchImportTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.file_paths = []
+        for i in range(4):
+            file_path = os.path.join(self.tmpdir.name, "take_%d.bvh" % i)
+            with open(file_path, 'w') as f:
+                f.write(_sample_bvh(frame_count=30 + i, seed=i))
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check_batch(self, rotate_mode):
+        arm_obs, failed = batch_bvh.batch_import(
+            bpy.context, self.file_paths, jobs=2, rotate_mode=rotate_mode, global_scale=0.1,
+        )
+        self.assertEqual(failed, [])
+        batch_curves = [_action_curves(arm_ob.animation_data.action) for arm_ob in arm_obs]
+        batch_bones = [[bone.matrix_local.copy() for bone in arm_ob.data.bones] for arm_ob in arm_obs]
+
+        for file_path, curves, bones in zip(self.file_paths, batch_curves, batch_bones):
+            bpy.ops.wm.read_factory_settings(use_empty=True)
+            import_bvh.load(bpy.context, file_path, rotate_mode=rotate_mode, global_scale=0.1)
+            arm_ob = bpy.context.view_layer.objects.active
+            self.assertEqual(bones, [bone.matrix_local for bone in arm_ob.data.bones])
+            expected_curves = _action_curves(arm_ob.animation_data.action)
+            self.assertEqual(curves.keys(), expected_curves.keys())
+            for key, co in curves.items():
+                np.testing.assert_array_equal(co, expected_curves[key], err_msg=str(key))
+
+    def test_native(self):
+        self._check_batch('NATIVE')
+
+    def test_quaternion(self):
+        self._check_batch('QUATERNION')
+
+    def test_export(self):
+        output_dir = os.path.join(self.tmpdir.name, "output")
+        os.mkdir(output_dir)
+        arm_obs, failed = batch_bvh.batch_import(
+            bpy.context, self.file_paths, jobs=2, output_dir=output_dir, keep_objects=False,
+        )
+        self.assertEqual((arm_obs, failed), ([], []))
+        self.assertEqual(len(bpy.data.objects), 0)
+        for file_path in self.file_paths:
+            bvh_joints, _frame_time, frame_count = bvh_utils.read_bvh_data(
+                os.path.join(output_dir, os.path.basename(file_path)))
+            expected_joints, _frame_time, expected_frame_count = bvh_utils.read_bvh_data(file_path)
+            self.assertEqual(frame_count, expected_frame_count)
+            self.assertEqual([joint.name for joint in bvh_joints], [joint.name for joint in expected_joints])
+
+
+if __name__ == '__main__':
+    # Blender's own arguments are not meant for unittest.
+    argv = [sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main(argv=argv, verbosity=2)
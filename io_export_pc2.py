@@ -31,19 +31,88 @@ from bpy.props import BoolProperty, IntProperty, EnumProperty
 import mathutils
 from bpy_extras.io_utils import ExportHelper
 
-from os import remove
+import os
 import time
 import math
 import struct
+from contextlib import ExitStack
+
+import numpy as np
+
+
+SUPPORTED_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT'}
 
 
 def get_sampled_frames(start, end, sampling):
     return [math.modf(start + x * sampling) for x in range(int((end - start) / sampling) + 1)]
 
 
-def do_export(context, props, filepath):
+def get_header(vert_count, start, sampling, sample_count):
+    return struct.pack('<12siiffi', b'POINTCACHE2\0', 1, vert_count, start, sampling, sample_count)
+
+
+def transform_coords(co, matrix):
+    """
+    Transform a (N, 3) float32 array of coordinates in place.
+
+    Each component is accumulated in the same order and precision as Mesh.transform() does,
+    so that coordinates are exactly the same as when transforming a mesh.
+    """
+    mat = np.array(matrix, dtype=np.float32)
+    co[:] = (co[:, 0, None] * mat[:3, 0] + co[:, 1, None] * mat[:3, 1] + co[:, 2, None] * mat[:3, 2]) + mat[:3, 3]
+
+
+class _ObjectCache:
+    """The export state of a single object: its file and a coordinates buffer reused for every frame."""
+    __slots__ = ("ob", "filepath", "file", "co")
+
+    def __init__(self, ob, filepath):
+        self.ob = ob
+        self.filepath = filepath
+        self.file = None
+        self.co = None
+
+    def get_mesh(self, depsgraph):
+        ob = self.ob if depsgraph is None else self.ob.evaluated_get(depsgraph)
+        if ob.type == 'MESH':
+            # Read the (evaluated) mesh directly, no need to create a new mesh for each frame.
+            return ob.data
+        return ob.to_mesh()
+
+    def clear_mesh(self, depsgraph):
+        ob = self.ob if depsgraph is None else self.ob.evaluated_get(depsgraph)
+        if ob.type != 'MESH':
+            ob.to_mesh_clear()
+
+    def read_coords(self, depsgraph):
+        me = self.get_mesh(depsgraph)
+        vert_count = len(me.vertices)
+        if self.co is None:
+            # Compatible with C float type, which is little endian as pc2 data on all platforms supported by Blender.
+            self.co = np.empty((vert_count, 3), dtype=np.float32)
+        elif len(self.co) != vert_count:
+            self.clear_mesh(depsgraph)
+            return False
+        me.vertices.foreach_get("co", self.co.ravel())
+        self.clear_mesh(depsgraph)
+        return True
+
+
+def _remove_failed_export(filepath):
+    try:
+        os.remove(filepath)
+    except:
+        with open(filepath, 'w') as empty:
+            empty.write('DUMMIFILE - export failed\n')
+
+
+def do_export(context, props, filepaths):
+    """
+    Export each object of *filepaths*, a sequence of (object, filepath) pairs, to its own pc2 file.
+
+    All objects are exported in a single pass over the frames, the scene is only evaluated once per sampled frame.
+    """
     mat_x90 = mathutils.Matrix.Rotation(-math.pi/2, 4, 'X')
-    ob = context.active_object
     sc = context.scene
     start = props.range_start
     end = props.range_end
@@ -52,60 +121,46 @@ def do_export(context, props, filepath):
     depsgraph = None
     if apply_modifiers:
         depsgraph = context.evaluated_depsgraph_get()
-        me = ob.evaluated_get(depsgraph).to_mesh()
-    else:
-        me = ob.to_mesh()
-    vertCount = len(me.vertices)
     sampletimes = get_sampled_frames(start, end, sampling)
     sampleCount = len(sampletimes)
 
-    # Create the header
-    headerFormat = '<12siiffi'
-    headerStr = struct.pack(headerFormat, b'POINTCACHE2\0',
-                            1, vertCount, start, sampling, sampleCount)
+    caches = [_ObjectCache(ob, filepath) for ob, filepath in filepaths]
 
-    file = open(filepath, "wb")
-    file.write(headerStr)
+    exported = True
+    # All files are closed on exit, also when an error is raised.
+    with ExitStack() as stack:
+        for cache in caches:
+            # Get the vertex count from the current frame, and allocate the coordinates buffer.
+            cache.read_coords(depsgraph)
+            cache.file = stack.enter_context(open(cache.filepath, "wb"))
+            cache.file.write(get_header(len(cache.co), start, sampling, sampleCount))
 
-    for frame in sampletimes:
-        # stupid modf() gives decimal part first!
-        sc.frame_set(int(frame[1]), subframe=frame[0])
-        if apply_modifiers:
-            me = ob.evaluated_get(depsgraph).to_mesh()
-        else:
-            me = ob.to_mesh()
-
-        if len(me.vertices) != vertCount:
-            bpy.data.meshes.remove(me, do_unlink=True)
-            file.close()
-            try:
-                remove(filepath)
-            except:
-                empty = open(filepath, 'w')
-                empty.write('DUMMIFILE - export failed\n')
-                empty.close()
-            print('Export failed. Vertexcount of Object is not constant')
-            return False
+        for frame in sampletimes:
+            # stupid modf() gives decimal part first!
+            sc.frame_set(int(frame[1]), subframe=frame[0])
 
-        if props.world_space:
-            me.transform(ob.matrix_world)
-        if props.rot_x90:
-            me.transform(mat_x90)
+            for cache in caches:
+                if not cache.read_coords(depsgraph):
+                    print('Export failed. Vertexcount of Object %r is not constant' % cache.ob.name)
+                    exported = False
+                    break
 
-        for v in me.vertices:
-            thisVertex = struct.pack('<fff', float(v.co[0]),
-                                     float(v.co[1]),
-                                     float(v.co[2]))
-            file.write(thisVertex)
+                if props.world_space:
+                    transform_coords(cache.co, cache.ob.matrix_world)
+                if props.rot_x90:
+                    transform_coords(cache.co, mat_x90)
 
-    if apply_modifiers:
-        ob.evaluated_get(depsgraph).to_mesh_clear()
-    else:
-        me = ob.to_mesh_clear()
+                # Write all the vertices of the frame at once.
+                cache.file.write(cache.co.data)
+
+            if not exported:
+                break
+
+    if not exported:
+        for cache in caches:
+            _remove_failed_export(cache.filepath)
 
-    file.flush()
-    file.close()
-    return True
+    return exported
 
 
 # EXPORT OPERATOR
@@ -154,13 +209,18 @@ class Export_pc2(bpy.types.Operator, ExportHelper):
                ),
         default='1',
                             )
+    use_selection: BoolProperty(
+        name="Selected Objects",
+        description="Export each selected object to its own file, named after the object, "
+                    "evaluating every frame only once for all of them",
+        default=False,)
 
     @classmethod
     def poll(cls, context):
         obj = context.active_object
         return (
             obj is not None
-            and obj.type in {'MESH', 'CURVE', 'SURFACE', 'FONT'}
+            and obj.type in SUPPORTED_TYPES
         )
 
     def execute(self, context):
@@ -170,12 +230,22 @@ class Export_pc2(bpy.types.Operator, ExportHelper):
         filepath = self.filepath
         filepath = bpy.path.ensure_ext(filepath, self.filename_ext)
 
-        exported = do_export(context, props, filepath)
+        if self.use_selection:
+            prefix = os.path.splitext(filepath)[0]
+            filepaths = [
+                (ob, prefix + bpy.path.clean_name(ob.name) + self.filename_ext)
+                for ob in context.selected_objects if ob.type in SUPPORTED_TYPES
+            ]
+        else:
+            filepaths = [(context.active_object, filepath)]
+
+        exported = do_export(context, props, filepaths)
 
         if exported:
             print('finished export in %s seconds' %
                   ((time.time() - start_time)))
-            print(filepath)
+            for _ob, filepath in filepaths:
+                print(filepath)
 
         return {'FINISHED'}
 
@@ -241,7 +241,6 @@ class ExportSTL(Operator, ExportHelper):
 
     def execute(self, context):
         import os
-        import itertools
         from mathutils import Matrix
         from . import stl_utils
         from . import blender_utils
@@ -281,18 +280,28 @@ class ExportSTL(Operator, ExportHelper):
             global_matrix = global_matrix @ self.global_space.inverted()
 
         if self.batch_mode == 'OFF':
-            faces = itertools.chain.from_iterable(
-                    blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
-                    for ob in data_seq)
+            faces = (
+                blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
+                for ob in data_seq
+            )
 
             stl_utils.write_stl(faces=faces, **keywords)
         elif self.batch_mode == 'OBJECT':
+            # Mesh data has to be gathered from the main thread, but writing files is pure NumPy and IO work
+            # which releases the GIL, so each object's file is written from a worker thread.
+            from concurrent.futures import ThreadPoolExecutor
+
             prefix = os.path.splitext(self.filepath)[0]
-            keywords_temp = keywords.copy()
-            for ob in data_seq:
-                faces = blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
-                keywords_temp["filepath"] = prefix + bpy.path.clean_name(ob.name) + ".stl"
-                stl_utils.write_stl(faces=faces, **keywords_temp)
+            with ThreadPoolExecutor() as executor:
+                futures = []
+                for ob in data_seq:
+                    keywords_temp = keywords.copy()
+                    keywords_temp["filepath"] = prefix + bpy.path.clean_name(ob.name) + ".stl"
+                    keywords_temp["faces"] = (blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers),)
+                    futures.append(executor.submit(stl_utils.write_stl, **keywords_temp))
+                for future in futures:
+                    # Propagate any error raised while writing.
+                    future.result()
 
         return {'FINISHED'}
 
@@ -7,35 +7,49 @@ def create_and_link_mesh(name, faces, face_nors, points, global_matrix):
     """
     Create a blender mesh and object called name from a list of
     *points* and *faces* and link it in the current scene.
+
+    *faces*, *face_nors* and *points* may be sequences or NumPy arrays,
+    mesh data is written in bulk with ``foreach_set``.
     """
 
-    import array
-    from itertools import chain
+    import numpy as np
     import bpy
 
-    mesh = bpy.data.meshes.new(name)
-    mesh.from_pydata(points, [], faces)
+    faces = np.asarray(faces, dtype=np.int32).reshape(-1, 3)
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    tot_faces = len(faces)
 
-    if face_nors:
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.ravel())
+    mesh.loops.add(tot_faces * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(tot_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, tot_faces * 3, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    if face_nors is not None and len(face_nors):
         # Write imported normals to a temporary attribute so they are interpolated by #mesh.validate().
         # It's important to validate before calling #mesh.normals_split_custom_set() which expects a
         # valid mesh.
-        lnors = tuple(chain(*chain(*zip(face_nors, face_nors, face_nors))))
+        lnors = np.repeat(np.asarray(face_nors, dtype=np.float32).reshape(-1, 3), 3, axis=0)
         mesh.attributes.new("temp_custom_normals", 'FLOAT_VECTOR', 'CORNER')
-        mesh.attributes["temp_custom_normals"].data.foreach_set("vector", lnors)
+        mesh.attributes["temp_custom_normals"].data.foreach_set("vector", lnors.ravel())
+    else:
+        face_nors = None
 
     mesh.transform(global_matrix)
 
     # update mesh to allow proper display
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
-    if face_nors:
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
+    if face_nors is not None:
+        clnors = np.empty(len(mesh.loops) * 3, dtype=np.float32)
         mesh.attributes["temp_custom_normals"].data.foreach_get("vector", clnors)
 
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
-        mesh.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        mesh.normals_split_custom_set(clnors.reshape(-1, 3))
         mesh.attributes.remove(mesh.attributes["temp_custom_normals"])
 
     mesh.update()
@@ -48,18 +62,16 @@ def create_and_link_mesh(name, faces, face_nors, points, global_matrix):
 
 def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
     """
-    From an object, return a generator over a list of faces.
+    From an object, return its triangles as a (N, 3, 3) float32 array.
 
-    Each faces is a list of his vertices. Each vertex is a tuple of
-    his coordinate.
+    Each triangle is made of 3 vertices, each vertex of 3 coordinates.
+    Mesh data is read in bulk with ``foreach_get`` and transformed with NumPy.
 
     use_mesh_modifiers
-        Apply the preview modifier to the returned liste
-
-    triangulate
-        Split the quad into two triangles
+        Apply the preview modifier to the returned triangles
     """
 
+    import numpy as np
     import bpy
 
     # get the editmode data
@@ -77,20 +89,27 @@ def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
     try:
         mesh = mesh_owner.to_mesh()
     except RuntimeError:
-        return
+        mesh = None
 
     if mesh is None:
-        return
+        return np.empty((0, 3, 3), dtype=np.float32)
 
     mat = global_matrix @ ob.matrix_world
-    mesh.transform(mat)
     if mat.is_negative:
         mesh.flip_normals()
     mesh.calc_loop_triangles()
 
-    vertices = mesh.vertices
-
-    for tri in mesh.loop_triangles:
-        yield [vertices[index].co.copy() for index in tri.vertices]
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    tris_verts = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris_verts)
 
     mesh_owner.to_mesh_clear()
+
+    # Transform all vertices at once. Each component is accumulated in the same order and precision as
+    # Mesh.transform() does, so that exported coordinates are exactly the same.
+    mat = np.array(mat, dtype=np.float32)
+    co = (co[:, 0, None] * mat[:3, 0] + co[:, 1, None] * mat[:3, 1] + co[:, 2, None] * mat[:3, 2]) + mat[:3, 3]
+
+    return co[tris_verts].reshape(-1, 3, 3)
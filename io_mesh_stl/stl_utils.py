@@ -52,6 +52,7 @@ class ListDict(dict):
 #   - 2 bytes of garbage (usually 0)
 BINARY_HEADER = 80
 BINARY_STRIDE = 12 * 4 + 2
+BINARY_DTYPE = [('normal', '<f4', (3,)), ('verts', '<f4', (3, 3)), ('attr', '<u2')]
 
 
 def _header_version():
@@ -87,8 +88,13 @@ def _is_ascii_file(data):
     return (file_size != BINARY_HEADER + 4 + BINARY_STRIDE * size)
 
 
-def _binary_read(data):
-    # Skip header...
+def _binary_facet_count(data):
+    """
+    Return the number of facets of a binary STL file, as stored in its header.
+
+    Falls back to inferring it from the file size when the reported size is
+    invalid (0), and never returns more facets than the file actually holds.
+    """
 
     import os
     import struct
@@ -96,31 +102,62 @@ def _binary_read(data):
     data.seek(BINARY_HEADER)
     size = struct.unpack('<I', data.read(4))[0]
 
+    data.seek(0, os.SEEK_END)
+    file_size = data.tell() - (BINARY_HEADER + 4)
+    # Reset to after-the-size in the file.
+    data.seek(BINARY_HEADER + 4)
+
     if size == 0:
         # Workaround invalid crap.
-        data.seek(0, os.SEEK_END)
-        file_size = data.tell()
-        # Reset to after-the-size in the file.
-        data.seek(BINARY_HEADER + 4)
-
-        file_size -= BINARY_HEADER + 4
         size = file_size // BINARY_STRIDE
         print("WARNING! Reported size (facet number) is 0, inferring %d facets from file size." % size)
+    elif size * BINARY_STRIDE > file_size:
+        size = file_size // BINARY_STRIDE
+        print("WARNING! File is truncated, only reading %d facets." % size)
+
+    return size
+
+
+def _binary_read(data):
+    """
+    Read a binary STL file as NumPy arrays, return a tuple (verts, normals).
+
+    The facets are memory-mapped as a structured array, *verts* is a (size, 3, 3) float view
+    and *normals* a (size, 3) float view over it, no per-facet Python objects are created.
+    """
+
+    import numpy as np
+
+    size = _binary_facet_count(data)
+    if size == 0:
+        return np.empty((0, 3, 3), dtype=np.float32), np.empty((0, 3), dtype=np.float32)
+
+    facets = np.memmap(data, dtype=BINARY_DTYPE, mode='r', offset=BINARY_HEADER + 4, shape=(size,))
+    return facets['verts'], facets['normal']
+
+
+def _weld_points(verts):
+    """
+    Merge identical points of a (size, 3, 3) array of triangles.
+
+    Returns a tuple (tris, pts), *tris* being a (size, 3) array of indices into the (N, 3) *pts* array.
+    Points keep the order of their first occurrence, like :class:`ListDict` would.
+    """
 
-    # We read 4096 elements at once, avoids too much calls to read()!
-    CHUNK_LEN = 4096
-    chunks = [CHUNK_LEN] * (size // CHUNK_LEN)
-    chunks.append(size % CHUNK_LEN)
+    import numpy as np
 
-    unpack = struct.Struct('<12f').unpack_from
-    for chunk_len in chunks:
-        if chunk_len == 0:
-            continue
-        buf = data.read(BINARY_STRIDE * chunk_len)
-        for i in range(chunk_len):
-            # read the normal and points coordinates of each triangle
-            pt = unpack(buf, BINARY_STRIDE * i)
-            yield pt[:3], (pt[3:6], pt[6:9], pt[9:])
+    # Adding zero turns -0.0 into 0.0, so that both compare equal byte-wise, as they do as floats.
+    pts = verts.reshape(-1, 3) + np.float32(0.0)
+    pts_key = np.ascontiguousarray(pts).view(np.dtype((np.void, pts.dtype.itemsize * 3))).ravel()
+    _, first_index, inverse = np.unique(pts_key, return_index=True, return_inverse=True)
+
+    # np.unique sorts its output, restore the order of first occurrence.
+    order = np.argsort(first_index, kind='stable')
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order), dtype=order.dtype)
+
+    tris = remap[inverse.ravel()].reshape(-1, 3)
+    return tris, pts[first_index[order]]
 
 
 def _ascii_read(data):
@@ -150,10 +187,47 @@ def _ascii_read(data):
             yield curr_nor, [tuple(map(float, l_item.split()[1:])) for l_item in (l, data.readline(), data.readline())]
 
 
+def _tris_normals(tris):
+    """
+    Return the (N, 3) normals of a (N, 3, 3) float32 array of triangles.
+
+    Matches ``mathutils.geometry.normal`` (Newell's method, then normalize),
+    operation by operation in single precision, so written files are unchanged.
+    """
+
+    import numpy as np
+
+    nors = np.zeros((len(tris), 3), dtype=np.float32)
+    for i_prev, i_curr in ((2, 0), (0, 1), (1, 2)):
+        v_prev = tris[:, i_prev]
+        v_curr = tris[:, i_curr]
+        nors[:, 0] += (v_prev[:, 1] - v_curr[:, 1]) * (v_prev[:, 2] + v_curr[:, 2])
+        nors[:, 1] += (v_prev[:, 2] - v_curr[:, 2]) * (v_prev[:, 0] + v_curr[:, 0])
+        nors[:, 2] += (v_prev[:, 0] - v_curr[:, 0]) * (v_prev[:, 1] + v_curr[:, 1])
+
+    d = nors[:, 0] * nors[:, 0] + nors[:, 1] * nors[:, 1] + nors[:, 2] * nors[:, 2]
+    valid = d > np.float32(1.0e-35)
+    nors[valid] *= (np.float32(1.0) / np.sqrt(d[valid]))[:, None]
+    nors[~valid] = 0.0
+    return nors
+
+
+def _binary_facets(tris):
+    """
+    Return the facets of a (N, 3, 3) array of triangles, as a contiguous array ready to be written to a binary file.
+    """
+
+    import numpy as np
+
+    tris = np.asarray(tris, dtype=np.float32).reshape(-1, 3, 3)
+    facets = np.zeros(len(tris), dtype=BINARY_DTYPE)
+    facets['normal'] = _tris_normals(tris)
+    facets['verts'] = tris
+    return facets
+
+
 def _binary_write(filepath, faces):
     import struct
-    import itertools
-    from mathutils.geometry import normal
 
     with open(filepath, 'wb') as data:
         fw = data.write
@@ -162,19 +236,14 @@ def _binary_write(filepath, faces):
         # call len(list(faces)) which may be expensive
         fw(struct.calcsize('<80sI') * b'\0')
 
-        # 3 vertex == 9f
-        pack = struct.Struct('<9f').pack
-
-        # number of vertices written
+        # number of facets written
         nb = 0
 
-        for face in faces:
-            # calculate face normal
-            # write normal + vertices + pad as attributes
-            fw(struct.pack('<3f', *normal(*face)) + pack(*itertools.chain.from_iterable(face)))
-            # attribute byte count (unused)
-            fw(b'\0\0')
-            nb += 1
+        for tris in faces:
+            # Each chunk of triangles is written at once, as a single buffer.
+            facets = _binary_facets(tris)
+            fw(facets.data)
+            nb += len(facets)
 
         # header, with correct value now
         data.seek(0)
@@ -182,19 +251,20 @@ def _binary_write(filepath, faces):
 
 
 def _ascii_write(filepath, faces):
-    from mathutils.geometry import normal
+    import numpy as np
 
     with open(filepath, 'w') as data:
         fw = data.write
         header = _header_version()
         fw('solid %s\n' % header)
 
-        for face in faces:
-            # calculate face normal
-            fw('facet normal %f %f %f\nouter loop\n' % normal(*face)[:])
-            for vert in face:
-                fw('vertex %f %f %f\n' % vert[:])
-            fw('endloop\nendfacet\n')
+        for tris in faces:
+            tris = np.asarray(tris, dtype=np.float32).reshape(-1, 3, 3)
+            for nor, face in zip(_tris_normals(tris).tolist(), tris.tolist()):
+                fw('facet normal %f %f %f\nouter loop\n' % tuple(nor))
+                for vert in face:
+                    fw('vertex %f %f %f\n' % tuple(vert))
+                fw('endloop\nendfacet\n')
 
         fw('endsolid %s\n' % header)
 
@@ -207,7 +277,8 @@ def write_stl(filepath="", faces=(), ascii=False):
        output filepath
 
     faces
-       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float
+       iterable of chunks of triangles, each chunk being a (N, 3, 3) float array
+       (N triangles of 3 vertices of 3 coordinates), typically one chunk per object.
 
     ascii
        save the file in ascii format (very huge)
@@ -219,61 +290,69 @@ def read_stl(filepath):
     """
     Return the triangles and points of an stl binary file.
 
-    Please note that this process can take lot of time if the file is
-    huge (~1m30 for a 1 Go stl file on an quad core i7).
+    Binary files are memory-mapped and processed with NumPy, so their import
+    time is mostly bound by disk bandwidth. ASCII files are still parsed line
+    by line and can take lot of time if the file is huge.
 
     - returns a tuple(triangles, triangles' normals, points).
 
       triangles
-          A list of triangles, each triangle as a tuple of 3 index of
+          A (N, 3) array of triangles, each triangle as 3 indices of
           point in *points*.
 
       triangles' normals
-          A list of vectors3 (tuples, xyz).
+          A (N, 3) array of vectors (xyz).
 
       points
-          An indexed list of points, each point is a tuple of 3 float
-          (xyz).
+          A (M, 3) array of points, each point being 3 floats (xyz).
 
     Example of use:
 
        >>> tris, tri_nors, pts = read_stl(filepath)
-       >>> pts = list(pts)
        >>>
        >>> # print the coordinate of the triangle n
        >>> print(pts[i] for i in tris[n])
     """
     import time
+    import numpy as np
     start_time = time.process_time()
 
-    tris, tri_nors, pts = [], [], ListDict()
-
     with open(filepath, 'rb') as data:
         # check for ascii or binary
-        gen = _ascii_read if _is_ascii_file(data) else _binary_read
-
-        for nor, pt in gen(data):
-            # Add the triangle and the point.
-            # If the point is already in the list of points, the
-            # index returned by pts.add() will be the one from the
-            # first equal point inserted.
-            tris.append([pts.add(p) for p in pt])
-            tri_nors.append(nor)
+        if _is_ascii_file(data):
+            tris, tri_nors, pts = [], [], ListDict()
+            for nor, pt in _ascii_read(data):
+                # Add the triangle and the point.
+                # If the point is already in the list of points, the
+                # index returned by pts.add() will be the one from the
+                # first equal point inserted.
+                tris.append([pts.add(p) for p in pt])
+                tri_nors.append(nor)
+
+            tris = np.array(tris, dtype=np.int32).reshape(-1, 3)
+            tri_nors = np.array(tri_nors, dtype=np.float32).reshape(-1, 3)
+            pts = np.array(pts.list, dtype=np.float32).reshape(-1, 3)
+        else:
+            verts, tri_nors = _binary_read(data)
+            tris, pts = _weld_points(verts)
+            # Copy out of the memory-mapped file, before it gets closed.
+            tri_nors = np.array(tri_nors)
 
     print('Import finished in %.4f sec.' % (time.process_time() - start_time))
 
-    return tris, tri_nors, pts.list
+    return tris, tri_nors, pts
 
 
 if __name__ == '__main__':
     import sys
     import bpy
+    from mathutils import Matrix
     from io_mesh_stl import blender_utils
 
     filepaths = sys.argv[sys.argv.index('--') + 1:]
 
     for filepath in filepaths:
         objName = bpy.path.display_name(filepath)
-        tris, pts = read_stl(filepath)
+        tris, tri_nors, pts = read_stl(filepath)
 
-        blender_utils.create_and_link_mesh(objName, tris, pts)
+        blender_utils.create_and_link_mesh(objName, tris, None, pts, Matrix())
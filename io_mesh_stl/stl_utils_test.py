@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import stl_utils
+else:
+    from . import stl_utils
+
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+try:
+    from mathutils.geometry import normal
+except ImportError:
+    normal = None
+
+
+HEADER_VERSION = "Exported from Blender-test"
+
+
+def _legacy_binary_write(filepath, faces):
+    """The per-facet binary writer, as it was before writing whole chunks of facets at once."""
+    import itertools
+
+    with open(filepath, 'wb') as data:
+        fw = data.write
+        fw(struct.calcsize('<80sI') * b'\0')
+        pack = struct.Struct('<9f').pack
+        nb = 0
+        for face in faces:
+            fw(struct.pack('<3f', *normal(*face)) + pack(*itertools.chain.from_iterable(face)))
+            fw(b'\0\0')
+            nb += 1
+        data.seek(0)
+        fw(struct.pack('<80sI', HEADER_VERSION.encode('ascii'), nb))
+
+
+def _random_tris(seed, tot):
+    rng = np.random.default_rng(seed)
+    tris = rng.uniform(-100.0, 100.0, (tot, 3, 3)).astype(np.float32)
+    # Some degenerate triangles, with a null normal.
+    tris[::7, 1] = tris[::7, 0]
+    tris[::7, 2] = tris[::7, 0]
+    return tris
+
+
+@mock.patch.object(stl_utils, "_header_version", lambda: HEADER_VERSION)
+class BinaryWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, chunks):
+        filepath = os.path.join(self.tmpdir.name, name)
+        stl_utils.write_stl(filepath=filepath, faces=chunks)
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    @unittest.skipIf(normal is None, "mathutils is not available")
+    def test_identical_to_legacy_writer(self):
+        chunks = [_random_tris(0, 100), _random_tris(1, 0), _random_tris(2, 33)]
+        filepath = os.path.join(self.tmpdir.name, "legacy.stl")
+        _legacy_binary_write(filepath, (face.tolist() for tris in chunks for face in tris))
+        with open(filepath, 'rb') as f:
+            expected = f.read()
+
+        self.assertEqual(self._write("new.stl", chunks), expected)
+
+    def test_layout(self):
+        tris = _random_tris(3, 50)
+        data = self._write("layout.stl", [tris[:20], tris[20:]])
+
+        self.assertEqual(len(data), stl_utils.BINARY_HEADER + 4 + stl_utils.BINARY_STRIDE * 50)
+        self.assertEqual(struct.unpack_from('<I', data, stl_utils.BINARY_HEADER)[0], 50)
+
+        facets = np.frombuffer(data, dtype=stl_utils.BINARY_DTYPE, offset=stl_utils.BINARY_HEADER + 4)
+        np.testing.assert_array_equal(facets['verts'], tris)
+        np.testing.assert_array_equal(facets['attr'], 0)
+
+        tris64 = tris.astype(np.float64)
+        nors = np.cross(tris64[:, 1] - tris64[:, 0], tris64[:, 2] - tris64[:, 0])
+        lengths = np.linalg.norm(nors, axis=1)
+        nors[lengths > 0.0] /= lengths[lengths > 0.0, None]
+        np.testing.assert_allclose(facets['normal'], nors, atol=1e-4)
+
+    def test_read_back(self):
+        tris = _random_tris(4, 40)
+        filepath = os.path.join(self.tmpdir.name, "read_back.stl")
+        stl_utils.write_stl(filepath=filepath, faces=[tris])
+
+        tris_index, _tri_nors, pts = stl_utils.read_stl(filepath)
+        np.testing.assert_array_equal(pts[tris_index], tris)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -101,6 +101,12 @@ class ImportFBX(bpy.types.Operator, ImportHelper):
             description="Import vertex color attributes",
             default='SRGB',
             )
+    use_shared_meshes: BoolProperty(
+            name="Share Identical Meshes",
+            description="Use a single mesh for all identical geometries, instead of a copy for each of them "
+                        "(skinned and shape-keyed geometries are never shared)",
+            default=False,
+            )
 
     use_image_search: BoolProperty(
             name="Image Search",
@@ -228,6 +234,7 @@ def import_panel_include(layout, operator):
     header.label(text="Include")
     if body:
         body.prop(operator, "use_custom_normals")
+        body.prop(operator, "use_shared_meshes")
         body.prop(operator, "use_subsurf")
         body.prop(operator, "use_custom_props")
         sub = body.row()
@@ -512,6 +519,14 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Always add a keyframe at start and end of actions for animated channels",
             default=True,
             )
+    bake_anim_direct_actions: BoolProperty(
+            name="Direct Action Evaluation",
+            description="With All Actions, compute the poses of armatures directly from their actions' curves, "
+                        "instead of evaluating the whole scene at each frame of each action "
+                        "(only for armatures without constraints, drivers or NLA tracks, "
+                        "others are evaluated as usual)",
+            default=False,
+            )
     bake_anim_step: FloatProperty(
             name="Sampling Rate",
             description="How often to evaluate animated values (in frames)",
@@ -682,6 +697,9 @@ def export_panel_animation(layout, operator):
         body.prop(operator, "bake_anim_use_all_bones")
         body.prop(operator, "bake_anim_use_nla_strips")
         body.prop(operator, "bake_anim_use_all_actions")
+        sub = body.row()
+        sub.enabled = operator.bake_anim_use_all_actions
+        sub.prop(operator, "bake_anim_direct_actions")
         body.prop(operator, "bake_anim_force_startend_keying")
         body.prop(operator, "bake_anim_step")
         body.prop(operator, "bake_anim_simplify_factor")
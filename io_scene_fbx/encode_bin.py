@@ -10,8 +10,10 @@ except:
     from fbx_utils_threading import MultiThreadedTaskConsumer
 
 from struct import pack
+from collections import deque
 from contextlib import contextmanager
 import array
+import os
 import numpy as np
 import zlib
 
@@ -344,6 +346,26 @@ class FBXElem:
             write(_BLOCK_SENTINEL_DATA)
 
 
+def _write_timedate_hack_elem(elem):
+    if elem.id == b'FileId':
+        assert(elem.props_type[0] == b'R'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_bytes(_FILE_ID)
+        return True
+    elif elem.id == b'CreationTime':
+        assert(elem.props_type[0] == b'S'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_string(_TIME_ID)
+        return True
+    return False
+
+
 def _write_timedate_hack(elem_root):
     # perform 2 changes
     # - set the FileID
@@ -351,22 +373,7 @@ def _write_timedate_hack(elem_root):
 
     ok = 0
     for elem in elem_root.elems:
-        if elem.id == b'FileId':
-            assert(elem.props_type[0] == b'R'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_bytes(_FILE_ID)
-            ok += 1
-        elif elem.id == b'CreationTime':
-            assert(elem.props_type[0] == b'S'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_string(_TIME_ID)
-            ok += 1
+        ok += _write_timedate_hack_elem(elem)
 
         if ok == 2:
             break
@@ -396,6 +403,31 @@ def init_version(fbx_version):
     _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
 
 
+def _write_head(write, version):
+    write(_HEAD_MAGIC)
+    write(pack('<I', version))
+
+
+def _write_foot(write, tell, version):
+    write(_FOOT_ID)
+    write(b'\x00' * 4)
+
+    # padding for alignment (values between 1 & 16 observed)
+    # if already aligned to 16, add a full 16 bytes padding.
+    ofs = tell()
+    pad = ((ofs + 15) & ~15) - ofs
+    if pad == 0:
+        pad = 16
+
+    write(b'\0' * pad)
+
+    write(pack('<I', version))
+
+    # unknown magic (always the same)
+    write(b'\0' * 120)
+    write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+
 def write(fn, elem_root, version):
     assert(elem_root.id == b'')
 
@@ -405,8 +437,7 @@ def write(fn, elem_root, version):
 
         init_version(version)
 
-        write(_HEAD_MAGIC)
-        write(pack('<I', version))
+        _write_head(write, version)
 
         # hack since we don't decode time.
         # ideally we would _not_ modify this data.
@@ -415,20 +446,189 @@ def write(fn, elem_root, version):
         elem_root._calc_offsets_children(tell(), False)
         elem_root._write_children(write, tell, False)
 
-        write(_FOOT_ID)
-        write(b'\x00' * 4)
+        _write_foot(write, tell, version)
+
+
+# The actual writing function, enable_multithreading_cm replaces FBXElem._write while compression is enabled.
+_FBXElem_write = FBXElem._write
+
 
-        # padding for alignment (values between 1 & 16 observed)
-        # if already aligned to 16, add a full 16 bytes padding.
-        ofs = tell()
-        pad = ((ofs + 15) & ~15) - ofs
-        if pad == 0:
-            pad = 16
+def _is_ready(elem):
+    """Whether no array of that element (or of its children) is still waiting for its multithreaded compression."""
+    return ... not in elem.props and all(_is_ready(sub_elem) for sub_elem in elem.elems)
 
-        write(b'\0' * pad)
 
-        write(pack('<I', version))
+class FBXStreamWriter:
+    """
+    Write an FBX file while its element hierarchy is being built, instead of once it is complete (see :func:`write`).
 
-        # unknown magic (always the same)
-        write(b'\0' * 120)
-        write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+    Children of the root element (and of the elements opened with :meth:`open`, like ``Objects``) are written and
+    released by :meth:`flush`, all but the last one, which may still be filled by the caller. The end offset of an
+    opened element is reserved in its header and written back once it is closed, so peak memory depends on the
+    largest of those children, not on the whole file. Output is identical to the one of :func:`write`.
+
+    Flushed elements must be complete, their properties and children must not be modified anymore.
+    Flushing can happen while multithreaded compression is enabled, elements with arrays still being compressed are
+    only written once they are ready. :meth:`finish` must be called once compression is done.
+
+        >>> with FBXStreamWriter(filepath, elem_root, version) as writer:
+        ...     with FBXElem.enable_multithreading_cm():
+        ...         # Add children to elem_root, calling writer.flush() whenever the previous ones are complete.
+        ...         ...
+        ...     writer.finish()
+    """
+    __slots__ = (
+        "_fn",
+        "_file",
+        "_version",
+        "_stack",  # Opened elements, as [elem, header offset (None until their header is queued)], root first.
+        "_pending",  # Queued write operations, in file order.
+        "_timedate_ok",
+    )
+
+    def __init__(self, fn, elem_root, version):
+        assert(elem_root.id == b'')
+
+        init_version(version)
+
+        self._fn = fn
+        self._file = open(fn, 'wb')
+        self._version = version
+        self._stack = [[elem_root, None]]
+        self._pending = deque()
+        self._timedate_ok = 0
+
+        _write_head(self._file.write, version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, _exc_value, _traceback):
+        is_finished = self._file.closed
+        self.close()
+        if exc_type is not None and not is_finished:
+            # Do not leave a truncated file behind.
+            os.remove(self._fn)
+
+    def close(self):
+        self._file.close()
+
+    def open(self, elem):
+        """
+        Stream the children of *elem* instead of writing it as a whole. *elem* must be the last child of the
+        innermost opened element, and have no properties.
+        """
+        entry = self._stack[-1]
+        assert(entry[0].elems and entry[0].elems[-1] is elem)
+        assert(not elem.props)
+        # All previous siblings of elem are complete.
+        entry[0].elems.pop()
+        self._queue_children(entry, False)
+        self._begin(entry)
+        self._stack.append([elem, None])
+        self._run()
+
+    def close_elem(self):
+        """Close the innermost opened element, once all its children have been added."""
+        assert(len(self._stack) > 1)
+        entry = self._stack.pop()
+        if entry[1] is None:
+            # Nothing streamed yet, write it as a whole with its siblings.
+            self._stack[-1][0].elems.append(entry[0])
+        else:
+            self._queue_children(entry, True)
+            self._pending.append((self._write_end, entry))
+        self._run()
+
+    def flush(self):
+        """Write the children of the innermost opened element, but its last one."""
+        entry = self._stack[-1]
+        elems = entry[0].elems
+        if len(elems) > 1:
+            last = elems.pop()
+            self._queue_children(entry, False)
+            elems.append(last)
+        self._run()
+
+    def finish(self):
+        """Write the remaining elements and the end of the file, multithreaded compression must be disabled."""
+        while len(self._stack) > 1:
+            self.close_elem()
+        self._queue_children(self._stack[0], True)
+        self._run()
+        if self._pending:
+            raise RuntimeError("Arrays are still being compressed, multithreaded compression must be disabled")
+
+        if self._timedate_ok != 2:
+            print("Missing fields!")
+
+        write = self._file.write
+        write(_BLOCK_SENTINEL_DATA)
+        _write_foot(write, self._file.tell, self._version)
+        self.close()
+
+    def _queue_children(self, entry, is_last):
+        """Queue writing all the current children of an opened element, *is_last* if it gets no more children."""
+        elem = entry[0]
+        elems = elem.elems
+        if not elems:
+            return
+        is_root = entry is self._stack[0]
+        self._begin(entry)
+        elem_last = elems[-1]
+        for sub_elem in elems:
+            if is_root and self._timedate_ok < 2:
+                # hack since we don't decode time (see _write_timedate_hack).
+                self._timedate_ok += _write_timedate_hack_elem(sub_elem)
+            self._pending.append((self._write_elem, (sub_elem, is_last and sub_elem is elem_last)))
+        # Only the queue keeps a reference to those, they are released once written.
+        elems.clear()
+
+    def _begin(self, entry):
+        """Queue writing the header of an opened element, before its first streamed child."""
+        if entry[1] is None and entry is not self._stack[0]:
+            entry[1] = -1
+            self._pending.append((self._write_begin, entry))
+
+    def _run(self):
+        pending = self._pending
+        while pending:
+            func, arg = pending[0]
+            if not func(arg):
+                break
+            pending.popleft()
+
+    def _write_elem(self, arg):
+        elem, is_last = arg
+        if not _is_ready(elem):
+            return False
+        tell = self._file.tell
+        elem._calc_offsets(tell(), is_last)
+        # Writing is disabled by enable_multithreading_cm as a safeguard, but this element is complete.
+        write_func = FBXElem._write
+        FBXElem._write = _FBXElem_write
+        try:
+            elem._write(self._file.write, tell, is_last)
+        finally:
+            FBXElem._write = write_func
+        return True
+
+    def _write_begin(self, entry):
+        elem = entry[0]
+        write = self._file.write
+        entry[1] = self._file.tell()
+        # The end offset is not known yet, it is written by _write_end.
+        write(pack(_ELEM_META_FORMAT, 0, 0, 0))
+        write(bytes((len(elem.id),)))
+        write(elem.id)
+        return True
+
+    def _write_end(self, entry):
+        # An opened element has no properties, and it was started so it has children.
+        f = self._file
+        f.write(_BLOCK_SENTINEL_DATA)
+        end_offset = f.tell()
+        f.seek(entry[1])
+        f.write(pack(_ELEM_META_FORMAT, end_offset, 0, 0))
+        f.seek(end_offset)
+        return True
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import encode_bin
+else:
+    from . import encode_bin
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def _build_tree(root, writer=None):
+    """Fill *root* like an exported file, streaming elements through *writer* if given."""
+    def flush():
+        if writer is not None:
+            writer.flush()
+
+    def add_elem(parent, elem_id):
+        elem = encode_bin.FBXElem(elem_id)
+        parent.elems.append(elem)
+        return elem
+
+    rng = np.random.default_rng(0)
+
+    add_elem(root, b"FBXHeaderExtension").elems.append(encode_bin.FBXElem(b"Empty"))
+    add_elem(root, b"FileId").add_bytes(b"FooBar")
+    add_elem(root, b"CreationTime").add_string(b"Today")
+    add_elem(root, b"Documents").add_int32(1)
+    flush()
+    add_elem(root, b"Definitions").elems.append(encode_bin.FBXElem(b"Empty"))
+
+    objects = add_elem(root, b"Objects")
+    if writer is not None:
+        writer.open(objects)
+    for i in range(5):
+        geom = add_elem(objects, b"Geometry")
+        geom.add_int64(i)
+        geom.add_string(b"Mesh%d\x00\x01Geometry" % i)
+        # Small arrays are not compressed, large ones are.
+        add_elem(geom, b"Vertices").add_float64_array(rng.uniform(-1.0, 1.0, 10 + 3000 * i))
+        add_elem(geom, b"PolygonVertexIndex").add_int32_array(rng.integers(-100, 100, 4000 * i, dtype=np.int32))
+        add_elem(geom, b"Empty")
+        add_elem(geom, b"EmptyLast")
+        flush()
+    for i in range(3):
+        acurvenode = add_elem(objects, b"AnimationCurveNode")
+        acurvenode.add_int64(100 + i)
+        acurve = add_elem(objects, b"AnimationCurve")
+        acurve.add_int64(200 + i)
+        add_elem(acurve, b"KeyTime").add_int64_array(np.arange(100 * i, dtype=np.int64))
+        # Properties of the curve node are only complete once its curves have been added.
+        add_elem(acurvenode, b"Properties70")
+        flush()
+    add_elem(objects, b"AnimationStack").add_int64(42)
+    if writer is not None:
+        writer.close_elem()
+    flush()
+
+    # An opened element without any streamed child.
+    empty_objects = add_elem(root, b"EmptyObjects")
+    if writer is not None:
+        writer.open(empty_objects)
+        writer.close_elem()
+
+    connections = add_elem(root, b"Connections")
+    for i in range(5):
+        connection = add_elem(connections, b"C")
+        connection.add_string(b"OO")
+        connection.add_int64(i)
+        connection.add_int64(0)
+    add_elem(root, b"Takes")
+
+
+class StreamWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, version):
+        filepath = os.path.join(self.tmpdir.name, "write_%d.fbx" % version)
+        root = encode_bin.FBXElem(b"")
+        _build_tree(root)
+        encode_bin.write(filepath, root, version)
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    def _write_stream(self, version, use_multithreading):
+        filepath = os.path.join(self.tmpdir.name, "stream_%d.fbx" % version)
+        root = encode_bin.FBXElem(b"")
+        with encode_bin.FBXStreamWriter(filepath, root, version) as writer:
+            if use_multithreading:
+                with encode_bin.FBXElem.enable_multithreading_cm():
+                    _build_tree(root, writer)
+            else:
+                _build_tree(root, writer)
+            writer.finish()
+        # Written elements are released.
+        self.assertEqual(len(root.elems), 0)
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    def test_identical_7400(self):
+        self.assertEqual(self._write_stream(7400, False), self._write(7400))
+
+    def test_identical_7500(self):
+        self.assertEqual(self._write_stream(7500, False), self._write(7500))
+
+    def test_identical_multithreading(self):
+        self.assertEqual(self._write_stream(7400, True), self._write(7400))
+        self.assertEqual(self._write_stream(7500, True), self._write(7500))
+
+    def test_finish_pending(self):
+        filepath = os.path.join(self.tmpdir.name, "pending.fbx")
+        root = encode_bin.FBXElem(b"")
+        with encode_bin.FBXStreamWriter(filepath, root, 7400) as writer:
+            elem = encode_bin.FBXElem(b"Vertices")
+            root.elems.append(elem)
+            elem.props.append(...)
+            with self.assertRaises(RuntimeError):
+                writer.finish()
+
+    def test_error(self):
+        filepath = os.path.join(self.tmpdir.name, "error.fbx")
+        root = encode_bin.FBXElem(b"")
+        with self.assertRaises(ValueError):
+            with encode_bin.FBXStreamWriter(filepath, root, 7400):
+                raise ValueError()
+        # No truncated file is left behind.
+        self.assertFalse(os.path.exists(filepath))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -54,6 +54,9 @@ from .fbx_utils import (
     MESH_ATTRIBUTE_SHARP_FACE, MESH_ATTRIBUTE_POSITION, MESH_ATTRIBUTE_MATERIAL_INDEX,
     # Mesh transform helpers.
     vcos_transformed, nors_transformed,
+    # Matrix array helpers.
+    matrices_inverted_safe, matrices_decompose, quaternions_to_compatible_eulers,
+    quaternions_to_matrices, eulers_to_matrices, axis_angles_to_matrices,
     # UUID from key.
     get_fbx_uuid_from_key,
     # Key generators.
@@ -94,6 +97,12 @@ convert_mm_to_inch = units_convertor("millimeter", "inch")
 convert_rad_to_deg = units_convertor("radian", "degree")
 convert_rad_to_deg_iter = units_convertor_iter("radian", "degree")
 
+# Bake the animation of bones from their pose matrices fetched in bulk, instead of one bone at a time.
+_BAKE_BONES_IN_BULK = True
+
+# Pose bone properties that actions evaluated directly may animate, see fbx_animations_direct_supported.
+_DIRECT_POSE_BONE_PROPS = {"location", "rotation_quaternion", "rotation_euler", "rotation_axis_angle", "scale"}
+
 
 # ##### Templates #####
 # TODO: check all those "default" values, they should match Blender's default as much as possible, I guess?
@@ -1990,9 +1999,11 @@ def fbx_data_object_elements(root, ob_obj, scene_data):
     elem_props_template_finalize(tmpl, props)
 
 
-def fbx_data_animation_elements(root, scene_data):
+def fbx_data_animation_elements(root, scene_data, flush=None):
     """
     Write animation data.
+
+    *flush* is called each time previous elements are complete.
     """
     animations = scene_data.animations
     if not animations:
@@ -2069,6 +2080,9 @@ def fbx_data_animation_elements(root, scene_data):
                         elem_data_single_int32_array(acurve, b"KeyAttrRefCount", (nbr_keys,))
 
                 elem_props_template_finalize(acn_tmpl, acn_props)
+                # Curve node's properties are only complete once its curves are written.
+                if flush is not None:
+                    flush()
 
 
 # ##### Top-level FBX data container. #####
@@ -2197,9 +2211,184 @@ def fbx_generate_leaf_bones(settings, data_bones):
     return leaf_bones
 
 
-def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=None, force_keep=False):
+def fbx_animations_bones_tx(scene_data, arm_obj, bones, pose_matrices, p_rots):
+    """
+    Compute the baked loc/rot/scale of bones of an armature for a whole frame range at once, giving the same values as
+    ObjectWrapper.fbx_object_tx (rotation being euler-compat with the previous frame's one, starting with p_rots).
+    pose_matrices are the matrices of all pose bones of the armature for each frame, as fetched with foreach_get.
+    Returns a dict mapping each bone to an array of its 9 loc/rot/scale curves, of shape (9, num_frames).
+    """
+    settings = scene_data.settings
+    pose_bones = arm_obj.bdata.pose.bones
+    num_frames = len(pose_matrices)
+    # foreach_get gives matrices in column-major order.
+    pose_matrices = pose_matrices.reshape(num_frames, -1, 4, 4).transpose(0, 1, 3, 2).astype(np.float64)
+
+    bone_indices = np.array([pose_bones.find(bo_obj.bdata.name) for bo_obj in bones])
+    parent_indices = np.array([pose_bones.find(bo_obj.bdata.parent.name) if bo_obj.bdata.parent else -1
+                               for bo_obj in bones])
+
+    # Same as ObjectWrapper.fbx_object_matrix for bones: local pose matrix, with the bone correction.
+    matrices = pose_matrices[:, bone_indices]
+    has_parent = parent_indices != -1
+    if has_parent.any():
+        local_matrices = matrices_inverted_safe(pose_matrices[:, parent_indices[has_parent]]) @ matrices[:, has_parent]
+        if settings.bone_correction_matrix_inv:
+            local_matrices = np.array(settings.bone_correction_matrix_inv) @ local_matrices
+        matrices[:, has_parent] = local_matrices
+    if settings.bone_correction_matrix:
+        matrices = matrices @ np.array(settings.bone_correction_matrix)
+
+    locs, quats, scales = matrices_decompose(matrices)
+    rots = quaternions_to_compatible_eulers(quats, [p_rots[bo_obj] for bo_obj in bones])
+
+    # Shape (num_frames, num_bones, 9) to (num_bones, 9, num_frames).
+    values = np.concatenate((locs, rots, scales), axis=-1).transpose(1, 2, 0)
+    return dict(zip(bones, values))
+
+
+def fbx_animations_frames(scene_data, f_start, f_end):
+    """
+    Frames to bake for a given frame range.
+    """
+    # `np.arange` excludes the `stop` argument like when using `range`, so we use np.nextafter to get the next
+    # representable value after f_end and use that as the `stop` argument instead.
+    return np.arange(f_start, np.nextafter(f_end, np.inf), step=scene_data.settings.bake_anim_step)
+
+
+def fbx_animations_direct_supported(scene_data, ob_obj, act):
+    """
+    Whether the animation of object ob_obj with action act can be baked without evaluating the scene at each frame,
+    i.e. when the action only animates the pose of an armature, and nothing else (constraints, drivers, NLA...) does.
+    The shape keys and cameras baked along must not depend on the armature either.
+    """
+    ob = ob_obj.bdata
+    anim_data = ob.animation_data
+    render = scene_data.scene.render
+    if (not _BAKE_BONES_IN_BULK or render.frame_map_old != render.frame_map_new or ob.type != 'ARMATURE'
+            or ob.parent or ob.constraints or ob.data.animation_data or ob.data.pose_position != 'POSE'):
+        return False
+    if (anim_data.drivers or anim_data.action_blend_type != 'REPLACE' or anim_data.action_influence != 1.0
+            or any(not track.mute and track.strips for track in anim_data.nla_tracks)):
+        return False
+    for fc in act.fcurves:
+        path, _sep, prop = fc.data_path.rpartition('.')
+        if not path.startswith("pose.bones[") or prop not in _DIRECT_POSE_BONE_PROPS:
+            return False
+    for pbo in ob.pose.bones:
+        bo = pbo.bone
+        if (pbo.constraints or not bo.use_inherit_rotation or bo.inherit_scale != 'FULL'
+                or not bo.use_local_location or bo.use_relative_parent):
+            return False
+    for me in scene_data.data_deformers_shape:
+        if me.shape_keys.animation_data and me.shape_keys.animation_data.drivers:
+            return False
+    for cam_obj in scene_data.data_cameras:
+        if cam_obj.bdata.data.animation_data and cam_obj.bdata.data.animation_data.drivers:
+            return False
+    return True
+
+
+def fbx_animations_direct_pose_matrices(ob, act, currframes):
+    """
+    Compute the matrices of all pose bones of armature ob for each frame, directly from the curves of action act,
+    in the same layout as fetched with foreach_get after setting the scene's frame with act assigned to ob.
+    Only valid when fbx_animations_direct_supported is True. Channels not animated by act keep their current values.
+    """
+    pose_bones = ob.pose.bones
+    num_frames = len(currframes)
+    num_bones = len(pose_bones)
+
+    channels = {}
+    for prop, size in (("location", 3), ("rotation_quaternion", 4), ("rotation_euler", 3),
+                       ("rotation_axis_angle", 4), ("scale", 3)):
+        values = np.empty(num_bones * size, dtype=np.float32)
+        pose_bones.foreach_get(prop, values)
+        channels[prop] = np.broadcast_to(values.reshape(num_bones, size), (num_frames, num_bones, size)).astype(float)
+    frames = currframes.tolist()
+    for fc in act.fcurves:
+        if fc.mute or fc.is_empty or (fc.group and fc.group.mute):
+            continue
+        path, _sep, prop = fc.data_path.rpartition('.')
+        bone_idx = pose_bones.find(ob.path_resolve(path).name)
+        channels[prop][:, bone_idx, fc.array_index] = np.fromiter(map(fc.evaluate, frames), dtype=float,
+                                                                   count=num_frames)
+
+    rotation_modes = np.array([pbo.rotation_mode for pbo in pose_bones])
+    rotations = np.empty((num_frames, num_bones, 3, 3))
+    for rotation_mode in set(rotation_modes):
+        mask = rotation_modes == rotation_mode
+        if rotation_mode == 'QUATERNION':
+            rotations[:, mask] = quaternions_to_matrices(channels["rotation_quaternion"][:, mask])
+        elif rotation_mode == 'AXIS_ANGLE':
+            rotations[:, mask] = axis_angles_to_matrices(channels["rotation_axis_angle"][:, mask])
+        else:
+            rotations[:, mask] = eulers_to_matrices(channels["rotation_euler"][:, mask], rotation_mode)
+
+    # Local transform of each bone, location being ignored for connected bones, like BKE_pchan_to_mat4 does.
+    matrices = np.zeros((num_frames, num_bones, 4, 4))
+    matrices[..., :3, :3] = rotations * channels["scale"][..., None, :]
+    not_connected = np.array([not pbo.bone.use_connect for pbo in pose_bones], dtype=bool)
+    translations = matrices[..., :3, 3]
+    translations[:, not_connected] = channels["location"][:, not_connected]
+    matrices[..., 3, 3] = 1.0
+
+    # Rest matrices, relative to the parent bone's rest matrix if any.
+    rest_matrices = np.array([pbo.bone.matrix_local for pbo in pose_bones], dtype=float).reshape(num_bones, 4, 4)
+    parent_indices = np.array([pose_bones.find(pbo.parent.name) if pbo.parent else -1 for pbo in pose_bones], dtype=int)
+    has_parent = parent_indices != -1
+    rest_matrices[has_parent] = (np.linalg.inv(rest_matrices[parent_indices[has_parent]])
+                                 @ rest_matrices[has_parent])
+    matrices = rest_matrices @ matrices
+
+    # Chain the bones with their parent, one hierarchy level at a time.
+    depths = np.array([len(pbo.parent_recursive) for pbo in pose_bones], dtype=int)
+    for depth in range(1, depths.max(initial=0) + 1):
+        mask = depths == depth
+        matrices[:, mask] = matrices[:, parent_indices[mask]] @ matrices[:, mask]
+
+    # foreach_get gives matrices in column-major order.
+    return matrices.transpose(0, 1, 3, 2).reshape(num_frames, -1)
+
+
+def fbx_animations_shared_values(scene_data, currframes):
+    """
+    Bake the values of shape keys and cameras for given frames, as fbx_animations_do does, in a single sweep over the
+    scene's frames, so that they can be shared by all actions evaluated directly (which do not affect them).
+    Returns an array of shape (num_frames, num_values).
+    """
+    scene = scene_data.scene
+    shapes = [shape for me, (_me_key, _shapes_key, me_shapes) in scene_data.data_deformers_shape.items()
+              if me.shape_keys.use_relative for shape in me_shapes]
+    cameras = [cam_obj.bdata.data for cam_obj in scene_data.data_cameras]
+    num_frames = len(currframes)
+    num_values_per_frame = len(shapes) + len(cameras) * 2
+    if not num_values_per_frame:
+        return np.empty((num_frames, 0))
+
+    def frame_values_gen():
+        int_currframes = currframes.astype(int)
+        subframes = currframes - int_currframes
+        for int_currframe, subframe in zip(int_currframes.data, subframes.data):
+            scene.frame_set(int_currframe, subframe=subframe)
+            for shape in shapes:
+                yield shape.value
+            for camera in cameras:
+                yield camera.lens
+                yield camera.dof.focus_distance
+
+    back_currframe = scene.frame_current
+    all_values_flat = np.fromiter(frame_values_gen(), dtype=float, count=num_frames * num_values_per_frame)
+    scene.frame_set(back_currframe, subframe=0.0)
+    return all_values_flat.reshape(num_frames, num_values_per_frame)
+
+
+def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=None, force_keep=False,
+                      direct_values=None):
     """
     Generate animation data (a single AnimStack) from objects, for a given frame range.
+    direct_values, if given, is a tuple of the pose matrices of each armature and of the shape keys and cameras values
+    for each frame, the scene is then not evaluated, and the objects themselves must not be animated.
     """
     bake_step = scene_data.settings.bake_anim_step
     simplify_fac = scene_data.settings.bake_anim_simplify_factor
@@ -2259,21 +2448,35 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
                                                           force_sek, (cam.dof.focus_distance,))
         animdata_cameras[cam_key] = (acnode_lens, acnode_focus_distance, cam)
 
+    # Bones are baked from the pose matrices of their armature, fetched in bulk for each frame.
+    animdata_bones = {}
+    if _BAKE_BONES_IN_BULK:
+        for ob_obj in animdata_ob:
+            if ob_obj.is_bone:
+                animdata_bones.setdefault(ob_obj.armature, []).append(ob_obj)
+    # Other objects are baked one at a time, for each frame.
+    animdata_ob_tx = [ob_obj for ob_obj in animdata_ob if not (_BAKE_BONES_IN_BULK and ob_obj.is_bone)]
+
     # Get all parent bdata of animated dupli instances, so that we can quickly identify which instances in
     # `depsgraph.object_instances` are animated and need their ObjectWrappers' matrices updated each frame.
     dupli_parent_bdata = {dup.get_parent().bdata for dup in animdata_ob if dup.is_dupli}
     has_animated_duplis = bool(dupli_parent_bdata)
 
     # Initialize keyframe times array. Each AnimationCurveNodeWrapper will share the same instance.
-    # `np.arange` excludes the `stop` argument like when using `range`, so we use np.nextafter to get the next
-    # representable value after f_end and use that as the `stop` argument instead.
-    currframes = np.arange(f_start, np.nextafter(f_end, np.inf), step=bake_step)
+    currframes = fbx_animations_frames(scene_data, f_start, f_end)
 
     # Convert from Blender time to FBX time.
     fps = scene.render.fps / scene.render.fps_base
     real_currframes = currframes - f_start if start_zero else currframes
     real_currframes = (real_currframes / fps * FBX_KTIME).astype(np.int64)
 
+    num_frames = len(real_currframes)
+    if direct_values is None:
+        pose_matrices = {arm_obj: np.empty((num_frames, len(arm_obj.bdata.pose.bones) * 16), dtype=np.float32)
+                         for arm_obj in animdata_bones}
+    else:
+        pose_matrices, shared_values = direct_values
+
     # Generator that yields the animated values of each frame in order.
     def frame_values_gen():
         # Precalculate integer frames and subframes.
@@ -2284,14 +2487,17 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
         animdata_shapes_only = [shape for _anim_shape, _me, shape in animdata_shapes.values()]
         animdata_cameras_only = [camera for _anim_camera_lens, _anim_camera_focus_distance, camera
                                  in animdata_cameras.values()]
-        # Previous frame's rotation for each object in animdata_ob, this will be updated each frame.
-        animdata_ob_p_rots = p_rots.values()
+        # Previous frame's rotation for each object in animdata_ob_tx, this will be updated each frame.
+        animdata_ob_p_rots = [p_rots[ob_obj] for ob_obj in animdata_ob_tx]
 
         # Iterate through each frame and yield the values for that frame.
         # Iterating .data, the memoryview of an array, is faster than iterating the array directly.
-        for int_currframe, subframe in zip(int_currframes.data, subframes.data):
+        for frame_idx, (int_currframe, subframe) in enumerate(zip(int_currframes.data, subframes.data)):
             scene.frame_set(int_currframe, subframe=subframe)
 
+            for arm_obj, arm_pose_matrices in pose_matrices.items():
+                arm_obj.bdata.pose.bones.foreach_get("matrix", arm_pose_matrices[frame_idx])
+
             if has_animated_duplis:
                 # Changing the scene's frame invalidates existing dupli instances. To get the updated matrices of duplis
                 # for this frame, we must get the duplis from the depsgraph again.
@@ -2301,7 +2507,7 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
                         # ObjectWrapper instance with the current frame's matrix and then returns the existing instance.
                         ObjectWrapper(dup)
             next_p_rots = []
-            for ob_obj, p_rot in zip(animdata_ob, animdata_ob_p_rots):
+            for ob_obj, p_rot in zip(animdata_ob_tx, animdata_ob_p_rots):
                 # We compute baked loc/rot/scale for all objects (rot being euler-compat with previous value!).
                 loc, rot, scale, _m, _mr = ob_obj.fbx_object_tx(scene_data, rot_euler_compat=p_rot)
                 next_p_rots.append(rot)
@@ -2316,18 +2522,25 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
                 yield camera.dof.focus_distance
 
     # Providing `count` to np.fromiter pre-allocates the array, avoiding extra memory allocations while iterating.
-    num_ob_values = len(animdata_ob) * 9  # Location, rotation and scale, each of which have x, y, and z components
+    num_ob_values = len(animdata_ob_tx) * 9  # Location, rotation and scale, each of which have x, y, and z components
     num_shape_values = len(animdata_shapes)  # Only 1 value per shape key
     num_camera_values = len(animdata_cameras) * 2  # Focal length (`.lens`) and focus distance
     num_values_per_frame = num_ob_values + num_shape_values + num_camera_values
-    num_frames = len(real_currframes)
-    all_values_flat = np.fromiter(frame_values_gen(), dtype=float, count=num_frames * num_values_per_frame)
+    if direct_values is None:
+        all_values_flat = np.fromiter(frame_values_gen(), dtype=float, count=num_frames * num_values_per_frame)
 
-    # Restore the scene's current frame.
-    scene.frame_set(back_currframe, subframe=0.0)
+        # Restore the scene's current frame.
+        scene.frame_set(back_currframe, subframe=0.0)
 
-    # View such that each column is all values for a single frame and each row is all values for a single curve.
-    all_values = all_values_flat.reshape(num_frames, num_values_per_frame).T
+        # View such that each column is all values for a single frame and each row is all values for a single curve.
+        all_values = all_values_flat.reshape(num_frames, num_values_per_frame).T
+    else:
+        # Same layout, objects keeping their current transform for all frames.
+        all_values = np.empty((num_values_per_frame, num_frames))
+        for i, ob_obj in enumerate(animdata_ob_tx):
+            loc, rot, scale, _m, _mr = ob_obj.fbx_object_tx(scene_data, rot_euler_compat=p_rots[ob_obj])
+            all_values[i * 9:(i + 1) * 9] = np.array((*loc, *rot, *scale))[:, None]
+        all_values[num_ob_values:] = shared_values.T
     # Split into views of the arrays for each curve type.
     split_at = [num_ob_values, num_shape_values, num_camera_values]
     # For unequal sized splits, np.split takes indices to split at, which can be acquired through a cumulative sum
@@ -2340,9 +2553,12 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
 
     # Set location/rotation/scale curves.
     # Split into equal sized views of the arrays for each object.
-    split_into = len(animdata_ob)
-    per_ob_values = np.split(all_ob_values, split_into) if split_into > 0 else ()
-    for anims, ob_values in zip(animdata_ob.values(), per_ob_values):
+    split_into = len(animdata_ob_tx)
+    per_ob_values = dict(zip(animdata_ob_tx, np.split(all_ob_values, split_into) if split_into > 0 else ()))
+    for arm_obj, bones in animdata_bones.items():
+        per_ob_values.update(fbx_animations_bones_tx(scene_data, arm_obj, bones, pose_matrices[arm_obj], p_rots))
+    for ob_obj, anims in animdata_ob.items():
+        ob_values = per_ob_values[ob_obj]
         # Split again into equal sized views of the location, rotation and scaling arrays.
         loc_xyz, rot_xyz, sca_xyz = np.split(ob_values, 3)
         # In-place convert from Blender rotation to FBX rotation.
@@ -2452,11 +2668,13 @@ def fbx_animations(scene_data):
                     strip.mute = True
 
         for strip in strips:
+            start_time = time.process_time()
             strip.mute = False
             add_anim(animations, animated,
                      fbx_animations_do(scene_data, strip, strip.frame_start, strip.frame_end, True, force_keep=True))
             strip.mute = True
             scene.frame_set(scene.frame_current, subframe=0.0)
+            print("\tNLA strip %r baked in %.4f sec." % (strip.name, time.process_time() - start_time))
 
         for strip in strips:
             strip.mute = False
@@ -2496,6 +2714,7 @@ def fbx_animations(scene_data):
                 if not ob_to.is_property_readonly(p):
                     setattr(ob_to, p, getattr(ob_from, p))
 
+        ob_actions = []
         for ob_obj in scene_data.objects:
             # Actions only for objects, not bones!
             if not ob_obj.is_object:
@@ -2509,6 +2728,31 @@ def fbx_animations(scene_data):
             if ob.animation_data.is_property_readonly('action'):
                 continue  # Cannot re-assign 'active action' to this object (usually related to NLA usage, see T48089).
 
+            org_act = ob.animation_data.action
+            path_resolve = ob.path_resolve
+
+            # For now, *all* paths in the action must be valid for the object, to validate the action.
+            # Unless that action was already assigned to the object!
+            acts = [act for act in bpy.data.actions if act == org_act or validate_actions(act, path_resolve)]
+            direct_acts = set()
+            if scene_data.settings.bake_anim_direct_actions:
+                direct_acts = {act for act in acts if fbx_animations_direct_supported(scene_data, ob_obj, act)}
+            ob_actions.append((ob_obj, acts, direct_acts))
+
+        # Actions evaluated directly do not need to evaluate the scene for their own frames, but shape keys and cameras
+        # are baked in all animstacks, so their values are baked once for all frames of those actions.
+        direct_frames = [fbx_animations_frames(scene_data, *act.frame_range)
+                         for _ob_obj, _acts, direct_acts in ob_actions for act in direct_acts]
+        if direct_frames:
+            start_time = time.process_time()
+            shared_frames = np.unique(np.concatenate(direct_frames))
+            shared_values = fbx_animations_shared_values(scene_data, shared_frames)
+            print("\tShape keys and cameras baked for directly evaluated actions in %.4f sec."
+                  % (time.process_time() - start_time))
+
+        for ob_obj, acts, direct_acts in ob_actions:
+            ob = ob_obj.bdata
+
             # We can't play with animdata and actions and get back to org state easily.
             # So we have to add a temp copy of the object to the scene, animate it, and remove it... :/
             ob_copy = ob.copy()
@@ -2516,12 +2760,18 @@ def fbx_animations(scene_data):
             pbones_matrices = [pbo.matrix_basis.copy() for pbo in ob.pose.bones] if ob.type == 'ARMATURE' else ...
 
             org_act = ob.animation_data.action
-            path_resolve = ob.path_resolve
 
-            for act in bpy.data.actions:
-                # For now, *all* paths in the action must be valid for the object, to validate the action.
-                # Unless that action was already assigned to the object!
-                if act != org_act and not validate_actions(act, path_resolve):
+            for act in acts:
+                start_time = time.process_time()
+                if act in direct_acts:
+                    frame_start, frame_end = act.frame_range  # sic!
+                    currframes = fbx_animations_frames(scene_data, frame_start, frame_end)
+                    direct_values = ({ob_obj: fbx_animations_direct_pose_matrices(ob, act, currframes)},
+                                     shared_values[np.searchsorted(shared_frames, currframes)])
+                    add_anim(animations, animated,
+                             fbx_animations_do(scene_data, (ob, act), frame_start, frame_end, True,
+                                               objects={ob_obj}, force_keep=True, direct_values=direct_values))
+                    print("\tAction %r baked directly in %.4f sec." % (act.name, time.process_time() - start_time))
                     continue
                 ob.animation_data.action = act
                 frame_start, frame_end = act.frame_range  # sic!
@@ -2535,6 +2785,7 @@ def fbx_animations(scene_data):
                 ob.animation_data.action = org_act
                 restore_object(ob, ob_copy)
                 scene.frame_set(scene.frame_current, subframe=0.0)
+                print("\tAction %r baked in %.4f sec." % (act.name, time.process_time() - start_time))
 
             if pbones_matrices is not ...:
                 for pbo, mat in zip(ob.pose.bones, pbones_matrices):
@@ -3279,28 +3530,40 @@ def fbx_definitions_elements(root, scene_data):
     fbx_templates_generate(definitions, scene_data.templates)
 
 
-def fbx_objects_elements(root, scene_data):
+def fbx_objects_elements(root, scene_data, writer=None):
     """
     Data (objects, geometry, material, textures, armatures, etc.).
+
+    With a *writer* (an encode_bin.FBXStreamWriter), each object is written as soon as it is complete.
     """
     perfmon = PerfMon()
     perfmon.level_up()
     objects = elem_empty(root, b"Objects")
 
+    if writer is not None:
+        writer.open(objects)
+        flush = writer.flush
+    else:
+        def flush():
+            pass
+
     perfmon.step("FBX export fetch empties (%d)..." % len(scene_data.data_empties))
 
     for empty in scene_data.data_empties:
         fbx_data_empty_elements(objects, empty, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch lamps (%d)..." % len(scene_data.data_lights))
 
     for lamp in scene_data.data_lights:
         fbx_data_light_elements(objects, lamp, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch cameras (%d)..." % len(scene_data.data_cameras))
 
     for cam in scene_data.data_cameras:
         fbx_data_camera_elements(objects, cam, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch meshes (%d)..."
                  % len({me_key for me_key, _me, _free in scene_data.data_meshes.values()}))
@@ -3308,6 +3571,7 @@ def fbx_objects_elements(root, scene_data):
     done_meshes = set()
     for me_obj in scene_data.data_meshes:
         fbx_data_mesh_elements(objects, me_obj, scene_data, done_meshes)
+        flush()
     del done_meshes
 
     perfmon.step("FBX export fetch objects (%d)..." % len(scene_data.objects))
@@ -3316,10 +3580,12 @@ def fbx_objects_elements(root, scene_data):
         if ob_obj.is_dupli:
             continue
         fbx_data_object_elements(objects, ob_obj, scene_data)
+        flush()
         for dp_obj in ob_obj.dupli_list_gen(scene_data.depsgraph):
             if dp_obj not in scene_data.objects:
                 continue
             fbx_data_object_elements(objects, dp_obj, scene_data)
+            flush()
 
     perfmon.step("FBX export fetch remaining...")
 
@@ -3327,23 +3593,31 @@ def fbx_objects_elements(root, scene_data):
         if not (ob_obj.is_object and ob_obj.type == 'ARMATURE'):
             continue
         fbx_data_armature_elements(objects, ob_obj, scene_data)
+        flush()
 
     if scene_data.data_leaf_bones:
         fbx_data_leaf_bone_elements(objects, scene_data)
+        flush()
 
     for ma in scene_data.data_materials:
         fbx_data_material_elements(objects, ma, scene_data)
+        flush()
 
     for blender_tex_key in scene_data.data_textures:
         fbx_data_texture_file_elements(objects, blender_tex_key, scene_data)
+        flush()
 
     for vid in scene_data.data_videos:
         fbx_data_video_elements(objects, vid, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch animations...")
     start_time = time.process_time()
 
-    fbx_data_animation_elements(objects, scene_data)
+    fbx_data_animation_elements(objects, scene_data, flush)
+
+    if writer is not None:
+        writer.close_elem()
 
     perfmon.level_down()
 
@@ -3405,6 +3679,7 @@ def save_single(operator, scene, depsgraph, filepath="",
                 bake_anim_step=1.0,
                 bake_anim_simplify_factor=1.0,
                 bake_anim_force_startend_keying=True,
+                bake_anim_direct_actions=False,
                 add_leaf_bones=False,
                 primary_bone_axis='Y',
                 secondary_bone_axis='X',
@@ -3485,7 +3760,7 @@ def save_single(operator, scene, depsgraph, filepath="",
         armature_nodetype, use_armature_deform_only,
         add_leaf_bones, bone_correction_matrix, bone_correction_matrix_inv,
         bake_anim, bake_anim_use_all_bones, bake_anim_use_nla_strips, bake_anim_use_all_actions,
-        bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying,
+        bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying, bake_anim_direct_actions,
         False, media_settings, use_custom_props, colors_type, prioritize_active_color
     )
 
@@ -3497,36 +3772,40 @@ def save_single(operator, scene, depsgraph, filepath="",
     # Generate some data about exported scene...
     scene_data = fbx_data_from_scene(scene, depsgraph, settings)
 
-    # Enable multithreaded array compression in FBXElem and wait until all threads are done before exiting the context
-    # manager.
-    with encode_bin.FBXElem.enable_multithreading_cm():
-        # Writing elements into an FBX hierarchy can now begin.
-        root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
+    root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
+
+    # Elements are written to file as soon as they are complete, instead of once the whole hierarchy is built.
+    with encode_bin.FBXStreamWriter(filepath, root, FBX_VERSION) as writer:
+        # Enable multithreaded array compression in FBXElem and wait until all threads are done before exiting the
+        # context manager.
+        with encode_bin.FBXElem.enable_multithreading_cm():
+            # Writing elements into an FBX hierarchy can now begin.
 
-        # Mostly FBXHeaderExtension and GlobalSettings.
-        fbx_header_elements(root, scene_data)
+            # Mostly FBXHeaderExtension and GlobalSettings.
+            fbx_header_elements(root, scene_data)
 
-        # Documents and References are pretty much void currently.
-        fbx_documents_elements(root, scene_data)
-        fbx_references_elements(root, scene_data)
+            # Documents and References are pretty much void currently.
+            fbx_documents_elements(root, scene_data)
+            fbx_references_elements(root, scene_data)
 
-        # Templates definitions.
-        fbx_definitions_elements(root, scene_data)
+            # Templates definitions.
+            fbx_definitions_elements(root, scene_data)
 
-        # Actual data.
-        fbx_objects_elements(root, scene_data)
+            # Actual data.
+            fbx_objects_elements(root, scene_data, writer)
 
-        # How data are inter-connected.
-        fbx_connections_elements(root, scene_data)
+            # How data are inter-connected.
+            fbx_connections_elements(root, scene_data)
+            writer.flush()
 
-        # Animation.
-        fbx_takes_elements(root, scene_data)
+            # Animation.
+            fbx_takes_elements(root, scene_data)
 
-        # Cleanup!
-        fbx_scene_data_cleanup(scene_data)
+            # Cleanup!
+            fbx_scene_data_cleanup(scene_data)
 
-    # And we are done, all multithreaded tasks are complete, and we can write the whole thing to file!
-    encode_bin.write(filepath, root, FBX_VERSION)
+        # And we are done, all multithreaded tasks are complete, and we can write the remaining elements to file!
+        writer.finish()
 
     # Clear cached ObjectWrappers!
     ObjectWrapper.cache_clear()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Must be run from Blender, with the FBX add-on available:
+#     blender --background --factory-startup --python export_fbx_bin_test.py
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    export_fbx_bin = parse_fbx = None
+elif __name__ == '__main__':
+    from io_scene_fbx import export_fbx_bin, parse_fbx
+else:
+    from . import export_fbx_bin, parse_fbx
+
+import itertools
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def _make_scene(frame_count):
+    """An armature with a chain of bones and a branch, animated with large rotations and non-uniform scales."""
+    bpy.ops.object.armature_add()
+    arm_obj = bpy.context.object
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = arm_obj.data.edit_bones
+    parent = edit_bones[0]
+    for i in range(4):
+        bone = edit_bones.new("Bone%d" % i)
+        bone.head = parent.tail
+        bone.tail = bone.head + parent.vector.normalized().cross((0.3, 0.2, 1.0)) + parent.vector
+        bone.parent = parent
+        parent = bone
+    branch = edit_bones.new("Branch")
+    branch.head = edit_bones[0].tail
+    branch.tail = (1.0, 0.0, 1.0)
+    branch.parent = edit_bones[0]
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    rng = np.random.default_rng(0)
+    for pose_bone in arm_obj.pose.bones:
+        pose_bone.rotation_mode = 'XYZ'
+        angles = np.zeros(3)
+        for frame in range(1, frame_count + 1, 5):
+            # Spin quickly enough for the euler rotations to need unwrapping.
+            angles += rng.uniform(-0.3, 1.2, 3)
+            pose_bone.rotation_euler = angles
+            pose_bone.location = rng.uniform(-0.2, 0.2, 3)
+            pose_bone.scale = rng.uniform(0.5, 1.5, 3)
+            pose_bone.keyframe_insert("rotation_euler", frame=frame)
+            pose_bone.keyframe_insert("location", frame=frame)
+            pose_bone.keyframe_insert("scale", frame=frame)
+
+    bpy.context.scene.frame_start = 1
+    bpy.context.scene.frame_end = frame_count
+
+
+def _add_actions(arm_obj, action_count):
+    """More actions with various rotation modes, frame ranges and partially animated bones, a connected bone, an
+    animated shape key and camera, and a constrained copy of the armature."""
+    bpy.ops.object.mode_set(mode='EDIT')
+    arm_obj.data.edit_bones["Bone1"].use_connect = True
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    rotation_modes = itertools.cycle(('QUATERNION', 'AXIS_ANGLE', 'ZXY', 'XYZ', 'YZX'))
+    for pose_bone, rotation_mode in zip(arm_obj.pose.bones, rotation_modes):
+        pose_bone.rotation_mode = rotation_mode
+
+    org_action = arm_obj.animation_data.action
+    rng = np.random.default_rng(1)
+    for i in range(action_count):
+        arm_obj.animation_data.action = bpy.data.actions.new("Action%d" % i)
+        for pose_bone in arm_obj.pose.bones[i % 2::2]:
+            for frame in range(10 * i, 60 + 10 * i, 7):
+                pose_bone.location = rng.uniform(-0.5, 0.5, 3)
+                pose_bone.rotation_quaternion = rng.normal(size=4)
+                pose_bone.rotation_axis_angle = rng.normal(size=4)
+                pose_bone.rotation_euler = rng.uniform(-3.0, 3.0, 3)
+                pose_bone.scale = rng.uniform(0.5, 1.5, 3)
+                for data_path in ("location", "rotation_quaternion", "rotation_axis_angle", "rotation_euler",
+                                  "scale"):
+                    pose_bone.keyframe_insert(data_path, frame=frame)
+    arm_obj.animation_data.action = org_action
+
+    constrained_obj = arm_obj.copy()
+    constrained_obj.location.x = 3.0
+    bpy.context.collection.objects.link(constrained_obj)
+    constraint = constrained_obj.pose.bones["Bone2"].constraints.new('LIMIT_ROTATION')
+    constraint.use_limit_x = True
+
+    bpy.ops.mesh.primitive_cube_add()
+    mesh_obj = bpy.context.object
+    mesh_obj.shape_key_add(name="Basis")
+    key = mesh_obj.shape_key_add(name="Key")
+    for frame, value in ((1, 0.0), (30, 1.0), (90, 0.2)):
+        key.value = value
+        key.keyframe_insert("value", frame=frame)
+
+    bpy.ops.object.camera_add()
+    camera = bpy.context.object.data
+    for frame, lens in ((1, 30.0), (60, 80.0)):
+        camera.lens = lens
+        camera.keyframe_insert("lens", frame=frame)
+
+
+def _anim_curves(filepath):
+    """Times and values of all animation curves of an FBX file, in file order."""
+    root, _version = parse_fbx.parse(filepath)
+    objects = next(elem for elem in root.elems if elem.id == b"Objects")
+    curves = []
+    for elem in objects.elems:
+        if elem.id != b"AnimationCurve":
+            continue
+        sub_elems = {sub_elem.id: sub_elem.props[0] for sub_elem in elem.elems if sub_elem.props}
+        curves.append((np.array(sub_elems[b"KeyTime"]), np.array(sub_elems[b"KeyValueFloat"])))
+    return curves
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class BakeBonesTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        _make_scene(120)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        export_fbx_bin._BAKE_BONES_IN_BULK = True
+        self.tmpdir.cleanup()
+
+    def _export(self, in_bulk, **settings):
+        export_fbx_bin._BAKE_BONES_IN_BULK = in_bulk
+        filepath = os.path.join(self.tmpdir.name, "%s.fbx" % ("bulk" if in_bulk else "per_bone"))
+        # No simplification, so that tiny differences between both bakes cannot change the kept keys.
+        bpy.ops.export_scene.fbx(filepath=filepath, bake_anim_simplify_factor=0.0, **settings)
+        return _anim_curves(filepath)
+
+    def _check(self, **settings):
+        curves = self._export(True, **settings)
+        expected = self._export(False, **settings)
+        # Location, rotation and scale of 6 bones.
+        self.assertGreaterEqual(len(expected), 6 * 3 * 3)
+        self.assertEqual(len(curves), len(expected))
+        for (times, values), (expected_times, expected_values) in zip(curves, expected):
+            np.testing.assert_array_equal(times, expected_times)
+            np.testing.assert_allclose(values, expected_values, rtol=1e-4, atol=1e-3)
+        # Rotations were unwrapped, not kept in [-180, 180].
+        self.assertTrue(any(np.abs(values).max() > 360.0 for _times, values in curves))
+
+    def test_bake(self):
+        self._check()
+
+    def test_bake_bone_correction(self):
+        self._check(primary_bone_axis='X', secondary_bone_axis='-Y')
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class DirectActionsTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        _make_scene(120)
+        _add_actions(bpy.context.object, 3)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.direct_pose_matrices_orig = export_fbx_bin.fbx_animations_direct_pose_matrices
+
+    def tearDown(self):
+        export_fbx_bin.fbx_animations_direct_pose_matrices = self.direct_pose_matrices_orig
+        self.tmpdir.cleanup()
+
+    def _export(self, direct):
+        filepath = os.path.join(self.tmpdir.name, "%s.fbx" % ("direct" if direct else "sweep"))
+        bpy.ops.export_scene.fbx(filepath=filepath, bake_anim_simplify_factor=0.0, bake_anim_use_nla_strips=False,
+                                 bake_anim_use_all_actions=True, bake_anim_direct_actions=direct)
+        return _anim_curves(filepath)
+
+    def test_direct_actions(self):
+        evaluated = []
+
+        def direct_pose_matrices(ob, act, currframes):
+            evaluated.append((ob.name, act.name))
+            return self.direct_pose_matrices_orig(ob, act, currframes)
+
+        export_fbx_bin.fbx_animations_direct_pose_matrices = direct_pose_matrices
+        curves = self._export(True)
+        expected = self._export(False)
+        # All actions of the armature, but none of its constrained copy.
+        self.assertEqual(sorted(evaluated), sorted(("Armature", action.name) for action in bpy.data.actions
+                                                   if action.fcurves[0].data_path.startswith("pose.bones")))
+        self.assertEqual(len(curves), len(expected))
+        for (times, values), (expected_times, expected_values) in zip(curves, expected):
+            np.testing.assert_array_equal(times, expected_times)
+            np.testing.assert_allclose(values, expected_values, rtol=1e-4, atol=1e-3)
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
@@ -429,6 +429,234 @@ def nors_transformed(raw_nors, m=None, dtype=None):
     return _mat4_vec3_array_multiply(m, raw_nors, dtype)
 
 
+def matrices_inverted_safe(matrices):
+    """Invert an array of 4x4 matrices of shape (..., 4, 4).
+
+    Singular matrices are inverted with Matrix.inverted_safe(), like when inverting each matrix with mathutils."""
+    shape = matrices.shape
+    matrices = matrices.reshape(-1, 4, 4)
+    inverted = np.empty_like(matrices)
+    singular = np.linalg.det(matrices) == 0.0
+    inverted[~singular] = np.linalg.inv(matrices[~singular])
+    for idx in np.flatnonzero(singular):
+        inverted[idx] = Matrix(matrices[idx]).inverted_safe()
+    return inverted.reshape(shape)
+
+
+def matrices_decompose(matrices):
+    """Decompose an array of 4x4 matrices of shape (..., 4, 4) like Matrix.decompose().
+
+    Returns the locations and scales, of shape (..., 3), and the rotations as quaternions of shape (..., 4) in (w, x, y,
+    z) order."""
+    locs = matrices[..., :3, 3]
+    mats3 = matrices[..., :3, :3]
+
+    # Scale is the length of each column, negated (with the rotation matrix) when the matrix is negative.
+    scales = np.linalg.norm(mats3, axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mats3 = np.where(scales[..., None, :] != 0.0, mats3 / scales[..., None, :], 0.0)
+    negative = np.linalg.det(matrices[..., :3, :3]) < 0.0
+    scales[negative] *= -1.0
+    mats3[negative] *= -1.0
+
+    # Same method as Blender's mat3_normalized_to_quat, choosing the largest quaternion component from the trace to
+    # avoid precision issues.
+    m00, m01, m02 = mats3[..., 0, 0], mats3[..., 0, 1], mats3[..., 0, 2]
+    m10, m11, m12 = mats3[..., 1, 0], mats3[..., 1, 1], mats3[..., 1, 2]
+    m20, m21, m22 = mats3[..., 2, 0], mats3[..., 2, 1], mats3[..., 2, 2]
+    cases = (
+        # (condition, trace, sign flip condition, index of the largest component, quaternion components from s)
+        ((m22 < 0.0) & (m00 > m11), 1.0 + m00 - m11 - m22, m21 < m12, 1, (m21 - m12, None, m10 + m01, m02 + m20)),
+        ((m22 < 0.0) & (m00 <= m11), 1.0 - m00 + m11 - m22, m02 < m20, 2, (m02 - m20, m10 + m01, None, m21 + m12)),
+        ((m22 >= 0.0) & (m00 < -m11), 1.0 - m00 - m11 + m22, m10 < m01, 3, (m10 - m01, m02 + m20, m21 + m12, None)),
+        ((m22 >= 0.0) & (m00 >= -m11), 1.0 + m00 + m11 + m22, False, 0, (None, m21 - m12, m02 - m20, m10 - m01)),
+    )
+    quats = np.zeros(locs.shape[:-1] + (4,), dtype=matrices.dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for condition, trace, flip, largest, components in cases:
+            s = 2.0 * np.sqrt(np.maximum(trace, 0.0))
+            s = np.where(flip, -s, s)
+            for i, component in enumerate(components):
+                value = 0.25 * s if i == largest else component / s
+                quats[..., i] = np.where(condition, value, quats[..., i])
+    quats /= np.linalg.norm(quats, axis=-1, keepdims=True)
+
+    # The rotation of a matrix with shear (or a null scale) depends on the exact conversion used, so let mathutils
+    # decompose those few matrices.
+    not_orthogonal = np.abs(mats3 @ mats3.swapaxes(-1, -2) - np.identity(3)).max(axis=(-2, -1)) > 1e-5
+    for idx in zip(*np.nonzero(not_orthogonal)):
+        quats[idx] = Matrix(matrices[idx]).decompose()[1]
+    return locs, quats, scales
+
+
+def quaternions_to_compatible_eulers(quats, euler_compat, order='XYZ'):
+    """Convert an array of quaternions of shape (num_frames, n, 4) to euler rotations in the given order, of shape
+    (num_frames, n, 3).
+
+    Like Quaternion.to_euler(order, euler_compat), each frame's rotation is made compatible with the previous frame's
+    one, starting with euler_compat, of shape (n, 3)."""
+    mats = quaternions_to_matrices(quats)
+
+    # Both euler solutions, like Blender's mat3_normalized_to_eulo2, with i, j and k the axes of the order.
+    i, j, k = ("XYZ".index(axis) for axis in order)
+    cy = np.hypot(mats[..., i, i], mats[..., j, i])
+    eul1 = np.empty(quats.shape[:-1] + (3,), dtype=mats.dtype)
+    eul2 = np.empty_like(eul1)
+    eul1[..., i] = np.arctan2(mats[..., k, j], mats[..., k, k])
+    eul1[..., j] = np.arctan2(-mats[..., k, i], cy)
+    eul1[..., k] = np.arctan2(mats[..., j, i], mats[..., i, i])
+    eul2[..., i] = np.arctan2(-mats[..., k, j], -mats[..., k, k])
+    eul2[..., j] = np.arctan2(-mats[..., k, i], -cy)
+    eul2[..., k] = np.arctan2(-mats[..., j, i], -mats[..., i, i])
+    gimbal_lock = cy <= 16.0 * np.finfo(np.float32).eps
+    eul_locked = np.empty_like(eul1)
+    eul_locked[..., i] = np.arctan2(-mats[..., j, k], mats[..., j, j])
+    eul_locked[..., j] = eul1[..., j]
+    eul_locked[..., k] = 0.0
+    eul1[gimbal_lock] = eul_locked[gimbal_lock]
+    eul2[gimbal_lock] = eul_locked[gimbal_lock]
+    if order in {'XZY', 'YXZ', 'ZYX'}:
+        # Odd permutations of the axes.
+        eul1 = -eul1
+        eul2 = -eul2
+
+    prev = np.asarray(euler_compat, dtype=eul1.dtype)
+    num_frames = len(quats)
+    if not num_frames:
+        return eul1
+
+    def compatible_eulers(eul1_frames, eul2_frames, prev_frames):
+        # Like Blender's mat3_normalized_to_compatible_eulO, for the rotations of any number of frames.
+        shape = prev_frames.shape
+        prev_frames = prev_frames.reshape(-1, 3)
+        eul1_frames = _compatible_eulers(eul1_frames.reshape(-1, 3), prev_frames)
+        eul2_frames = _compatible_eulers(eul2_frames.reshape(-1, 3), prev_frames)
+        use_eul2 = np.abs(eul1_frames - prev_frames).sum(axis=-1) > np.abs(eul2_frames - prev_frames).sum(axis=-1)
+        return np.where(use_eul2[:, None], eul2_frames, eul1_frames).reshape(shape)
+
+    # The compatibility of each frame depends on the previous one. Rather than going frame by frame, the next frames are
+    # guessed to stay on the same solution as the last right frame, without jumps, and all made compatible with the
+    # previous frames of that guess at once. Up to the first one that changes, the guess was right, and that frame is now
+    # right too.
+    eulers = np.empty_like(eul1)
+    eulers[0] = compatible_eulers(eul1[0], eul2[0], prev)
+    frame = 0
+    block_size = 16
+    while frame + 1 < num_frames:
+        block = slice(frame + 1, min(frame + 1 + block_size, num_frames))
+        euler = eulers[frame]
+        use_eul2 = (np.abs((euler - eul2[frame] + math.pi) % (2.0 * math.pi) - math.pi).sum(axis=-1)
+                    < np.abs((euler - eul1[frame] + math.pi) % (2.0 * math.pi) - math.pi).sum(axis=-1))
+        guess = np.where(use_eul2[..., None], eul2[block], eul1[block])
+        guess = np.unwrap(np.concatenate((euler[None], guess)), axis=0)[1:]
+        # Made compatible with themselves, the guessed frames match exactly what they get when made compatible with
+        # the previous frames, when the guess is right.
+        guess = compatible_eulers(eul1[block], eul2[block], guess)
+        new_eulers = compatible_eulers(eul1[block], eul2[block], np.concatenate((euler[None], guess[:-1])))
+        changed = (new_eulers != guess).reshape(len(guess), -1).any(axis=1)
+        if changed.any():
+            num_right = changed.argmax()
+            eulers[block.start:block.start + num_right] = guess[:num_right]
+            frame = block.start + num_right
+            eulers[frame] = new_eulers[num_right]
+            block_size = 16
+        else:
+            eulers[block] = guess
+            frame = block.stop - 1
+            # Rotations usually have few jumps, check more frames at once while there are none.
+            block_size *= 2
+    return eulers
+
+
+def quaternions_to_matrices(quats):
+    """Convert an array of quaternions of shape (..., 4), in (w, x, y, z) order, to rotation matrices of shape (..., 3,
+    3), normalizing them first like Blender does for pose bones."""
+    norms = np.linalg.norm(quats, axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quats = np.where(norms != 0.0, quats / norms, np.array((0.0, 1.0, 0.0, 0.0)))
+    w, x, y, z = np.moveaxis(quats, -1, 0)
+    return np.stack((
+        np.stack((1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - w * z), 2.0 * (x * z + w * y)), axis=-1),
+        np.stack((2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - w * x)), axis=-1),
+        np.stack((2.0 * (x * z - w * y), 2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + y * y)), axis=-1),
+    ), axis=-2)
+
+
+def eulers_to_matrices(eulers, order='XYZ'):
+    """Convert an array of euler rotations of shape (..., 3) in the given order to rotation matrices of shape (..., 3,
+    3)."""
+    mats = np.broadcast_to(np.identity(3), eulers.shape[:-1] + (3, 3))
+    # The first axis of the order is applied first.
+    for axis in order:
+        i = "XYZ".index(axis)
+        j, k = (i + 1) % 3, (i + 2) % 3
+        cos, sin = np.cos(eulers[..., i]), np.sin(eulers[..., i])
+        rot = np.zeros(eulers.shape[:-1] + (3, 3))
+        rot[..., i, i] = 1.0
+        rot[..., j, j] = cos
+        rot[..., j, k] = -sin
+        rot[..., k, j] = sin
+        rot[..., k, k] = cos
+        mats = rot @ mats
+    return mats
+
+
+def axis_angles_to_matrices(axis_angles):
+    """Convert an array of axis-angle rotations of shape (..., 4), in (angle, x, y, z) order, to rotation matrices of
+    shape (..., 3, 3). A null axis gives no rotation."""
+    angles = axis_angles[..., 0]
+    axes = axis_angles[..., 1:]
+    norms = np.linalg.norm(axes, axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        axes = np.where(norms != 0.0, axes / norms, 0.0)
+    angles = np.where(norms[..., 0] != 0.0, angles, 0.0)
+    # Rodrigues' rotation formula.
+    cross = np.zeros(axes.shape[:-1] + (3, 3))
+    cross[..., 0, 1], cross[..., 0, 2], cross[..., 1, 2] = -axes[..., 2], axes[..., 1], -axes[..., 0]
+    cross -= cross.swapaxes(-1, -2)
+    sin = np.sin(angles)[..., None, None]
+    cos = np.cos(angles)[..., None, None]
+    return np.identity(3) + sin * cross + (1.0 - cos) * (cross @ cross)
+
+
+def quaternions_to_axis_angles(quats):
+    """Convert an array of quaternions of shape (..., 4), in (w, x, y, z) order, to axis-angle rotations of shape (...,
+    4), in (angle, x, y, z) order, like Quaternion.to_axis_angle()."""
+    norms = np.linalg.norm(quats, axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quats = np.where(norms != 0.0, quats / norms, np.array((0.0, 1.0, 0.0, 0.0)))
+    half_angles = np.arccos(np.clip(quats[..., 0], -1.0, 1.0))
+    sin = np.sin(half_angles)
+    sin = np.where(np.abs(sin) < np.finfo(np.float32).eps, 1.0, sin)
+    axes = quats[..., 1:] / sin[..., None]
+    # Blender uses the Y axis when there is no rotation.
+    axes[(axes == 0.0).all(axis=-1), 1] = 1.0
+    return np.concatenate((2.0 * half_angles[..., None], axes), axis=-1)
+
+
+def _compatible_eulers(eul, oldrot):
+    """Vectorized version of Blender's compatible_eul, for arrays of euler rotations of shape (n, 3)."""
+    # Blender uses 5.1 instead of pi as a threshold, since it gives better results.
+    pi_thresh = 5.1
+    pi_x2 = 2.0 * math.pi
+
+    # Correct differences of about 360 degrees first.
+    deul = eul - oldrot
+    eul = np.where(deul > pi_thresh, eul - np.floor(deul / pi_x2 + 0.5) * pi_x2, eul)
+    eul = np.where(deul < -pi_thresh, eul + np.floor(-deul / pi_x2 + 0.5) * pi_x2, eul)
+    deul = eul - oldrot
+
+    # Is one of the axis rotations larger than 180 degrees and the others small?
+    abs_deul = np.abs(deul)
+    large = abs_deul > 3.2
+    small = abs_deul < 1.6
+    for i in range(3):
+        j, k = (i + 1) % 3, (i + 2) % 3
+        to_fix = large[:, i] & small[:, j] & small[:, k]
+        eul[to_fix, i] -= np.copysign(pi_x2, deul[to_fix, i])
+    return eul
+
+
 def astype_view_signedness(arr, new_dtype):
     """Unsafely views arr as new_dtype if the itemsize and byteorder of arr matches but the signedness does not.
 
@@ -1897,7 +2125,7 @@ FBXExportSettings = namedtuple("FBXExportSettings", (
     "armature_nodetype", "use_armature_deform_only", "add_leaf_bones",
     "bone_correction_matrix", "bone_correction_matrix_inv",
     "bake_anim", "bake_anim_use_all_bones", "bake_anim_use_nla_strips", "bake_anim_use_all_actions",
-    "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying",
+    "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying", "bake_anim_direct_actions",
     "use_metadata", "media_settings", "use_custom_props", "colors_type", "prioritize_active_color"
 ))
 
@@ -1927,5 +2155,5 @@ FBXImportSettings = namedtuple("FBXImportSettings", (
     "use_custom_props", "use_custom_props_enum_as_string",
     "nodal_material_wrap_map", "image_cache",
     "ignore_leaf_bones", "force_connect_children", "automatic_bone_orientation", "bone_correction_matrix",
-    "use_prepost_rot", "colors_type",
+    "use_prepost_rot", "colors_type", "use_shared_meshes",
 ))
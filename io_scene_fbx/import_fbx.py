@@ -16,7 +16,7 @@ if "bpy" in locals():
 
 import bpy
 from bpy.app.translations import pgettext_tip as tip_
-from mathutils import Matrix, Euler, Vector, Quaternion
+from mathutils import Matrix, Euler, Vector
 
 # Also imported in .fbx_utils, so importing here is unlikely to further affect Blender startup time.
 import numpy as np
@@ -29,6 +29,7 @@ from .parse_fbx import (
     data_types,
     FBXElem,
 )
+from .fbx_utils_threading import MultiThreadedTaskConsumer
 from .fbx_utils import (
     PerfMon,
     units_blender_to_fbx_factor,
@@ -48,6 +49,10 @@ from .fbx_utils import (
     MESH_ATTRIBUTE_SHARP_FACE,
     MESH_ATTRIBUTE_SHARP_EDGE,
     expand_shape_key_range,
+    matrices_decompose,
+    eulers_to_matrices,
+    quaternions_to_compatible_eulers,
+    quaternions_to_axis_angles,
     FBX_KTIME_V7,
     FBX_KTIME_V8,
     FBX_TIMECODE_DEFINITION_TO_KTIME_PER_SECOND,
@@ -180,8 +185,7 @@ def elem_props_find_first(elem, elem_prop_id):
         # When properties are not found... Should never happen, but happens - as usual.
         return None
     # support for templates (tuple of elems)
-    if type(elem) is not FBXElem:
-        assert(type(elem) is tuple)
+    if type(elem) is tuple:
         for e in elem:
             result = elem_props_find_first(e, elem_prop_id)
             if result is not None:
@@ -532,16 +536,12 @@ def blen_read_object_transform_preprocess(fbx_props, fbx_obj, rot_alt_mat, use_p
 
 # ---------
 # Animation
-def _blen_read_object_transform_do_anim(transform_data, lcl_translation_mat, lcl_rot_euler, lcl_scale_mat,
-                                        extra_pre_matrix, extra_post_matrix):
-    """Specialized version of blen_read_object_transform_do for animation that pre-calculates the non-animated matrices
-    and returns a function that calculates (base_mat @ geom_mat). See the comments in blen_read_object_transform_do for
-    a full description of what this function is doing.
+def _blen_read_object_transform_anim_matrices(transform_data, extra_post_matrix):
+    """Pre-calculate the non-animated matrices of blen_read_object_transform_do for animation, combined into the
+    matrices to multiply after the animated Lcl Translation, Lcl Rotation and Lcl Scaling matrices respectively. See the
+    comments in blen_read_object_transform_do for a full description of these matrices.
 
-    The lcl_translation_mat, lcl_rot_euler and lcl_scale_mat arguments should have their values updated each frame and
-    then calling the returned function will calculate the matrix for the current frame.
-
-    extra_pre_matrix and extra_post_matrix are any extra matrices to multiply first/last."""
+    extra_post_matrix is any extra matrix to multiply last."""
     # Translation
     geom_loc = Matrix.Translation(transform_data.geom_loc)
 
@@ -572,51 +572,12 @@ def _blen_read_object_transform_do_anim(transform_data, lcl_translation_mat, lcl
     post_lcl_rotation = transform_data.rot_alt_mat @ pst_rot_inv @ rot_piv_inv @ sca_ofs @ sca_piv
     post_lcl_scaling = sca_piv_inv @ geom_mat @ extra_post_matrix
 
-    # Get the bound to_matrix method to avoid re-binding it on each call.
-    lcl_rot_euler_to_matrix_3x3 = lcl_rot_euler.to_matrix
-    # Get the unbound Matrix.to_4x4 method to avoid having to look it up again on each call.
-    matrix_to_4x4 = Matrix.to_4x4
-
-    if extra_pre_matrix == Matrix():
-        # There aren't any other matrices that must be multiplied before lcl_translation_mat that extra_pre_matrix can
-        # be combined with, so skip extra_pre_matrix when it's the identity matrix.
-        return lambda: (lcl_translation_mat @
-                        post_lcl_translation @
-                        matrix_to_4x4(lcl_rot_euler_to_matrix_3x3()) @
-                        post_lcl_rotation @
-                        lcl_scale_mat @
-                        post_lcl_scaling)
-    else:
-        return lambda: (extra_pre_matrix @
-                        lcl_translation_mat @
-                        post_lcl_translation @
-                        matrix_to_4x4(lcl_rot_euler_to_matrix_3x3()) @
-                        post_lcl_rotation @
-                        lcl_scale_mat @
-                        post_lcl_scaling)
-
-
-def _transformation_curves_gen(item, values_arrays, channel_keys):
-    """Yields flattened location/rotation/scaling values for imported PoseBone/Object Lcl Translation/Rotation/Scaling
-    animation curve values.
-
-    The value arrays must have the same lengths, where each index of each array corresponds to a single keyframe.
-
-    Each value array must have a corresponding channel key tuple that identifies the fbx property
-    (b'Lcl Translation'/b'Lcl Rotation'/b'Lcl Scaling') and the channel (x/y/z as 0/1/2) of that property."""
-    from operator import setitem
-    from functools import partial
+    return post_lcl_translation, post_lcl_rotation, post_lcl_scaling
 
-    if item.is_bone:
-        bl_obj = item.bl_obj.pose.bones[item.bl_bone]
-    else:
-        bl_obj = item.bl_obj
-
-    rot_mode = bl_obj.rotation_mode
-    transform_data = item.fbx_transform_data
-    rot_eul_prev = bl_obj.rotation_euler.copy()
-    rot_quat_prev = bl_obj.rotation_quaternion.copy()
 
+def _transformation_curves_extra_matrices(item):
+    """The extra matrices to multiply first/last to get the matrix of an imported PoseBone/Object from its Lcl
+    Translation/Rotation/Scaling."""
     # Pre-compute combined pre-matrix
     # Remove that rest pose matrix from current matrix (also in parent space) by computing the inverted local rest
     # matrix of the bone, if relevant.
@@ -632,76 +593,72 @@ def _transformation_curves_gen(item, values_arrays, channel_keys):
     if item.post_matrix:
         combined_post_matrix @= item.post_matrix
 
-    # Create matrices/euler from the initial transformation values of this item.
-    # These variables will be updated in-place as we iterate through each frame.
-    lcl_translation_mat = Matrix.Translation(transform_data.loc)
-    lcl_rotation_eul = Euler(convert_deg_to_rad_iter(transform_data.rot), transform_data.rot_ord)
-    lcl_scaling_mat = Matrix()
-    lcl_scaling_mat[0][0], lcl_scaling_mat[1][1], lcl_scaling_mat[2][2] = transform_data.sca
-
-    # Create setters into lcl_translation_mat, lcl_rotation_eul and lcl_scaling_mat for each values_array and convert
-    # any rotation values into radians.
-    lcl_setters = []
-    values_arrays_converted = []
+    return combined_pre_matrix, combined_post_matrix
+
+
+def _transformation_curves(item, values_arrays, channel_keys):
+    """Convert imported PoseBone/Object Lcl Translation/Rotation/Scaling animation curve values to location/rotation/
+    scaling values, for all the keyframes at once.
+
+    The value arrays must have the same lengths, where each index of each array corresponds to a single keyframe.
+
+    Each value array must have a corresponding channel key tuple that identifies the fbx property
+    (b'Lcl Translation'/b'Lcl Rotation'/b'Lcl Scaling') and the channel (x/y/z as 0/1/2) of that property.
+
+    Returns the location/rotation/scaling values as an array of shape (num_channels, num_keyframes), where the channels
+    are in the order that the location/rotation/scale FCurves are created in."""
+    if item.is_bone:
+        bl_obj = item.bl_obj.pose.bones[item.bl_bone]
+    else:
+        bl_obj = item.bl_obj
+
+    rot_mode = bl_obj.rotation_mode
+    transform_data = item.fbx_transform_data
+    num_frames = len(values_arrays[0])
+
+    # The Lcl Translation/Lcl Rotation/Lcl Scaling values of each frame, starting from the initial transformation values
+    # of this item, which are kept for the channels that are not animated.
+    lcl_values = {
+        b'Lcl Translation': np.tile(transform_data.loc, (num_frames, 1)),
+        # FBX rotations are in degrees, but Blender uses radians.
+        b'Lcl Rotation': np.tile(np.deg2rad(transform_data.rot), (num_frames, 1)),
+        b'Lcl Scaling': np.tile(transform_data.sca, (num_frames, 1)),
+    }
     for values_array, (fbx_prop, channel) in zip(values_arrays, channel_keys):
-        if fbx_prop == b'Lcl Translation':
-            # lcl_translation_mat.translation[channel] = value
-            setter = partial(setitem, lcl_translation_mat.translation, channel)
-        elif fbx_prop == b'Lcl Rotation':
-            # FBX rotations are in degrees, but Blender uses radians, so convert all rotation values in advance.
+        if fbx_prop == b'Lcl Rotation':
             values_array = np.deg2rad(values_array)
-            # lcl_rotation_eul[channel] = value
-            setter = partial(setitem, lcl_rotation_eul, channel)
-        else:
-            assert(fbx_prop == b'Lcl Scaling')
-            # lcl_scaling_mat[channel][channel] = value
-            setter = partial(setitem, lcl_scaling_mat[channel], channel)
-        lcl_setters.append(setter)
-        values_arrays_converted.append(values_array)
-
-    # Create an iterator that gets one value from each array. Each iterated tuple will be all the imported
-    # Lcl Translation/Lcl Rotation/Lcl Scaling values for a single frame, in that order.
-    # Note that an FBX animation does not have to animate all the channels, so only the animated channels of each
-    # property will be present.
-    # .data, the memoryview of an np.ndarray, is faster to iterate than the ndarray itself.
-    frame_values_it = zip(*(arr.data for arr in values_arrays_converted))
-
-    # Getting the unbound methods in advance avoids having to look them up again on each call within the loop.
-    mat_decompose = Matrix.decompose
-    quat_to_axis_angle = Quaternion.to_axis_angle
-    quat_to_euler = Quaternion.to_euler
-    quat_dot = Quaternion.dot
-
-    calc_mat = _blen_read_object_transform_do_anim(transform_data,
-                                                   lcl_translation_mat, lcl_rotation_eul, lcl_scaling_mat,
-                                                   combined_pre_matrix, combined_post_matrix)
-
-    # Iterate through the values for each frame.
-    for frame_values in frame_values_it:
-        # Set each value into its corresponding lcl matrix/euler.
-        for lcl_setter, value in zip(lcl_setters, frame_values):
-            lcl_setter(value)
-
-        # Calculate the updated matrix for this frame.
-        mat = calc_mat()
-
-        # Now we have a virtual matrix of transform from AnimCurves, we can yield keyframe values!
-        loc, rot, sca = mat_decompose(mat)
-        if rot_mode == 'QUATERNION':
-            if quat_dot(rot_quat_prev, rot) < 0.0:
-                rot = -rot
-            rot_quat_prev = rot
-        elif rot_mode == 'AXIS_ANGLE':
-            vec, ang = quat_to_axis_angle(rot)
-            rot = ang, vec.x, vec.y, vec.z
-        else:  # Euler
-            rot = quat_to_euler(rot, rot_mode, rot_eul_prev)
-            rot_eul_prev = rot
-
-        # Yield order matches the order that the location/rotation/scale FCurves are created in.
-        yield from loc
-        yield from rot
-        yield from sca
+        lcl_values[fbx_prop][:, channel] = values_array
+
+    lcl_translation_mats = np.tile(np.identity(4), (num_frames, 1, 1))
+    lcl_translation_mats[:, :3, 3] = lcl_values[b'Lcl Translation']
+    lcl_rotation_mats = np.tile(np.identity(4), (num_frames, 1, 1))
+    lcl_rotation_mats[:, :3, :3] = eulers_to_matrices(lcl_values[b'Lcl Rotation'], transform_data.rot_ord)
+    lcl_scaling_mats = np.tile(np.identity(4), (num_frames, 1, 1))
+    lcl_scaling_mats[:, range(3), range(3)] = lcl_values[b'Lcl Scaling']
+
+    # Multiply the matrices of all the frames at once.
+    extra_pre_matrix, extra_post_matrix = _transformation_curves_extra_matrices(item)
+    post_lcl_translation, post_lcl_rotation, post_lcl_scaling = _blen_read_object_transform_anim_matrices(
+        transform_data, extra_post_matrix)
+    mats = (np.array(extra_pre_matrix) @ lcl_translation_mats @ np.array(post_lcl_translation) @ lcl_rotation_mats
+            @ np.array(post_lcl_rotation) @ lcl_scaling_mats @ np.array(post_lcl_scaling))
+
+    locs, quats, scales = matrices_decompose(mats)
+    if rot_mode == 'QUATERNION':
+        # Each quaternion is flipped when its dot product with the previous, possibly flipped, quaternion is negative,
+        # so the quaternions are flipped when an odd number of dot products with the previous quaternions are negative.
+        # A null dot product never flips a quaternion, whatever the previous quaternion was.
+        dots = (np.concatenate(([bl_obj.rotation_quaternion], quats[:-1])) * quats).sum(axis=-1)
+        signs = np.cumprod(np.where(dots < 0.0, -1.0, 1.0))
+        last_null_dots = np.maximum.accumulate(np.where(dots == 0.0, np.arange(num_frames), -1))
+        signs *= np.where(last_null_dots >= 0, signs[last_null_dots], 1.0)
+        rots = quats * signs[:, None]
+    elif rot_mode == 'AXIS_ANGLE':
+        rots = quaternions_to_axis_angles(quats)
+    else:  # Euler
+        rots = quaternions_to_compatible_eulers(quats[:, None], [bl_obj.rotation_euler], rot_mode)[:, 0]
+
+    return np.concatenate((locs, rots, scales), axis=1).T
 
 
 def _combine_curve_keyframe_times(times_and_values_tuples, initial_values):
@@ -1030,24 +987,7 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset, glo
 
         # Convert from FBX Lcl Translation/Lcl Rotation/Lcl Scaling to the Blender location/rotation/scaling properties
         # of this Object/PoseBone.
-        # The number of fcurves for the Blender properties varies depending on the rotation mode.
-        num_loc_channels = 3
-        num_rot_channels = 4 if rot_mode in {'QUATERNION', 'AXIS_ANGLE'} else 3  # Variations of EULER are all 3
-        num_sca_channels = 3
-        num_channels = num_loc_channels + num_rot_channels + num_sca_channels
-        num_frames = len(combined_fbx_times)
-        full_length = num_channels * num_frames
-
-        # Do the conversion.
-        flattened_channel_values_gen = _transformation_curves_gen(item, values_arrays, channel_keys)
-        flattened_channel_values = np.fromiter(flattened_channel_values_gen, dtype=np.single, count=full_length)
-
-        # Reshape to one row per frame and then view the transpose so that each row corresponds to a single channel.
-        # e.g.
-        # loc_channels = channel_values[:num_loc_channels]
-        # rot_channels = channel_values[num_loc_channels:num_loc_channels + num_rot_channels]
-        # sca_channels = channel_values[num_loc_channels + num_rot_channels:]
-        channel_values = flattened_channel_values.reshape(num_frames, num_channels).T
+        channel_values = _transformation_curves(item, values_arrays, channel_keys)
 
         # Each channel has the same keyframe times, so the combined times can be passed once along with all the curves
         # and values arrays.
@@ -1132,7 +1072,8 @@ def blen_read_geom_layerinfo(fbx_layer):
 def blen_read_geom_validate_blen_data(blen_data, blen_dtype, item_size):
     """Validate blen_data when it's not a bpy_prop_collection.
     Returns whether blen_data is a bpy_prop_collection"""
-    blen_data_is_collection = isinstance(blen_data, bpy.types.bpy_prop_collection)
+    # Not checking against bpy.types.bpy_prop_collection, so that arrays can be prepared on a separate thread.
+    blen_data_is_collection = not isinstance(blen_data, np.ndarray)
     if not blen_data_is_collection:
         if item_size > 1:
             assert(len(blen_data.shape) == 2)
@@ -1374,10 +1315,14 @@ def blen_read_geom_array_foreach_set_looptovert(mesh, blen_data, blen_attr, blen
                                                 descr, xform):
     """Generic fbx_layer to blen_data foreach setter for face corner ByVertice layers.
     blen_data must be a bpy_prop_collection or 2d np.ndarray whose second axis length is item_size.
-    fbx_data must be an array.array"""
+    fbx_data must be an array.array
+    mesh may also be the vertex index of each face corner as an np.ndarray, when the mesh is not created yet."""
     # The fbx_data is mapped to vertices. To expand fbx_data to face corners, get an array of the vertex index of each
     # face corner that will then be used to index fbx_data.
-    corner_vertex_indices = MESH_ATTRIBUTE_CORNER_VERT.to_ndarray(mesh.attributes)
+    if isinstance(mesh, np.ndarray):
+        corner_vertex_indices = mesh
+    else:
+        corner_vertex_indices = MESH_ATTRIBUTE_CORNER_VERT.to_ndarray(mesh.attributes)
     blen_read_geom_array_foreach_set_indexed(blen_data, blen_attr, blen_dtype, fbx_data, corner_vertex_indices, stride,
                                              item_size, descr, xform)
 
@@ -1563,7 +1508,10 @@ def blen_read_geom_layer_material(fbx_obj, mesh):
         )
 
 
-def blen_read_geom_layer_uv(fbx_obj, mesh):
+def blen_read_geom_layer_uv_prepare(fbx_obj, corner_vertex_indices):
+    """Read the UV layers as arrays of the UV of each face corner, see blen_read_geom_prepare.
+    Returns a list of (name, uvs) tuples, uvs being None when the layer has no data."""
+    uv_layers = []
     for layer_id in (b'LayerElementUV',):
         for fbx_layer in elem_find_iter(fbx_obj, layer_id):
             # all should be valid
@@ -1575,26 +1523,35 @@ def blen_read_geom_layer_uv(fbx_obj, mesh):
             fbx_layer_data = elem_prop_first(elem_find_first(fbx_layer, b'UV'))
             fbx_layer_index = elem_prop_first(elem_find_first(fbx_layer, b'UVIndex'))
 
-            # Always init our new layers with (0, 0) UVs.
-            uv_lay = mesh.uv_layers.new(name=fbx_layer_name, do_init=False)
-            if uv_lay is None:
-                print("Failed to add {%r %r} UVLayer to %r (probably too many of them?)"
-                      "" % (layer_id, fbx_layer_name, mesh.name))
-                continue
-
-            blen_data = uv_lay.uv
-
             # some valid files omit this data
             if fbx_layer_data is None:
                 print("%r %r missing data" % (layer_id, fbx_layer_name))
+                uv_layers.append((fbx_layer_name, None))
                 continue
 
+            # Always init our new layers with (0, 0) UVs.
+            blen_data = np.zeros((len(corner_vertex_indices), 2), dtype=np.single)
             blen_read_geom_array_mapped_polyloop(
-                mesh, blen_data, "vector", np.single,
+                corner_vertex_indices, blen_data, "vector", np.single,
                 fbx_layer_data, fbx_layer_index,
                 fbx_layer_mapping, fbx_layer_ref,
                 2, 2, layer_id,
                 )
+            uv_layers.append((fbx_layer_name, blen_data))
+    return uv_layers
+
+
+def blen_read_geom_layer_uv(mesh, uv_layers):
+    for fbx_layer_name, uvs in uv_layers:
+        # Always init our new layers with (0, 0) UVs.
+        uv_lay = mesh.uv_layers.new(name=fbx_layer_name, do_init=False)
+        if uv_lay is None:
+            print("Failed to add {%r %r} UVLayer to %r (probably too many of them?)"
+                  "" % (b'LayerElementUV', fbx_layer_name, mesh.name))
+            continue
+
+        if uvs is not None:
+            uv_lay.uv.foreach_set("vector", uvs.ravel())
 
 
 def blen_read_geom_layer_color(fbx_obj, mesh, colors_type):
@@ -1733,11 +1690,13 @@ def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
         print("warning layer %r mapping type unsupported: %r" % (fbx_layer.id, fbx_layer_mapping))
         return False
 
-def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
+def blen_read_geom_layer_normal_prepare(fbx_obj, tot_verts, corner_vertex_indices, poly_loop_totals, xform=None):
+    """Read the normals as an array of the normal of each face corner, see blen_read_geom_prepare.
+    Returns None when there are no valid normals."""
     fbx_layer = elem_find_first(fbx_obj, b'LayerElementNormal')
 
     if fbx_layer is None:
-        return False
+        return None
 
     (fbx_layer_name,
      fbx_layer_mapping,
@@ -1750,37 +1709,66 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
 
     if fbx_layer_data is None:
         print("warning %r %r missing data" % (layer_id, fbx_layer_name))
-        return False
+        return None
 
-    # Normals are temporarily set here so that they can be retrieved again after a call to Mesh.validate().
     bl_norm_dtype = np.single
     item_size = 3
     # try loops, then polygons, then vertices.
-    tries = ((mesh.attributes["temp_custom_normals"].data, "Loops", False, blen_read_geom_array_mapped_polyloop),
-             (mesh.polygons, "Polygons", True, blen_read_geom_array_mapped_polygon),
-             (mesh.vertices, "Vertices", True, blen_read_geom_array_mapped_vert))
-    for blen_data, blen_data_type, is_fake, func in tries:
-        bdata = np.zeros((len(blen_data), item_size), dtype=bl_norm_dtype) if is_fake else blen_data
-        if func(mesh, bdata, "vector", bl_norm_dtype,
+    tries = ((len(corner_vertex_indices), "Loops", blen_read_geom_array_mapped_polyloop),
+             (len(poly_loop_totals), "Polygons", blen_read_geom_array_mapped_polygon),
+             (tot_verts, "Vertices", blen_read_geom_array_mapped_vert))
+    for num_items, blen_data_type, func in tries:
+        bdata = np.zeros((num_items, item_size), dtype=bl_norm_dtype)
+        if func(corner_vertex_indices, bdata, "vector", bl_norm_dtype,
                 fbx_layer_data, fbx_layer_index, fbx_layer_mapping, fbx_layer_ref, 3, item_size, layer_id, xform, True):
             if blen_data_type == "Polygons":
                 # To expand to per-loop normals, repeat each per-polygon normal by the number of loops of each polygon.
-                poly_loop_totals = np.empty(len(mesh.polygons), dtype=np.uintc)
-                mesh.polygons.foreach_get("loop_total", poly_loop_totals)
-                loop_normals = np.repeat(bdata, poly_loop_totals, axis=0)
-                mesh.attributes["temp_custom_normals"].data.foreach_set("vector", loop_normals.ravel())
+                return np.repeat(bdata, poly_loop_totals, axis=0)
             elif blen_data_type == "Vertices":
                 # We have to copy vnors to lnors! Far from elegant, but simple.
-                loop_vertex_indices = MESH_ATTRIBUTE_CORNER_VERT.to_ndarray(mesh.attributes)
-                mesh.attributes["temp_custom_normals"].data.foreach_set("vector", bdata[loop_vertex_indices].ravel())
-            return True
+                return bdata[corner_vertex_indices]
+            return bdata
 
     blen_read_geom_array_error_mapping("normal", fbx_layer_mapping)
     blen_read_geom_array_error_ref("normal", fbx_layer_ref)
-    return False
+    return None
+
 
+def blen_read_geom_hash(fbx_obj):
+    """Digest of the content of a Geometry element, excluding its own uuid, name and class, so that identical geometries
+    written as separate elements can share the same mesh.
+    Arrays are hashed from their decoded buffers, parse_fbx does not keep their compressed bytes."""
+    import hashlib
+    hasher = hashlib.sha1()
+
+    def elem_hash(elems):
+        hasher.update(b'%d' % len(elems))
+        for elem in elems:
+            hasher.update(elem.id)
+            hasher.update(elem.props_type)
+            for prop, prop_type in zip(elem.props, elem.props_type):
+                if prop_type in b'SRbcilfd':
+                    # Strings, binary data and arrays, the latter are hashed from their buffer without any conversion.
+                    hasher.update(b'%d' % len(prop))
+                    hasher.update(prop)
+                else:
+                    hasher.update(repr(prop).encode())
+            elem_hash(elem.elems)
+
+    elem_hash(fbx_obj.elems)
+    return hasher.digest()
 
-def blen_read_geom(fbx_tmpl, fbx_obj, settings):
+
+# Arrays of a Geometry element, ready to be set into a new mesh, see blen_read_geom_prepare.
+FBXGeomArrays = namedtuple("FBXGeomArrays", (
+    "verts", "corner_verts", "poly_loop_starts", "edges", "uv_layers", "normals",
+))
+
+
+def blen_read_geom_prepare(fbx_obj, settings):
+    """Array-only part of reading a Geometry element: decode its vertices, polygons, edges, UVs and normals, and
+    transform them, as arrays ready to be set into a new mesh by blen_read_geom.
+    Does not use bpy, so that the geometry of many elements can be prepared on separate threads."""
     # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
     # global matrix, so we need to apply the global matrix to the vertices to get the correct result.
     geom_mat_co = settings.global_matrix if settings.bake_space_transform else None
@@ -1791,9 +1779,6 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         geom_mat_no.translation = Vector()
         geom_mat_no.normalize()
 
-    # TODO, use 'fbx_tmpl'
-    elem_name_utf8 = elem_name_ensure_class(fbx_obj, b'Geometry')
-
     fbx_verts = elem_prop_first(elem_find_first(fbx_obj, b'Vertices'))
     fbx_polys = elem_prop_first(elem_find_first(fbx_obj, b'PolygonVertexIndex'))
     fbx_edges = elem_prop_first(elem_find_first(fbx_obj, b'Edges'))
@@ -1813,22 +1798,18 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
     tot_loops = len(fbx_polys)
     tot_edges = len(fbx_edges)
 
-    mesh = bpy.data.meshes.new(name=elem_name_utf8)
-    attributes = mesh.attributes
-
     if tot_verts:
         if geom_mat_co is not None:
             fbx_verts = vcos_transformed(fbx_verts, geom_mat_co, MESH_ATTRIBUTE_POSITION.dtype)
         else:
             fbx_verts = fbx_verts.astype(MESH_ATTRIBUTE_POSITION.dtype, copy=False)
 
-        mesh.vertices.add(tot_verts)
-        MESH_ATTRIBUTE_POSITION.foreach_set(attributes, fbx_verts.ravel())
-
+    poly_loop_starts = np.empty(0, dtype=np.uintc)
+    edges_conv = np.empty(0, dtype=MESH_ATTRIBUTE_EDGE_VERTS.dtype)
+    uv_layers = []
     if tot_loops:
         bl_loop_start_dtype = np.uintc
 
-        mesh.loops.add(tot_loops)
         # The end of each polygon is specified by an inverted index.
         fbx_loop_end_idx = np.flatnonzero(fbx_polys < 0)
 
@@ -1836,9 +1817,6 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
 
         # Un-invert the loop ends.
         fbx_polys[fbx_loop_end_idx] ^= -1
-        # Set loop vertex indices, casting to the Blender C type first for performance.
-        MESH_ATTRIBUTE_CORNER_VERT.foreach_set(
-            attributes, astype_view_signedness(fbx_polys, MESH_ATTRIBUTE_CORNER_VERT.dtype))
 
         poly_loop_starts = np.empty(tot_polys, dtype=bl_loop_start_dtype)
         # The first loop is always a loop start.
@@ -1846,12 +1824,7 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         # Ignoring the last loop end, the indices after every loop end are the remaining loop starts.
         poly_loop_starts[1:] = fbx_loop_end_idx[:-1] + 1
 
-        mesh.polygons.add(tot_polys)
-        mesh.polygons.foreach_set("loop_start", poly_loop_starts)
-
-        blen_read_geom_layer_material(fbx_obj, mesh)
-        blen_read_geom_layer_uv(fbx_obj, mesh)
-        blen_read_geom_layer_color(fbx_obj, mesh, settings.colors_type)
+        uv_layers = blen_read_geom_layer_uv_prepare(fbx_obj, fbx_polys)
 
         if tot_edges:
             # edges in fact index the polygons (NOT the vertices)
@@ -1879,29 +1852,70 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
             # np.concatenate is used because np.column_stack doesn't allow specifying the dtype of the returned array.
             edges_conv = np.concatenate((edges_a.reshape(-1, 1), edges_b.reshape(-1, 1)),
                                         axis=1, dtype=MESH_ATTRIBUTE_EDGE_VERTS.dtype, casting='unsafe')
+    elif tot_edges:
+        print("ERROR: No polygons, but edges exist. Ignoring the edges!")
+
+    normals = None
+    if settings.use_custom_normals:
+        # The number of loops of each polygon, the last polygon using all remaining loops.
+        poly_loop_totals = np.diff(poly_loop_starts, append=tot_loops)
+        xform = None if geom_mat_no is None else (lambda v_array: nors_transformed(v_array, geom_mat_no))
+        normals = blen_read_geom_layer_normal_prepare(fbx_obj, tot_verts, fbx_polys, poly_loop_totals, xform)
+
+    return FBXGeomArrays(fbx_verts, fbx_polys, poly_loop_starts, edges_conv, uv_layers, normals)
+
+
+def blen_read_geom(fbx_tmpl, fbx_obj, settings, geom_arrays=None):
+    """Create a mesh from a Geometry element. geom_arrays is the result of blen_read_geom_prepare for that element, it
+    is prepared here if not given."""
+    if geom_arrays is None:
+        geom_arrays = blen_read_geom_prepare(fbx_obj, settings)
+    fbx_verts, fbx_polys, poly_loop_starts, edges_conv, uv_layers, normals = geom_arrays
+
+    # TODO, use 'fbx_tmpl'
+    elem_name_utf8 = elem_name_ensure_class(fbx_obj, b'Geometry')
+
+    tot_verts = fbx_verts.size // 3
+    tot_loops = len(fbx_polys)
+
+    mesh = bpy.data.meshes.new(name=elem_name_utf8)
+    attributes = mesh.attributes
+
+    if tot_verts:
+        mesh.vertices.add(tot_verts)
+        MESH_ATTRIBUTE_POSITION.foreach_set(attributes, fbx_verts.ravel())
 
+    if tot_loops:
+        mesh.loops.add(tot_loops)
+        # Set loop vertex indices, casting to the Blender C type first for performance.
+        MESH_ATTRIBUTE_CORNER_VERT.foreach_set(
+            attributes, astype_view_signedness(fbx_polys, MESH_ATTRIBUTE_CORNER_VERT.dtype))
+
+        mesh.polygons.add(len(poly_loop_starts))
+        mesh.polygons.foreach_set("loop_start", poly_loop_starts)
+
+        blen_read_geom_layer_material(fbx_obj, mesh)
+        blen_read_geom_layer_uv(mesh, uv_layers)
+        blen_read_geom_layer_color(fbx_obj, mesh, settings.colors_type)
+
+        if len(edges_conv):
             # Add the edges and set their vertex indices.
             mesh.edges.add(len(edges_conv))
             # ravel() because edges_conv must be flat and C-contiguous when passed to foreach_set.
             MESH_ATTRIBUTE_EDGE_VERTS.foreach_set(attributes, edges_conv.ravel())
-    elif tot_edges:
-        print("ERROR: No polygons, but edges exist. Ignoring the edges!")
 
     # must be after edge, face loading.
     blen_read_geom_layer_smooth(fbx_obj, mesh)
 
     blen_read_geom_layer_edge_crease(fbx_obj, mesh)
 
-    ok_normals = False
+    ok_normals = normals is not None
     if settings.use_custom_normals:
         # Note: we store 'temp' normals in loops, since validate() may alter final mesh,
         #       we can only set custom lnors *after* calling it.
         mesh.attributes.new("temp_custom_normals", 'FLOAT_VECTOR', 'CORNER')
-        if geom_mat_no is None:
-            ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh)
-        else:
-            ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh,
-                                                     lambda v_array: nors_transformed(v_array, geom_mat_no))
+        if ok_normals:
+            mesh.attributes["temp_custom_normals"].data.foreach_set("vector", normals.ravel())
 
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
@@ -3025,7 +3039,8 @@ def load(operator, context, filepath="",
          primary_bone_axis='Y',
          secondary_bone_axis='X',
          use_prepost_rot=True,
-         colors_type='SRGB'):
+         colors_type='SRGB',
+         use_shared_meshes=False):
 
     global fbx_elem_nil
     fbx_elem_nil = FBXElem('', (), (), ())
@@ -3164,7 +3179,7 @@ def load(operator, context, filepath="",
         use_custom_props, use_custom_props_enum_as_string,
         nodal_material_wrap_map, image_cache,
         ignore_leaf_bones, force_connect_children, automatic_bone_orientation, bone_correction_matrix,
-        use_prepost_rot, colors_type,
+        use_prepost_rot, colors_type, use_shared_meshes,
     )
 
     # #### And now, the "real" data.
@@ -3249,13 +3264,51 @@ def load(operator, context, filepath="",
     def _():
         fbx_tmpl = fbx_template_get((b'Geometry', b'KFbxMesh'))
 
+        def has_deformer(geom_uuid):
+            # Skinned and shape-keyed geometries get vertex groups and shape keys of their own objects into their mesh.
+            for src_uuid, _src_link in fbx_connection_map_reverse.get(geom_uuid, ()):
+                fbx_src, _blen_src = fbx_table_nodes.get(src_uuid, (None, None))
+                if fbx_src is not None and fbx_src.id == b'Deformer':
+                    return True
+            return False
+
+        fbx_items = []
+        # Geometries identical to a previous one, and that previous one, which mesh they share.
+        shared_fbx_items = []
+        fbx_items_by_hash = {}
         for fbx_uuid, fbx_item in fbx_table_nodes.items():
             fbx_obj, blen_data = fbx_item
             if fbx_obj.id != b'Geometry':
                 continue
             if fbx_obj.props[-1] == b'Mesh':
                 assert(blen_data is None)
-                fbx_item[1] = blen_read_geom(fbx_tmpl, fbx_obj, settings)
+                if settings.use_shared_meshes and not has_deformer(fbx_uuid):
+                    shared_fbx_item = fbx_items_by_hash.setdefault(blen_read_geom_hash(fbx_obj), fbx_item)
+                    if shared_fbx_item is not fbx_item:
+                        shared_fbx_items.append((fbx_item, shared_fbx_item))
+                        continue
+                fbx_items.append(fbx_item)
+
+        # The array-only part of reading all geometries is done first, on separate threads if possible, the meshes are
+        # then created from the prepared arrays on this thread.
+        geoms_arrays = [None] * len(fbx_items)
+
+        def prepare_geom(index, fbx_obj):
+            geoms_arrays[index] = blen_read_geom_prepare(fbx_obj, settings)
+
+        # This thread is only waiting for the other threads meanwhile.
+        with MultiThreadedTaskConsumer.new_cpu_bound_cm(prepare_geom, 0) as prepare_geom_func:
+            for index, (fbx_obj, _blen_data) in enumerate(fbx_items):
+                prepare_geom_func(index, fbx_obj)
+
+        for fbx_item, geom_arrays in zip(fbx_items, geoms_arrays):
+            fbx_item[1] = blen_read_geom(fbx_tmpl, fbx_item[0], settings, geom_arrays)
+
+        for fbx_item, shared_fbx_item in shared_fbx_items:
+            fbx_item[1] = shared_fbx_item[1]
+        if shared_fbx_items:
+            operator.report({'INFO'}, tip_("%d duplicate geometries share the mesh of an identical one")
+                            % len(shared_fbx_items))
     _(); del _
 
     perfmon.step("FBX import: Materials & Textures...")
@@ -3968,12 +4021,17 @@ def load(operator, context, filepath="",
     def _():
         # Annoying workaround for cycles having no z-offset
         if material_decals and use_alpha_decals:
+            processed_meshes = set()
             for fbx_uuid, fbx_item in fbx_table_nodes.items():
                 fbx_obj, blen_data = fbx_item
                 if fbx_obj.id != b'Geometry':
                     continue
                 if fbx_obj.props[-1] == b'Mesh':
                     mesh = fbx_item[1]
+                    # Meshes shared by identical geometries must only be offset once.
+                    if mesh in processed_meshes:
+                        continue
+                    processed_meshes.add(mesh)
 
                     num_verts = len(mesh.vertices)
                     if decal_offset != 0.0 and num_verts > 0:
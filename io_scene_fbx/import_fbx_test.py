@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Must be run from Blender, with the FBX add-on available:
+#     blender --background --factory-startup --python import_fbx_test.py
+
+try:
+    import bpy
+    from mathutils import Euler, Matrix
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    fbx_utils_threading = import_fbx = None
+elif __name__ == '__main__':
+    from io_scene_fbx import fbx_utils_threading, import_fbx
+else:
+    from . import fbx_utils_threading, import_fbx
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def _make_scene(mesh_count):
+    """Many meshes, with UVs, custom normals, materials, sharp edges and loose geometry."""
+    materials = [bpy.data.materials.new("Material%d" % i) for i in range(2)]
+    for i in range(mesh_count):
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=6 + i, ring_count=4 + i % 5, location=(3.0 * i, 0.0, 0.0))
+        mesh = bpy.context.object.data
+        mesh.uv_layers.new(name="Second")
+        for material in materials:
+            mesh.materials.append(material)
+        for polygon in mesh.polygons:
+            polygon.material_index = polygon.index % 2
+        if i % 2:
+            mesh.shade_smooth()
+            mesh.normals_split_custom_set_from_vertices([v.co.normalized() for v in mesh.vertices])
+        for edge in mesh.edges[::3]:
+            edge.use_edge_sharp = True
+        if i % 3 == 0:
+            # Loose edge.
+            start = len(mesh.vertices)
+            mesh.vertices.add(2)
+            mesh.vertices[start].co = (0.0, 0.0, 2.0)
+            mesh.vertices[start + 1].co = (0.0, 1.0, 2.0)
+            mesh.edges.add(1)
+            mesh.edges[-1].vertices = (start, start + 1)
+            mesh.update()
+
+
+def _mesh_data():
+    """All imported mesh data, by mesh name."""
+    data = {}
+    for mesh in bpy.data.meshes:
+        for name, collection, attribute, size, dtype in (
+                ("co", mesh.vertices, "co", 3, np.float32),
+                ("corner_verts", mesh.loops, "vertex_index", 1, np.int32),
+                ("loop_starts", mesh.polygons, "loop_start", 1, np.int32),
+                ("material_indices", mesh.polygons, "material_index", 1, np.int32),
+                ("edges", mesh.edges, "vertices", 2, np.int32),
+                ("sharp_edges", mesh.edges, "use_edge_sharp", 1, bool),
+                ("normals", mesh.corner_normals, "vector", 3, np.float32)):
+            array = np.empty(len(collection) * size, dtype=dtype)
+            collection.foreach_get(attribute, array)
+            data[mesh.name, name] = array
+        for uv_layer in mesh.uv_layers:
+            array = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            uv_layer.uv.foreach_get("vector", array)
+            data[mesh.name, uv_layer.name] = array
+    return data
+
+
+def _make_anim_scene(frame_count):
+    """An armature with a chain of bones and an object, animated with large rotations and non-uniform scales."""
+    bpy.ops.object.armature_add()
+    arm_obj = bpy.context.object
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = arm_obj.data.edit_bones
+    parent = edit_bones[0]
+    for i in range(3):
+        bone = edit_bones.new("Bone%d" % i)
+        bone.head = parent.tail
+        bone.tail = bone.head + parent.vector.normalized().cross((0.3, 0.2, 1.0)) + parent.vector
+        bone.parent = parent
+        parent = bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.empty_add(location=(2.0, 0.0, 0.0))
+
+    rng = np.random.default_rng(0)
+    for bl_obj in (*arm_obj.pose.bones, bpy.context.object):
+        bl_obj.rotation_mode = 'XYZ'
+        angles = np.zeros(3)
+        for frame in range(1, frame_count + 1, 3):
+            # Spin quickly enough for the imported euler rotations to need unwrapping.
+            angles += rng.uniform(-0.3, 1.2, 3)
+            bl_obj.rotation_euler = angles
+            bl_obj.location = rng.uniform(-0.2, 0.2, 3)
+            bl_obj.scale = rng.uniform(0.5, 1.5, 3)
+            bl_obj.keyframe_insert("rotation_euler", frame=frame)
+            bl_obj.keyframe_insert("location", frame=frame)
+            bl_obj.keyframe_insert("scale", frame=frame)
+
+    bpy.context.scene.frame_start = 1
+    bpy.context.scene.frame_end = frame_count
+
+
+def _legacy_transformation_curves(item, values_arrays, channel_keys):
+    """Convert the transformation curves of an imported PoseBone/Object frame by frame with mathutils, as the importer
+    used to, see import_fbx._transformation_curves."""
+    bl_obj = item.bl_obj.pose.bones[item.bl_bone] if item.is_bone else item.bl_obj
+    rot_mode = bl_obj.rotation_mode
+    transform_data = item.fbx_transform_data
+    rot_eul_prev = bl_obj.rotation_euler.copy()
+    rot_quat_prev = bl_obj.rotation_quaternion.copy()
+
+    pre_matrix, post_matrix = import_fbx._transformation_curves_extra_matrices(item)
+    post_lcl_translation, post_lcl_rotation, post_lcl_scaling = import_fbx._blen_read_object_transform_anim_matrices(
+        transform_data, post_matrix)
+
+    values = []
+    for frame_values in zip(*(values_array.tolist() for values_array in values_arrays)):
+        lcl_values = {
+            b'Lcl Translation': list(transform_data.loc),
+            b'Lcl Rotation': list(transform_data.rot),
+            b'Lcl Scaling': list(transform_data.sca),
+        }
+        for value, (fbx_prop, channel) in zip(frame_values, channel_keys):
+            lcl_values[fbx_prop][channel] = value
+
+        mat = (pre_matrix @
+               Matrix.Translation(lcl_values[b'Lcl Translation']) @
+               post_lcl_translation @
+               Euler(np.deg2rad(lcl_values[b'Lcl Rotation']).tolist(), transform_data.rot_ord).to_matrix().to_4x4() @
+               post_lcl_rotation @
+               Matrix.Diagonal(lcl_values[b'Lcl Scaling']).to_4x4() @
+               post_lcl_scaling)
+
+        loc, rot, sca = mat.decompose()
+        if rot_mode == 'QUATERNION':
+            if rot_quat_prev.dot(rot) < 0.0:
+                rot = -rot
+            rot_quat_prev = rot
+        elif rot_mode == 'AXIS_ANGLE':
+            vec, ang = rot.to_axis_angle()
+            rot = ang, vec.x, vec.y, vec.z
+        else:  # Euler
+            rot = rot.to_euler(rot_mode, rot_eul_prev)
+            rot_eul_prev = rot
+        values.append((*loc, *rot, *sca))
+
+    return np.array(values).T
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class PrepareGeometryTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        _make_scene(20)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "scene.fbx")
+        bpy.ops.export_scene.fbx(filepath=self.filepath, mesh_smooth_type='EDGE')
+
+    def tearDown(self):
+        fbx_utils_threading._MULTITHREADING_ENABLED = True
+        self.tmpdir.cleanup()
+
+    def _import(self, use_threads, **settings):
+        fbx_utils_threading._MULTITHREADING_ENABLED = use_threads
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        bpy.ops.import_scene.fbx(filepath=self.filepath, **settings)
+        return _mesh_data()
+
+    def _check(self, **settings):
+        data = self._import(True, **settings)
+        expected = self._import(False, **settings)
+        self.assertEqual(data.keys(), expected.keys())
+        self.assertEqual(len(bpy.data.meshes), 20)
+        for key, value in expected.items():
+            np.testing.assert_array_equal(data[key], value, err_msg=repr(key))
+
+    def test_prepare(self):
+        self._check()
+
+    def test_prepare_bake_space_transform(self):
+        self._check(bake_space_transform=True, use_manual_orientation=True, axis_forward='X', axis_up='-Z')
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class TransformationCurvesTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        _make_anim_scene(300)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "anim.fbx")
+        bpy.ops.export_scene.fbx(filepath=self.filepath, bake_anim_simplify_factor=0.0)
+        self.transformation_curves = import_fbx._transformation_curves
+
+    def tearDown(self):
+        import_fbx._transformation_curves = self.transformation_curves
+        self.tmpdir.cleanup()
+
+    def _check(self, **settings):
+        converted = []
+
+        def transformation_curves(item, values_arrays, channel_keys):
+            # The reference conversion depends on the current rotation of the item, so it is done before any keyframe
+            # gets set, and only compared once the import is done.
+            expected = _legacy_transformation_curves(item, values_arrays, channel_keys)
+            channel_values = self.transformation_curves(item, values_arrays, channel_keys)
+            converted.append((item.bl_bone if item.is_bone else item.bl_obj.name, channel_values, expected))
+            return channel_values
+
+        import_fbx._transformation_curves = transformation_curves
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        bpy.ops.import_scene.fbx(filepath=self.filepath, **settings)
+
+        # The bones, with quaternion rotations, and the object, with euler rotations.
+        self.assertGreaterEqual(len(converted), 5)
+        for name, channel_values, expected in converted:
+            self.assertEqual(channel_values.shape, expected.shape)
+            np.testing.assert_allclose(channel_values, expected, rtol=1e-4, atol=1e-4, err_msg=name)
+
+    def test_transformation_curves(self):
+        self._check()
+
+    def test_transformation_curves_bone_orientation(self):
+        self._check(automatic_bone_orientation=True, global_scale=2.0)
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class SharedMeshesTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        _make_scene(3)
+        # Single-user copies of each mesh, exported as separate but identical geometries.
+        copies = []
+        for obj in list(bpy.context.scene.objects):
+            for i in range(2):
+                copy = obj.copy()
+                copy.data = obj.data.copy()
+                copy.location.y += 3.0 * (i + 1)
+                bpy.context.collection.objects.link(copy)
+                copies.append(copy)
+
+        # Shape-keyed and skinned geometries are never shared, their mesh gets data of their own object.
+        # Basis-only shape keys are not exported, so a second shape key is needed.
+        shape_keyed = copies[0]
+        shape_keyed.shape_key_add(name="Basis")
+        shape_keyed.shape_key_add(name="Key").data[0].co.z += 1.0
+        bpy.ops.object.armature_add()
+        skinned = copies[2]
+        skinned.vertex_groups.new(name=bpy.context.object.data.bones[0].name).add(
+            range(len(skinned.data.vertices)), 1.0, 'REPLACE')
+        skinned.modifiers.new("Armature", 'ARMATURE').object = bpy.context.object
+        self.shape_keyed_name = shape_keyed.name
+        self.skinned_name = skinned.name
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "scene.fbx")
+        bpy.ops.export_scene.fbx(filepath=self.filepath, mesh_smooth_type='EDGE')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _import(self, use_shared_meshes):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_fbx")
+        bpy.ops.import_scene.fbx(filepath=self.filepath, use_shared_meshes=use_shared_meshes)
+        data = _mesh_data()
+        # By object name, since the names of the meshes differ.
+        return {(obj.name, name): value for obj in bpy.data.objects if obj.type == 'MESH'
+                for (mesh_name, name), value in data.items() if mesh_name == obj.data.name}
+
+    def test_shared_meshes(self):
+        expected = self._import(False)
+        self.assertEqual(len(bpy.data.meshes), 9)
+        data = self._import(True)
+        # One mesh for each of the 3 geometries, and one for each deformed copy.
+        self.assertEqual(len(bpy.data.meshes), 5)
+        self.assertEqual(len([obj for obj in bpy.data.objects if obj.type == 'MESH']), 9)
+        shape_keyed = bpy.data.objects[self.shape_keyed_name]
+        self.assertEqual(shape_keyed.data.users, 1)
+        self.assertEqual(len(shape_keyed.data.shape_keys.key_blocks), 2)
+        skinned = bpy.data.objects[self.skinned_name]
+        self.assertEqual(skinned.data.users, 1)
+        self.assertEqual(len(skinned.vertex_groups), 1)
+        self.assertEqual(data.keys(), expected.keys())
+        for key, value in expected.items():
+            np.testing.assert_array_equal(data[key], value, err_msg=repr(key))
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
@@ -8,15 +8,21 @@ __all__ = (
     "data_types",
     "parse_version",
     "FBXElem",
+    "FBXElemLazy",
     )
 
-from struct import unpack
+from struct import calcsize, unpack, unpack_from
 import array
+import mmap
 import zlib
 from io import BytesIO
 
-from . import data_types
-from .fbx_utils_threading import MultiThreadedTaskConsumer
+try:
+    from . import data_types
+    from .fbx_utils_threading import MultiThreadedTaskConsumer
+except:
+    import data_types
+    from fbx_utils_threading import MultiThreadedTaskConsumer
 
 # at the end of each nested block, there is a NUL record to indicate
 # that the sub-scope exists (i.e. to distinguish between P: and P : {})
@@ -66,7 +72,9 @@ def _create_array(data, length, array_type, array_stride, array_byteswap):
     # FBX file.
     assert(length * array_stride == len(data))
 
-    data_array = array.array(array_type, data)
+    # frombytes() also accepts memoryview slices of memory-mapped files.
+    data_array = array.array(array_type)
+    data_array.frombytes(data)
     if array_byteswap and _IS_BIG_ENDIAN:
         data_array.byteswap()
     return data_array
@@ -236,6 +244,159 @@ def read_elem(read, tell, use_namedtuple, decompress_array_func, tell_file_offse
     return FBXElem(*args) if use_namedtuple else args
 
 
+class _MemoryReader:
+    """File-like reads from a memoryview, returning memoryview slices (no copy)."""
+    __slots__ = ("_view", "_pos")
+
+    def __init__(self, view, pos=0):
+        self._view = view
+        self._pos = pos
+
+    def read(self, size):
+        data = self._view[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+    def tell(self):
+        return self._pos
+
+
+class _LazyFile:
+    """The memory-mapped FBX file shared by all the elements of a lazily parsed tree."""
+    __slots__ = ("view", "elem_start", "elem_start_size", "sentinel_length", "_mmap")
+
+    def __init__(self, fn, fbx_version):
+        with open(fn, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self._mmap)
+        # end_offset, prop_count, prop_length, elem_id_size
+        if fbx_version < 7500:
+            self.elem_start = "<IIIB"
+            self.sentinel_length = 13
+        else:
+            self.elem_start = "<QQQB"
+            self.sentinel_length = 25
+        self.elem_start_size = calcsize(self.elem_start)
+
+
+class FBXElemLazy:
+    """
+    An element of a lazily parsed FBX tree, with the same attributes as FBXElem (and also usable as a tuple).
+
+    Parsing only reads the header of elements, recording offsets and sizes of their properties and sub-elements:
+    sub-elements are indexed on first access to `elems`, and properties (arrays in particular) are only read and
+    decoded from the memory-mapped file on first access to `props`.
+    """
+    __slots__ = ("id", "_file", "_props_offset", "_prop_count", "_elems_offset", "_end_offset",
+                 "_props", "_props_type", "_elems")
+
+    def __init__(self, file, id, props_offset, prop_count, elems_offset, end_offset):
+        self.id = id
+        self._file = file
+        self._props_offset = props_offset
+        self._prop_count = prop_count
+        self._elems_offset = elems_offset
+        self._end_offset = end_offset
+        self._props = None
+        self._props_type = None
+        self._elems = None
+
+    @property
+    def props(self):
+        if self._props is None:
+            self._props, self._props_type = self._read_props(decode=True)
+        return self._props
+
+    @property
+    def props_type(self):
+        if self._props_type is None:
+            _props, self._props_type = self._read_props(decode=False)
+        return self._props_type
+
+    @property
+    def elems(self):
+        if self._elems is None:
+            self._elems = _read_elems_lazy(self._file, self._elems_offset, self._end_offset)
+        return self._elems
+
+    def _read_props(self, decode):
+        reader = _MemoryReader(self._file.view, self._props_offset)
+        read = reader.read
+        prop_count = self._prop_count
+        elem_props_type = bytearray(prop_count)
+        elem_props_data = [None] * prop_count if decode else None
+
+        for i in range(prop_count):
+            data_type = read(1)[0]
+            if data_type in read_array_dict:
+                if decode:
+                    val, needs_decompression = read_array_dict[data_type](read)
+                    if needs_decompression:
+                        _decompress_and_insert_array(elem_props_data, i, val)
+                    else:
+                        elem_props_data[i] = val
+                else:
+                    _length, _encoding, comp_len = read_array_params(read)
+                    read(comp_len)
+            else:
+                val = read_data_dict[data_type](read)
+                if decode:
+                    # Binary and string data are memoryview slices of the file.
+                    elem_props_data[i] = bytes(val) if type(val) is memoryview else val
+            elem_props_type[i] = data_type
+
+        if reader.tell() != self._elems_offset:
+            raise IOError("properties length not reached, something is wrong")
+        return elem_props_data, elem_props_type
+
+    def __iter__(self):
+        return iter((self.id, self.props, self.props_type, self.elems))
+
+    def __getitem__(self, index):
+        return (self.id, self.props, self.props_type, self.elems)[index]
+
+    def __len__(self):
+        return 4
+
+    def __repr__(self):
+        return "FBXElemLazy(id=%r, offset=%d, end_offset=%d)" % (self.id, self._props_offset, self._end_offset)
+
+
+def _read_elem_lazy(file, pos):
+    """Read the header of the element at *pos*, its properties and sub-elements are skipped."""
+    end_offset, prop_count, prop_length, elem_id_size = unpack_from(file.elem_start, file.view, pos)
+    if end_offset == 0:
+        return None
+    pos += file.elem_start_size
+    props_offset = pos + elem_id_size
+    elem_id = bytes(file.view[pos:props_offset])
+    return FBXElemLazy(file, elem_id, props_offset, prop_count, props_offset + prop_length, end_offset)
+
+
+def _read_elems_lazy(file, offset, end_offset):
+    """Index the sub-elements of an element, from *offset* (the end of its properties) to its *end_offset*."""
+    elems = []
+    if offset == end_offset:
+        return elems
+    if offset > end_offset:
+        raise IOError("scope length not reached, something is wrong")
+
+    sub_tree_end = end_offset - file.sentinel_length
+    pos = offset
+    while pos < sub_tree_end:
+        elem = _read_elem_lazy(file, pos)
+        if elem is None:
+            break
+        elems.append(elem)
+        pos = elem._end_offset
+
+    # At the end of each subtree there should be a sentinel (an empty element with all bytes set to zero).
+    if pos != sub_tree_end or any(file.view[pos:end_offset]):
+        raise IOError("failed to read nested block sentinel, "
+                      "expected all bytes to be 0")
+    return elems
+
+
 def parse_version(fn):
     """
     Return the FBX version,
@@ -250,7 +411,17 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def parse(fn, use_namedtuple=True, lazy=False):
+    """
+    Parse a binary FBX file, return a tuple (root element, FBX version).
+
+    With *lazy*, the file is memory-mapped and only the headers of top-level elements are read, elements are
+    FBXElemLazy instances, which only read their properties and sub-elements when accessed (*use_namedtuple* is
+    ignored). The file stays mapped as long as elements of the tree are referenced.
+    """
+    if lazy:
+        return _parse_lazy(fn)
+
     root_elems = []
 
     multithread_decompress_array_cm = MultiThreadedTaskConsumer.new_cpu_bound_cm(_decompress_and_insert_array)
@@ -272,3 +443,28 @@ def parse(fn, use_namedtuple=True):
 
     args = (b'', [], bytearray(0), root_elems)
     return FBXElem(*args) if use_namedtuple else args, fbx_version
+
+
+def _parse_lazy(fn):
+    with open(fn, 'rb') as f:
+        read = f.read
+
+        if read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
+            raise IOError("Invalid header")
+
+        fbx_version = read_uint(read)
+
+    file = _LazyFile(fn, fbx_version)
+
+    root_elems = []
+    pos = len(_HEAD_MAGIC) + 4
+    while True:
+        elem = _read_elem_lazy(file, pos)
+        if elem is None:
+            break
+        root_elems.append(elem)
+        pos = elem._end_offset
+
+    elem_root = FBXElemLazy(file, b'', pos, 0, pos, pos)
+    elem_root._elems = root_elems
+    return elem_root, fbx_version
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import encode_bin
+    import parse_fbx
+else:
+    from . import encode_bin
+    from . import parse_fbx
+
+import array
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def _sample_tree():
+    rng = np.random.default_rng(0)
+    root = encode_bin.FBXElem(b"")
+
+    elem = encode_bin.FBXElem(b"FileId")
+    elem.add_bytes(b"\0" * 16)
+    root.elems.append(elem)
+    elem = encode_bin.FBXElem(b"CreationTime")
+    elem.add_string(b"")
+    root.elems.append(elem)
+
+    header = encode_bin.FBXElem(b"FBXHeaderExtension")
+    for add, value in (("add_bool", True), ("add_char", b"x"), ("add_int8", -3), ("add_int16", 300),
+                       ("add_int32", -70000), ("add_int64", 1 << 40), ("add_float32", 0.5), ("add_float64", 0.1),
+                       ("add_string_unicode", "été")):
+        sub_elem = encode_bin.FBXElem(add.encode())
+        getattr(sub_elem, add)(value)
+        header.elems.append(sub_elem)
+    # Elements without properties nor children.
+    header.elems.append(encode_bin.FBXElem(b"Empty"))
+    header.elems.append(encode_bin.FBXElem(b"EmptyLast"))
+    root.elems.append(header)
+
+    objects = encode_bin.FBXElem(b"Objects")
+    for i in range(4):
+        geom = encode_bin.FBXElem(b"Geometry")
+        geom.add_int64(i)
+        geom.add_string(b"Mesh%d\x00\x01Geometry" % i)
+        geom.add_string(b"Mesh")
+        for name, add, values in (
+                (b"Vertices", "add_float64_array", rng.uniform(-1.0, 1.0, 300 * (i + 1))),
+                (b"PolygonVertexIndex", "add_int32_array", rng.integers(-100, 100, 10 + 400 * i, dtype=np.int32)),
+                (b"Edges", "add_int64_array", rng.integers(0, 1 << 40, 3 + i, dtype=np.int64)),
+                (b"UV", "add_float32_array", rng.uniform(0.0, 1.0, 50 * i).astype(np.float32)),
+                (b"Smoothing", "add_bool_array", rng.integers(0, 2, 200, dtype=bool)),
+                (b"Content", "add_byte_array", rng.integers(-128, 128, 1000 * i, dtype=np.byte)),
+        ):
+            sub_elem = encode_bin.FBXElem(name)
+            getattr(sub_elem, add)(values)
+            geom.elems.append(sub_elem)
+        layer = encode_bin.FBXElem(b"Layer")
+        layer.add_int32(0)
+        layer_elem = encode_bin.FBXElem(b"LayerElement")
+        layer_elem.add_string(b"LayerElementNormal")
+        layer.elems.append(layer_elem)
+        geom.elems.append(layer)
+        objects.elems.append(geom)
+    stack = encode_bin.FBXElem(b"AnimationStack")
+    stack.add_int64(42)
+    objects.elems.append(stack)
+    root.elems.append(objects)
+
+    connections = encode_bin.FBXElem(b"Connections")
+    connection = encode_bin.FBXElem(b"C")
+    connection.add_string(b"OO")
+    connection.add_int64(1)
+    connection.add_int64(0)
+    connections.elems.append(connection)
+    root.elems.append(connections)
+    return root
+
+
+def _as_tuple(elem):
+    """Fully read an element, as plain data."""
+    return (
+        elem.id,
+        [prop.tolist() if isinstance(prop, array.array) else prop for prop in elem.props],
+        bytes(elem.props_type),
+        [_as_tuple(sub_elem) for sub_elem in elem.elems],
+    )
+
+
+class LazyParseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, version):
+        filepath = os.path.join(self.tmpdir.name, "sample_%d.fbx" % version)
+        encode_bin.write(filepath, _sample_tree(), version)
+        return filepath
+
+    def _check_identical(self, version):
+        filepath = self._write(version)
+        elem_root, fbx_version = parse_fbx.parse(filepath)
+        elem_root_lazy, fbx_version_lazy = parse_fbx.parse(filepath, lazy=True)
+
+        self.assertEqual(fbx_version_lazy, fbx_version)
+        self.assertEqual(_as_tuple(elem_root_lazy), _as_tuple(elem_root))
+
+        # Arrays are decoded the same way.
+        vertices = elem_root.elems[3].elems[2].elems[0].props[0]
+        vertices_lazy = elem_root_lazy.elems[3].elems[2].elems[0].props[0]
+        self.assertEqual(vertices_lazy.typecode, vertices.typecode)
+        self.assertEqual(vertices_lazy, vertices)
+
+    def test_identical_7400(self):
+        self._check_identical(7400)
+
+    def test_identical_7500(self):
+        self._check_identical(7500)
+
+    def test_sections(self):
+        filepath = self._write(7500)
+        elem_root, _fbx_version = parse_fbx.parse(filepath)
+        elem_root_lazy, _fbx_version = parse_fbx.parse(filepath, lazy=True)
+
+        # Only read a single section, in a different order than in the file.
+        connections_lazy = elem_root_lazy.elems[4]
+        self.assertEqual(connections_lazy.id, b"Connections")
+        self.assertEqual(_as_tuple(connections_lazy), _as_tuple(elem_root.elems[4]))
+
+        geom_lazy = elem_root_lazy.elems[3].elems[1]
+        # Property types are known without decoding properties.
+        self.assertEqual(bytes(geom_lazy.elems[0].props_type), b"d")
+        self.assertIsNone(geom_lazy.elems[0]._props)
+        self.assertEqual(_as_tuple(geom_lazy), _as_tuple(elem_root.elems[3].elems[1]))
+
+        # Lazy elements can also be used as tuples.
+        elem_id, props, props_type, elems = geom_lazy
+        self.assertEqual((elem_id, props, props_type), tuple(elem_root.elems[3].elems[1])[:3])
+        self.assertIs(elems, geom_lazy[3])
+
+    def test_invalid(self):
+        filepath = os.path.join(self.tmpdir.name, "invalid.fbx")
+        with open(filepath, 'wb') as f:
+            f.write(b"Not an FBX file" * 10)
+        with self.assertRaises(IOError):
+            parse_fbx.parse(filepath, lazy=True)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
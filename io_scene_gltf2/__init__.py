@@ -993,6 +993,7 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         from .io.com.gltf2_io_debug import Log
         from .blender.exp import gltf2_blender_export
         from .io.com.gltf2_io_path import path_to_uri
+        from .io.exp.gltf2_io_disk_cache import ImageCache, MeshCache, default_cache_directory
 
         if self.will_save_settings:
             self.save_settings(context)
@@ -1024,6 +1025,24 @@ class ExportGLTF2_Base(ConvertGLTF2_Base):
         export_settings['gltf_add_webp'] = self.export_image_add_webp
         export_settings['gltf_webp_fallback'] = self.export_image_webp_fallback
         export_settings['gltf_image_quality'] = self.export_image_quality
+        addon_prefs = bpy.context.preferences.addons['io_scene_gltf2'].preferences
+        if addon_prefs.image_cache_ui:
+            export_settings['gltf_image_cache'] = ImageCache(
+                bpy.path.abspath(addon_prefs.image_cache_dir_ui) or default_cache_directory(),
+                addon_prefs.image_cache_size_ui * 1024 * 1024,
+                # Encoding depends on Blender (image saving) and on the add-on.
+                salt=(bpy.app.version, bl_info['version']),
+            )
+        else:
+            export_settings['gltf_image_cache'] = None
+        if addon_prefs.mesh_cache_ui:
+            export_settings['gltf_mesh_cache'] = MeshCache(
+                bpy.path.abspath(addon_prefs.mesh_cache_dir_ui) or default_cache_directory("mesh"),
+                addon_prefs.mesh_cache_size_ui * 1024 * 1024,
+                salt=(bpy.app.version, bl_info['version']),
+            )
+        else:
+            export_settings['gltf_mesh_cache'] = None
         export_settings['gltf_copyright'] = self.export_copyright
         export_settings['gltf_texcoords'] = self.export_texcoords
         export_settings['gltf_normals'] = self.export_normals
@@ -1709,6 +1728,33 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         default=False,
     )
 
+    import_quantize_weights: BoolProperty(
+        name='Quantize Vertex Weights',
+        description=(
+            'Round vertex weights to the 16-bit precision of glTF normalized weights, '
+            'so that vertices with the same weight are added to their vertex groups at once. '
+            'Much faster for dense skinned meshes with float weights'
+        ),
+        default=False,
+    )
+
+    import_instancing: BoolProperty(
+        name='Instance Repeated Meshes',
+        description=(
+            'Import nodes sharing a mesh as instances on the points of a single object, '
+            'using Geometry Nodes, instead of one object per node. '
+            'Only nodes without children, skin, shape keys, animation or custom properties are instanced'
+        ),
+        default=False,
+    )
+
+    instancing_threshold: IntProperty(
+        name='Instancing Threshold',
+        description='Minimal number of nodes using the same mesh, under the same parent, to instance them',
+        default=100,
+        min=2,
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -1722,6 +1768,11 @@ class ImportGLTF2(Operator, ConvertGLTF2_Base, ImportHelper):
         layout.prop(self, 'bone_heuristic')
         layout.prop(self, 'export_import_convert_lighting_mode')
         layout.prop(self, 'import_webp_texture')
+        layout.prop(self, 'import_quantize_weights')
+        layout.prop(self, 'import_instancing')
+        col = layout.column()
+        col.active = self.import_instancing
+        col.prop(self, 'instancing_threshold')
 
     def invoke(self, context, event):
         import sys
@@ -1868,6 +1919,48 @@ class GLTF_AddonPreferences(bpy.types.AddonPreferences):
         description="Allow glTF Embedded format"
     )
 
+    image_cache_ui: bpy.props.BoolProperty(
+        default=False,
+        name="Cache Exported Images",
+        description="Keep encoded images in a cache on disk, so that unchanged images are not encoded again "
+                    "by later exports"
+    )
+
+    image_cache_dir_ui: bpy.props.StringProperty(
+        default="",
+        name="Image Cache Directory",
+        description="Directory of the image cache (in the system temporary directory when empty)",
+        subtype='DIR_PATH'
+    )
+
+    image_cache_size_ui: bpy.props.IntProperty(
+        default=512,
+        min=1,
+        name="Image Cache Size",
+        description="Maximum size of the image cache, in MB. Least recently used images are removed first"
+    )
+
+    mesh_cache_ui: bpy.props.BoolProperty(
+        default=False,
+        name="Cache Exported Meshes",
+        description="Keep primitives of exported meshes in a cache on disk, so that meshes with unchanged data "
+                    "are not processed again by later exports"
+    )
+
+    mesh_cache_dir_ui: bpy.props.StringProperty(
+        default="",
+        name="Mesh Cache Directory",
+        description="Directory of the mesh cache (in the system temporary directory when empty)",
+        subtype='DIR_PATH'
+    )
+
+    mesh_cache_size_ui: bpy.props.IntProperty(
+        default=1024,
+        min=1,
+        name="Mesh Cache Size",
+        description="Maximum size of the mesh cache, in MB. Least recently used meshes are removed first"
+    )
+
     def draw(self, context):
         layout = self.layout
         row = layout.row()
@@ -1880,6 +1973,18 @@ class GLTF_AddonPreferences(bpy.types.AddonPreferences):
         row.prop(self, "allow_embedded_format", text="Allow glTF Embedded format")
         if self.allow_embedded_format:
             layout.label(text="This is the least efficient of the available forms, and should only be used when required.", icon='ERROR')
+        row = layout.row()
+        row.prop(self, "image_cache_ui", text="Cache Exported Images")
+        col = layout.column()
+        col.active = self.image_cache_ui
+        col.prop(self, "image_cache_dir_ui", text="Image Cache Directory")
+        col.prop(self, "image_cache_size_ui", text="Image Cache Size (MB)")
+        row = layout.row()
+        row.prop(self, "mesh_cache_ui", text="Cache Exported Meshes")
+        col = layout.column()
+        col.active = self.mesh_cache_ui
+        col.prop(self, "mesh_cache_dir_ui", text="Mesh Cache Directory")
+        col.prop(self, "mesh_cache_size_ui", text="Mesh Cache Size (MB)")
 
 
 class IO_FH_gltf2(bpy.types.FileHandler):
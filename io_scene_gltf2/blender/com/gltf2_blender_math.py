@@ -4,6 +4,7 @@
 
 import typing
 import math
+import numpy as np
 from mathutils import Matrix, Vector, Quaternion, Euler
 
 from .gltf2_blender_data_path import get_target_property_name
@@ -157,6 +158,117 @@ def transform_value(value: Vector, _: Matrix = Matrix.Identity(4), need_rotation
     return value
 
 
+def transform_array(values: np.ndarray, data_path: str, transform: Matrix = Matrix.Identity(4), need_rotation_correction: bool = False) -> np.ndarray:
+    """Manage transformations, of an array of values (one row per keyframe, quaternions are w first)."""
+    target = get_target_property_name(data_path)
+    m = np.array(transform, dtype=np.float64)
+
+    if target in ["delta_location", "location"]:
+        # Rotation correction does not change location
+        return values @ m[:3, :3].T + m[:3, 3]
+    elif target in ["delta_rotation_quaternion", "rotation_quaternion"]:
+        norm = np.linalg.norm(values, axis=1, keepdims=True)
+        rotations = values / np.where(norm == 0.0, 1.0, norm)
+        rotations = quaternion_multiply_array(np.array(transform.to_quaternion()), rotations)
+        if need_rotation_correction:
+            rotations = quaternion_multiply_array(rotations, np.array((2**0.5/2, -2**0.5/2, 0.0, 0.0)))
+        # Same sign as Matrix.to_quaternion
+        rotations[rotations[:, 0] < 0.0] *= -1.0
+        return rotations
+    elif target in ["delta_scale", "scale"]:
+        scales = np.abs(values) * np.linalg.norm(m[:3, :3], axis=0)
+        # As Matrix.to_scale, all axes are negative when the matrix has a negative determinant
+        negative = np.linalg.det(m[:3, :3]) * np.prod(values, axis=1) < 0.0
+        scales[negative] *= -1.0
+        return scales
+    elif target == "value":
+        return values
+
+    raise RuntimeError("Cannot transform values at {}".format(data_path))
+
+
+def quaternion_multiply_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Product of quaternions (w first), a @ b for each row."""
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def matrices_decompose(matrices: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decompose an array of 4x4 matrices of shape (..., 4, 4) like Matrix.decompose().
+
+    Returns the locations and scales, of shape (..., 3), and the rotations as quaternions (w first) of shape (..., 4).
+    """
+    locs = matrices[..., :3, 3]
+    mats3 = matrices[..., :3, :3]
+
+    # Scale is the length of each column, negated (with the rotation matrix) when the matrix is negative.
+    scales = np.linalg.norm(mats3, axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mats3 = np.where(scales[..., None, :] != 0.0, mats3 / scales[..., None, :], 0.0)
+    negative = np.linalg.det(matrices[..., :3, :3]) < 0.0
+    scales[negative] *= -1.0
+    mats3[negative] *= -1.0
+
+    # Same method as Blender's mat3_normalized_to_quat, choosing the largest quaternion component from the trace to
+    # avoid precision issues.
+    m00, m01, m02 = mats3[..., 0, 0], mats3[..., 0, 1], mats3[..., 0, 2]
+    m10, m11, m12 = mats3[..., 1, 0], mats3[..., 1, 1], mats3[..., 1, 2]
+    m20, m21, m22 = mats3[..., 2, 0], mats3[..., 2, 1], mats3[..., 2, 2]
+    cases = (
+        # (condition, trace, sign flip condition, index of the largest component, quaternion components from s)
+        ((m22 < 0.0) & (m00 > m11), 1.0 + m00 - m11 - m22, m21 < m12, 1, (m21 - m12, None, m10 + m01, m02 + m20)),
+        ((m22 < 0.0) & (m00 <= m11), 1.0 - m00 + m11 - m22, m02 < m20, 2, (m02 - m20, m10 + m01, None, m21 + m12)),
+        ((m22 >= 0.0) & (m00 < -m11), 1.0 - m00 - m11 + m22, m10 < m01, 3, (m10 - m01, m02 + m20, m21 + m12, None)),
+        ((m22 >= 0.0) & (m00 >= -m11), 1.0 + m00 + m11 + m22, False, 0, (None, m21 - m12, m02 - m20, m10 - m01)),
+    )
+    quats = np.zeros(locs.shape[:-1] + (4,), dtype=matrices.dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for condition, trace, flip, largest, components in cases:
+            s = 2.0 * np.sqrt(np.maximum(trace, 0.0))
+            s = np.where(flip, -s, s)
+            for i, component in enumerate(components):
+                value = 0.25 * s if i == largest else component / s
+                quats[..., i] = np.where(condition, value, quats[..., i])
+    quats /= np.linalg.norm(quats, axis=-1, keepdims=True)
+
+    # The rotation of a matrix with shear (or a null scale) depends on the exact conversion used, so let mathutils
+    # decompose those few matrices.
+    not_orthogonal = np.abs(mats3 @ mats3.swapaxes(-1, -2) - np.identity(3)).max(axis=(-2, -1)) > 1e-5
+    for idx in zip(*np.nonzero(not_orthogonal)):
+        quats[idx] = Matrix(matrices[idx].tolist()).decompose()[1]
+    return locs, quats, scales
+
+
+def swizzle_yup_array(values: np.ndarray, data_path: str) -> np.ndarray:
+    """Manage Yup, of an array of values (one row per keyframe, quaternions are w first)."""
+    target = get_target_property_name(data_path)
+    if target in ["delta_location", "location"]:
+        return np.stack((values[:, 0], values[:, 2], -values[:, 1]), axis=-1)
+    elif target in ["delta_rotation_quaternion", "rotation_quaternion"]:
+        return np.stack((values[:, 0], values[:, 1], values[:, 3], -values[:, 2]), axis=-1)
+    elif target in ["delta_scale", "scale"]:
+        return values[:, [0, 2, 1]]
+    elif target == "value":
+        return values
+
+    raise RuntimeError("Cannot transform values at {}".format(data_path))
+
+
+def array_to_gltf(values: np.ndarray, data_path: str) -> np.ndarray:
+    """Transform an array of values (one row per keyframe) to glTF."""
+    if get_target_property_name(data_path) in ["delta_rotation_quaternion", "rotation_quaternion"]:
+        # Blender has w-first quaternion notation
+        return values[:, [1, 2, 3, 0]]
+    return values
+
+
 def round_if_near(value: float, target: float) -> float:
     """If value is very close to target, round to target."""
     return value if abs(value - target) > 2.0e-6 else target
@@ -67,3 +67,41 @@ def fast_structured_np_unique(arr, *args, **kwargs):
         return (unique,) + result[1:]
     else:
         return unique
+
+
+def set_vertex_weights(vgs, vert_joints, vert_weights, levels=None):
+    """
+    Add vertices to the vertex groups of their joints, with one add() per group of same joint and weight.
+
+    vert_joints and vert_weights are lists of (vertices, 4) arrays, one for each JOINTS_n/WEIGHTS_n set, and vgs the
+    vertex groups of the joints. When levels is given, weights are first rounded to multiples of 1 / levels: fewer
+    distinct weights mean fewer add() calls, which is much faster for meshes with many vertices and float weights.
+    """
+    num_verts = len(vert_joints[0])
+    js = np.concatenate([joints.reshape(-1) for joints in vert_joints]).astype(np.int64)
+    ws = np.concatenate([weights.reshape(-1) for weights in vert_weights])
+    vis = np.tile(np.repeat(np.arange(num_verts), 4), len(vert_joints))
+
+    nonzero = ws != 0
+    js, ws, vis = js[nonzero], ws[nonzero], vis[nonzero]
+    if len(js) == 0:
+        return
+
+    # A vertex can be influenced several times by the same joint: the last influence wins, as if they were
+    # added one after the other with REPLACE.
+    pair_keys = vis * (js.max() + 1) + js
+    _, last = np.unique(pair_keys[::-1], return_index=True)
+    last = len(pair_keys) - 1 - last
+    js, ws, vis = js[last], ws[last], vis[last]
+
+    if levels is not None:
+        ws = np.round(ws * levels) / levels
+        nonzero = ws != 0
+        js, ws, vis = js[nonzero], ws[nonzero], vis[nonzero]
+
+    order = np.lexsort((vis, ws, js))
+    js, ws, vis = js[order], ws[order], vis[order]
+    starts = np.flatnonzero(np.concatenate(([True], (js[1:] != js[:-1]) | (ws[1:] != ws[:-1]))))
+    ends = np.append(starts[1:], len(js))
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        vgs[js[start]].add(vis[start:end].tolist(), ws[start].item(), 'REPLACE')
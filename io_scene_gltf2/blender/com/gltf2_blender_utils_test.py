@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import gltf2_blender_utils
+else:
+    from . import gltf2_blender_utils
+
+import unittest
+
+import numpy as np
+
+
+class FakeVertexGroup:
+    """Records the weights added to a vertex group, like VertexGroup.add() with REPLACE does."""
+
+    def __init__(self):
+        self.weights = {}
+        self.add_calls = 0
+
+    def add(self, index, weight, type):
+        assert type == 'REPLACE'
+        self.add_calls += 1
+        for vertex_index in index:
+            self.weights[vertex_index] = weight
+
+
+class SetVertexWeightsTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        num_verts = 2000
+        # Two JOINTS_n/WEIGHTS_n sets, with zero weights and some joints repeated for the same vertex.
+        self.vert_joints = [rng.integers(0, 6, (num_verts, 4), dtype=np.uint16) for _ in range(2)]
+        # Float weights close to (but not on) multiples of 1/15, which are on the 16-bit grid.
+        self.vert_weights = [
+            (rng.integers(0, 16, (num_verts, 4)) / 15 + rng.uniform(-1e-6, 1e-6, (num_verts, 4))).astype(np.float32)
+            for _ in range(2)
+        ]
+        for weights in self.vert_weights:
+            weights[weights < 1e-5] = 0.0
+
+    def _expected(self, quantize=lambda w: w):
+        """The weights of each vertex group, adding influences one by one."""
+        expected = [{} for _ in range(6)]
+        for joints, weights in zip(self.vert_joints, self.vert_weights):
+            for vertex_index, (vertex_joints, vertex_weights) in enumerate(zip(joints.tolist(), weights.tolist())):
+                for joint, weight in zip(vertex_joints, vertex_weights):
+                    if weight != 0.0:
+                        expected[joint][vertex_index] = weight
+        return [{i: quantize(w) for i, w in group.items() if quantize(w) != 0.0} for group in expected]
+
+    def _set(self, levels=None):
+        vgs = [FakeVertexGroup() for _ in range(6)]
+        gltf2_blender_utils.set_vertex_weights(vgs, self.vert_joints, self.vert_weights, levels=levels)
+        return vgs
+
+    def test_exact(self):
+        vgs = self._set()
+        expected = self._expected()
+        self.assertEqual([vg.weights for vg in vgs], expected)
+        # One call per distinct weight of each group.
+        self.assertEqual([vg.add_calls for vg in vgs], [len(set(group.values())) for group in expected])
+
+    def test_quantized(self):
+        vgs = self._set(levels=65535)
+        expected = self._expected(lambda w: round(w * 65535) / 65535)
+        for vg, group in zip(vgs, expected):
+            self.assertEqual(vg.weights.keys(), group.keys())
+            np.testing.assert_allclose([vg.weights[i] for i in group], list(group.values()), atol=1e-7)
+            # Weights close to each other are added at once: one call for each of the 15 non-zero weights.
+            self.assertEqual(vg.add_calls, 15)
+        self.assertGreater(sum(vg.add_calls for vg in self._set()), 1000)
+
+    def test_no_weights(self):
+        self.vert_weights = [np.zeros_like(weights) for weights in self.vert_weights]
+        vgs = self._set(levels=65535)
+        self.assertEqual([vg.add_calls for vg in vgs], [0] * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,7 @@ from .sampled.shapekeys.gltf2_blender_gather_sk_action_sampled import gather_act
 from .sampled.object.gltf2_blender_gather_object_channels import gather_object_sampled_channels, gather_sampled_object_channel
 from .sampled.shapekeys.gltf2_blender_gather_sk_channels import gather_sampled_sk_channel
 from .gltf2_blender_gather_drivers import get_sk_drivers
+from .sampled.gltf2_blender_gather_animation_sampling_cache import get_cache_data
 from .gltf2_blender_gather_animation_utils import reset_bone_matrix, reset_sk_data, link_samplers, add_slide_data, merge_tracks_perform, bake_animation
 
 def gather_actions_animations(export_settings):
@@ -46,6 +47,9 @@ def gather_actions_animations(export_settings):
         animations_, merged_tracks = gather_action_animations(obj_uuid, merged_tracks, len(animations), export_settings)
         animations += animations_
 
+        # All channels of this object are gathered, its sampled data is no more needed
+        get_cache_data.release_object(obj_uuid)
+
     if export_settings['gltf_animation_mode'] == "ACTIVE_ACTIONS":
         # Fake an animation with all animations of the scene
         merged_tracks = {}
@@ -5,6 +5,7 @@
 import typing
 import bpy
 import mathutils
+import numpy as np
 from ...com import gltf2_blender_math
 
 class Keyframe:
@@ -125,3 +126,24 @@ class Keyframe:
     @out_tangent.setter
     def out_tangent(self, value: typing.List[float]):
         self.__out_tangent = self.__set_indexed(value)
+
+
+class SampledKeyframes:
+    """
+    Keyframes of a baked channel, as arrays: frames, and values with one row per keyframe
+    (Blender space, quaternions are w first).
+    There are no tangents: baked channels are LINEAR or STEP.
+    """
+    def __init__(self, frames, values: np.ndarray, target: str):
+        self.frames = np.asarray(frames, dtype=np.float64)
+        self.values = values
+        self.target = target
+
+    def __len__(self):
+        return len(self.frames)
+
+    def is_constant(self, tolerance=0.0001):
+        return bool(np.all(np.ptp(self.values, axis=0) < tolerance))
+
+    def first_and_last(self):
+        return SampledKeyframes(self.frames[[0, -1]], self.values[[0, -1]], self.target)
@@ -11,6 +11,7 @@ from .sampled.armature.armature_channels import gather_armature_sampled_channels
 from .sampled.object.gltf2_blender_gather_object_channels import gather_object_sampled_channels
 from .sampled.shapekeys.gltf2_blender_gather_sk_channels import gather_sk_sampled_channels
 from .sampled.data.gltf2_blender_gather_data_channels import gather_data_sampled_channels
+from .sampled.gltf2_blender_gather_animation_sampling_cache import get_cache_data
 from .gltf2_blender_gather_animation_utils import link_samplers, add_slide_data
 
 def gather_scene_animations(export_settings):
@@ -99,6 +100,9 @@ def gather_scene_animations(export_settings):
                 if channels is not None:
                     total_channels.extend(channels)
 
+        # All channels of this object are gathered, its sampled data is no more needed
+        get_cache_data.release_object(obj_uuid)
+
         if export_settings['gltf_anim_scene_split_object'] is True:
             if len(total_channels) > 0:
                 animation = gltf2_io.Animation(
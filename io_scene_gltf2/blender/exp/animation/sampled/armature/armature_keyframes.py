@@ -4,11 +4,11 @@
 
 import typing
 import numpy as np
-from ....gltf2_blender_gather_cache import cached
-from ...gltf2_blender_gather_keyframes import Keyframe
-from ..gltf2_blender_gather_animation_sampling_cache import get_cache_data
+from ....gltf2_blender_gather_cache import lru_cached, KEYFRAMES_CACHE_SIZE
+from ...gltf2_blender_gather_keyframes import SampledKeyframes
+from ..gltf2_blender_gather_animation_sampling_cache import get_cache_decomposed
 
-@cached
+@lru_cached(maxsize=KEYFRAMES_CACHE_SIZE)
 def gather_bone_sampled_keyframes(
         armature_uuid: str,
         bone: str,
@@ -16,42 +16,31 @@ def gather_bone_sampled_keyframes(
         action_name: str,
         node_channel_is_animated: bool,
         export_settings
-        ) -> typing.List[Keyframe]:
+        ) -> typing.Optional[SampledKeyframes]:
 
     start_frame = export_settings['ranges'][armature_uuid][action_name]['start']
     end_frame  = export_settings['ranges'][armature_uuid][action_name]['end']
 
-    keyframes = []
-
-    frame = start_frame
     step = export_settings['gltf_frame_step']
-
-    while frame <= end_frame:
-        key = Keyframe(None, frame, channel)
-
-        mat = get_cache_data(
-            'bone',
-            armature_uuid,
-            bone,
-            action_name,
-            frame,
-            step,
-            export_settings)
-
-        trans, rot, scale = mat.decompose()
-
-        key.value = {
-            "location": trans,
-            "rotation_quaternion": rot,
-            "scale": scale
-            }[channel]
-
-        keyframes.append(key)
-        frame += step
-
-    if len(keyframes) == 0:
+    count = int((end_frame - start_frame) // step) + 1 if end_frame >= start_frame else 0
+    if count == 0:
         # For example, option CROP negative frames, but all are negatives
         return None
+    frames = start_frame + step * np.arange(count)
+
+    # Matrices of all frames are decomposed at once, and only once for the three channels
+    decomposed = get_cache_decomposed(
+        'bone',
+        armature_uuid,
+        bone,
+        action_name,
+        start_frame,
+        frames[-1].item(),
+        step,
+        export_settings)
+    component = ["location", "rotation_quaternion", "scale"].index(channel)
+
+    keyframes = SampledKeyframes(frames, decomposed[component], channel)
 
     if not export_settings['gltf_optimize_animation']:
         # For bones, if all values are the same, keeping only if changing values, or if user want to keep data
@@ -61,7 +50,7 @@ def gather_bone_sampled_keyframes(
             # baked bones
             if export_settings['gltf_optimize_animation_keep_armature'] is False:
                  # Not keeping if not changing property
-                cst = fcurve_is_constant(keyframes)
+                cst = keyframes.is_constant()
                 return None if cst is True else keyframes
             else:
                 # Keep data, as requested by user. We keep all samples, as user don't want to optimize
@@ -74,18 +63,16 @@ def gather_bone_sampled_keyframes(
         # In that case, if there is no real keyframe on this channel for this given bone,
         # We can ignore these keyframes
         # if there are some fcurve, we can keep only 2 keyframes, first and last
-        cst = fcurve_is_constant(keyframes)
+        cst = keyframes.is_constant()
 
         if node_channel_is_animated is True: # fcurve on this bone for this property
                 # Keep animation, but keep only 2 keyframes if data are not changing
-                return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
+                return keyframes.first_and_last() if cst is True and len(keyframes) >= 2 else keyframes
         else: # bone is not animated (no fcurve)
             # Not keeping if not changing property if user decided to not keep
             if export_settings['gltf_optimize_animation_keep_armature'] is False:
                 return None if cst is True else keyframes
             else:
                 # Keep at least 2 keyframes if data are not changing
-                return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
+                return keyframes.first_and_last() if cst is True and len(keyframes) >= 2 else keyframes
 
-def fcurve_is_constant(keyframes):
-    return all([j < 0.0001 for j in np.ptp([[k.value[i] for i in range(len(keyframes[0].value))] for k in keyframes], axis=0)])
@@ -5,6 +5,7 @@
 import bpy
 import typing
 import mathutils
+import numpy as np
 from ......io.com import gltf2_io
 from ......io.exp.gltf2_io_user_extensions import export_user_extensions
 from ......io.com import gltf2_io_constants
@@ -88,28 +89,27 @@ def __gather_keyframes(
 
 def __convert_keyframes(armature_uuid, bone_name, channel, keyframes, action_name, export_settings):
 
+    frames = keyframes.frames
     # Sliding can come from:
     # - option SLIDE for negative frames
     # - option to start animation at frame 0 for looping
     if armature_uuid in export_settings['slide'].keys() and action_name in export_settings['slide'][armature_uuid].keys():
-        for k in keyframes:
-            k.frame += -export_settings['slide'][armature_uuid][action_name]
-            k.seconds = k.frame / (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
+        frames = frames - export_settings['slide'][armature_uuid][action_name]
 
-    times = [k.seconds for k in keyframes]
+    fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
+    times = frames / fps
     input =  gather_accessor(
-        gltf2_io_binary_data.BinaryData.from_list(times, gltf2_io_constants.ComponentType.Float),
+        gltf2_io_binary_data.BinaryData(times.astype(np.float32).tobytes()),
         gltf2_io_constants.ComponentType.Float,
         len(times),
-        tuple([max(times)]),
-        tuple([min(times)]),
+        tuple([float(times.max())]),
+        tuple([float(times.min())]),
         gltf2_io_constants.DataType.Scalar,
         export_settings)
 
     is_yup = export_settings['gltf_yup']
 
     bone = export_settings['vtree'].nodes[armature_uuid].blender_object.pose.bones[bone_name]
-    target_datapath = "pose.bones['" + bone_name + "']." + channel
 
     if bone.parent is None:
         # bone at root of armature
@@ -144,46 +144,20 @@ def __convert_keyframes(armature_uuid, bone_name, channel, keyframes, action_nam
             correction_matrix_local = axis_basis_change
     transform = correction_matrix_local
 
-    values = []
-    fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
-    for keyframe in keyframes:
-        # Transform the data and build gltf control points
-        value = gltf2_blender_math.transform(keyframe.value, target_datapath, transform, False)
-        keyframe_value = gltf2_blender_math.mathutils_to_gltf(value)
-
-        if keyframe.in_tangent is not None:
-            # we can directly transform the tangent as it currently is represented by a control point
-            in_tangent = gltf2_blender_math.transform(keyframe.in_tangent, target_datapath, transform, False)
-
-            # the tangent in glTF is relative to the keyframe value and uses seconds
-            if not isinstance(value, list):
-                in_tangent = fps * (in_tangent - value)
-            else:
-                in_tangent = [fps * (in_tangent[i] - value[i]) for i in range(len(value))]
-            keyframe_value = gltf2_blender_math.mathutils_to_gltf(in_tangent) + keyframe_value  # append
-
-        if keyframe.out_tangent is not None:
-            # we can directly transform the tangent as it currently is represented by a control point
-            out_tangent = gltf2_blender_math.transform(keyframe.out_tangent, target_datapath, transform, False)
-
-            # the tangent in glTF is relative to the keyframe value and uses seconds
-            if not isinstance(value, list):
-                out_tangent = fps * (out_tangent - value)
-            else:
-                out_tangent = [fps * (out_tangent[i] - value[i]) for i in range(len(value))]
-            keyframe_value = keyframe_value + gltf2_blender_math.mathutils_to_gltf(out_tangent)  # append
-
-        values += keyframe_value
+    # Transform the data and build gltf control points, for all keyframes at once
+    # No tangents when baking, we are using LINEAR interpolation
+    values = gltf2_blender_math.transform_array(keyframes.values, channel, transform, False)
+    values = gltf2_blender_math.array_to_gltf(values, channel)
 
      # store the keyframe data in a binary buffer
     component_type = gltf2_io_constants.ComponentType.Float
-    data_type = gltf2_io_constants.DataType.vec_type_from_num(len(keyframes[0].value))
+    data_type = gltf2_io_constants.DataType.vec_type_from_num(values.shape[1])
 
     output =  gltf2_io.Accessor(
-        buffer_view=gltf2_io_binary_data.BinaryData.from_list(values, component_type),
+        buffer_view=gltf2_io_binary_data.BinaryData(values.astype(np.float32).tobytes()),
         byte_offset=None,
         component_type=component_type,
-        count=len(values) // gltf2_io_constants.DataType.num_elements(data_type),
+        count=len(values),
         extensions=None,
         extras=None,
         max=None,
@@ -216,7 +190,7 @@ def __gather_interpolation(node_channel_is_animated, node_channel_interpolation,
             # baked => We have first and last keyframe
             return "STEP"
         else:
-            if keyframes[0].value == keyframes[1].value:
+            if np.array_equal(keyframes.values[0], keyframes.values[1]):
                 return "STEP"
             else:
                 return "LINEAR"
@@ -7,12 +7,12 @@ import math
 import numpy as np
 import bpy
 from .....com.gltf2_blender_conversion import PBR_WATTS_TO_LUMENS
-from ....gltf2_blender_gather_cache import cached
+from ....gltf2_blender_gather_cache import lru_cached, KEYFRAMES_CACHE_SIZE
 from ...gltf2_blender_gather_keyframes import Keyframe
 from ..gltf2_blender_gather_animation_sampling_cache import get_cache_data
 
 
-@cached
+@lru_cached(maxsize=KEYFRAMES_CACHE_SIZE)
 def gather_data_sampled_keyframes(
         blender_type_data: str,
         blender_id,
@@ -5,9 +5,11 @@
 import mathutils
 import bpy
 import typing
+import numpy as np
 from .....blender.com.gltf2_blender_data_path import get_sk_exported
 from .....blender.com.gltf2_blender_conversion import inverted_trs_mapping_node, texture_transform_blender_to_gltf, yvof_blender_to_gltf
-from ...gltf2_blender_gather_cache import datacache
+from .....blender.com.gltf2_blender_math import matrices_decompose
+from ...gltf2_blender_gather_cache import datacache, lru_cached, KEYFRAMES_CACHE_SIZE
 from ...gltf2_blender_gather_tree import VExportNode
 from ..gltf2_blender_gather_drivers import get_sk_drivers
 
@@ -20,13 +22,12 @@ def get_cache_data(path: str,
                       current_frame: int,
                       step: int,
                       export_settings,
-                      only_gather_provided=False
+                      only_gather_provided=False,
+                      frames=None
                     ):
 
     data = {}
 
-    min_, max_ = get_range(blender_obj_uuid, action_name, export_settings)
-
     if only_gather_provided:
         obj_uuids = [blender_obj_uuid] if blender_obj_uuid in export_settings['vtree'].nodes.keys() else [] #If object is not in vtree, this is a material or light for pointers
     else:
@@ -36,6 +37,15 @@ def get_cache_data(path: str,
     if export_settings['gltf_animation_mode'] in "NLA_TRACKS":
         obj_uuids = [blender_obj_uuid]  if blender_obj_uuid in export_settings['vtree'].nodes.keys() else [] #If object is not in vtree, this is a material or light for pointers
 
+    # First call samples all objects (their active action) on the whole range.
+    # Next calls, for other actions of an object, only need the range of this action,
+    # or only the frames missing from the cache (frames)
+    if frames is not None:
+        min_, max_ = frames
+    else:
+        min_, max_ = get_range(blender_obj_uuid, action_name, export_settings, only_object=len(obj_uuids) == 1 and only_gather_provided)
+    frame_range = (min_, max_, step)
+
     # If there is only 1 object to cache, we can disable viewport for other objects (for performance)
     # This can be on these cases:
     # - TRACK mode
@@ -64,7 +74,7 @@ def get_cache_data(path: str,
         bpy.context.scene.frame_set(int(frame))
         current_instance = {} # For GN instances, we are going to track instances by their order in instance iterator
 
-        object_caching(data, obj_uuids, current_instance, action_name, frame, depsgraph, export_settings)
+        object_caching(data, obj_uuids, current_instance, action_name, frame, frame_range, depsgraph, export_settings)
 
         # KHR_animation_pointer caching for materials, lights, cameras
         if export_settings['gltf_export_anim_pointer'] is True:
@@ -82,10 +92,29 @@ def get_cache_data(path: str,
 
     return data
 
+@lru_cached(maxsize=KEYFRAMES_CACHE_SIZE)
+def get_cache_decomposed(path: str,
+                         blender_obj_uuid: str,
+                         bone: typing.Optional[str],
+                         action_name: str,
+                         start_frame,
+                         end_frame,
+                         step: int,
+                         export_settings):
+    """
+    Locations, rotations and scales of the matrices of an object ('matrix') or a bone ('bone'), sampled from
+    start_frame to end_frame. Decomposed once for the three channels.
+    """
+    matrices = get_cache_data(path, blender_obj_uuid, bone, action_name, (start_frame, end_frame), step, export_settings)
+    return matrices_decompose(matrices.astype(np.float64))
+
 # For perf, we may be more precise, and get a list of ranges to be exported that include all needed frames
-def get_range(obj_uuid, key, export_settings):
+def get_range(obj_uuid, key, export_settings, only_object=False):
     if export_settings['gltf_animation_mode'] in ["NLA_TRACKS"]:
         return export_settings['ranges'][obj_uuid][key]['start'], export_settings['ranges'][obj_uuid][key]['end']
+    elif only_object and key in export_settings['ranges'].get(obj_uuid, {}).keys():
+        # Frames of other actions are sampled when these actions are active
+        return export_settings['ranges'][obj_uuid][key]['start'], export_settings['ranges'][obj_uuid][key]['end']
     else:
         min_ = None
         max_ = None
@@ -98,12 +127,99 @@ def get_range(obj_uuid, key, export_settings):
     return min_, max_
 
 
-def initialize_data_dict(data, key1, key2, key3, key4):
+def initialize_data_dict(data, key1, key2, key3, key4, frame_range=None):
     # No check on key1, this is already done before calling this function
     if key2 not in data[key1].keys():
         data[key1][key2] = {}
         data[key1][key2][key3] = {}
-        data[key1][key2][key3][key4] = {}
+        data[key1][key2][key3][key4] = {} if frame_range is None else SampledMatrices(*frame_range)
+
+
+class SampledMatrices:
+    """
+    Matrices sampled every *step* frames from *start* to *end*, stored in a preallocated array.
+    Used like a dict keyed by frame, for matrices of objects and bones, that are most of sampled data.
+    Matrices are read as arrays: rows of *matrices*, or all of them at once with get_range.
+    """
+    __slots__ = ("start", "step", "matrices", "sampled")
+
+    def __init__(self, start, end, step):
+        self.start = start
+        self.step = step
+        count = int((end - start) // step) + 1 if end >= start else 0
+        # Matrices are single precision, no loss here
+        self.matrices = np.empty((count, 4, 4), dtype=np.float32)
+        self.sampled = np.zeros(count, dtype=bool)
+
+    def __end(self):
+        return self.start + (len(self.sampled) - 1) * self.step
+
+    def __index(self, frame):
+        index, remainder = divmod(frame - self.start, self.step)
+        if remainder != 0 or not 0 <= index < len(self.sampled):
+            raise KeyError(frame)
+        return int(index)
+
+    def __setitem__(self, frame, matrix):
+        index = self.__index(frame)
+        self.matrices[index] = matrix
+        self.sampled[index] = True
+
+    def __getitem__(self, frame):
+        index = self.__index(frame)
+        if not self.sampled[index]:
+            raise KeyError(frame)
+        return self.matrices[index]
+
+    def __contains__(self, frame):
+        try:
+            return bool(self.sampled[self.__index(frame)])
+        except KeyError:
+            return False
+
+    def __slice(self, start, end):
+        return slice(self.__index(start), self.__index(end) + 1)
+
+    def get_range(self, start, end):
+        """The matrices sampled from start to end, as a (frames, 4, 4) array."""
+        frames = self.__slice(start, end)
+        if not np.all(self.sampled[frames]):
+            raise KeyError((start, end))
+        return self.matrices[frames]
+
+    def missing(self, start, end):
+        """The first and last frames from start to end that are not sampled, None if all are."""
+        frames = start + self.step * np.arange(int((end - start) // self.step) + 1)
+        indices = (frames - self.start) / self.step
+        inside = (indices == np.floor(indices)) & (indices >= 0) & (indices < len(self.sampled))
+        sampled = np.zeros(len(frames), dtype=bool)
+        sampled[inside] = self.sampled[indices[inside].astype(np.int64)]
+        missing = np.flatnonzero(~sampled)
+        if len(missing) == 0:
+            return None
+        return frames[missing[0]].item(), frames[missing[-1]].item()
+
+    def update(self, other):
+        """Add the matrices sampled in other, extending the range if needed."""
+        if len(other.sampled) == 0:
+            return
+        if len(self.sampled) == 0:
+            start, end = other.start, other.__end()
+        else:
+            start, end = min(self.start, other.start), max(self.__end(), other.__end())
+        if start != self.start or end != self.__end():
+            matrices, sampled, old_start = self.matrices, self.sampled, self.start
+            SampledMatrices.__init__(self, start, end, self.step)
+            if len(sampled):
+                offset = self.__index(old_start)
+                self.matrices[offset:offset + len(sampled)] = matrices
+                self.sampled[offset:offset + len(sampled)] = sampled
+        offset = self.__index(other.start)
+        self.matrices[offset:offset + len(other.sampled)][other.sampled] = other.matrices[other.sampled]
+        self.sampled[offset:offset + len(other.sampled)] |= other.sampled
+
+    def __len__(self):
+        return int(np.count_nonzero(self.sampled))
 
 
 def material_caching(data, action_name, frame, export_settings):
@@ -311,7 +427,7 @@ def material_nodetree_caching(data, action_name, frame, export_settings):
                     data[key1][key2][key3][path][frame] = list(val)[:export_settings['KHR_animation_pointer']['materials'][mat]['paths'][path]['length']]
 
 
-def armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_settings):
+def armature_caching(data, obj_uuid, blender_obj, action_name, frame, frame_range, export_settings):
     bones = export_settings['vtree'].get_all_bones(obj_uuid)
     if blender_obj.animation_data and blender_obj.animation_data.action \
             and export_settings['gltf_animation_mode'] in ["ACTIVE_ACTIONS", "ACTIONS", "BROADCAST"]:
@@ -344,10 +460,10 @@ def armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_set
                 matrix = matrix @ blender_obj.matrix_world
 
         if blender_bone.name not in data[key1][key2][key3].keys():
-            data[key1][key2][key3][blender_bone.name] = {}
+            data[key1][key2][key3][blender_bone.name] = SampledMatrices(*frame_range)
         data[key1][key2][key3][blender_bone.name][frame] = matrix
 
-def object_caching(data, obj_uuids, current_instance, action_name, frame, depsgraph, export_settings):
+def object_caching(data, obj_uuids, current_instance, action_name, frame, frame_range, depsgraph, export_settings):
     for obj_uuid in obj_uuids:
         blender_obj = export_settings['vtree'].nodes[obj_uuid].blender_object
         if blender_obj is None: #GN instance
@@ -410,19 +526,19 @@ def object_caching(data, obj_uuids, current_instance, action_name, frame, depsgr
                 key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
         else:
             key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
-        initialize_data_dict(data, key1, key2, key3, key4)
+        initialize_data_dict(data, key1, key2, key3, key4, frame_range)
         data[key1][key2][key3][key4][frame] = mat
 
         # Store data for all bones, if object is an armature
 
         if blender_obj and blender_obj.type == "ARMATURE":
-            armature_caching(data, obj_uuid, blender_obj, action_name, frame, export_settings)
+            armature_caching(data, obj_uuid, blender_obj, action_name, frame, frame_range, export_settings)
 
         elif blender_obj is None: # GN instances
             # case of baking object, for GN instances
             # There is no animation, so use uuid of object as key
             key1, key2, key3, key4 = obj_uuid, obj_uuid, "matrix", None
-            initialize_data_dict(data, key1, key2, key3, key4)
+            initialize_data_dict(data, key1, key2, key3, key4, frame_range)
             data[key1][key2][key3][key4][frame] = mat
 
         # Check SK animation here, as we are caching data
@@ -4,12 +4,12 @@
 
 import numpy as np
 from ....gltf2_blender_gather_tree import VExportNode
-from ....gltf2_blender_gather_cache import cached
-from ...gltf2_blender_gather_keyframes import Keyframe
-from ..gltf2_blender_gather_animation_sampling_cache import get_cache_data
+from ....gltf2_blender_gather_cache import lru_cached, KEYFRAMES_CACHE_SIZE
+from ...gltf2_blender_gather_keyframes import SampledKeyframes
+from ..gltf2_blender_gather_animation_sampling_cache import get_cache_decomposed
 
 
-@cached
+@lru_cached(maxsize=KEYFRAMES_CACHE_SIZE)
 def gather_object_sampled_keyframes(
         obj_uuid: str,
         channel: str,
@@ -21,36 +21,26 @@ def gather_object_sampled_keyframes(
     start_frame = export_settings['ranges'][obj_uuid][action_name]['start']
     end_frame  = export_settings['ranges'][obj_uuid][action_name]['end']
 
-    keyframes = []
-
-    frame = start_frame
     step = export_settings['gltf_frame_step']
-
-    while frame <= end_frame:
-        key = Keyframe(None, frame, channel)
-
-        mat = get_cache_data(
-            'matrix',
-            obj_uuid,
-            None,
-            action_name,
-            frame,
-            step,
-            export_settings)
-
-        trans, rot, sca = mat.decompose()
-        key.value_total = {
-            "location": trans,
-            "rotation_quaternion": rot,
-            "scale": sca,
-        }[channel]
-
-        keyframes.append(key)
-        frame += step
-
-    if len(keyframes) == 0:
+    count = int((end_frame - start_frame) // step) + 1 if end_frame >= start_frame else 0
+    if count == 0:
         # For example, option CROP negative frames, but all are negatives
         return None
+    frames = start_frame + step * np.arange(count)
+
+    # Matrices of all frames are decomposed at once, and only once for the three channels
+    decomposed = get_cache_decomposed(
+        'matrix',
+        obj_uuid,
+        None,
+        action_name,
+        start_frame,
+        frames[-1].item(),
+        step,
+        export_settings)
+    component = ["location", "rotation_quaternion", "scale"].index(channel)
+
+    keyframes = SampledKeyframes(frames, decomposed[component], channel)
 
     if not export_settings['gltf_optimize_animation']:
         # For objects, if all values are the same, keeping only if changing values, or if user want to keep data
@@ -60,7 +50,7 @@ def gather_object_sampled_keyframes(
             # baked object
             if export_settings['gltf_optimize_animation_keep_object'] is False:
                  # Not keeping if not changing property
-                cst = fcurve_is_constant(keyframes)
+                cst = keyframes.is_constant()
                 return None if cst is True else keyframes
             else:
                 # Keep data, as requested by user. We keep all samples, as user don't want to optimize
@@ -69,9 +59,9 @@ def gather_object_sampled_keyframes(
     else:
 
         # For objects, if all values are the same, we keep only first and last
-        cst = fcurve_is_constant(keyframes)
+        cst = keyframes.is_constant()
         if node_channel_is_animated is True:
-            return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
+            return keyframes.first_and_last() if cst is True and len(keyframes) >= 2 else keyframes
         else:
             # baked object
             # Not keeping if not changing property if user decided to not keep
@@ -79,7 +69,5 @@ def gather_object_sampled_keyframes(
                 return None if cst is True else keyframes
             else:
                 # Keep at least 2 keyframes if data are not changing
-                return [keyframes[0], keyframes[-1]] if cst is True and len(keyframes) >= 2 else keyframes
+                return keyframes.first_and_last() if cst is True and len(keyframes) >= 2 else keyframes
 
-def fcurve_is_constant(keyframes):
-    return all([j < 0.0001 for j in np.ptp([[k.value[i] for i in range(len(keyframes[0].value))] for k in keyframes], axis=0)])
@@ -4,11 +4,11 @@
 
 import bpy
 import mathutils
+import numpy as np
 from ......io.com import gltf2_io
 from ......io.com import gltf2_io_constants
 from ......io.exp import gltf2_io_binary_data
 from ......io.exp.gltf2_io_user_extensions import export_user_extensions
-from .....com.gltf2_blender_data_path import get_target_object_path
 from .....com import gltf2_blender_math
 from ....gltf2_blender_gather_tree import VExportNode
 from ....gltf2_blender_gather_cache import cached
@@ -72,56 +72,47 @@ def __gather_keyframes(
 
 def __convert_keyframes(obj_uuid: str, channel: str, keyframes, action_name: str, export_settings):
 
+    frames = keyframes.frames
     # Sliding can come from:
     # - option SLIDE for negative frames
     # - option to start animation at frame 0 for looping
     if obj_uuid in export_settings['slide'].keys() and action_name in export_settings['slide'][obj_uuid].keys():
-        for k in keyframes:
-            k.frame += -export_settings['slide'][obj_uuid][action_name]
-            k.seconds = k.frame / (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
+        frames = frames - export_settings['slide'][obj_uuid][action_name]
 
-    times = [k.seconds for k in keyframes]
+    fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
+    times = frames / fps
     input = gather_accessor(
-        gltf2_io_binary_data.BinaryData.from_list(times, gltf2_io_constants.ComponentType.Float),
+        gltf2_io_binary_data.BinaryData(times.astype(np.float32).tobytes()),
         gltf2_io_constants.ComponentType.Float,
         len(times),
-        tuple([max(times)]),
-        tuple([min(times)]),
+        tuple([float(times.max())]),
+        tuple([float(times.min())]),
         gltf2_io_constants.DataType.Scalar,
         export_settings)
 
     is_yup = export_settings['gltf_yup']
 
-    object_path = get_target_object_path(channel)
     transform = mathutils.Matrix.Identity(4)
 
     need_rotation_correction = (export_settings['gltf_cameras'] and export_settings['vtree'].nodes[obj_uuid].blender_type == VExportNode.CAMERA) or \
         (export_settings['gltf_lights'] and export_settings['vtree'].nodes[obj_uuid].blender_type == VExportNode.LIGHT)
 
-
-    values = []
-    fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
-    for keyframe in keyframes:
-
-        # Transform the data and build gltf control points
-        value = gltf2_blender_math.transform(keyframe.value, channel, transform, need_rotation_correction)
-        if is_yup:
-            value = gltf2_blender_math.swizzle_yup(value, channel)
-        keyframe_value = gltf2_blender_math.mathutils_to_gltf(value)
-
-        # No tangents when baking, we are using LINEAR interpolation
-
-        values += keyframe_value
+    # Transform the data and build gltf control points, for all keyframes at once
+    # No tangents when baking, we are using LINEAR interpolation
+    values = gltf2_blender_math.transform_array(keyframes.values, channel, transform, need_rotation_correction)
+    if is_yup:
+        values = gltf2_blender_math.swizzle_yup_array(values, channel)
+    values = gltf2_blender_math.array_to_gltf(values, channel)
 
     # store the keyframe data in a binary buffer
     component_type = gltf2_io_constants.ComponentType.Float
-    data_type = gltf2_io_constants.DataType.vec_type_from_num(len(keyframes[0].value))
+    data_type = gltf2_io_constants.DataType.vec_type_from_num(values.shape[1])
 
     output = gltf2_io.Accessor(
-        buffer_view=gltf2_io_binary_data.BinaryData.from_list(values, component_type),
+        buffer_view=gltf2_io_binary_data.BinaryData(values.astype(np.float32).tobytes()),
         byte_offset=None,
         component_type=component_type,
-        count=len(values) // gltf2_io_constants.DataType.num_elements(data_type),
+        count=len(values),
         extensions=None,
         extras=None,
         max=None,
@@ -158,7 +149,7 @@ def __gather_interpolation(
             # baked => We have first and last keyframe
             return "STEP"
         else:
-            if keyframes[0].value == keyframes[1].value:
+            if np.array_equal(keyframes.values[0], keyframes.values[1]):
                 return "STEP"
             else:
                 return "LINEAR"
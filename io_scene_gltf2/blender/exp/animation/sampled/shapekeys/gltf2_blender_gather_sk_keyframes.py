@@ -6,14 +6,14 @@ import bpy
 import typing
 import numpy as np
 from ......blender.com.gltf2_blender_data_path import get_sk_exported
-from ....gltf2_blender_gather_cache import cached
+from ....gltf2_blender_gather_cache import lru_cached, KEYFRAMES_CACHE_SIZE
 from ...gltf2_blender_gather_keyframes import Keyframe
 from ...fcurves.gltf2_blender_gather_fcurves_channels import get_channel_groups
 from ...fcurves.gltf2_blender_gather_fcurves_keyframes import gather_non_keyed_values
 from ..gltf2_blender_gather_animation_sampling_cache import get_cache_data
 
 
-@cached
+@lru_cached(maxsize=KEYFRAMES_CACHE_SIZE)
 def gather_sk_sampled_keyframes(obj_uuid,
         action_name,
         export_settings):
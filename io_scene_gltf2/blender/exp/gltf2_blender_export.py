@@ -15,7 +15,10 @@ from ...io.exp import gltf2_io_draco_compression_extension
 from ...io.exp.gltf2_io_user_extensions import export_user_extensions
 from ..com import gltf2_blender_json
 from . import gltf2_blender_gather
+from .gltf2_blender_gather_cache import reset_cache_stats, log_cache_stats
 from .gltf2_blender_gltf2_exporter import GlTF2Exporter
+from .material.extensions.gltf2_blender_image import ImageEncodeQueue
+from .gltf2_blender_gather_primitives_extract import PrimitiveCreationQueue
 
 
 def save(context, export_settings):
@@ -30,11 +33,13 @@ def save(context, export_settings):
 
     __notify_start(context, export_settings)
     start_time = time.time()
+    reset_cache_stats()
     pre_export_callbacks = export_settings["pre_export_callbacks"]
     for callback in pre_export_callbacks:
         callback(export_settings)
 
     json, buffer = __export(export_settings)
+    log_cache_stats(export_settings)
 
     post_export_callbacks = export_settings["post_export_callbacks"]
     for callback in post_export_callbacks:
@@ -193,7 +198,10 @@ def __manage_extension_declaration(json, export_settings):
         json['extensionsRequired'] = new_ext_required
 
 def __gather_gltf(exporter, export_settings):
-    active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
+    # Images are encoded in their own stage, once all of them are gathered.
+    # Primitives of meshes are created in their own stage too, while next meshes are read from Blender.
+    with ImageEncodeQueue.stage_cm(export_settings), PrimitiveCreationQueue.stage_cm(export_settings):
+        active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
 
     unused_skins = export_settings['vtree'].get_unused_skins()
 
@@ -3,8 +3,78 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import functools
+import logging
+from collections import OrderedDict
 
-def cached_by_key(key):
+
+class CacheStats:
+    """
+    Counters of a cache, for the current export.
+
+    *size* is the number of entries currently cached (for the sampling cache, the number of sampled values),
+    *maxsize* the bound of LRU caches (None when unbounded). *evictions* counts entries dropped by LRU caches,
+    *released* the sampled values dropped by the sampling cache once objects are gathered.
+    """
+    __slots__ = ("name", "maxsize", "hits", "misses", "size", "peak_size", "evictions", "released")
+
+    def __init__(self, name, maxsize=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self.peak_size = 0
+        self.evictions = 0
+        self.released = 0
+
+    def set_size(self, size):
+        self.size = size
+        if size > self.peak_size:
+            self.peak_size = size
+
+    def __repr__(self):
+        return "{}: {} hits, {} misses, {} entries (peak {}{}), {} evicted{}".format(
+            self.name, self.hits, self.misses, self.size, self.peak_size,
+            ", max {}".format(self.maxsize) if self.maxsize is not None else "", self.evictions,
+            ", {} released".format(self.released) if self.released else "")
+
+
+# Stats of all the caches, by decorated function
+__cache_stats = []
+
+
+def __register_stats(func, maxsize=None):
+    stats = CacheStats(func.__module__.rpartition('.')[2] + "." + func.__name__, maxsize)
+    __cache_stats.append(stats)
+    return stats
+
+
+def reset_cache_stats():
+    for stats in __cache_stats:
+        stats.reset()
+
+
+def log_cache_stats(export_settings):
+    """Report the counters of caches used during the export, when debug logging is on."""
+    if not export_settings['log'].logger.isEnabledFor(logging.DEBUG):
+        return
+    for stats in __cache_stats:
+        if stats.hits or stats.misses:
+            export_settings['log'].debug("Cache {}".format(stats))
+    image_cache = export_settings.get('gltf_image_cache')
+    if image_cache is not None:
+        export_settings['log'].debug("Image cache {}: {} hits, {} encoded".format(
+            image_cache.directory, image_cache.hits, image_cache.misses))
+    mesh_cache = export_settings.get('gltf_mesh_cache')
+    if mesh_cache is not None:
+        export_settings['log'].debug("Mesh cache {}: {} hits, {} created".format(
+            mesh_cache.directory, mesh_cache.hits, mesh_cache.misses))
+
+
+def cached_by_key(key, maxsize=None):
     """
     Decorates functions whose result should be cached. Use it like:
         @cached_by_key(key=...)
@@ -14,8 +84,12 @@ def cached_by_key(key):
     (the cache is stored here).
     The key argument to the decorator is a function that computes the key to
     cache on. It is passed all the arguments to func.
+    When maxsize is given, only the maxsize last used results are kept. Only use
+    it for caches that are not needed for unicity (see "unique").
     """
     def inner(func):
+        stats = __register_stats(func, maxsize)
+
         @functools.wraps(func)
         def wrapper_cached(*args, **kwargs):
             if kwargs.get("export_settings"):
@@ -26,15 +100,25 @@ def cached_by_key(key):
             cache_key = key(*args, **kwargs)
 
             # invalidate cache if export settings have changed
-            if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
-                func.__cache = {}
+            # (export settings are a new dict for each export, no need to compare their content)
+            if not hasattr(func, "__export_settings") or export_settings is not func.__export_settings:
+                func.__cache = {} if maxsize is None else OrderedDict()
                 func.__export_settings = export_settings
+                stats.set_size(0)
             # use or fill cache
             if cache_key in func.__cache:
+                stats.hits += 1
+                if maxsize is not None:
+                    func.__cache.move_to_end(cache_key)
                 return func.__cache[cache_key]
             else:
+                stats.misses += 1
                 result = func(*args, **kwargs)
                 func.__cache[cache_key] = result
+                if maxsize is not None and len(func.__cache) > maxsize:
+                    func.__cache.popitem(last=False)
+                    stats.evictions += 1
+                stats.set_size(len(func.__cache))
                 return result
 
         return wrapper_cached
@@ -68,12 +152,101 @@ def default_key(*args, **kwargs):
 def cached(func):
     return cached_by_key(key=default_key)(func)
 
+
+# Sampled keyframes are only read once, when gathering their (cached) channel sampler
+KEYFRAMES_CACHE_SIZE = 64
+
+
+def lru_cached(maxsize):
+    """
+    Same as "cached", keeping only the maxsize last used results. Use it like:
+        @lru_cached(maxsize=...)
+        def func(..., export_settings):
+            ...
+    """
+    return cached_by_key(key=default_key, maxsize=maxsize)
+
+def __count_values(data, depth=3):
+    # Number of values (frames) in sampled data of an object: data[action_name][path][bone][frame]
+    if depth == 0:
+        return len(data)
+    if not isinstance(data, dict):
+        return 1
+    return sum(__count_values(d, depth - 1) for d in data.values())
+
+
+def __driver_owner(key):
+    # Data of shape keys driven by an armature are keyed "armature_uuid + '_' + action_name"
+    if isinstance(key, str):
+        owner, sep, _ = key.partition("_")
+        if sep:
+            return owner
+    return None
+
+
+def __missing_frames(cache, key_args):
+    # First and last frames to sample for the frame (or the (start_frame, end_frame) range of sampled matrices, see
+    # SampledMatrices) requested from the sampling cache, None if all are sampled
+    path, obj_uuid, bone, action_name, frame = key_args[:5]
+    start, end = frame if isinstance(frame, tuple) else (frame, frame)
+    data = cache[obj_uuid][action_name].get(path, {}).get(bone)
+    if data is None:
+        return start, end
+    if isinstance(data, dict):
+        return None if frame in data else (start, end)
+    return data.missing(start, end)
+
+
+def __merge_sampled(cache, result, depth=4):
+    # Add newly sampled frames to the cache: cache[obj_uuid][action_name][path][bone] are dicts keyed by frame or
+    # SampledMatrices, both updated with the new frames
+    for key, value in result.items():
+        if key not in cache.keys():
+            cache[key] = value
+        elif depth == 1:
+            cache[key].update(value)
+        else:
+            __merge_sampled(cache[key], value, depth - 1)
+
+
 def datacache(func):
+    stats = __register_stats(func)
 
     def reset_all_cache():
         func.__cache = {}
+        func.__sizes = {}
+        stats.set_size(0)
+
+    def update_size(obj_uuid):
+        old_size = func.__sizes.get(obj_uuid, 0)
+        func.__sizes[obj_uuid] = __count_values(func.__cache[obj_uuid], 3)
+        stats.set_size(stats.size + func.__sizes[obj_uuid] - old_size)
+        return old_size - func.__sizes[obj_uuid]
+
+    def release_object(obj_uuid):
+        """
+        Drop the sampled data of an object, once all its channels are gathered.
+        Data of shape keys driven by an armature belong to the armature, and are only dropped with it.
+        """
+        if not hasattr(func, "__cache"):
+            return
+        released = 0
+        for uuid, data in func.__cache.items():
+            if uuid == obj_uuid:
+                # Keep an empty entry: if needed again, only this object is sampled again
+                keys = [k for k in data.keys() if __driver_owner(k) == obj_uuid
+                        or __driver_owner(k) not in func.__cache.keys()]
+            else:
+                keys = [k for k in data.keys() if __driver_owner(k) == obj_uuid]
+            if not keys:
+                continue
+            for k in keys:
+                del data[k]
+            released += update_size(uuid)
+        stats.released += released
 
     func.reset_cache = reset_all_cache
+    func.release_object = release_object
 
     @functools.wraps(func)
     def wrapper_objectcache(*args, **kwargs):
@@ -82,10 +255,11 @@ def datacache(func):
         # 1 : object_uuid
         # 2 : bone (can be, of course, None for path other than 'bone')
         # 3 : action_name
-        # 4 : current_frame
+        # 4 : current_frame, or (start_frame, end_frame) for all sampled matrices of an object or a bone
         # 5 : step
         # 6 : export_settings
         # only_gather_provided : only_gather_provided
+        # frames : only sample these frames (start, end), missing from the cache
 
         cache_key_args = args
         cache_key_args = args[:-1]
@@ -95,23 +269,41 @@ def datacache(func):
 
         # object is not cached yet
         if cache_key_args[1] not in func.__cache.keys():
+            stats.misses += 1
             result = func(*args)
             func.__cache = result
-            # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
+            func.__sizes = {}
+            stats.set_size(0)
+            for uuid in result.keys():
+                update_size(uuid)
         # object is in cache, but not this action
         # We need to not erase other actions of this object
         elif cache_key_args[3] not in func.__cache[cache_key_args[1]].keys():
+            stats.misses += 1
             result = func(*args, only_gather_provided=True)
             # The result can contains multiples animations, in case this is an armature with drivers
             # Need to create all newly retrieved animations
             func.__cache.update(result)
-            # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return result[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
-        # all is already cached
+            for uuid in result.keys():
+                update_size(uuid)
         else:
-            # Here are the key used: result[obj_uuid][action_name][path][bone][frame]
-            return func.__cache[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]][cache_key_args[4]]
+            # action is in cache, but some frames can be missing: when sampling another action of an object, only
+            # the range of this action is sampled. Only the missing frames are sampled, and added to the cache.
+            missing = __missing_frames(func.__cache, cache_key_args)
+            if missing is None:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+                result = func(*args, only_gather_provided=True, frames=missing)
+                __merge_sampled(func.__cache, result)
+                for uuid in result.keys():
+                    update_size(uuid)
+
+        # Here are the key used: cache[obj_uuid][action_name][path][bone][frame]
+        data = func.__cache[cache_key_args[1]][cache_key_args[3]][cache_key_args[0]][cache_key_args[2]]
+        if isinstance(cache_key_args[4], tuple):
+            return data.get_range(*cache_key_args[4])
+        return data[cache_key_args[4]]
     return wrapper_objectcache
 
 # TODO: replace "cached" with "unique" in all cases where the caching is functional and not only for performance reasons
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import gltf2_blender_gather_cache
+else:
+    from . import gltf2_blender_gather_cache
+
+import unittest
+
+
+class DatacacheTest(unittest.TestCase):
+    def setUp(self):
+        self.sampled = []
+
+        @gltf2_blender_gather_cache.datacache
+        def get_cache_data(path, obj_uuid, bone, action_name, current_frame, step, export_settings,
+                           only_gather_provided=False, frames=None):
+            # Like the sampling cache, the first call samples the whole range.
+            start, end = frames if frames is not None else (0, 10)
+            self.sampled.append((start, end))
+            return {obj_uuid: {action_name: {path: {bone: {f: 2 * f for f in range(start, end + 1, step)}}}}}
+
+        self.get_cache_data = get_cache_data
+        get_cache_data.reset_cache()
+
+    def test_missing_frames(self):
+        self.assertEqual(self.get_cache_data('value', "obj", None, "action", 4, 1, {}), 8)
+        self.assertEqual(self.sampled, [(0, 10)])
+        # Only the missing frame is sampled, once.
+        for _ in range(3):
+            self.assertEqual(self.get_cache_data('value', "obj", None, "action", 15, 1, {}), 30)
+        self.assertEqual(self.sampled, [(0, 10), (15, 15)])
+        # Frames sampled first are kept.
+        self.assertEqual(self.get_cache_data('value', "obj", None, "action", 10, 1, {}), 20)
+        self.assertEqual(self.sampled, [(0, 10), (15, 15)])
+
+    def test_missing_action(self):
+        self.get_cache_data('value', "obj", None, "action", 4, 1, {})
+        self.assertEqual(self.get_cache_data('value', "obj", None, "other", 4, 1, {}), 8)
+        self.assertEqual(self.sampled, [(0, 10), (0, 10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
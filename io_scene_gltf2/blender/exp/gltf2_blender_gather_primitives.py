@@ -82,6 +82,10 @@ def gather_primitives(
         )
         primitives.append(primitive)
 
+        # Primitive not created yet, completed in the primitive creation stage
+        if "mesh_primitives" in internal_primitive:
+            internal_primitive["mesh_primitives"].append(primitive)
+
     return primitives
 
 
@@ -119,27 +123,78 @@ def __gather_cache_primitives(
     """
     Gather parts that are identical for instances, i.e. excluding materials
     """
-    primitives = []
+    if blender_mesh.shape_keys is not None:
+        exported_shape_key_count = len(get_sk_exported(blender_mesh.shape_keys.key_blocks))
+    else:
+        exported_shape_key_count = 0
+
+    queue = export_settings.get('gltf_primitive_creation_queue')
+    if queue is None:
+        blender_primitives, additional_materials_udim, shared_attributes = gltf2_blender_gather_primitives_extract.extract_primitives(
+            materials, blender_mesh, uuid_for_skined_data, vertex_groups, modifiers, export_settings)
+
+        primitives = __gather_created_primitives(blender_primitives, shared_attributes, exported_shape_key_count, export_settings)
+        return primitives, additional_materials_udim
 
-    blender_primitives, additional_materials_udim, shared_attributes = gltf2_blender_gather_primitives_extract.extract_primitives(
+    # Primitives are created later, in the creation stage. Everything but their attributes, indices and targets is
+    # already known: glTF primitives can be gathered now, they are completed once created (see gather_primitives).
+    primitive_creator = gltf2_blender_gather_primitives_extract.prepare_primitives(
         materials, blender_mesh, uuid_for_skined_data, vertex_groups, modifiers, export_settings)
+    layout, additional_materials_udim, _shared = primitive_creator.primitive_layout()
+
+    primitives = []
+    for internal_primitive in layout:
+        primitives.append({
+            "attributes": None,
+            "indices": None,
+            "mode": internal_primitive.get('mode'),
+            "material": internal_primitive.get('material'),
+            "targets": None,
+            "uvmap_attributes_index": internal_primitive.get('uvmap_attributes_index'),
+            "mesh_primitives": []
+        })
+
+    mesh_name = blender_mesh.name
+
+    def finish(blender_primitives, _additional_materials, shared_attributes):
+        created = __gather_created_primitives(blender_primitives, shared_attributes, exported_shape_key_count, export_settings)
+        # The layout is computed apart from the creation of primitives, make sure they are the same primitives
+        layout_keys = [(p['mode'], p['material'], p['uvmap_attributes_index']) for p in primitives]
+        created_keys = [(p['mode'], p['material'], p['uvmap_attributes_index']) for p in created]
+        if layout_keys != created_keys:
+            raise RuntimeError("Primitives created for mesh {} do not match their layout: {} instead of {}".format(
+                mesh_name, created_keys, layout_keys))
+        for primitive, created_primitive in zip(primitives, created):
+            for key in ("attributes", "indices", "targets"):
+                primitive[key] = created_primitive[key]
+            for mesh_primitive in primitive.pop("mesh_primitives"):
+                mesh_primitive.attributes = primitive["attributes"]
+                mesh_primitive.indices = primitive["indices"]
+                mesh_primitive.targets = primitive["targets"]
+
+    queue.submit(primitive_creator, finish)
+
+    return primitives, additional_materials_udim
 
 
+def __gather_created_primitives(blender_primitives, shared_attributes, exported_shape_key_count, export_settings):
+    primitives = []
+
     if shared_attributes is not None:
 
         if len(blender_primitives) > 0:
             shared = {}
             shared["attributes"] = shared_attributes
 
-            attributes = __gather_attributes(shared, blender_mesh, modifiers, export_settings)
-            targets = __gather_targets(shared, blender_mesh, modifiers, export_settings)
+            attributes = __gather_attributes(shared, export_settings)
+            targets = __gather_targets(shared, exported_shape_key_count, export_settings)
 
         for internal_primitive in blender_primitives:
             if internal_primitive.get('mode') is None:
 
                 primitive = {
                     "attributes": attributes,
-                    "indices": __gather_indices(internal_primitive, blender_mesh, modifiers, export_settings),
+                    "indices": __gather_indices(internal_primitive, export_settings),
                     "mode": internal_primitive.get('mode'),
                     "material": internal_primitive.get('material'),
                     "targets": targets,
@@ -149,11 +204,11 @@ def __gather_cache_primitives(
             else:
                 # Edges & points, no shared attributes
                 primitive = {
-                    "attributes": __gather_attributes(internal_primitive, blender_mesh, modifiers, export_settings),
-                    "indices": __gather_indices(internal_primitive, blender_mesh, modifiers, export_settings),
+                    "attributes": __gather_attributes(internal_primitive, export_settings),
+                    "indices": __gather_indices(internal_primitive, export_settings),
                     "mode": internal_primitive.get('mode'),
                     "material": internal_primitive.get('material'),
-                    "targets": __gather_targets(internal_primitive, blender_mesh, modifiers, export_settings),
+                    "targets": __gather_targets(internal_primitive, exported_shape_key_count, export_settings),
                     "uvmap_attributes_index": internal_primitive.get('uvmap_attributes_index')
                 }
             primitives.append(primitive)
@@ -162,18 +217,18 @@ def __gather_cache_primitives(
 
         for internal_primitive in blender_primitives:
             primitive = {
-                    "attributes": __gather_attributes(internal_primitive, blender_mesh, modifiers, export_settings),
-                    "indices": __gather_indices(internal_primitive, blender_mesh, modifiers, export_settings),
+                    "attributes": __gather_attributes(internal_primitive, export_settings),
+                    "indices": __gather_indices(internal_primitive, export_settings),
                     "mode": internal_primitive.get('mode'),
                     "material": internal_primitive.get('material'),
-                    "targets": __gather_targets(internal_primitive, blender_mesh, modifiers, export_settings),
+                    "targets": __gather_targets(internal_primitive, exported_shape_key_count, export_settings),
                     "uvmap_attributes_index": internal_primitive.get('uvmap_attributes_index')
                 }
             primitives.append(primitive)
 
-    return primitives, additional_materials_udim
+    return primitives
 
-def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings):
+def __gather_indices(blender_primitive, export_settings):
     indices = blender_primitive.get('indices')
     if indices is None:
         return None
@@ -208,59 +263,58 @@ def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings
     )
 
 
-def __gather_attributes(blender_primitive, blender_mesh, modifiers, export_settings):
+def __gather_attributes(blender_primitive, export_settings):
     return gltf2_blender_gather_primitive_attributes.gather_primitive_attributes(blender_primitive, export_settings)
 
 
-def __gather_targets(blender_primitive, blender_mesh, modifiers, export_settings):
+def __gather_targets(blender_primitive, exported_shape_key_count, export_settings):
     if export_settings['gltf_morph']:
         targets = []
-        if blender_mesh.shape_keys is not None:
-            morph_index = 0
-            for blender_shape_key in get_sk_exported(blender_mesh.shape_keys.key_blocks):
-
-                target_position_id = 'MORPH_POSITION_' + str(morph_index)
-                target_normal_id = 'MORPH_NORMAL_' + str(morph_index)
-                target_tangent_id = 'MORPH_TANGENT_' + str(morph_index)
-
-                if blender_primitive["attributes"].get(target_position_id) is not None:
-                    target = {}
-                    internal_target_position = blender_primitive["attributes"][target_position_id]["data"]
-                    target["POSITION"] = array_to_accessor(
-                        internal_target_position,
+        morph_index = 0
+        for _ in range(exported_shape_key_count):
+
+            target_position_id = 'MORPH_POSITION_' + str(morph_index)
+            target_normal_id = 'MORPH_NORMAL_' + str(morph_index)
+            target_tangent_id = 'MORPH_TANGENT_' + str(morph_index)
+
+            if blender_primitive["attributes"].get(target_position_id) is not None:
+                target = {}
+                internal_target_position = blender_primitive["attributes"][target_position_id]["data"]
+                target["POSITION"] = array_to_accessor(
+                    internal_target_position,
+                    export_settings,
+                    component_type=gltf2_io_constants.ComponentType.Float,
+                    data_type=gltf2_io_constants.DataType.Vec3,
+                    include_max_and_min=True,
+                    sparse_type='SK'
+                )
+
+                if export_settings['gltf_normals'] \
+                        and export_settings['gltf_morph_normal'] \
+                        and blender_primitive["attributes"].get(target_normal_id) is not None:
+
+                    internal_target_normal = blender_primitive["attributes"][target_normal_id]["data"]
+                    target['NORMAL'] = array_to_accessor(
+                        internal_target_normal,
                         export_settings,
                         component_type=gltf2_io_constants.ComponentType.Float,
                         data_type=gltf2_io_constants.DataType.Vec3,
-                        include_max_and_min=True,
                         sparse_type='SK'
                     )
 
-                    if export_settings['gltf_normals'] \
-                            and export_settings['gltf_morph_normal'] \
-                            and blender_primitive["attributes"].get(target_normal_id) is not None:
-
-                        internal_target_normal = blender_primitive["attributes"][target_normal_id]["data"]
-                        target['NORMAL'] = array_to_accessor(
-                            internal_target_normal,
-                            export_settings,
-                            component_type=gltf2_io_constants.ComponentType.Float,
-                            data_type=gltf2_io_constants.DataType.Vec3,
-                            sparse_type='SK'
-                        )
-
-                    if export_settings['gltf_tangents'] \
-                            and export_settings['gltf_morph_tangent'] \
-                            and blender_primitive["attributes"].get(target_tangent_id) is not None:
-                        internal_target_tangent = blender_primitive["attributes"][target_tangent_id]["data"]
-                        target['TANGENT'] = array_to_accessor(
-                            internal_target_tangent,
-                            export_settings,
-                            component_type=gltf2_io_constants.ComponentType.Float,
-                            data_type=gltf2_io_constants.DataType.Vec3,
-                            sparse_type='SK'
-                        )
-                    targets.append(target)
-                    morph_index += 1
+                if export_settings['gltf_tangents'] \
+                        and export_settings['gltf_morph_tangent'] \
+                        and blender_primitive["attributes"].get(target_tangent_id) is not None:
+                    internal_target_tangent = blender_primitive["attributes"][target_tangent_id]["data"]
+                    target['TANGENT'] = array_to_accessor(
+                        internal_target_tangent,
+                        export_settings,
+                        component_type=gltf2_io_constants.ComponentType.Float,
+                        data_type=gltf2_io_constants.DataType.Vec3,
+                        sparse_type='SK'
+                    )
+                targets.append(target)
+                morph_index += 1
         return targets
     return None
 
@@ -2,6 +2,10 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 from copy import deepcopy
 from mathutils import Vector
@@ -16,8 +20,17 @@ from .material.gltf2_blender_gather_texture_info import gather_udim_texture_info
 from . import gltf2_blender_gather_skins
 
 
+_CREATION_QUEUE_ENABLED = True
+
+
 def extract_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
     """Extract primitives from a mesh."""
+    primitive_creator = prepare_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings)
+    return primitive_creator.create_primitives()
+
+
+def prepare_primitives(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
+    """Read from Blender all the data needed to create the primitives of a mesh."""
     export_settings['log'].info("Extracting primitive: " + blender_mesh.name)
 
     primitive_creator = PrimitiveCreator(materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings)
@@ -27,10 +40,58 @@ def extract_primitives(materials, blender_mesh, uuid_for_skined_data, blender_ve
     primitive_creator.populate_dots_data()
     primitive_creator.primitive_split()
     primitive_creator.manage_material_info() # UVMap & Vertex Color
-    if export_settings['gltf_shared_accessors'] is False:
-        return primitive_creator.primitive_creation_not_shared(), primitive_creator.additional_materials, None
-    else:
-        return primitive_creator.primitive_creation_shared()
+    return primitive_creator
+
+
+class PrimitiveCreationQueue:
+    """Primitive creation stage of the export.
+
+    While it is active (see stage_cm), primitives of meshes are not created when gathered: once the data of a mesh
+    is read from Blender (see prepare_primitives), its primitives are created in a pool of threads, while next meshes
+    are read. Created primitives are then finished on the main thread, in submission order.
+    """
+
+    def __init__(self, export_settings, max_workers=None):
+        self.export_settings = export_settings
+        if max_workers is None:
+            max_workers = min(32, os.cpu_count() or 1)
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Only a few meshes are kept pending, so that data of all meshes are not in memory at once.
+        self.__max_pending = max_workers * 2
+        self.__pending = deque()
+
+    @classmethod
+    @contextmanager
+    def stage_cm(cls, export_settings):
+        """Create the primitives gathered in this context in a creation stage, all primitives are finished on exit."""
+        # Hooks of user extensions may need primitives right when meshes are gathered.
+        if not _CREATION_QUEUE_ENABLED or export_settings['gltf_user_extensions']:
+            yield None
+            return
+
+        queue = cls(export_settings)
+        export_settings['gltf_primitive_creation_queue'] = queue
+        try:
+            yield queue
+            queue.finish()
+        finally:
+            export_settings['gltf_primitive_creation_queue'] = None
+            queue.__executor.shutdown(cancel_futures=True)
+
+    def submit(self, primitive_creator, finish):
+        """Create primitives of a prepared mesh, `finish` is later called with the result of create_primitives."""
+        self.__pending.append((finish, self.__executor.submit(primitive_creator.create_primitives)))
+        while len(self.__pending) > self.__max_pending:
+            self.__finish_oldest()
+
+    def finish(self):
+        while self.__pending:
+            self.__finish_oldest()
+
+    def __finish_oldest(self):
+        finish, future = self.__pending.popleft()
+        finish(*future.result())
+
 
 class PrimitiveCreator:
     def __init__(self, materials, blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
@@ -633,6 +694,86 @@ class PrimitiveCreator:
 
         self.prim_indices = new_prim_indices
 
+    def create_primitives(self):
+        """Create primitives from the data read from Blender.
+
+        Does not access Blender data anymore, so that it can run in another thread (see PrimitiveCreationQueue).
+        """
+        cache = self.export_settings.get('gltf_mesh_cache')
+        # UDIM materials are not cached, primitives are then created each time.
+        if cache is None or any(m is not None for m in self.additional_materials):
+            return self.__create_primitives()
+        primitives, additional_materials, shared_attributes = cache.get_or_create(
+            cache.key(*self.cache_key_parts()), self.__create_primitives)
+
+        # Component types are cached as plain integers.
+        for attributes in [p['attributes'] for p in primitives if 'attributes' in p] + [shared_attributes or {}]:
+            for attribute in attributes.values():
+                if isinstance(attribute, dict) and 'component_type' in attribute:
+                    attribute['component_type'] = gltf2_io_constants.ComponentType(attribute['component_type'])
+        return primitives, additional_materials, shared_attributes
+
+    def cache_key_parts(self):
+        """All data primitives are created from, for the mesh cache."""
+        parts = [
+            self.export_settings['gltf_shared_accessors'],
+            self.export_settings['gltf_loose_edges'],
+            self.export_settings['gltf_loose_points'],
+            self.tex_coord_max,
+            self.uvmap_attribute_list,
+            [{k: v for k, v in attr.items() if not callable(v)} for attr in self.blender_attributes],
+            self.dots,
+            self.locs,
+            len(self.morph_locs),
+            *self.morph_locs,
+            len(self.prim_indices),
+        ]
+        for material_idx, dot_indices in self.prim_indices.items():
+            parts.extend((int(material_idx), dot_indices))
+        parts.append(bool(self.skin))
+        if self.skin:
+            parts.extend((self.num_joint_sets, self.vert_bones))
+        if self.export_settings['gltf_loose_edges']:
+            parts.extend((self.dots_edges, self.blender_idxs_edges))
+        if self.export_settings['gltf_loose_points']:
+            parts.extend((self.dots_points, self.blender_idxs_points))
+        return parts
+
+    def __create_primitives(self):
+        if self.export_settings['gltf_shared_accessors'] is False:
+            return self.primitive_creation_not_shared(), self.additional_materials, None
+        else:
+            return self.primitive_creation_shared()
+
+    def primitive_layout(self):
+        """Describe the primitives create_primitives will return, without creating them.
+
+        :return: primitives (without attributes nor indices), additional materials, and whether attributes are shared
+        """
+        primitives = []
+        for material_idx, dot_indices in self.prim_indices.items():
+            if len(dot_indices) == 0:
+                continue
+            primitives.append({
+                'material': material_idx,
+                'uvmap_attributes_index': {attr: self.tex_coord_max + i for i, attr in enumerate(self.uvmap_attribute_list)}
+            })
+        has_triangle_primitive = len(primitives) != 0
+
+        # Edges & points primitives have no material (see primitive_creation_edges_and_points)
+        additional_materials = list(self.additional_materials)
+        if self.export_settings['gltf_loose_edges'] and self.blender_idxs_edges.shape[0] > 0:
+            primitives.append({'mode': 1, 'material': 0, 'uvmap_attributes_index': {}})
+            additional_materials.append(None)
+        if self.export_settings['gltf_loose_points'] and self.blender_idxs_points.shape[0] > 0:
+            primitives.append({'mode': 0, 'material': 0, 'uvmap_attributes_index': {}})
+            additional_materials.append(None)
+
+        if self.export_settings['gltf_shared_accessors'] is False:
+            return primitives, additional_materials, False
+        else:
+            return primitives, [None] * len(primitives), has_triangle_primitive
+
     def primitive_creation_shared(self):
         primitives = []
         self.dots, shared_dot_indices = fast_structured_np_unique(self.dots, return_inverse=True)
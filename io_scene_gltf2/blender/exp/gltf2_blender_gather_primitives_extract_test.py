@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Must be run from Blender, with the glTF add-on available:
+#     blender --background --factory-startup --python gltf2_blender_gather_primitives_extract_test.py
+
+import os
+import tempfile
+import unittest
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    gltf2_blender_gather_primitives_extract = None
+elif __name__ == '__main__':
+    from io_scene_gltf2.blender.exp import gltf2_blender_gather_primitives_extract
+else:
+    from . import gltf2_blender_gather_primitives_extract
+
+
+def _make_scene(mesh_count):
+    """A scene with many meshes, some of them instanced, with several materials, shape keys and loose geometry."""
+    materials = [bpy.data.materials.new("Material%d" % i) for i in range(3)]
+
+    for i in range(mesh_count):
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=8 + 4 * i, ring_count=6 + 2 * i, location=(3.0 * i, 0.0, 0.0))
+        obj = bpy.context.object
+        mesh = obj.data
+        for material in materials[:1 + i % 3]:
+            mesh.materials.append(material)
+        for polygon in mesh.polygons:
+            polygon.material_index = polygon.index % len(mesh.materials)
+
+        if i % 2 == 0:
+            obj.shape_key_add(name="Basis")
+            key = obj.shape_key_add(name="Key")
+            for point in key.data[::3]:
+                point.co.z += 0.5
+
+        if i % 3 == 0:
+            # Loose edge and loose point.
+            start = len(mesh.vertices)
+            mesh.vertices.add(3)
+            for vertex, co in zip(mesh.vertices[start:], ((0.0, 0.0, 2.0), (0.0, 1.0, 2.0), (1.0, 1.0, 2.0))):
+                vertex.co = co
+            mesh.edges.add(1)
+            mesh.edges[-1].vertices = (start, start + 1)
+            mesh.update()
+
+        if i % 4 == 0:
+            # An instance, sharing the mesh.
+            instance = obj.copy()
+            instance.location.y = 3.0
+            bpy.context.collection.objects.link(instance)
+
+
+def _read_files(directory):
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class ParallelCreationTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        _make_scene(12)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        gltf2_blender_gather_primitives_extract._CREATION_QUEUE_ENABLED = True
+        prefs = bpy.context.preferences.addons["io_scene_gltf2"].preferences
+        prefs.mesh_cache_ui = False
+        prefs.mesh_cache_dir_ui = ""
+        self.tmpdir.cleanup()
+
+    def _export(self, use_queue, **settings):
+        gltf2_blender_gather_primitives_extract._CREATION_QUEUE_ENABLED = use_queue
+        directory = os.path.join(self.tmpdir.name, "%s_%d" % ("parallel" if use_queue else "serial", len(os.listdir(self.tmpdir.name))))
+        os.makedirs(directory)
+        bpy.ops.export_scene.gltf(filepath=os.path.join(directory, "scene.gltf"), export_format='GLTF_SEPARATE',
+                                  export_morph_normal=True, export_morph_tangent=True, export_tangents=True,
+                                  use_mesh_edges=True, use_mesh_vertices=True, **settings)
+        return _read_files(directory)
+
+    def test_identical(self):
+        files = self._export(True)
+        self.assertEqual(files, self._export(False))
+
+    def test_identical_shared_accessors(self):
+        files = self._export(True, export_shared_accessors=True)
+        self.assertEqual(files, self._export(False, export_shared_accessors=True))
+
+    def test_mesh_cache(self):
+        files = self._export(False)
+        prefs = bpy.context.preferences.addons["io_scene_gltf2"].preferences
+        prefs.mesh_cache_ui = True
+        with tempfile.TemporaryDirectory() as cache_dir:
+            prefs.mesh_cache_dir_ui = cache_dir
+            # Filling the cache, then using it.
+            self.assertEqual(files, self._export(True))
+            self.assertEqual(files, self._export(True))
+            self.assertEqual(files, self._export(False))
+
+    def test_identical_modifiers(self):
+        for obj in bpy.context.scene.objects:
+            obj.modifiers.new("Subdivision", 'SUBSURF')
+        files = self._export(True, export_apply=True)
+        self.assertEqual(files, self._export(False, export_apply=True))
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
@@ -69,6 +69,8 @@ class GlTF2Exporter:
 
         self.__buffer = gltf2_io_buffer.Buffer()
         self.__images = {}
+        # Indices of the images already traversed, by content (see __image_key)
+        self.__image_indices = {}
 
         # mapping of all glTFChildOfRootProperty types to their corresponding root level arrays
         self.__childOfRootPropertyTypeLookup = {
@@ -122,7 +124,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + uri_to_path(buffer_name), 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -139,7 +141,8 @@ class GlTF2Exporter:
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            # Copied to the file chunk by chunk by gltf2_io_export.save_gltf.
+            return self.__buffer
 
     def add_draco_extension(self):
         """
@@ -419,6 +422,26 @@ class GlTF2Exporter:
             target.append(obj)
             return index
 
+    @staticmethod
+    def __image_key(image: gltf2_io.Image):
+        """
+        Content of an image not traversed yet, or None.
+
+        Images encoded in an encoding stage (see ImageEncodeQueue) only get their data at the end of the stage, so
+        identical images are only known to be the same when traversed.
+        """
+        if image.extensions is not None or image.extras is not None:
+            return None
+        if isinstance(image.buffer_view, gltf2_io_binary_data.BinaryData):
+            data, uri_name = image.buffer_view.data, None
+        elif isinstance(image.uri, gltf2_io_image_data.ImageData):
+            data, uri_name = image.uri.data, image.uri.name
+        else:
+            return None
+        if data is None:
+            return None
+        return data, image.mime_type, image.name, uri_name
+
     def __add_image(self, image: gltf2_io_image_data.ImageData):
         name = image.adjusted_name()
         count = 1
@@ -503,8 +526,13 @@ class GlTF2Exporter:
         """
         # traverse nodes of a child of root property type and add them to the glTF root
         if type(node) in self.__childOfRootPropertyTypeLookup:
+            image_key = self.__image_key(node) if type(node) == gltf2_io.Image else None
+            if image_key in self.__image_indices:
+                return self.__image_indices[image_key]
             node = self.__traverse_property(node)
             idx = self.__to_reference(node)
+            if image_key is not None:
+                self.__image_indices[image_key] = idx
             # child of root properties are only present at root level --> replace with index in upper level
             return idx
 
@@ -4,11 +4,21 @@
 
 import bpy
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional, Tuple
 import numpy as np
 import tempfile
 import enum
 
+from .....io.exp.gltf2_io_binary_data import BinaryData
+from .....io.exp.gltf2_io_disk_cache import ImageCache
+from .....io.exp.gltf2_io_image_data import ImageData
+
+# For debugging/profiling purposes, can be modified at runtime to encode images one after another, while gathering.
+_ENCODE_QUEUE_ENABLED = True
+
 
 class Channel(enum.IntEnum):
     R = 0
@@ -169,11 +179,66 @@ class ExportImage:
         )
 
     def encode(self, mime_type: Optional[str], export_settings) -> Tuple[bytes, bool]:
-        self.file_format = {
-            "image/jpeg": "JPEG",
-            "image/png": "PNG",
-            "image/webp": "WEBP"
-        }.get(mime_type, "PNG")
+        job = self.prepare_encode(mime_type, export_settings)
+        job.run(export_settings.get('gltf_image_cache'))
+        job.finish(export_settings)
+        return job.data, job.factor
+
+    def encode_binary_data(self, mime_type: Optional[str], export_settings):
+        """Return a tuple (BinaryData of the encoded image, factor), like encode."""
+        return self.__encode_into(
+            BinaryData.pending, ("BINARY",), mime_type, export_settings)
+
+    def encode_image_data(self, mime_type: Optional[str], name: str, export_settings):
+        """Return a tuple (ImageData of the encoded image, factor), like encode."""
+        return self.__encode_into(
+            lambda: ImageData(data=None, mime_type=mime_type, name=name), ("URI", name), mime_type, export_settings)
+
+    def __encode_into(self, make_target, target_key, mime_type: Optional[str], export_settings):
+        """Encode the image into the data of a new target (ImageData or BinaryData).
+
+        While an image encoding stage is running (see ImageEncodeQueue), the data of the target is only set once
+        the stage is finished, and images made of the same content share the same target."""
+        queue = export_settings.get('gltf_image_encode_queue')
+        if queue is not None:
+            signature = self.__signature(mime_type, export_settings)
+            target = queue.get_target(signature, target_key)
+            if target is not None:
+                return target, None
+
+        job = self.prepare_encode(mime_type, export_settings)
+        target = make_target()
+        job.targets.append(target)
+        if queue is None:
+            job.run(export_settings.get('gltf_image_cache'))
+            job.finish(export_settings)
+        else:
+            queue.submit(job, signature, target_key, target)
+        return target, job.factor
+
+    def __signature(self, mime_type: Optional[str], export_settings):
+        """Describe the content of the encoded image, without encoding it: images with the same signature are
+        identical. None when it can only be known once encoded."""
+        if self.numpy_calc is not None or self.original is not None:
+            return None
+        fills = []
+        for dst_chan, fill in sorted(self.fills.items()):
+            if isinstance(fill, FillImage):
+                fills.append((int(dst_chan), "IMAGE", fill.image.as_pointer(), int(fill.src_chan)))
+            elif isinstance(fill, FillImageTile):
+                fills.append((int(dst_chan), "TILE", fill.image.as_pointer(), fill.tile, int(fill.src_chan),
+                              export_settings['current_udim_info']['tile']))
+            elif isinstance(fill, FillWith):
+                fills.append((int(dst_chan), "WITH", repr(fill.value)))
+            else:
+                fills.append((int(dst_chan), "WHITE"))
+        return (_file_format(mime_type), tuple(fills))
+
+    def prepare_encode(self, mime_type: Optional[str], export_settings) -> 'EncodeJob':
+        """Do the part of the encoding that needs Blender data, see EncodeJob."""
+        file_format = _file_format(mime_type)
+        self.file_format = file_format
+        use_cache = export_settings.get('gltf_image_cache') is not None
 
         # Happy path = we can just use an existing Blender image
         if self.__on_happy_path():
@@ -181,25 +246,71 @@ class ExportImage:
             for fill in self.fills.values():
                 export_settings['exported_images'][fill.image.name] = 1 # Fully used
                 break
-            return self.__encode_happy(export_settings), None
+            return self.__prepare_happy(file_format, use_cache, export_settings)
 
         if self.__on_happy_path_udim():
-            return self.__encode_happy_tile(export_settings), None
+            return self.__prepare_happy_tile(file_format, export_settings)
 
         # Unhappy path = we need to create the image self.fills describes or self.stores describes
         if self.numpy_calc is None:
-            return self.__encode_unhappy(export_settings), None
+            return self.__prepare_unhappy(file_format, export_settings)
         else:
             pixels, width, height, factor = self.numpy_calc(self.stored, export_settings)
-            return self.__encode_from_numpy_array(pixels, (width, height), export_settings), factor
+            job = self.__prepare_from_numpy_array(pixels, (width, height), file_format, export_settings)
+            job.factor = factor
+            return job
+
+    def __prepare_happy(self, file_format, use_cache, export_settings) -> 'EncodeJob':
+        image = self.blender_image(export_settings)
+        job = EncodeJob(file_format, export_settings['gltf_image_quality'])
 
-    def __encode_happy(self, export_settings) -> bytes:
-        return self.__encode_from_image(self.blender_image(export_settings), export_settings)
+        # See if there is an existing file we can use.
+        # Sequence image can't be exported, but it avoid to crash to check that default image exists
+        # Else, it can crash when trying to access a non existing image
+        src_path = None
+        data = None
+        if image.source in ['FILE', 'SEQUENCE'] and not image.is_dirty:
+            if image.packed_file is not None:
+                data = image.packed_file.data
+            else:
+                src_path = bpy.path.abspath(image.filepath_raw)
+                if not os.path.isfile(src_path):
+                    src_path = None
+
+        def encode():
+            # Copy to a temp image and save.
+            with TmpImageGuard() as guard:
+                make_temp_image_copy(guard, src_image=image)
+                tmp_image = guard.image
+                return _encode_temp_image(tmp_image, file_format, export_settings)
+
+        job.encode = encode
+        job.read = lambda: _read_file(src_path) if src_path is not None else data
+        key_parts = ("IMAGE", tuple(image.size), image.channels, image.is_float, image.alpha_mode,
+                     image.colorspace_settings.name)
+        if src_path is None and data is None:
+            # Generated image, or unsaved changes: without the cache, pixels are not read, so there is no key at
+            # all, since images of the same size would have the same one.
+            if use_cache:
+                pixels = np.empty(image.size[0] * image.size[1] * image.channels, np.float32)
+                image.pixels.foreach_get(pixels)
+                job.key_parts = key_parts + (pixels,)
+        else:
+            # Content of the source file.
+            job.key_parts = lambda data: key_parts + (data,)
+        return job
 
-    def __encode_happy_tile(self, export_settings) -> bytes:
-        return self.__encode_from_image_tile(self.fills[list(self.fills.keys())[0]].image, export_settings['current_udim_info']['tile'], export_settings)
+    def __prepare_happy_tile(self, file_format, export_settings) -> 'EncodeJob':
+        udim_image = self.fills[list(self.fills.keys())[0]].image
+        tile = export_settings['current_udim_info']['tile']
+        src_path = bpy.path.abspath(udim_image.filepath_raw).replace("<UDIM>", tile)
 
-    def __encode_unhappy(self, export_settings) -> bytes:
+        job = EncodeJob(file_format, export_settings['gltf_image_quality'])
+        job.read = lambda: _read_file(src_path)
+        # We don't manage UDIM packed image, so there is nothing to encode
+        return job
+
+    def __prepare_unhappy(self, file_format, export_settings) -> 'EncodeJob':
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels.
 
@@ -214,15 +325,15 @@ class ExportImage:
         if not images:
             # No ImageFills; use a 1x1 white pixel
             pixels = np.array([1.0, 1.0, 1.0, 1.0], np.float32)
-            return self.__encode_from_numpy_array(pixels, (1, 1), export_settings)
+            return self.__prepare_from_numpy_array(pixels, (1, 1), file_format, export_settings)
 
         width = max(image.size[0] for image in images)
         height = max(image.size[1] for image in images)
 
-        out_buf = np.ones(width * height * 4, np.float32)
-        tmp_buf = np.empty(width * height * 4, np.float32)
-
+        # Pixels of all images are read here, the channels are copied to the output by the job.
+        image_bufs = []
         for image in images:
+            tmp_buf = np.empty(width * height * 4, np.float32)
             if image.size[0] == width and image.size[1] == height:
                 image.pixels.foreach_get(tmp_buf)
             else:
@@ -232,82 +343,205 @@ class ExportImage:
                     tmp_image = guard.image
                     tmp_image.scale(width, height)
                     tmp_image.pixels.foreach_get(tmp_buf)
+            image_bufs.append((image, tmp_buf))
 
-            # Copy any channels for this image to the output
+        # Channels to copy to the output, (dst_chan, tmp_buf, src_chan) or (dst_chan, value, None).
+        copies = []
+        for image, tmp_buf in image_bufs:
             for dst_chan, fill in self.fills.items():
                 if isinstance(fill, FillImage) and fill.image == image:
-                    out_buf[int(dst_chan)::4] = tmp_buf[int(fill.src_chan)::4]
+                    copies.append((int(dst_chan), tmp_buf, int(fill.src_chan)))
                 elif isinstance(fill, FillWith):
-                    out_buf[int(dst_chan)::4] = fill.value
-
-        tmp_buf = None  # GC this
-
-        return self.__encode_from_numpy_array(out_buf, (width, height), export_settings)
+                    copies.append((int(dst_chan), fill.value, None))
+        image_bufs = None
+
+        def compose():
+            out_buf = np.ones(width * height * 4, np.float32)
+            for dst_chan, src, src_chan in copies:
+                if src_chan is None:
+                    out_buf[dst_chan::4] = src
+                else:
+                    out_buf[dst_chan::4] = src[src_chan::4]
+            copies.clear()  # GC this
+            return out_buf
+
+        job = self.__prepare_from_numpy_array(None, (width, height), file_format, export_settings)
+        job.compose = compose
+        return job
+
+    def __prepare_from_numpy_array(self, pixels, dim: Tuple[int, int], file_format, export_settings) -> 'EncodeJob':
+        alpha = Channel.A in self.fills
+        job = EncodeJob(file_format, export_settings['gltf_image_quality'])
+        job.pixels = pixels
+
+        def encode():
+            with TmpImageGuard() as guard:
+                guard.image = bpy.data.images.new(
+                    "##gltf-export:tmp-image##",
+                    width=dim[0],
+                    height=dim[1],
+                    alpha=alpha,
+                )
+                tmp_image = guard.image
+
+                tmp_image.pixels.foreach_set(job.pixels)
+
+                return _encode_temp_image(tmp_image, file_format, export_settings)
+
+        job.encode = encode
+        job.key_parts = lambda pixels: ("PIXELS", tuple(dim), alpha, pixels.dtype.str, pixels)
+        return job
+
+
+class EncodeJob:
+    """Encoding of an image, in three steps:
+    - prepare (ExportImage.prepare_encode): everything that needs Blender data, on the main thread.
+    - run: reading source files, composing channels with numpy, looking up the image cache, which can be done
+      in another thread.
+    - finish: encoding with Blender, if still needed, on the main thread. Encoded data is then set on the targets.
+    """
 
-    def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int], export_settings) -> bytes:
-        with TmpImageGuard() as guard:
-            guard.image = bpy.data.images.new(
-                "##gltf-export:tmp-image##",
-                width=dim[0],
-                height=dim[1],
-                alpha=Channel.A in self.fills,
-            )
-            tmp_image = guard.image
+    def __init__(self, file_format, quality):
+        self.file_format = file_format
+        self.quality = quality
+        self.factor = None
+        self.read = None  # Return the data of an existing image file, if any.
+        self.compose = None  # Return the pixels to encode.
+        self.pixels = None
+        self.encode = None  # Encode the image with Blender.
+        self.key_parts = None  # Describe the image to encode, for the image cache.
+        self.key = None
+        self.data = None
+        self.targets = []
+
+    def run(self, cache, use_key=False):
+        """Look the image up in the cache, if any, and compute its key if use_key is set."""
+        source = None
+        if self.read is not None:
+            source = self.read()
+            if source and _has_magic(source, self.file_format):
+                self.data = source
+                return
+        if self.compose is not None:
+            self.pixels = self.compose()
+            self.compose = None
+
+        if self.encode is None or self.key_parts is None or (cache is None and not use_key):
+            return
+        key_parts = self.key_parts
+        if callable(key_parts):
+            key_parts = key_parts(source if self.pixels is None else self.pixels)
+        self.key = ImageCache.key(self.file_format, self.quality, *key_parts)
+        if cache is not None:
+            self.data = cache.get(self.key)
+            if self.data is not None:
+                self.pixels = None
+
+    def finish(self, export_settings):
+        if self.data is None and self.encode is not None:
+            self.data = self.encode()
+            cache = export_settings.get('gltf_image_cache')
+            if cache is not None and self.key is not None and self.data:
+                cache.put(self.key, self.data)
+        self.pixels = None
+        self.encode = None
+        for target in self.targets:
+            target.data = self.data
+
+
+class ImageEncodeQueue:
+    """Image encoding stage of the export.
+
+    While it is active (see stage_cm), images are not encoded when gathered: once prepared, the part of their
+    encoding which does not need Blender (see EncodeJob.run) runs in a pool of threads, and the encoding with
+    Blender is done later on the main thread, in submission order. Images with identical content are only
+    encoded once.
+    """
 
-            tmp_image.pixels.foreach_set(pixels)
+    def __init__(self, export_settings, max_workers=None):
+        self.export_settings = export_settings
+        self.cache = export_settings.get('gltf_image_cache')
+        if max_workers is None:
+            max_workers = min(32, os.cpu_count() or 1)
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Only a few jobs are kept pending, so that pixels of all images are not in memory at once.
+        self.__max_pending = max_workers * 2
+        self.__pending = deque()
+        self.__encoded = {}
+        self.__targets = {}
+
+    @classmethod
+    @contextmanager
+    def stage_cm(cls, export_settings):
+        """Encode the images gathered in this context in an encoding stage, all images are encoded on exit."""
+        # Hooks of user extensions may need data of images right when they are gathered.
+        if not _ENCODE_QUEUE_ENABLED or export_settings['gltf_user_extensions']:
+            yield None
+            return
+
+        queue = cls(export_settings)
+        export_settings['gltf_image_encode_queue'] = queue
+        try:
+            yield queue
+            queue.finish()
+        finally:
+            export_settings['gltf_image_encode_queue'] = None
+            queue.__executor.shutdown(cancel_futures=True)
+
+    def get_target(self, signature, target_key):
+        """Return the target already submitted for an image of the same signature, if any."""
+        if signature is None:
+            return None
+        return self.__targets.get((signature, target_key))
+
+    def submit(self, job: EncodeJob, signature, target_key, target):
+        if signature is not None:
+            self.__targets[(signature, target_key)] = target
+        self.__pending.append((job, self.__executor.submit(job.run, self.cache, True)))
+        while len(self.__pending) > self.__max_pending:
+            self.__finish_oldest()
+
+    def finish(self):
+        while self.__pending:
+            self.__finish_oldest()
+        self.__encoded.clear()
+        self.__targets.clear()
+
+    def __finish_oldest(self):
+        job, future = self.__pending.popleft()
+        future.result()
+        if job.data is None and job.key in self.__encoded:
+            job.data = self.__encoded[job.key]
+        job.finish(self.export_settings)
+        if job.key is not None:
+            self.__encoded[job.key] = job.data
+
+
+def _file_format(mime_type: Optional[str]) -> str:
+    return {
+        "image/jpeg": "JPEG",
+        "image/png": "PNG",
+        "image/webp": "WEBP"
+    }.get(mime_type, "PNG")
+
+
+def _read_file(path):
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return None
 
-            return _encode_temp_image(tmp_image, self.file_format, export_settings)
 
-    def __encode_from_image(self, image: bpy.types.Image, export_settings) -> bytes:
-        # See if there is an existing file we can use.
-        data = None
-        # Sequence image can't be exported, but it avoid to crash to check that default image exists
-        # Else, it can crash when trying to access a non existing image
-        if image.source in ['FILE', 'SEQUENCE'] and not image.is_dirty:
-            if image.packed_file is not None:
-                data = image.packed_file.data
-            else:
-                src_path = bpy.path.abspath(image.filepath_raw)
-                if os.path.isfile(src_path):
-                    with open(src_path, 'rb') as f:
-                        data = f.read()
-        # Check magic number is right
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
-
-        # Copy to a temp image and save.
-        with TmpImageGuard() as guard:
-            make_temp_image_copy(guard, src_image=image)
-            tmp_image = guard.image
-            return _encode_temp_image(tmp_image, self.file_format, export_settings)
-
-    def __encode_from_image_tile(self, udim_image, tile, export_settings):
-        src_path = bpy.path.abspath(udim_image.filepath_raw).replace("<UDIM>", tile)
+def _has_magic(data, file_format) -> bool:
+    # Check magic number is right
+    if file_format == 'PNG':
+        return data.startswith(b'\x89PNG')
+    elif file_format == 'JPEG':
+        return data.startswith(b'\xff\xd8\xff')
+    elif file_format == 'WEBP':
+        return data[8:12] == b'WEBP'
+    return False
 
-        if os.path.isfile(src_path):
-            with open(src_path, 'rb') as f:
-                data = f.read()
-
-        if data:
-            if self.file_format == 'PNG':
-                if data.startswith(b'\x89PNG'):
-                    return data
-            elif self.file_format == 'JPEG':
-                if data.startswith(b'\xff\xd8\xff'):
-                    return data
-            elif self.file_format == 'WEBP':
-                if data[8:12] == b'WEBP':
-                    return data
-
-        # We don't manage UDIM packed image, so this could not happen to be here
 
 def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str, export_settings) -> bytes:
     with tempfile.TemporaryDirectory() as tmpdirname:
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Must be run from Blender, with the glTF add-on available:
+#     blender --background --factory-startup --python gltf2_blender_image_test.py
+
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    gltf2_blender_image = None
+elif __name__ == '__main__':
+    from io_scene_gltf2.blender.exp.material.extensions import gltf2_blender_image
+else:
+    from . import gltf2_blender_image
+
+
+def _make_scene(image_count):
+    """A scene with many textured materials, with channel packed metallic/roughness textures."""
+    rng = np.random.default_rng(0)
+    images = []
+    for i in range(image_count):
+        image = bpy.data.images.new("Image%d" % i, width=32 + 8 * i, height=32, alpha=(i % 2 == 0))
+        image.pixels.foreach_set(rng.random(image.size[0] * image.size[1] * 4, dtype=np.float32))
+        images.append(image)
+
+    for i, image in enumerate(images):
+        mat = bpy.data.materials.new("Material%d" % i)
+        mat.use_nodes = True
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+        bsdf = nodes["Principled BSDF"]
+
+        tex = nodes.new("ShaderNodeTexImage")
+        tex.image = image
+        links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+
+        # Metallic and roughness from two other images, to be packed in a single texture.
+        for socket_name, other_image, channel in (("Metallic", images[(i + 1) % image_count], "Red"),
+                                                   ("Roughness", images[(i + 2) % image_count], "Green")):
+            other_tex = nodes.new("ShaderNodeTexImage")
+            other_tex.image = other_image
+            separate = nodes.new("ShaderNodeSeparateColor")
+            links.new(other_tex.outputs["Color"], separate.inputs["Color"])
+            links.new(separate.outputs[channel], bsdf.inputs[socket_name])
+
+        bpy.ops.mesh.primitive_plane_add(location=(2.0 * i, 0.0, 0.0))
+        bpy.context.object.data.materials.append(mat)
+
+
+def _make_reused_scene(image_count, directory):
+    """Each image used by two materials, and one file loaded in two images."""
+    rng = np.random.default_rng(0)
+    images = []
+    for i in range(image_count):
+        # Generated images of the same size, with different pixels.
+        image = bpy.data.images.new("Image%d" % i, width=16, height=16)
+        image.pixels.foreach_set(rng.random(image.size[0] * image.size[1] * 4, dtype=np.float32))
+        images.append(image)
+
+    file_image = bpy.data.images.new("File", width=16, height=8)
+    file_image.pixels.foreach_set(rng.random(16 * 8 * 4, dtype=np.float32))
+    filepath = os.path.join(directory, "file.png")
+    file_image.save(filepath=filepath)
+    bpy.data.images.remove(file_image)
+    images.extend(bpy.data.images.load(filepath, check_existing=False) for _ in range(2))
+
+    for i in range(2 * len(images)):
+        mat = bpy.data.materials.new("Material%d" % i)
+        mat.use_nodes = True
+        tex = mat.node_tree.nodes.new("ShaderNodeTexImage")
+        tex.image = images[i % len(images)]
+        mat.node_tree.links.new(tex.outputs["Color"], mat.node_tree.nodes["Principled BSDF"].inputs["Base Color"])
+        bpy.ops.mesh.primitive_plane_add(location=(2.0 * i, 0.0, 0.0))
+        bpy.context.object.data.materials.append(mat)
+
+
+def _read_gltf(filepath):
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    if filepath.endswith(".glb"):
+        # JSON chunk, right after the header.
+        length, = struct.unpack_from("<I", data, 12)
+        data = data[20:20 + length]
+    return json.loads(data)
+
+
+def _read_files(directory):
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class ParallelEncodingTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        prefs = bpy.context.preferences.addons["io_scene_gltf2"].preferences
+        self.image_cache_orig = prefs.image_cache_ui
+        # Compare actual encodings, not cached ones.
+        prefs.image_cache_ui = False
+        _make_scene(12)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        gltf2_blender_image._ENCODE_QUEUE_ENABLED = True
+        bpy.context.preferences.addons["io_scene_gltf2"].preferences.image_cache_ui = self.image_cache_orig
+        self.tmpdir.cleanup()
+
+    def _export(self, export_format, use_queue):
+        gltf2_blender_image._ENCODE_QUEUE_ENABLED = use_queue
+        directory = os.path.join(self.tmpdir.name, "%s_%s" % (export_format, "parallel" if use_queue else "serial"))
+        os.makedirs(directory)
+        ext = ".glb" if export_format == 'GLB' else ".gltf"
+        bpy.ops.export_scene.gltf(filepath=os.path.join(directory, "scene" + ext), export_format=export_format)
+        return _read_files(directory)
+
+    def test_glb(self):
+        files = self._export('GLB', True)
+        self.assertEqual(files, self._export('GLB', False))
+
+    def test_gltf_separate(self):
+        files = self._export('GLTF_SEPARATE', True)
+        # Base color and packed metallic/roughness textures.
+        self.assertGreaterEqual(len([name for name in files if name.endswith(".png")]), 12)
+        self.assertEqual(files, self._export('GLTF_SEPARATE', False))
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class ImageSharingTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        prefs = bpy.context.preferences.addons["io_scene_gltf2"].preferences
+        self.image_cache_orig = prefs.image_cache_ui
+        prefs.image_cache_ui = False
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # More images than jobs kept pending by the encoding stage, so that some are encoded while gathering.
+        self.image_count = 2 * min(32, os.cpu_count() or 1) + 4
+        _make_reused_scene(self.image_count, self.tmpdir.name)
+
+    def tearDown(self):
+        gltf2_blender_image._ENCODE_QUEUE_ENABLED = True
+        bpy.context.preferences.addons["io_scene_gltf2"].preferences.image_cache_ui = self.image_cache_orig
+        self.tmpdir.cleanup()
+
+    def _export(self, export_format, use_queue):
+        gltf2_blender_image._ENCODE_QUEUE_ENABLED = use_queue
+        directory = os.path.join(self.tmpdir.name, "%s_%s" % (export_format, "parallel" if use_queue else "serial"))
+        os.makedirs(directory)
+        filepath = os.path.join(directory, "scene" + (".glb" if export_format == 'GLB' else ".gltf"))
+        bpy.ops.export_scene.gltf(filepath=filepath, export_format=export_format)
+        return directory, _read_gltf(filepath)
+
+    def test_glb(self):
+        for use_queue in (True, False):
+            _, gltf = self._export('GLB', use_queue)
+            # The two images of the same file are shared too.
+            self.assertEqual(len(gltf["images"]), self.image_count + 1, use_queue)
+            self.assertEqual(len(gltf["materials"]), 2 * (self.image_count + 2), use_queue)
+            accessor_views = {accessor["bufferView"] for accessor in gltf["accessors"]}
+            self.assertEqual(len(gltf["bufferViews"]) - len(accessor_views), self.image_count + 1, use_queue)
+
+    def test_gltf_separate(self):
+        for use_queue in (True, False):
+            directory, gltf = self._export('GLTF_SEPARATE', use_queue)
+            self.assertEqual(len(gltf["images"]), self.image_count + 1, use_queue)
+            files = _read_files(directory)
+            pngs = {name: data for name, data in files.items() if name.endswith(".png")}
+            self.assertEqual(len(pngs), self.image_count + 1, use_queue)
+            self.assertEqual(len(set(pngs.values())), len(pngs), use_queue)
+
+    def test_generated_same_size(self):
+        # Generated images of the same size are not mistaken for one another by the encoding stage.
+        directory, _ = self._export('GLTF_SEPARATE', True)
+        expected_directory, _ = self._export('GLTF_SEPARATE', False)
+        self.assertEqual(_read_files(directory), _read_files(expected_directory))
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
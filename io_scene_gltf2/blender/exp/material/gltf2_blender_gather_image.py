@@ -8,7 +8,6 @@ import os
 
 from ....io.com import gltf2_io
 from ....io.com.gltf2_io_path import path_to_uri
-from ....io.exp import gltf2_io_binary_data, gltf2_io_image_data
 from ....io.com import gltf2_io_debug
 from ....io.exp.gltf2_io_user_extensions import export_user_extensions
 from ..gltf2_blender_gather_cache import cached
@@ -104,8 +103,7 @@ def __filter_image(sockets, export_settings):
 @cached
 def __gather_buffer_view(image_data, mime_type, name, export_settings):
     if export_settings['gltf_format'] != 'GLTF_SEPARATE':
-        data, factor = image_data.encode(mime_type, export_settings)
-        return gltf2_io_binary_data.BinaryData(data=data), factor
+        return image_data.encode_binary_data(mime_type, export_settings)
     return None, None
 
 
@@ -183,12 +181,7 @@ def __gather_name(export_image, export_settings):
 def __gather_uri(image_data, mime_type, name, export_settings):
     if export_settings['gltf_format'] == 'GLTF_SEPARATE':
         # as usual we just store the data in place instead of already resolving the references
-        data, factor = image_data.encode(mime_type, export_settings)
-        return gltf2_io_image_data.ImageData(
-            data=data,
-            mime_type=mime_type,
-            name=name
-        ), factor
+        return image_data.encode_image_data(mime_type, name, export_settings)
 
     return None, None
 
@@ -7,8 +7,6 @@ import bpy
 
 from ....io.exp.gltf2_io_user_extensions import export_user_extensions
 from ....io.com.gltf2_io_extensions import Extension
-from ....io.exp.gltf2_io_image_data import ImageData
-from ....io.exp.gltf2_io_binary_data import BinaryData
 from ....io.com import gltf2_io_debug
 from ....io.com import gltf2_io
 from ..gltf2_blender_gather_sampler import gather_sampler
@@ -96,20 +94,15 @@ def __gather_extensions(blender_shader_sockets, source, webp_image, image_data,
         # We need here to create some WebP textures
 
         new_mime_type = "image/webp"
-        new_data, _ = image_data.encode(new_mime_type, export_settings)
 
         if export_settings['gltf_format'] == 'GLTF_SEPARATE':
 
-            uri = ImageData(
-                data=new_data,
-                mime_type=new_mime_type,
-                name=source.uri.name
-            )
+            uri, _ = image_data.encode_image_data(new_mime_type, source.uri.name, export_settings)
             buffer_view = None
             name = source.uri.name
 
         else:
-            buffer_view = BinaryData(data=new_data)
+            buffer_view, _ = image_data.encode_binary_data(new_mime_type, export_settings)
             uri = None
             name = source.name
 
@@ -217,20 +210,15 @@ def __gather_source(blender_shader_sockets, use_tile, export_settings):
             # Need to create a PNG texture
 
             new_mime_type = "image/png"
-            new_data, _ = image_data.encode(new_mime_type, export_settings)
 
             if export_settings['gltf_format'] == 'GLTF_SEPARATE':
                 buffer_view = None
-                uri = ImageData(
-                    data=new_data,
-                    mime_type=new_mime_type,
-                    name=source.uri.name
-                )
+                uri, _ = image_data.encode_image_data(new_mime_type, source.uri.name, export_settings)
                 name = source.uri.name
 
             else:
                 uri = None
-                buffer_view = BinaryData(data=new_data)
+                buffer_view, _ = image_data.encode_binary_data(new_mime_type, export_settings)
                 name = source.name
 
             png_image = __make_webp_image(buffer_view, None, None, new_mime_type, name, uri, export_settings)
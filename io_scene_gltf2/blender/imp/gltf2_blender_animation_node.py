@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import bpy
+import numpy as np
 from mathutils import Vector
 
 from ...io.imp.gltf2_io_user_extensions import import_user_extensions
@@ -55,7 +56,7 @@ class BlenderNodeAnim():
 
         action = BlenderNodeAnim.get_or_create_action(gltf, node_idx, animation.track_name)
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
+        keys = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].input)
         values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
 
         if animation.samplers[channel.sampler].interpolation == "CUBICSPLINE":
@@ -145,11 +146,12 @@ class BlenderNodeAnim():
 
         fps = (bpy.context.scene.render.fps * bpy.context.scene.render.fps_base)
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        coords = np.empty(2 * len(keys), dtype=np.float32)
+        coords[::2] = keys[:, 0].astype(np.float64) * fps
+        values = np.array(values, dtype=np.float64).reshape(len(values), num_components)
 
         for i in range(0, num_components):
-            coords[1::2] = (vals[i] for vals in values)
+            coords[1::2] = values[:, i]
             make_fcurve(
                 action,
                 coords,
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import bpy
+import numpy as np
 
 from ...io.imp.gltf2_io_user_extensions import import_user_extensions
 from ...io.imp.gltf2_io_binary import BinaryData
@@ -51,8 +52,8 @@ class BlenderWeightAnim():
         action.id_root = "KEY"
         gltf.needs_stash.append((obj.data.shape_keys, action))
 
-        keys = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].input)
-        values = BinaryData.get_data_from_accessor(gltf, animation.samplers[channel.sampler].output)
+        keys = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].input)
+        values = BinaryData.decode_accessor(gltf, animation.samplers[channel.sampler].output)
 
         # retrieve number of targets
         pymesh = gltf.data.meshes[gltf.data.nodes[node_idx].mesh]
@@ -65,12 +66,12 @@ class BlenderWeightAnim():
             offset = 0
             stride = nb_targets
 
-        coords = [0] * (2 * len(keys))
-        coords[::2] = (key[0] * fps for key in keys)
+        coords = np.empty(2 * len(keys), dtype=np.float32)
+        coords[::2] = keys[:, 0].astype(np.float64) * fps
 
         for sk in range(nb_targets):
             if pymesh.shapekey_names[sk] is not None: # Do not animate shapekeys not created
-                coords[1::2] = (values[offset + stride * i + sk][0] for i in range(len(keys)))
+                coords[1::2] = values[offset + sk::stride, 0][:len(keys)]
                 kb_name = pymesh.shapekey_names[sk]
                 data_path = 'key_blocks["%s"].value' % bpy.utils.escape_identifier(kb_name)
 
@@ -108,6 +108,9 @@ class BlenderGlTF():
         # Init is to False, and will be set to True during creation
         gltf.animation_object = False
 
+        # Geometry Nodes group of instancers, created when needed
+        gltf.instancer_node_group = None
+
         # Blender material
         if gltf.data.materials:
             for material in gltf.data.materials:
@@ -130,6 +133,7 @@ class BlenderGlTF():
         if gltf.data.meshes:
             for mesh in gltf.data.meshes:
                 mesh.blender_name = {}  # caches Blender mesh name
+                mesh.blender_prototype = None  # object instanced on points, see BlenderNode.create_instancer_object
 
         if gltf.data.extensions_used is not None and "KHR_animation_pointer" in gltf.data.extensions_used:
             # Meshes initialization
@@ -10,7 +10,7 @@ from ...io.imp.gltf2_io_binary import BinaryData
 from ...io.com.gltf2_io_constants import DataType, ComponentType
 from ...blender.com.gltf2_blender_conversion import get_attribute_type
 from ..com.gltf2_blender_extras import set_extras
-from ..com.gltf2_blender_utils import fast_structured_np_unique
+from ..com.gltf2_blender_utils import fast_structured_np_unique, set_vertex_weights
 from .gltf2_blender_material import BlenderMaterial
 from .gltf2_io_draco_compression_extension import decode_primitive
 
@@ -335,7 +335,6 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
         mesh.color_attributes.render_color_index = 0
 
     # Skinning
-    # TODO: this is slow :/
     if num_joint_sets and mesh_options.skinning:
         pyskin = gltf.data.skins[skin_idx]
         for i, node_idx in enumerate(pyskin.joints):
@@ -344,16 +343,11 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
 
         vgs = list(ob.vertex_groups)
 
-        for i in range(num_joint_sets):
-            js = vert_joints[i].tolist()  # tolist() is faster
-            ws = vert_weights[i].tolist()
-            for vi in range(len(vert_locs)):
-                w0, w1, w2, w3 = ws[vi]
-                j0, j1, j2, j3 = js[vi]
-                if w0 != 0: vgs[j0].add((vi,), w0, 'REPLACE')
-                if w1 != 0: vgs[j1].add((vi,), w1, 'REPLACE')
-                if w2 != 0: vgs[j2].add((vi,), w2, 'REPLACE')
-                if w3 != 0: vgs[j3].add((vi,), w3, 'REPLACE')
+        set_vertex_weights(
+            vgs, vert_joints[:num_joint_sets], vert_weights[:num_joint_sets],
+            # The 16-bit normalized grid of glTF weights.
+            levels=65535 if gltf.import_settings['import_quantize_weights'] else None,
+        )
 
     # Shapekeys
     if num_shapekeys:
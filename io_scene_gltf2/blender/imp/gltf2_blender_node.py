@@ -49,7 +49,10 @@ class BlenderNode():
     def create_object(gltf, vnode_id):
         vnode = gltf.vnodes[vnode_id]
 
-        if vnode.mesh_node_idx is not None:
+        if vnode.instances is not None:
+            obj = BlenderNode.create_instancer_object(gltf, vnode)
+
+        elif vnode.mesh_node_idx is not None:
             obj = BlenderNode.create_mesh_object(gltf, vnode)
 
         elif vnode.type == VNode.Inst and vnode.mesh_idx is not None:
@@ -129,6 +132,14 @@ class BlenderNode():
         obj.show_in_front = True
         obj.data.relation_line_position = "HEAD"
 
+        # Create an icosphere, and assign it to the collection
+        bpy.ops.mesh.primitive_ico_sphere_add(radius=1, enter_editmode=False, align='WORLD', location=(0, 0, 0), scale=(1, 1, 1))
+        BlenderNode.special_collection(gltf).objects.link(bpy.context.object)
+        gltf.bone_shape = bpy.context.object.name
+        bpy.context.collection.objects.unlink(bpy.context.object)
+
+    @staticmethod
+    def special_collection(gltf):
         # Create a special collection (if not exists already)
         # Content of this collection will not be exported
         if BLENDER_GLTF_SPECIAL_COLLECTION not in bpy.data.collections:
@@ -136,12 +147,7 @@ class BlenderNode():
             bpy.data.scenes[gltf.blender_scene].collection.children.link(bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION])
             bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_viewport = True
             bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].hide_render = True
-
-        # Create an icosphere, and assign it to the collection
-        bpy.ops.mesh.primitive_ico_sphere_add(radius=1, enter_editmode=False, align='WORLD', location=(0, 0, 0), scale=(1, 1, 1))
-        bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION].objects.link(bpy.context.object)
-        gltf.bone_shape = bpy.context.object.name
-        bpy.context.collection.objects.unlink(bpy.context.object)
+        return bpy.data.collections[BLENDER_GLTF_SPECIAL_COLLECTION]
 
     @staticmethod
     def calc_empty_display_size(gltf, vnode_id):
@@ -285,6 +291,89 @@ class BlenderNode():
 
         return obj
 
+    @staticmethod
+    def create_instancer_object(gltf, vnode):
+        """Creates one object for many instances of a mesh: the instances are
+        points of a mesh, and a Geometry Nodes modifier instances the mesh on
+        them, with the rotation and scale stored in point attributes.
+        """
+        pymesh = gltf.data.meshes[vnode.mesh_idx]
+
+        # The instanced object, not exported, so only the instances are.
+        if pymesh.blender_prototype is None:
+            # Same cache as create_mesh_object, for a mesh without skin or
+            # shapekeys
+            cache_key = (None,)
+            if cache_key in pymesh.blender_name:
+                mesh = bpy.data.meshes[pymesh.blender_name[cache_key]]
+            else:
+                gltf.log.info("Blender create Mesh node {}".format(pymesh.name or vnode.mesh_idx))
+                mesh = BlenderMesh.create(gltf, vnode.mesh_idx, None)
+                pymesh.blender_name[cache_key] = mesh.name
+            prototype = bpy.data.objects.new(mesh.name, mesh)
+            BlenderNode.special_collection(gltf).objects.link(prototype)
+            pymesh.blender_prototype = prototype.name
+        prototype = bpy.data.objects[pymesh.blender_prototype]
+
+        locs, rots, scales = vnode.instances
+        name = vnode.name or prototype.name
+        points = bpy.data.meshes.new(name)
+        points.vertices.add(len(locs))
+        points.vertices.foreach_set('co', locs.reshape(-1))
+        points.attributes.new('rotation', 'QUATERNION', 'POINT').data.foreach_set('value', rots.reshape(-1))
+        points.attributes.new('scale', 'FLOAT_VECTOR', 'POINT').data.foreach_set('vector', scales.reshape(-1))
+        points.update()
+
+        obj = bpy.data.objects.new(name, points)
+        node_group = BlenderNode.instancer_node_group(gltf)
+        mod = obj.modifiers.new(name="Instances", type='NODES')
+        mod.node_group = node_group
+        mod[node_group.interface.items_tree['Instance'].identifier] = prototype
+
+        return obj
+
+    @staticmethod
+    def instancer_node_group(gltf):
+        """Geometry Nodes group instancing an object on the points of the geometry."""
+        if gltf.instancer_node_group is not None:
+            return bpy.data.node_groups[gltf.instancer_node_group]
+
+        group = bpy.data.node_groups.new("glTF Instances", 'GeometryNodeTree')
+        group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+        group.interface.new_socket("Instance", in_out='INPUT', socket_type='NodeSocketObject')
+        group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+        def attribute_output(node):
+            # Named Attribute has one output per data type
+            return next(socket for socket in node.outputs if socket.name == "Attribute" and socket.enabled)
+
+        group_input = group.nodes.new('NodeGroupInput')
+        group_input.location = (-600, 0)
+        object_info = group.nodes.new('GeometryNodeObjectInfo')
+        object_info.location = (-400, -100)
+        rotation = group.nodes.new('GeometryNodeInputNamedAttribute')
+        rotation.location = (-400, -300)
+        rotation.data_type = 'QUATERNION'
+        rotation.inputs['Name'].default_value = 'rotation'
+        scale = group.nodes.new('GeometryNodeInputNamedAttribute')
+        scale.location = (-400, -450)
+        scale.data_type = 'FLOAT_VECTOR'
+        scale.inputs['Name'].default_value = 'scale'
+        instance_on_points = group.nodes.new('GeometryNodeInstanceOnPoints')
+        instance_on_points.location = (-100, 0)
+        group_output = group.nodes.new('NodeGroupOutput')
+        group_output.location = (150, 0)
+
+        group.links.new(group_input.outputs['Geometry'], instance_on_points.inputs['Points'])
+        group.links.new(group_input.outputs['Instance'], object_info.inputs['Object'])
+        group.links.new(object_info.outputs['Geometry'], instance_on_points.inputs['Instance'])
+        group.links.new(attribute_output(rotation), instance_on_points.inputs['Rotation'])
+        group.links.new(attribute_output(scale), instance_on_points.inputs['Scale'])
+        group.links.new(instance_on_points.outputs['Instances'], group_output.inputs['Geometry'])
+
+        gltf.instancer_node_group = group.name
+        return group
+
     @staticmethod
     def set_morph_weights(gltf, pynode, obj):
         pymesh = gltf.data.meshes[pynode.mesh]
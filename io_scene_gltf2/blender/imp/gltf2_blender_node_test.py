@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Must be run from Blender, with the glTF add-on available:
+#     blender --background --factory-startup --python gltf2_blender_node_test.py
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+
+def _make_scene(instance_count):
+    """Many objects sharing a mesh, some of them not instanceable, and a parent."""
+    bpy.ops.mesh.primitive_cone_add()
+    cone = bpy.context.object
+    bpy.ops.object.empty_add(location=(0.0, 0.0, 1.0), rotation=(0.0, 0.0, 0.5))
+    parent = bpy.context.object
+
+    rng = np.random.default_rng(0)
+    for i in range(instance_count):
+        obj = cone.copy()
+        obj.name = "Cone%d" % i
+        obj.location = rng.uniform(-10.0, 10.0, 3)
+        obj.rotation_euler = rng.uniform(-3.0, 3.0, 3)
+        obj.scale = rng.uniform(0.5, 2.0, 3)
+        obj.parent = parent
+        bpy.context.collection.objects.link(obj)
+
+    # Custom properties are kept on their own object
+    cone["prop"] = 1
+
+
+def _instance_matrices():
+    """World matrices of all evaluated mesh instances, rounded and sorted."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    matrices = [
+        np.array(instance.matrix_world).round(4).reshape(-1)
+        for instance in depsgraph.object_instances
+        if instance.object.type == 'MESH' and instance.object.data.polygons
+    ]
+    return sorted(map(tuple, matrices))
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class InstancingTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        _make_scene(50)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmpdir.name, "scene.glb")
+        bpy.ops.export_scene.gltf(filepath=self.filepath, export_extras=True)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _import(self, **settings):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        bpy.ops.import_scene.gltf(filepath=self.filepath, **settings)
+        return _instance_matrices()
+
+    def test_instancing(self):
+        expected = self._import()
+        self.assertEqual(len(expected), 51)
+
+        matrices = self._import(import_instancing=True, instancing_threshold=10)
+        np.testing.assert_allclose(matrices, expected, atol=1e-3)
+        # The parent, the instancer and the cone with custom properties.
+        self.assertEqual(len(bpy.context.scene.collection.all_objects) - len(bpy.data.collections["glTF_not_exported"].objects), 3)
+        # The cone mesh is shared by all instances.
+        self.assertEqual(len([mesh for mesh in bpy.data.meshes if mesh.polygons]), 1)
+
+    def test_threshold(self):
+        expected = self._import()
+        matrices = self._import(import_instancing=True, instancing_threshold=51)
+        self.assertEqual(matrices, expected)
+        self.assertNotIn("glTF_not_exported", bpy.data.collections)
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
@@ -99,11 +99,12 @@ class BlenderScene():
         if gltf.data.scene is not None:
             pyscene = gltf.data.scenes[gltf.data.scene]
             if pyscene.nodes:
-                vnode = gltf.vnodes[pyscene.nodes[0]]
+                # Can be missing, when merged in instances
+                vnode = gltf.vnodes.get(pyscene.nodes[0])
 
         if not vnode:
             for pyscene in gltf.data.scenes or []:
-                if pyscene.nodes:
+                if pyscene.nodes and pyscene.nodes[0] in gltf.vnodes:
                     vnode = gltf.vnodes[pyscene.nodes[0]]
                     break
 
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import bpy
+import numpy as np
 from mathutils import Vector, Quaternion, Matrix
 from ...io.imp.gltf2_io_binary import BinaryData
 from ..com.gltf2_blender_math import scale_rot_swap_matrix, nearby_signed_perm_matrix
@@ -20,6 +21,7 @@ def compute_vnodes(gltf):
     pick_bind_pose(gltf)
     prettify_bones(gltf)
     calc_bone_matrices(gltf)
+    instance_repeated_meshes(gltf)
 
 
 class VNode:
@@ -56,6 +58,10 @@ class VNode:
         self.camera_node_idx = None
         self.light_node_idx = None
 
+        # For a vnode merging many instances of a mesh: the TRS of each
+        # instance, as arrays. See instance_repeated_meshes.
+        self.instances = None
+
     def trs(self):
         # (final TRS) = (rotation after) (base TRS) (rotation before)
         t, r, s = self.base_trs
@@ -572,3 +578,89 @@ def calc_bone_matrices(gltf):
             visit(child)
 
     visit('root')
+
+
+def instance_repeated_meshes(gltf):
+    """
+    Files like CAD assemblies or vegetation can use the same mesh from
+    thousands of nodes, and creating one object per node is slow.
+    Merge the leaf vnodes using the same mesh, under the same parent, into a
+    single vnode. It will become one object instancing the mesh on points
+    with Geometry Nodes. Only vnodes with nothing more than a mesh to import
+    (no skin, morph targets, animation or extras) are merged.
+    """
+    if not gltf.import_settings['import_instancing']:
+        return
+    # Hooks are called for each node
+    if gltf.import_settings['import_user_extensions']:
+        return
+
+    groups = {}
+    for id, vnode in gltf.vnodes.items():
+        mesh_idx = instanceable_mesh(gltf, id, vnode)
+        if mesh_idx is not None:
+            groups.setdefault((vnode.parent, mesh_idx), []).append(id)
+
+    merged = set()
+    parents = set()
+    for (parent, mesh_idx), ids in groups.items():
+        if len(ids) < gltf.import_settings['instancing_threshold']:
+            continue
+
+        trs = [gltf.vnodes[id].trs() for id in ids]
+        new_id = '%s.instances.%d' % (parent, mesh_idx)
+        new_vnode = VNode()
+        gltf.vnodes[new_id] = new_vnode
+        new_vnode.name = gltf.data.meshes[mesh_idx].name
+        new_vnode.default_name = 'Instances_%d' % mesh_idx
+        new_vnode.parent = parent
+        new_vnode.mesh_idx = mesh_idx
+        new_vnode.instances = (
+            np.array([t for t, _, _ in trs], dtype=np.float32),
+            np.array([r for _, r, _ in trs], dtype=np.float32),
+            np.array([s for _, _, s in trs], dtype=np.float32),
+        )
+        gltf.vnodes[parent].children.append(new_id)
+
+        for id in ids:
+            del gltf.vnodes[id]
+        merged.update(ids)
+        parents.add(parent)
+
+    for parent in parents:
+        vnode = gltf.vnodes[parent]
+        vnode.children = [child for child in vnode.children if child not in merged]
+    if merged:
+        gltf.log.info("Instancing %d nodes on points" % len(merged))
+
+
+def instanceable_mesh(gltf, id, vnode):
+    """Returns the mesh of a vnode that can be merged with other instances, or None."""
+    if vnode.children or vnode.is_arma:
+        return None
+    if vnode.camera_node_idx is not None or vnode.light_node_idx is not None:
+        return None
+    if vnode.parent is None or gltf.vnodes[vnode.parent].type not in [VNode.Object, VNode.DummyRoot]:
+        return None
+
+    if vnode.type == VNode.Inst:
+        mesh_idx = vnode.mesh_idx
+    elif vnode.type == VNode.Object and vnode.mesh_node_idx is not None:
+        pynode = gltf.data.nodes[vnode.mesh_node_idx]
+        if pynode.skin is not None:
+            return None
+        mesh_idx = pynode.mesh
+    else:
+        return None
+
+    if isinstance(id, int):
+        pynode = gltf.data.nodes[id]
+        if pynode.extras or (gltf.data.animations and pynode.animations):
+            return None
+
+    if not (0 <= mesh_idx < len(gltf.data.meshes)):
+        return None
+    if gltf.data.meshes[mesh_idx].shapekey_names:
+        return None
+
+    return mesh_idx
@@ -15,13 +15,32 @@ class BinaryData:
             raise TypeError("Data is not a bytes array")
         self.data = data
         self.bufferViewTarget = bufferViewTarget
+        self._pending = False
 
     def __eq__(self, other):
+        if not isinstance(other, BinaryData):
+            return NotImplemented
+        if self._pending or other._pending:
+            return self is other
         return self.data == other.data
 
     def __hash__(self):
+        if self._pending:
+            return id(self)
         return hash(self.data)
 
+    @classmethod
+    def pending(cls, bufferViewTarget=None):
+        """
+        Binary data set later (e.g. encoded images, see ImageEncodeQueue).
+
+        It is only equal to itself, even once set, so that its hash does not change while it is used as a key.
+        """
+        binary_data = cls(b"", bufferViewTarget)
+        binary_data.data = None
+        binary_data._pending = True
+        return binary_data
+
     @classmethod
     def from_list(cls, lst: typing.List[typing.Any], gltf_component_type: gltf2_io_constants.ComponentType, bufferViewTarget=None):
         format_char = gltf2_io_constants.ComponentType.to_type_code(gltf_component_type)
@@ -3,30 +3,46 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+import shutil
+import tempfile
 
 from ...io.com import gltf2_io
 from ...io.exp import gltf2_io_binary_data
 
 
 class Buffer:
-    """Class representing binary data for use in a glTF file as 'buffer' property."""
+    """Class representing binary data for use in a glTF file as 'buffer' property.
+
+    Data is appended to a temporary file, kept in memory until it gets bigger than SPOOL_SIZE, so that exporting
+    big scenes does not need the whole buffer in memory. Use write_to to copy it to the exported file.
+    """
+
+    # Size of the data kept in memory before it gets written to disk.
+    SPOOL_SIZE = 16 * 1024 * 1024
+    # Size of the chunks the data gets copied by.
+    CHUNK_SIZE = 1024 * 1024
 
     def __init__(self, buffer_index=0, initial_data=None):
-        self.__data = bytearray(b"")
+        self.__file = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE)
+        self.__length = 0
         if initial_data is not None:
-            self.__data = bytearray(initial_data.tobytes())
+            self.__write(initial_data.tobytes())
         self.__buffer_index = buffer_index
 
+    def __write(self, data):
+        self.__file.write(data)
+        self.__length += len(data)
+
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
         """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
+        offset = self.__length
+        self.__write(binary_data.data)
 
         length = binary_data.byte_length
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        self.__write(b"\x00" * padding)
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
@@ -42,13 +58,45 @@ class Buffer:
 
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__length
+
+    def __len__(self):
+        return self.__length
+
+    def iter_chunks(self, chunk_size=None):
+        """Yield the data of the buffer, in chunks of chunk_size bytes (the last one can be smaller)."""
+        if chunk_size is None:
+            chunk_size = self.CHUNK_SIZE
+        self.__file.seek(0)
+        try:
+            while True:
+                chunk = self.__file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.__file.seek(0, 2)
+
+    def write_to(self, file):
+        """Copy the data of the buffer to a (binary) file object."""
+        self.__file.seek(0)
+        shutil.copyfileobj(self.__file, file, self.CHUNK_SIZE)
+        self.__file.seek(0, 2)
 
     def to_bytes(self):
-        return self.__data
+        self.__file.seek(0)
+        data = self.__file.read()
+        self.__file.seek(0, 2)
+        return data
 
     def clear(self):
-        self.__data = b""
+        self.__file.close()
+        self.__file = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE)
+        self.__length = 0
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        # Encode by chunks (multiple of 3 bytes, so that no padding is added in the middle of the data),
+        # instead of making an encoded copy of the whole buffer on top of the final string.
+        chunk_size = self.CHUNK_SIZE - self.CHUNK_SIZE % 3
+        return 'data:application/octet-stream;base64,' + ''.join(
+            base64.b64encode(chunk).decode('ascii') for chunk in self.iter_chunks(chunk_size))
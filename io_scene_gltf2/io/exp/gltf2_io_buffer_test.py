@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Must be run from Blender, with the glTF add-on available:
+#     blender --background --factory-startup --python gltf2_io_buffer_test.py
+
+import base64
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    gltf2_io_binary_data = gltf2_io_buffer = gltf2_io_export = None
+elif __name__ == '__main__':
+    from io_scene_gltf2.io.exp import gltf2_io_binary_data, gltf2_io_buffer, gltf2_io_export
+else:
+    from . import gltf2_io_binary_data, gltf2_io_buffer, gltf2_io_export
+
+
+class _BytearrayBuffer:
+    """The buffer as it was before it got spooled to a temporary file, kept in memory as a bytearray."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def add_and_get_view(self, binary_data):
+        offset = len(self.data)
+        self.data.extend(binary_data.data)
+        length = binary_data.byte_length
+        self.data.extend(b"\x00" * ((4 - (length % 4)) % 4))
+        return offset, length
+
+    def to_embed_string(self):
+        return 'data:application/octet-stream;base64,' + base64.b64encode(self.data).decode('ascii')
+
+
+def _make_datas(total_size):
+    """Binary data of varied lengths, most of them not a multiple of 4, up to about total_size bytes."""
+    datas = []
+    size = 0
+    length = 1
+    while size < total_size:
+        datas.append(gltf2_io_binary_data.BinaryData(os.urandom(length)))
+        size += length
+        length = length * 3 + 1
+    return datas
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class BufferTest(unittest.TestCase):
+    def _fill(self, buffer_class, total_size):
+        buffer = buffer_class()
+        reference = _BytearrayBuffer()
+        for binary_data in _make_datas(total_size):
+            view = buffer.add_and_get_view(binary_data)
+            self.assertEqual((view.byte_offset, view.byte_length), reference.add_and_get_view(binary_data))
+        self.assertEqual(len(buffer), len(reference.data))
+        return buffer, reference
+
+    def _check(self, buffer, reference):
+        self.assertEqual(buffer.to_bytes(), reference.data)
+
+        file = io.BytesIO()
+        buffer.write_to(file)
+        self.assertEqual(file.getvalue(), reference.data)
+
+        self.assertEqual(buffer.to_embed_string(), reference.to_embed_string())
+
+        # Reading the buffer does not prevent adding data afterwards.
+        binary_data = gltf2_io_binary_data.BinaryData(b"\x01\x02\x03")
+        view = buffer.add_and_get_view(binary_data)
+        self.assertEqual((view.byte_offset, view.byte_length), reference.add_and_get_view(binary_data))
+        self.assertEqual(buffer.to_bytes(), reference.data)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            contents = []
+            for name, glb_buffer in (("buffer.glb", buffer), ("bytearray.glb", reference.data)):
+                export_settings = {
+                    'gltf_format': 'GLB',
+                    'gltf_filepath': os.path.join(tmpdir, name),
+                    'gltf_user_extensions': [],
+                }
+                gltf = {"asset": {"version": "2.0"}, "buffers": [{"byteLength": len(reference.data)}]}
+                gltf2_io_export.save_gltf(gltf, export_settings, json.JSONEncoder, glb_buffer)
+                with open(export_settings['gltf_filepath'], 'rb') as f:
+                    contents.append(f.read())
+            self.assertEqual(contents[0], contents[1])
+
+    def test_below_spool_size(self):
+        buffer, reference = self._fill(gltf2_io_buffer.Buffer, 100 * 1024)
+        self.assertLess(len(buffer), gltf2_io_buffer.Buffer.SPOOL_SIZE)
+        self._check(buffer, reference)
+
+    def test_above_spool_size(self):
+        class SmallBuffer(gltf2_io_buffer.Buffer):
+            # A chunk size that is not a multiple of 3 nor of 4.
+            SPOOL_SIZE = 64 * 1024
+            CHUNK_SIZE = 1000
+
+        buffer, reference = self._fill(SmallBuffer, 1024 * 1024)
+        self.assertGreater(len(buffer), SmallBuffer.SPOOL_SIZE)
+        self._check(buffer, reference)
+
+    def test_empty(self):
+        buffer = gltf2_io_buffer.Buffer()
+        self.assertEqual(len(buffer), 0)
+        self._check(buffer, _BytearrayBuffer())
+
+    def test_clear(self):
+        buffer, _reference = self._fill(gltf2_io_buffer.Buffer, 1024)
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        buffer, reference = self._fill(lambda: buffer, 1024)
+        self._check(buffer, reference)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []), verbosity=2)
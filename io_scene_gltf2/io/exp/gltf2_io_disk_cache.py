@@ -0,0 +1,252 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import zipfile
+
+import numpy as np
+
+# Bump when the way images are encoded changes, to invalidate previously cached images.
+IMAGE_CACHE_VERSION = 1
+# Bump when the way primitives are created changes, to invalidate previously cached meshes.
+MESH_CACHE_VERSION = 2
+
+
+def default_cache_directory(kind="image"):
+    return os.path.join(tempfile.gettempdir(), "blender_gltf_%s_cache" % kind)
+
+
+class DiskCache:
+    """On-disk cache of exported data, shared between exports.
+
+    Entries are keyed by a hash of everything their data depends on, see `key`. Total size of the cache is capped,
+    least recently used entries being evicted first (the modification time of an entry is updated each time it is
+    used).
+
+    `salt` is what all entries depend on besides their key (e.g. the versions of Blender and of the add-on), entries
+    cached with another salt are never used.
+    """
+
+    # Bump in subclasses when the way their data is created changes, to invalidate previously cached entries.
+    version = 0
+
+    def __init__(self, directory: str, max_size: int, salt=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # Total size of the cache, computed on first write.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key(cls, *parts) -> str:
+        """Hash parts of a key: numpy arrays are hashed from their dtype and bytes, other bytes-like objects
+        as is, anything else from its repr."""
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(repr(cls.version).encode())
+        for part in parts:
+            if isinstance(part, np.ndarray) and not part.dtype.hasobject:
+                # Not through the buffer protocol, which rejects some field names of structured arrays (e.g. with ':').
+                hasher.update(repr(part.dtype.descr).encode())
+                data = memoryview(np.ascontiguousarray(part).view(np.uint8))
+            else:
+                try:
+                    data = memoryview(part)
+                    if not data.c_contiguous:
+                        data = memoryview(data.tobytes())
+                except TypeError:
+                    data = memoryview(repr(part).encode())
+            hasher.update(b"\0%d\0" % data.nbytes)
+            hasher.update(data)
+        return hasher.hexdigest()
+
+    def __path(self, key: str) -> str:
+        if self.salt is not None:
+            key = self.key(self.salt, key)
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str):
+        """Return the data cached for `key`, or None."""
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark as recently used.
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        path = self.__path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first, so that other exports never read partially written entries.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print("WARNING: glTF cache: could not write %r (%s)" % (path, e))
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self.__scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_size:
+                self.__evict()
+
+    def get_or_encode(self, key: str, encode) -> bytes:
+        """Return the data cached for `key`, else encode it by calling `encode()`, and cache it."""
+        data = self.get(key)
+        if data is not None:
+            return data
+        data = encode()
+        if data:
+            self.put(key, data)
+        return data
+
+    def __entries(self):
+        try:
+            sub_dirs = os.scandir(self.directory)
+        except OSError:
+            return
+        with sub_dirs:
+            for sub_dir in sub_dirs:
+                if not sub_dir.is_dir():
+                    continue
+                with os.scandir(sub_dir.path) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.startswith(".tmp"):
+                            yield entry
+
+    def __scan_size(self) -> int:
+        size = 0
+        for entry in self.__entries():
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def __evict(self):
+        """Remove least recently used entries, until the cache is down to its size cap."""
+        entries = []
+        size = 0
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            size += stat.st_size
+        entries.sort()
+        for _mtime, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+
+class ImageCache(DiskCache):
+    """On-disk cache of encoded images.
+
+    Entries are keyed by a hash of everything their encoding depends on (source pixels or file, channel mapping,
+    encoding settings...).
+    """
+
+    version = IMAGE_CACHE_VERSION
+
+
+class MeshCache(DiskCache):
+    """On-disk cache of created mesh primitives.
+
+    Entries are keyed by a hash of the mesh data read from Blender and of the export settings primitives depend on,
+    so that meshes with identical data are only turned into primitives once, in an export or across exports.
+    Primitives are stored as NumPy arrays (in the .npz format) and a JSON description of their structure.
+    """
+
+    version = MESH_CACHE_VERSION
+
+    def get_or_create(self, key: str, create):
+        """Return the primitives cached for `key`, else create them by calling `create()`, and cache them."""
+        data = self.get(key)
+        if data is not None:
+            try:
+                return self.decode(data)
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                # Corrupted entry, replaced below.
+                pass
+        value = create()
+        self.put(key, self.encode(value))
+        return value
+
+    @staticmethod
+    def encode(value) -> bytes:
+        """Serialize nested dicts, lists and tuples of NumPy arrays, numbers, strings and None.
+
+        Enums are stored as their value. Lists and tuples, dict keys included, are decoded as such.
+        """
+        arrays = {}
+
+        def add_array(array):
+            name = "a%d" % len(arrays)
+            arrays[name] = array
+            return name
+
+        def describe(v):
+            if isinstance(v, np.ndarray):
+                return {"array": add_array(v)}
+            if isinstance(v, np.generic):
+                return v.item()
+            if isinstance(v, dict):
+                return {"dict": [[describe(key), describe(item)] for key, item in v.items()]}
+            if isinstance(v, (list, tuple)):
+                # Long lists of numbers (joints, weights...) are stored as arrays.
+                if v and {type(item) for item in v} in ({int}, {float}):
+                    return {"numbers": add_array(np.array(v)), "tuple": isinstance(v, tuple)}
+                return {"list" if isinstance(v, list) else "tuple": [describe(item) for item in v]}
+            if v is None or isinstance(v, (bool, int, float, str)):
+                return v
+            raise TypeError("can not cache %r" % type(v))
+
+        description = json.dumps(describe(value)).encode()
+        f = io.BytesIO()
+        np.savez(f, description=np.frombuffer(description, dtype=np.uint8), **arrays)
+        return f.getvalue()
+
+    @staticmethod
+    def decode(data: bytes):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            def build(v):
+                if not isinstance(v, dict):
+                    return v
+                if "array" in v:
+                    return arrays[v["array"]]
+                if "numbers" in v:
+                    numbers = arrays[v["numbers"]].tolist()
+                    return tuple(numbers) if v["tuple"] else numbers
+                if "dict" in v:
+                    return {build(key): build(item) for key, item in v["dict"]}
+                if "list" in v:
+                    return [build(item) for item in v["list"]]
+                return tuple(build(item) for item in v["tuple"])
+
+            return build(json.loads(arrays["description"].tobytes()))
@@ -0,0 +1,213 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import gltf2_io_disk_cache
+else:
+    from . import gltf2_io_disk_cache
+
+import os
+import tempfile
+import time
+import unittest
+import zlib
+
+import numpy as np
+
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.encodes = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _cache(self, max_size=1 << 20):
+        return gltf2_io_disk_cache.ImageCache(self.tmpdir.name, max_size)
+
+    def _export(self, cache, images, quality=75):
+        """Encode all images like an export would, return the encoded data."""
+        def encoder(pixels):
+            def encode():
+                self.encodes += 1
+                return zlib.compress(pixels.tobytes(), 1)
+            return encode
+
+        return [cache.get_or_encode(cache.key("PNG", quality, "PIXELS", pixels.shape, pixels), encoder(pixels))
+                for pixels in images]
+
+    def test_second_export(self):
+        rng = np.random.default_rng(0)
+        images = [rng.random((16 * (i + 1), 16, 4), dtype=np.float32) for i in range(3)]
+
+        data = self._export(self._cache(), images)
+        self.assertEqual(self.encodes, 3)
+
+        # A new export, using the images cached on disk.
+        cache = self._cache()
+        self.assertEqual(self._export(cache, images), data)
+        self.assertEqual(self.encodes, 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 0))
+
+        # Changed pixels, or encoding settings, are encoded again.
+        images[0] = images[0].copy()
+        images[0][0, 0, 0] += 0.5
+        self._export(cache, images)
+        self.assertEqual(self.encodes, 4)
+        self._export(cache, images, quality=90)
+        self.assertEqual(self.encodes, 7)
+
+    def test_key(self):
+        key = gltf2_io_disk_cache.ImageCache.key
+        pixels = np.arange(64, dtype=np.float32).reshape(4, 4, 4)
+        self.assertEqual(key("PNG", pixels), key("PNG", pixels.copy()))
+        # Non-contiguous arrays are supported.
+        self.assertEqual(key("PNG", pixels[:, ::2]), key("PNG", pixels[:, ::2].copy()))
+        self.assertNotEqual(key("PNG", pixels), key("JPEG", pixels))
+        self.assertNotEqual(key("PNG", b"ab", b"c"), key("PNG", b"a", b"bc"))
+
+    def test_key_structured(self):
+        key = gltf2_io_disk_cache.MeshCache.key
+        # Field names come from attribute names, which can contain characters the buffer protocol rejects.
+        dots = np.zeros(4, dtype=[('co:x', np.float32), ('Col:0', np.uint8, 4)])
+        dots['co:x'] = np.arange(4)
+        self.assertEqual(key(dots), key(dots.copy()))
+        self.assertEqual(key(dots[::2]), key(dots[::2].copy()))
+        self.assertNotEqual(key(dots), key(dots[::-1]))
+        self.assertNotEqual(key(dots), key(dots.astype([('co:y', np.float32), ('Col:0', np.uint8, 4)])))
+
+    def test_salt(self):
+        key = gltf2_io_disk_cache.ImageCache.key("PNG")
+        gltf2_io_disk_cache.ImageCache(self.tmpdir.name, 1 << 20, salt=((4, 2, 0), (4, 2, 23))).put(key, b"data")
+        cache = gltf2_io_disk_cache.ImageCache(self.tmpdir.name, 1 << 20, salt=((4, 2, 0), (4, 2, 23)))
+        self.assertEqual(cache.get(key), b"data")
+        # Another version of Blender or of the add-on does not use that entry.
+        cache = gltf2_io_disk_cache.ImageCache(self.tmpdir.name, 1 << 20, salt=((4, 3, 0), (4, 2, 23)))
+        self.assertIsNone(cache.get(key))
+        self.assertIsNone(self._cache().get(key))
+
+    def test_eviction(self):
+        cache = self._cache(max_size=2500)
+        for i in range(3):
+            cache.put(cache.key(i), bytes(1000))
+            # Make sure modification times differ.
+            time.sleep(0.01)
+        # Least recently used entry was removed.
+        self.assertIsNone(cache.get(cache.key(0)))
+
+        # Using an entry makes it the most recently used one.
+        self.assertIsNotNone(cache.get(cache.key(1)))
+        time.sleep(0.01)
+        cache.put(cache.key(3), bytes(1000))
+        self.assertIsNotNone(cache.get(cache.key(1)))
+        self.assertIsNone(cache.get(cache.key(2)))
+        self.assertIsNotNone(cache.get(cache.key(3)))
+
+        size = sum(len(files) * 1000 for _root, _dirs, files in os.walk(self.tmpdir.name))
+        self.assertLessEqual(size, 2500)
+
+
+class MeshCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.creations = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _primitives(self):
+        rng = np.random.default_rng(0)
+        primitives = [{
+            'attributes': {
+                'POSITION': {'data': rng.random((30, 3), dtype=np.float32), 'data_type': "VEC3", 'component_type': 5126},
+                'MORPH_POSITION_0': {'data': rng.random((30, 3), dtype=np.float32)},
+                'JOINTS_0': [0, 1, 2, 3] * 30,
+                'WEIGHTS_0': [0.5, 0.25, 0.25, 0.0] * 30,
+            },
+            'indices': rng.integers(0, 30, 60),
+            'material': np.uint32(2),
+            'uvmap_attributes_index': {"UVMap": 1},
+        }, {
+            'attributes': {},
+            'mode': 0,
+            'material': 0,
+            'uvmap_attributes_index': {},
+        }]
+        return primitives, [None, None], None
+
+    def _create(self):
+        self.creations += 1
+        return self._primitives()
+
+    def test_round_trip(self):
+        primitives, additional_materials, shared_attributes = self._primitives()
+        cache = gltf2_io_disk_cache.MeshCache
+        decoded = cache.decode(cache.encode((primitives, additional_materials, shared_attributes)))
+        self.assertIsInstance(decoded, tuple)
+        decoded_primitives, decoded_materials, decoded_shared = decoded
+        self.assertEqual(decoded_materials, [None, None])
+        self.assertIsNone(decoded_shared)
+
+        attributes = decoded_primitives[0]['attributes']
+        np.testing.assert_array_equal(attributes['POSITION']['data'], primitives[0]['attributes']['POSITION']['data'])
+        self.assertEqual(attributes['POSITION']['data'].dtype, np.float32)
+        self.assertEqual(attributes['MORPH_POSITION_0'].keys(), {'data'})
+        # Lists are kept as lists, with numbers of the same type.
+        self.assertEqual(attributes['JOINTS_0'], primitives[0]['attributes']['JOINTS_0'])
+        self.assertIsInstance(attributes['JOINTS_0'][0], int)
+        self.assertEqual(attributes['WEIGHTS_0'], primitives[0]['attributes']['WEIGHTS_0'])
+        self.assertEqual(decoded_primitives[0]['indices'].dtype, primitives[0]['indices'].dtype)
+        self.assertEqual(decoded_primitives[0]['material'], 2)
+        self.assertEqual(decoded_primitives[1], primitives[1])
+
+    def test_tuples(self):
+        value = {
+            'numbers': (1, 2, 3),
+            'floats': [0.5, 1.5],
+            'mixed': ("a", (0.5, 1.0), [1, None]),
+            (0, 1): "numbers key",
+            ("a", 1.5): "mixed key",
+            'empty': ((), []),
+        }
+        cache = gltf2_io_disk_cache.MeshCache
+        decoded = cache.decode(cache.encode(value))
+        self.assertEqual(decoded, value)
+        self.assertEqual(list(decoded), list(value))
+        self.assertIsInstance(decoded['numbers'], tuple)
+        self.assertIsInstance(decoded['floats'], list)
+        self.assertIsInstance(decoded['mixed'][1], tuple)
+        self.assertIsInstance(decoded['mixed'][2], list)
+        self.assertEqual([type(v) for v in decoded['empty']], [tuple, list])
+
+    def test_second_export(self):
+        mesh_data = np.arange(90, dtype=np.float32)
+        cache = gltf2_io_disk_cache.MeshCache(self.tmpdir.name, 1 << 20)
+        cache.get_or_create(cache.key(True, mesh_data), self._create)
+        # Identical mesh data, in the same export or a later one.
+        cache = gltf2_io_disk_cache.MeshCache(self.tmpdir.name, 1 << 20)
+        primitives, _, _ = cache.get_or_create(cache.key(True, mesh_data.copy()), self._create)
+        self.assertEqual(self.creations, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual(primitives[0]['attributes']['JOINTS_0'], self._primitives()[0][0]['attributes']['JOINTS_0'])
+
+        # Changed data or export settings.
+        cache.get_or_create(cache.key(False, mesh_data), self._create)
+        mesh_data[0] = 1.0
+        cache.get_or_create(cache.key(True, mesh_data), self._create)
+        self.assertEqual(self.creations, 3)
+
+    def test_corrupted_entry(self):
+        cache = gltf2_io_disk_cache.MeshCache(self.tmpdir.name, 1 << 20)
+        key = cache.key("mesh")
+        cache.put(key, b"not a mesh")
+        cache.get_or_create(key, self._create)
+        cache.get_or_create(key, self._create)
+        self.assertEqual(self.creations, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -109,7 +109,11 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         if length_bin > 0:
             file.write(struct.pack("I", length_bin))
             file.write('BIN\0'.encode())
-            file.write(binary)
+            if hasattr(binary, "write_to"):
+                # Buffer, only copied chunk by chunk.
+                binary.write_to(file)
+            else:
+                file.write(binary)
             file.write(b'\0' * zeros_bin)
 
         file.close()
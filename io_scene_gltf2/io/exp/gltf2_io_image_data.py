@@ -14,11 +14,20 @@ class ImageData:
         self._data = data
         self._mime_type = mime_type
         self._name = name
+        # Data of encoded images may only be set later (see ImageEncodeQueue): such images are only equal to
+        # themselves, even once set, so that their hash does not change while they are used as keys.
+        self._pending = data is None
 
     def __eq__(self, other):
+        if not isinstance(other, ImageData):
+            return NotImplemented
+        if self._pending or other._pending:
+            return self is other
         return self._data == other.data
 
     def __hash__(self):
+        if self._pending:
+            return id(self)
         return hash(self._data)
 
     def adjusted_name(self):
@@ -31,6 +40,10 @@ class ImageData:
     def data(self):
         return self._data
 
+    @data.setter
+    def data(self, data: bytes):
+        self._data = data
+
     @property
     def name(self):
         return self._name
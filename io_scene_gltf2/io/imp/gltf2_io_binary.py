@@ -66,13 +66,13 @@ class BinaryData():
     def decode_accessor(gltf, accessor_idx, cache=False):
         """Decodes accessor to 2D numpy array (count x num_components)."""
         if accessor_idx in gltf.decode_accessor_cache:
-            return gltf.accessor_cache[accessor_idx]
+            return gltf.decode_accessor_cache[accessor_idx]
 
         accessor = gltf.data.accessors[accessor_idx]
         array = BinaryData.decode_accessor_obj(gltf, accessor)
 
         if cache:
-            gltf.accessor_cache[accessor_idx] = array
+            gltf.decode_accessor_cache[accessor_idx] = array
             # Prevent accidentally modifying cached arrays
             array.flags.writeable = False
 
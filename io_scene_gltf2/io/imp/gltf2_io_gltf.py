@@ -9,6 +9,7 @@ import logging
 import json
 import struct
 import base64
+import mmap
 from os.path import dirname, join, isfile
 
 
@@ -17,6 +18,16 @@ class ImportError(RuntimeError):
     pass
 
 
+def map_file(path):
+    """Read a file as a memory mapping: it is only paged in when accessed, and never copied."""
+    with open(path, 'rb') as f:
+        try:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (ValueError, OSError):
+            # Empty files (or files that don't support it) can't be mapped
+            return memoryview(f.read())
+
+
 class glTFImporter():
     """glTF Importer class."""
 
@@ -147,8 +158,8 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        # Buffers of GLB files are used in place.
+        content = map_file(self.filename)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -170,7 +181,7 @@ class glTFImporter():
         buffer = self.data.buffers[buffer_idx]
 
         if buffer.uri:
-            data = self.load_uri(buffer.uri)
+            data = self.load_uri(buffer.uri, memory_map=True)
             if data is None:
                 raise ImportError("Missing resource, '" + buffer.uri + "'.")
             self.buffers[buffer_idx] = data
@@ -181,7 +192,7 @@ class glTFImporter():
             if buffer_idx == 0 and self.glb_buffer is not None:
                 self.buffers[buffer_idx] = self.glb_buffer
 
-    def load_uri(self, uri):
+    def load_uri(self, uri, memory_map=False):
         """Loads a URI."""
         sep = ';base64,'
         if uri.startswith('data:'):
@@ -192,6 +203,8 @@ class glTFImporter():
 
         path = join(dirname(self.filename), uri_to_path(uri))
         try:
+            if memory_map:
+                return map_file(path)
             with open(path, 'rb') as f_:
                 return memoryview(f_.read())
         except Exception:
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2018-2024 The glTF-Blender-IO authors
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Must be run from Blender, with the glTF add-on available:
+#     blender --background --factory-startup --python gltf2_io_gltf_test.py
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if bpy is None:
+    gltf2_io_gltf = None
+elif __name__ == '__main__':
+    from io_scene_gltf2.io.imp import gltf2_io_gltf
+else:
+    from . import gltf2_io_gltf
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return memoryview(f.read())
+
+
+def _make_scene():
+    """A skinned mesh, with UVs and an animated shape key, moved by an animated armature."""
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=8)
+    mesh_obj = bpy.context.object
+    mesh_obj.shape_key_add(name="Basis")
+    key = mesh_obj.shape_key_add(name="Key")
+    for point in key.data[::2]:
+        point.co.z += 0.25
+    for frame, value in ((1, 0.0), (10, 1.0), (20, 0.3)):
+        key.value = value
+        key.keyframe_insert("value", frame=frame)
+
+    bpy.ops.object.armature_add(location=(0.0, 0.0, -1.0))
+    arma_obj = bpy.context.object
+    bpy.ops.object.mode_set(mode='EDIT')
+    child = arma_obj.data.edit_bones.new("Child")
+    child.head = (0.0, 0.0, 1.0)
+    child.tail = (0.0, 0.0, 2.0)
+    child.parent = arma_obj.data.edit_bones[0]
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    mesh_obj.parent = arma_obj
+    mesh_obj.modifiers.new("Armature", 'ARMATURE').object = arma_obj
+    for bone in arma_obj.data.bones:
+        group = mesh_obj.vertex_groups.new(name=bone.name)
+        for vertex in mesh_obj.data.vertices:
+            weight = (vertex.co.z + 1.0) / 2.0
+            group.add([vertex.index], weight if bone.name == "Child" else 1.0 - weight, 'REPLACE')
+
+    pose_bone = arma_obj.pose.bones["Child"]
+    for frame, angle in ((1, 0.0), (10, 0.5), (20, -0.5)):
+        pose_bone.rotation_quaternion = (np.cos(angle), np.sin(angle), 0.0, 0.0)
+        pose_bone.keyframe_insert("rotation_quaternion", frame=frame)
+        arma_obj.location.x = angle
+        arma_obj.keyframe_insert("location", frame=frame)
+
+
+def _scene_data():
+    """Everything imported from accessors: mesh data, weights, shape keys and animations."""
+    data = {}
+    for obj in sorted(bpy.context.scene.objects, key=lambda o: o.name):
+        if obj.type == 'MESH':
+            mesh = obj.data
+            for name, collection, attribute, size in (
+                    ("co", mesh.vertices, "co", 3),
+                    ("loops", mesh.loops, "vertex_index", 1)):
+                array = np.empty(len(collection) * size, dtype=np.float32)
+                collection.foreach_get(attribute, array)
+                data[obj.name, name] = array
+            for uv_layer in mesh.uv_layers:
+                array = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+                uv_layer.data.foreach_get("uv", array)
+                data[obj.name, uv_layer.name] = array
+            data[obj.name, "weights"] = [
+                sorted((obj.vertex_groups[g.group].name, g.weight) for g in vertex.groups)
+                for vertex in mesh.vertices
+            ]
+            for key_block in (mesh.shape_keys.key_blocks if mesh.shape_keys else []):
+                array = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+                key_block.data.foreach_get("co", array)
+                data[obj.name, key_block.name] = array
+
+    for action in sorted(bpy.data.actions, key=lambda a: a.name):
+        for fcurve in action.fcurves:
+            array = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+            fcurve.keyframe_points.foreach_get("co", array)
+            data[action.name, fcurve.data_path, fcurve.array_index] = array
+    return data
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class MappedBuffersTest(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        _make_scene()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.map_file_orig = gltf2_io_gltf.map_file
+
+    def tearDown(self):
+        gltf2_io_gltf.map_file = self.map_file_orig
+        self.tmpdir.cleanup()
+
+    def _import(self, filepath, use_mapping):
+        gltf2_io_gltf.map_file = self.map_file_orig if use_mapping else _read_file
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        bpy.ops.preferences.addon_enable(module="io_scene_gltf2")
+        bpy.ops.import_scene.gltf(filepath=filepath)
+        return _scene_data()
+
+    def _check(self, export_format, ext):
+        filepath = os.path.join(self.tmpdir.name, "scene" + ext)
+        bpy.ops.export_scene.gltf(filepath=filepath, export_format=export_format)
+
+        data = self._import(filepath, True)
+        expected = self._import(filepath, False)
+        self.assertEqual(data.keys(), expected.keys())
+        self.assertTrue(any(key[1] == "co" for key in data))
+        for key, value in expected.items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_array_equal(data[key], value, err_msg=repr(key))
+            else:
+                self.assertEqual(data[key], value, msg=repr(key))
+
+    def test_glb(self):
+        self._check('GLB', ".glb")
+
+    def test_gltf_separate(self):
+        self._check('GLTF_SEPARATE', ".gltf")
+
+
+if __name__ == '__main__':
+    import sys
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2)
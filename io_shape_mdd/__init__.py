@@ -8,7 +8,7 @@ bl_info = {
     "version": (1, 0, 1),
     "blender": (2, 80, 0),
     "location": "File > Import-Export",
-    "description": "Import-Export MDD as mesh shape keys",
+    "description": "Import-Export MDD as mesh shape keys, import PC2 as mesh shape keys",
     "warning": "",
     "doc_url": "{BLENDER_MANUAL_URL}/addons/import_export/shape_mdd.html",
     "support": 'OFFICIAL',
@@ -17,10 +17,14 @@ bl_info = {
 
 if "bpy" in locals():
     import importlib
+    if "point_cache" in locals():
+        importlib.reload(point_cache)
     if "import_mdd" in locals():
         importlib.reload(import_mdd)
     if "export_mdd" in locals():
         importlib.reload(export_mdd)
+    if "import_pc2" in locals():
+        importlib.reload(import_pc2)
 
 
 import bpy
@@ -33,18 +37,8 @@ from bpy.props import (
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
 
-class ImportMDD(bpy.types.Operator, ImportHelper):
-    """Import MDD vertex keyframe file to shape keys"""
-    bl_idname = "import_shape.mdd"
-    bl_label = "Import MDD"
-    bl_options = {'UNDO'}
-
-    filename_ext = ".mdd"
-
-    filter_glob: StringProperty(
-            default="*.mdd",
-            options={'HIDDEN'},
-            )
+class ImportPointCacheHelper:
+    """Options shared by the point cache importers"""
     frame_start: IntProperty(
             name="Start Frame",
             description="Start frame for inserting animation",
@@ -56,6 +50,25 @@ class ImportMDD(bpy.types.Operator, ImportHelper):
             min=1, max=1000,
             default=1,
             )
+    cache_frame_start: IntProperty(
+            name="First Cache Frame",
+            description="First frame of the file to import (counted from 0)",
+            min=0,
+            default=0,
+            )
+    cache_frame_end: IntProperty(
+            name="Last Cache Frame",
+            description="Last frame of the file to import (counted from 0), -1 to import all remaining frames",
+            min=-1,
+            default=-1,
+            )
+    cache_frame_stride: IntProperty(
+            name="Cache Stride",
+            description="Only import every Nth frame of the file, "
+                        "imported frames are still placed Step frames apart",
+            min=1, max=1000,
+            default=1,
+            )
 
     @classmethod
     def poll(cls, context):
@@ -68,11 +81,61 @@ class ImportMDD(bpy.types.Operator, ImportHelper):
 
         return super().invoke(context, event)
 
+
+class ImportMDD(ImportPointCacheHelper, bpy.types.Operator, ImportHelper):
+    """Import MDD vertex keyframe file to shape keys"""
+    bl_idname = "import_shape.mdd"
+    bl_label = "Import MDD"
+    bl_options = {'UNDO'}
+
+    filename_ext = ".mdd"
+
+    filter_glob: StringProperty(
+            default="*.mdd",
+            options={'HIDDEN'},
+            )
+
     def execute(self, context):
         keywords = self.as_keywords(ignore=("filter_glob",))
 
         from . import import_mdd
-        return import_mdd.load(context, **keywords)
+        return import_mdd.load(context, report=self.report, **keywords)
+
+
+class ImportPC2(ImportPointCacheHelper, bpy.types.Operator, ImportHelper):
+    """Import PC2 vertex keyframe file to shape keys"""
+    bl_idname = "import_shape.pc2"
+    bl_label = "Import PC2"
+    bl_options = {'UNDO'}
+
+    filename_ext = ".pc2"
+
+    filter_glob: StringProperty(
+            default="*.pc2",
+            options={'HIDDEN'},
+            )
+    use_file_frames: BoolProperty(
+            name="Use File Frames",
+            description="Place the imported frames at the start frame and sample rate stored in the file, "
+                        "instead of using Start Frame and Step",
+            default=True,
+            )
+    rot_x90: BoolProperty(
+            name="Convert from Y-up",
+            description="Rotate 90 degrees around X to convert from y-up, "
+                        "as done by the Convert to Y-up option of the PC2 exporter",
+            default=True,
+            )
+
+    def execute(self, context):
+        keywords = self.as_keywords(ignore=("filter_glob",))
+
+        from . import import_pc2
+        try:
+            return import_pc2.load(context, report=self.report, **keywords)
+        except ValueError as ex:
+            self.report({'ERROR'}, str(ex))
+            return {'CANCELLED'}
 
 
 class ExportMDD(bpy.types.Operator, ExportHelper):
@@ -140,6 +203,9 @@ def menu_func_import(self, context):
     self.layout.operator(ImportMDD.bl_idname,
                          text="Lightwave Point Cache (.mdd)",
                          )
+    self.layout.operator(ImportPC2.bl_idname,
+                         text="Pointcache (.pc2)",
+                         )
 
 
 def menu_func_export(self, context):
@@ -150,6 +216,7 @@ def menu_func_export(self, context):
 
 classes = (
     ImportMDD,
+    ImportPC2,
     ExportMDD
 )
 
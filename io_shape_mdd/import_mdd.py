@@ -16,78 +16,109 @@
 # Bill Niewuendorp
 
 import bpy
-from struct import unpack
-
-def set_linear_interpolation(obj, shapekey):
-    anim_data = obj.data.shape_keys.animation_data
-    data_path = "key_blocks[\"" + shapekey.name + "\"].value"
-
-    for fcu in anim_data.action.fcurves:
-        if fcu.data_path == data_path:
-            for keyframe in fcu.keyframe_points:
-                keyframe.interpolation = 'LINEAR'
-
-
-def obj_update_frame(file, scene, obj, start, fr, step):
-
-    # Insert new shape key
-    new_shapekey = obj.shape_key_add()
-    new_shapekey.name = ("frame_%.4d" % fr)
-    new_shapekey_index = len(obj.data.shape_keys.key_blocks) - 1
-
-    obj.active_shape_key_index = new_shapekey_index
-    obj.show_only_shape_key = True
-
-    verts = new_shapekey.data
-
-    for v in verts:  # 12 is the size of 3 floats
-        v.co[:] = unpack('>3f', file.read(12))
-
-    # me.update()
-    obj.show_only_shape_key = False
-
-    # insert keyframes
-    new_shapekey = obj.data.shape_keys.key_blocks[new_shapekey_index]
-    frame = start + fr*step
-
-    new_shapekey.value = 0.0
-    new_shapekey.keyframe_insert("value", frame=frame - step)
-
-    new_shapekey.value = 1.0
-    new_shapekey.keyframe_insert("value", frame=frame)
-
-    new_shapekey.value = 0.0
-    new_shapekey.keyframe_insert("value", frame=frame + step)
-
-    set_linear_interpolation(obj, new_shapekey)
-
-    obj.data.update()
-
-
-def load(context, filepath, frame_start=0, frame_step=1):
-
-    scene = context.scene
+import numpy as np
+
+from .point_cache import read_mdd
+
+LINEAR_INTERPOLATION_VALUE = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+
+
+def add_shape_key_keyframes(obj, shape_keys, frame_start, frame_step):
+    """
+    Animate each shape key to be fully active on its own frame only, fading linearly from and to its neighbors.
+
+    Key frames are created in bulk, instead of one keyframe_insert() call per keyframe.
+    """
+    key = obj.data.shape_keys
+    anim_data = key.animation_data or key.animation_data_create()
+    if anim_data.action is None:
+        anim_data.action = bpy.data.actions.new(name=key.name + "Action")
+    action = anim_data.action
+
+    # Compatible with C float type
+    keyframe_points_co = np.empty(3 * 2, dtype=np.single)
+    # Compatible with C char type
+    interpolation_array = np.full(3, LINEAR_INTERPOLATION_VALUE, dtype=np.ubyte)
+    # Odd indices are values, even indices are times.
+    keyframe_points_co[1::2] = (0.0, 1.0, 0.0)
+
+    for i, shape_key in enumerate(shape_keys):
+        frame = frame_start + i * frame_step
+        keyframe_points_co[0::2] = (frame - frame_step, frame, frame + frame_step)
+
+        data_path = shape_key.path_from_id("value")
+        # The action may already animate this shape key, e.g. when importing again onto the same object.
+        fcurve = action.fcurves.find(data_path) or action.fcurves.new(data_path=data_path)
+        fcurve.keyframe_points.clear()
+        fcurve.keyframe_points.add(3)
+        fcurve.keyframe_points.foreach_set('co', keyframe_points_co)
+        fcurve.keyframe_points.foreach_set('interpolation', interpolation_array)
+        fcurve.update()
+
+
+def load_point_cache(context, cache, frame_start=0, frame_step=1,
+                     cache_frame_start=0, cache_frame_end=-1, cache_frame_stride=1, matrix=None, report=print):
+    """
+    Import the selected frames of a point cache as shape keys of the active object, each one animated
+    to be fully active on its own frame.
+
+    If given, the 3x3 *matrix* transforms the coordinates of every frame.
+    """
     obj = context.object
 
-    print('\n\nimporting mdd %r' % filepath)
-
     if bpy.ops.object.mode_set.poll():
         bpy.ops.object.mode_set(mode='OBJECT')
 
-    file = open(filepath, 'rb')
-    frames, points = unpack(">2i", file.read(8))
-    time = unpack((">%df" % frames), file.read(frames * 4))
+    frame_indices, frames_co = cache.frames(cache_frame_start, cache_frame_end, cache_frame_stride)
+    points = cache.point_count
+
+    print('\tpoints:%d frames:%d' % (points, len(frame_indices)))
+    print('\tstart frame:%g step:%g' % (frame_start, frame_step))
 
-    print('\tpoints:%d frames:%d' % (points, frames))
-    print('\tstart frame:%d step:%d' % (frame_start, frame_step))
+    if points != len(obj.data.vertices):
+        report({'ERROR'}, "Point count of the file (%d) does not match the vertex count of %r (%d)" %
+               (points, obj.name, len(obj.data.vertices)))
+        return {'CANCELLED'}
 
     # If target object doesn't have Basis shape key, create it.
     if not obj.data.shape_keys:
         basis = obj.shape_key_add()
         basis.name = "Basis"
-        obj.data.update()
 
-    for i in range(frames):
-        obj_update_frame(file, scene, obj, frame_start, i, frame_step)
+    # Compatible with C float type
+    co = np.empty((points, 3), dtype=np.single)
+    if matrix is not None:
+        # Transposed, to transform row vectors.
+        matrix = np.array(matrix, dtype=np.single).T
+    shape_keys = []
+    for fr, frame_co in zip(frame_indices, frames_co):
+        # Insert new shape key
+        new_shapekey = obj.shape_key_add(from_mix=False)
+        new_shapekey.name = ("frame_%.4d" % fr)
+        new_shapekey.value = 0.0
+
+        # Only now is the frame actually read from the file, converted to native byte order.
+        co[:] = frame_co
+        if matrix is not None:
+            np.matmul(co, matrix, out=co)
+        new_shapekey.data.foreach_set("co", co.ravel())
+        shape_keys.append(new_shapekey)
+
+    if shape_keys:
+        obj.active_shape_key_index = len(obj.data.shape_keys.key_blocks) - 1
+        add_shape_key_keyframes(obj, shape_keys, frame_start, frame_step)
+
+    obj.data.update()
 
     return {'FINISHED'}
+
+
+def load(context, filepath, frame_start=0, frame_step=1,
+         cache_frame_start=0, cache_frame_end=-1, cache_frame_stride=1, report=print):
+
+    print('\n\nimporting mdd %r' % filepath)
+
+    return load_point_cache(
+        context, read_mdd(filepath), frame_start, frame_step,
+        cache_frame_start, cache_frame_end, cache_frame_stride, report=report,
+    )
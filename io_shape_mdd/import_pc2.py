@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Import PC2 (POINTCACHE2) vertex caches as shape keys, the same way MDD files are.
+
+import math
+
+from mathutils import Matrix
+
+from .import_mdd import load_point_cache
+from .point_cache import read_pc2
+
+
+def load(context, filepath, frame_start=0, frame_step=1,
+         cache_frame_start=0, cache_frame_end=-1, cache_frame_stride=1,
+         use_file_frames=True, rot_x90=True, report=print):
+
+    print('\n\nimporting pc2 %r' % filepath)
+
+    cache = read_pc2(filepath)
+    print('\tfile start frame:%g sample rate:%g' % (cache.start_frame, cache.sample_rate))
+
+    if use_file_frames and cache.sample_rate > 0.0:
+        # Frame i of the file was sampled at start_frame + i * sample_rate, keep that timing for the imported frames.
+        frame_start = cache.start_frame + cache_frame_start * cache.sample_rate
+        frame_step = cache.sample_rate * cache_frame_stride
+
+    # Inverse of the "Convert to Y-up" rotation of the PC2 exporter.
+    matrix = Matrix.Rotation(math.pi / 2, 3, 'X') if rot_x90 else None
+
+    return load_point_cache(
+        context, cache, frame_start, frame_step,
+        cache_frame_start, cache_frame_end, cache_frame_stride, matrix=matrix, report=report,
+    )
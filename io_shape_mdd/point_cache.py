@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Read point cache files (MDD and PC2) as NumPy arrays.
+
+Frames are memory-mapped, so accessing a single frame of a huge cache only
+reads that frame from disk, never the whole file.
+
+Note: `bpy` is not imported here, so this module can be used outside of Blender.
+
+    >>> cache = open_point_cache(filepath)
+    >>> cache.co.shape
+    (frame_count, point_count, 3)
+    >>> co = cache.frame(10)  # Native float32 (point_count, 3) array.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+# An mdd file is (big endian)
+# - 4 bytes of frame count (int)
+# - 4 bytes of point count (int)
+# - frame count * 4 bytes of frame times, in seconds (float)
+# - frame count blocks of point count * 3 floats (xyz)
+MDD_HEADER = struct.Struct('>2i')
+MDD_DTYPE = np.dtype('>f4')
+
+# A pc2 file is (little endian)
+# - 12 bytes of signature ('POINTCACHE2\0')
+# - 4 bytes of file version, 1 (int)
+# - 4 bytes of point count (int)
+# - 4 bytes of start frame (float)
+# - 4 bytes of sample rate, in frames (float)
+# - 4 bytes of sample (frame) count (int)
+# - sample count blocks of point count * 3 floats (xyz)
+PC2_HEADER = struct.Struct('<12siiffi')
+PC2_SIGNATURE = b'POINTCACHE2\0'
+PC2_DTYPE = np.dtype('<f4')
+
+
+class PointCache:
+    """
+    A point cache file.
+
+    Its frames are exposed as a lazily memory-mapped (frame count, point count, 3) array in *co*,
+    in the byte order of the file.
+
+    MDD files store the time of each frame (in seconds) in *times*, PC2 files a *start_frame* and
+    a *sample_rate* (in frames), attributes which do not apply to a format are None.
+    """
+    __slots__ = (
+        "filepath", "format", "frame_count", "point_count", "times", "start_frame", "sample_rate",
+        "_offset", "_dtype", "_co",
+    )
+
+    def __init__(self, filepath, format, frame_count, point_count, offset, dtype):
+        self.filepath = filepath
+        self.format = format
+        self.frame_count = frame_count
+        self.point_count = point_count
+        self.times = None
+        self.start_frame = None
+        self.sample_rate = None
+        self._offset = offset
+        self._dtype = dtype
+        self._co = None
+
+        # Never map past the end of truncated files.
+        frame_size = point_count * 3 * dtype.itemsize
+        data_size = os.path.getsize(filepath) - offset
+        if frame_size and data_size < frame_count * frame_size:
+            self.frame_count = max(0, data_size // frame_size)
+            print("WARNING! Point cache %r is truncated, only %d of %d frames available" %
+                  (filepath, self.frame_count, frame_count))
+
+    def __len__(self):
+        return self.frame_count
+
+    @property
+    def co(self):
+        if self._co is None:
+            if self.frame_count and self.point_count:
+                self._co = np.memmap(self.filepath, dtype=self._dtype, mode='r', offset=self._offset,
+                                     shape=(self.frame_count, self.point_count, 3))
+            else:
+                self._co = np.empty((self.frame_count, self.point_count, 3), dtype=self._dtype)
+        return self._co
+
+    def frame(self, index, out=None):
+        """
+        Return the coordinates of a single frame, as a native float32 (point count, 3) array.
+
+        When given, *out* is filled and returned instead of allocating a new array.
+        """
+        if out is None:
+            return self.co[index].astype(np.float32)
+        out[:] = self.co[index]
+        return out
+
+    def frames(self, start=0, end=-1, stride=1):
+        """
+        Return a tuple (frame indices, coordinates) for frames from *start* to *end* (included, -1 being the last
+        frame), every *stride* frames.
+
+        Coordinates are a view on *co*, nothing is read until it gets accessed.
+        """
+        if end < 0 or end >= self.frame_count:
+            end = self.frame_count - 1
+        return range(start, end + 1, stride), self.co[start:end + 1:stride]
+
+
+def read_mdd(filepath):
+    with open(filepath, 'rb') as file:
+        frame_count, point_count = MDD_HEADER.unpack(file.read(MDD_HEADER.size))
+        times = np.frombuffer(file.read(frame_count * MDD_DTYPE.itemsize), dtype=MDD_DTYPE)
+
+    cache = PointCache(filepath, 'MDD', frame_count, point_count,
+                       MDD_HEADER.size + frame_count * MDD_DTYPE.itemsize, MDD_DTYPE)
+    cache.times = times.astype(np.float32)
+    return cache
+
+
+def read_pc2(filepath):
+    with open(filepath, 'rb') as file:
+        header = file.read(PC2_HEADER.size)
+    if len(header) != PC2_HEADER.size or not header.startswith(PC2_SIGNATURE):
+        raise ValueError("%r is not a pc2 file" % filepath)
+
+    _signature, _version, point_count, start_frame, sample_rate, frame_count = PC2_HEADER.unpack(header)
+
+    cache = PointCache(filepath, 'PC2', frame_count, point_count, PC2_HEADER.size, PC2_DTYPE)
+    cache.start_frame = start_frame
+    cache.sample_rate = sample_rate
+    return cache
+
+
+def open_point_cache(filepath):
+    """
+    Read the header of a point cache file, the format being detected from its content (PC2 files have a signature).
+    """
+    with open(filepath, 'rb') as file:
+        is_pc2 = file.read(len(PC2_SIGNATURE)) == PC2_SIGNATURE
+    return read_pc2(filepath) if is_pc2 else read_mdd(filepath)
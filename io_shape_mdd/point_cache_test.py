@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from point_cache import (open_point_cache, read_mdd, read_pc2)
+else:
+    from .point_cache import (open_point_cache, read_mdd, read_pc2)
+
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+
+def _random_frames(frame_count, point_count):
+    return np.random.default_rng(0).uniform(-10.0, 10.0, (frame_count, point_count, 3)).astype(np.float32)
+
+
+class PointCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_mdd(self, frames, truncate=0):
+        filepath = os.path.join(self.tmpdir.name, "cache.mdd")
+        with open(filepath, 'wb') as f:
+            f.write(struct.pack(">2i", frames.shape[0], frames.shape[1]))
+            f.write(struct.pack(">%df" % frames.shape[0], *[i / 25.0 for i in range(frames.shape[0])]))
+            data = frames.astype('>f4').tobytes()
+            f.write(data[:len(data) - truncate])
+        return filepath
+
+    def _write_pc2(self, frames):
+        filepath = os.path.join(self.tmpdir.name, "cache.pc2")
+        with open(filepath, 'wb') as f:
+            f.write(struct.pack('<12siiffi', b'POINTCACHE2\0', 1, frames.shape[1], 10.0, 0.5, frames.shape[0]))
+            f.write(frames.astype('<f4').tobytes())
+        return filepath
+
+    def test_mdd(self):
+        frames = _random_frames(7, 11)
+        cache = read_mdd(self._write_mdd(frames))
+
+        self.assertEqual(cache.format, 'MDD')
+        self.assertEqual((len(cache), cache.point_count), (7, 11))
+        np.testing.assert_allclose(cache.times, np.arange(7) / 25.0, rtol=1e-6)
+        np.testing.assert_array_equal(cache.co, frames)
+        self.assertEqual(cache.frame(3).dtype, np.float32)
+        np.testing.assert_array_equal(cache.frame(3), frames[3])
+
+    def test_pc2(self):
+        frames = _random_frames(5, 4)
+        cache = read_pc2(self._write_pc2(frames))
+
+        self.assertEqual(cache.format, 'PC2')
+        self.assertEqual((len(cache), cache.point_count), (5, 4))
+        self.assertEqual((cache.start_frame, cache.sample_rate), (10.0, 0.5))
+        np.testing.assert_array_equal(cache.co, frames)
+        out = np.empty((4, 3), dtype=np.float32)
+        self.assertIs(cache.frame(4, out=out), out)
+        np.testing.assert_array_equal(out, frames[4])
+
+    def test_format_detection(self):
+        frames = _random_frames(2, 3)
+        self.assertEqual(open_point_cache(self._write_mdd(frames)).format, 'MDD')
+        self.assertEqual(open_point_cache(self._write_pc2(frames)).format, 'PC2')
+        with self.assertRaises(ValueError):
+            read_pc2(self._write_mdd(frames))
+
+    def test_frame_range(self):
+        frames = _random_frames(10, 3)
+        cache = read_mdd(self._write_mdd(frames))
+
+        indices, co = cache.frames(2, 8, 3)
+        self.assertEqual(list(indices), [2, 5, 8])
+        np.testing.assert_array_equal(co, frames[2:9:3])
+
+        indices, co = cache.frames(4)
+        self.assertEqual(list(indices), list(range(4, 10)))
+        np.testing.assert_array_equal(co, frames[4:])
+
+    def test_truncated(self):
+        frames = _random_frames(6, 5)
+        # Cut the file in the middle of the last frame.
+        cache = read_mdd(self._write_mdd(frames, truncate=7))
+
+        self.assertEqual(len(cache), 5)
+        np.testing.assert_array_equal(cache.co, frames[:5])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
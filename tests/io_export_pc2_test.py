@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2024 Blender Foundation
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Run from Blender:
+#   blender --background --factory-startup --python tests/io_export_pc2_test.py
+#
+# Tests of single file add-ons are kept here: Blender lists each module at the root of the add-ons as an add-on.
+
+import math
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+try:
+    import bpy
+    import mathutils
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import io_export_pc2
+
+
+def _legacy_export(context, props, filepath):
+    """The per-vertex exporter, as it was before reading coordinates with foreach_get."""
+    mat_x90 = mathutils.Matrix.Rotation(-math.pi/2, 4, 'X')
+    ob = context.active_object
+    sc = context.scene
+    start = props.range_start
+    sampling = float(props.sampling)
+    depsgraph = context.evaluated_depsgraph_get() if props.apply_modifiers else None
+
+    def get_mesh():
+        return ob.evaluated_get(depsgraph).to_mesh() if depsgraph else ob.to_mesh()
+
+    me = get_mesh()
+    sampletimes = io_export_pc2.get_sampled_frames(start, props.range_end, sampling)
+    with open(filepath, "wb") as file:
+        file.write(struct.pack('<12siiffi', b'POINTCACHE2\0', 1, len(me.vertices), start, sampling, len(sampletimes)))
+        for frame in sampletimes:
+            sc.frame_set(int(frame[1]), subframe=frame[0])
+            me = get_mesh()
+            if props.world_space:
+                me.transform(ob.matrix_world)
+            if props.rot_x90:
+                me.transform(mat_x90)
+            for v in me.vertices:
+                file.write(struct.pack('<fff', float(v.co[0]), float(v.co[1]), float(v.co[2])))
+    (ob.evaluated_get(depsgraph) if depsgraph else ob).to_mesh_clear()
+
+
+@unittest.skipIf(bpy is None, "must be run from Blender")
+class ExportPC2Test(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        self.objects = []
+        for i in range(2):
+            bpy.ops.mesh.primitive_uv_sphere_add(location=(i, 2.0, -1.0), rotation=(0.3, 0.2 * i, 0.1))
+            ob = bpy.context.active_object
+            ob.modifiers.new("Twist", 'SIMPLE_DEFORM').angle = 0.7
+            ob.keyframe_insert("location", frame=1)
+            ob.location.z += 3.0
+            ob.scale.x = 1.5 + i
+            ob.keyframe_insert("location", frame=10)
+            ob.keyframe_insert("scale", frame=10)
+            self.objects.append(ob)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _props(self, **kwargs):
+        props = dict(rot_x90=True, world_space=True, apply_modifiers=True, range_start=1, range_end=10, sampling='0.5')
+        props.update(kwargs)
+        return SimpleNamespace(**props)
+
+    def _read(self, filepath):
+        with open(filepath, 'rb') as f:
+            return f.read()
+
+    def _check_identical(self, props):
+        for ob in self.objects:
+            bpy.context.view_layer.objects.active = ob
+            legacy_filepath = os.path.join(self.tmpdir.name, "legacy.pc2")
+            filepath = os.path.join(self.tmpdir.name, "new.pc2")
+            _legacy_export(bpy.context, props, legacy_filepath)
+            self.assertTrue(io_export_pc2.do_export(bpy.context, props, [(ob, filepath)]))
+            self.assertEqual(self._read(filepath), self._read(legacy_filepath))
+
+    def test_identical_to_legacy_exporter(self):
+        self._check_identical(self._props())
+
+    def test_identical_to_legacy_exporter_local_space(self):
+        self._check_identical(self._props(rot_x90=False, world_space=False, apply_modifiers=False, sampling='2'))
+
+    def test_multiple_objects(self):
+        props = self._props()
+        filepaths = [(ob, os.path.join(self.tmpdir.name, "%s.pc2" % ob.name)) for ob in self.objects]
+        self.assertTrue(io_export_pc2.do_export(bpy.context, props, filepaths))
+
+        for ob, filepath in filepaths:
+            bpy.context.view_layer.objects.active = ob
+            legacy_filepath = os.path.join(self.tmpdir.name, "legacy.pc2")
+            _legacy_export(bpy.context, props, legacy_filepath)
+            self.assertEqual(self._read(filepath), self._read(legacy_filepath))
+
+
+if __name__ == '__main__':
+    # Blender's own arguments are not meant for unittest.
+    argv = [sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main(argv=argv, verbosity=2)